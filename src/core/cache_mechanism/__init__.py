@@ -9,6 +9,7 @@ from .functions import (
     create_cache,
     create_memory_cache,
     create_redis_cache,
+    create_sharded_cache,
     configure_cache,
     cache_get,
     cache_set,
@@ -27,6 +28,7 @@ __all__ = [
     "create_cache",
     "create_memory_cache",
     "create_redis_cache",
+    "create_sharded_cache",
     "configure_cache",
     # High-level convenience functions
     "cache_get",
@@ -7,16 +7,40 @@ supporting TTL, basic LRU eviction, and pattern-based invalidation.
 
 from __future__ import annotations
 
+import asyncio
+import atexit
+import logging
+import mmap
+import os
+import pickle
+import struct
+import threading
 import time
+import weakref
 from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Any, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 try:
     import redis  # type: ignore - Dragonfly is Redis-compatible
 except Exception:  # pragma: no cover - optional dependency
     redis = None
 
+try:
+    from redis import asyncio as redis_asyncio  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    redis_asyncio = None
+
+from ..utils.blocking_executor import run_blocking
+
+logger = logging.getLogger(__name__)
+
+# Snapshot file layout: header | pickled values back to back | pickled index.
+# The index maps namespaced key -> (offset, length, absolute expiry), so a
+# value is only unpickled from the memory map when it is first requested.
+_SNAPSHOT_MAGIC = b"SDKCSNP1"
+_SNAPSHOT_HEADER = struct.Struct("<8sQQ")  # magic, index offset, index length
+
 
 @dataclass
 class CacheConfig:
@@ -25,6 +49,9 @@ class CacheConfig:
     max_size: int = 1024  # only applies to memory backend
     dragonfly_url: Optional[str] = None
     namespace: str = "sdk_cache"
+    max_connections: Optional[int] = None  # Dragonfly connection pool size
+    snapshot_path: Optional[str] = None  # memory backend: warm-restart snapshot file
+    snapshot_interval: Optional[float] = 60.0  # seconds between snapshots (None = manual only)
 
 
 class CacheMechanism:
@@ -39,10 +66,48 @@ class CacheMechanism:
         if self.backend == "dragonfly":
             if redis is None:
                 raise ImportError("redis package is required for Dragonfly backend (Dragonfly is Redis-compatible)")
-            self._client = redis.Redis.from_url(self.config.dragonfly_url or "dragonfly://localhost:6379/0")
+            pool_kwargs = {}
+            if self.config.max_connections:
+                pool_kwargs["max_connections"] = self.config.max_connections
+            self._client = redis.Redis.from_url(
+                self.config.dragonfly_url or "dragonfly://localhost:6379/0",
+                **pool_kwargs
+            )
+            # Async clients for get_async/set_async, one per event loop
+            # (asyncio connections cannot be shared across loops)
+            self._pool_kwargs = pool_kwargs
+            self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = (
+                weakref.WeakKeyDictionary()
+            )
         else:
             # Simple in-memory LRU with TTL
             self._store: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+            # Guards _store so batched operations touch it under a single acquisition
+            self._lock = threading.RLock()
+            # Warm-restart snapshot state: keys whose bytes in the mapped
+            # snapshot are still current, and keys changed since the last one
+            self._snapshot_map: Optional[mmap.mmap] = None
+            self._snapshot_index: Dict[str, Tuple[int, int, float]] = {}
+            self._dirty_keys: set[str] = set()
+            self._snapshot_write_lock = threading.Lock()
+            self._snapshot_stop = threading.Event()
+            self._snapshot_thread: Optional[threading.Thread] = None
+            if self.config.snapshot_path:
+                self._load_snapshot()
+                self._start_snapshotting()
+
+        # Optional access monitor (see cache_enhancements.CacheMonitor)
+        self.monitor: Optional[Any] = None
+
+    def attach_monitor(self, monitor: Any) -> None:
+        """
+        Attach an access monitor that is notified on every get and set.
+
+        Args:
+            monitor: Object exposing record_access(key, hit, tenant_id) and
+                record_write(key, tenant_id), e.g. CacheMonitor
+        """
+        self.monitor = monitor
 
     def _namespaced_key(self, key: str, tenant_id: Optional[str] = None) -> str:
         """Create namespaced cache key with optional tenant isolation."""
@@ -63,6 +128,9 @@ class CacheMechanism:
         expires_at = time.time() + ttl
         namespaced = self._namespaced_key(key, tenant_id=tenant_id)
 
+        if self.monitor is not None:
+            self.monitor.record_write(key, tenant_id=tenant_id)
+
         if self.backend == "dragonfly":
             # Dragonfly backend: Distributed cache, survives process restarts
             self._client.set(namespaced, value, ex=ttl)
@@ -71,9 +139,11 @@ class CacheMechanism:
         # MEMORY BACKEND: In-memory LRU cache with TTL
         # LRU (Least Recently Used) eviction: removes least recently accessed items when full
         # This keeps frequently accessed items in cache, maximizing cache hit rate
-        self._store[namespaced] = (value, expires_at)
-        self._store.move_to_end(namespaced)  # Mark as recently used (LRU)
-        self._evict_if_needed()  # Remove oldest items if cache is full
+        with self._lock:
+            self._mark_dirty(namespaced)
+            self._store[namespaced] = (value, expires_at)
+            self._store.move_to_end(namespaced)  # Mark as recently used (LRU)
+            self._evict_if_needed()  # Remove oldest items if cache is full
 
     def get(self, key: str, tenant_id: Optional[str] = None) -> Optional[Any]:
         """
@@ -86,13 +156,23 @@ class CacheMechanism:
 
         if self.backend == "dragonfly":
             value = self._client.get(namespaced)
-            return value
+        else:
+            with self._lock:
+                value = self._get_locked(namespaced, time.time())
+
+        if self.monitor is not None:
+            self.monitor.record_access(key, value is not None, tenant_id=tenant_id)
+        return value
 
-        if namespaced not in self._store:
-            return None  # Cache miss
+    def _get_locked(self, namespaced: str, now: float) -> Optional[Any]:
+        """Look up a namespaced key in the memory store. Caller must hold ``_lock``."""
+        entry = self._store.get(namespaced)
+        if entry is None:
+            # Cache miss, unless a restored snapshot still holds the key
+            return self._load_snapshot_entry(namespaced, now)
 
-        value, expires_at = self._store[namespaced]
-        if expires_at < time.time():
+        value, expires_at = entry
+        if expires_at < now:
             # TTL expired: Remove from cache (cache miss)
             self._store.pop(namespaced, None)
             return None
@@ -102,12 +182,169 @@ class CacheMechanism:
         self._store.move_to_end(namespaced)
         return value  # Cache hit: return cached value
 
+    def _async_client(self) -> Optional[Any]:
+        """Get this event loop's async Dragonfly client (None without ``redis.asyncio``)."""
+        if redis_asyncio is None:
+            return None
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = redis_asyncio.Redis.from_url(
+                self.config.dragonfly_url or "dragonfly://localhost:6379/0",
+                **self._pool_kwargs
+            )
+            self._async_clients[loop] = client
+        return client
+
+    async def get_async(self, key: str, tenant_id: Optional[str] = None) -> Optional[Any]:
+        """
+        Retrieve a value without blocking the event loop.
+
+        The memory backend is a dictionary lookup and is read in place;
+        Dragonfly is read through a ``redis.asyncio`` client (or on the shared
+        blocking executor if only the sync client is installed).
+        """
+        if self.backend != "dragonfly":
+            return self.get(key, tenant_id=tenant_id)
+
+        client = self._async_client()
+        if client is None:
+            return await run_blocking(None, self.get, key, tenant_id)
+        value = await client.get(self._namespaced_key(key, tenant_id=tenant_id))
+        if self.monitor is not None:
+            self.monitor.record_access(key, value is not None, tenant_id=tenant_id)
+        return value
+
+    async def set_async(
+        self,
+        key: str,
+        value: Any,
+        tenant_id: Optional[str] = None,
+        ttl: Optional[int] = None
+    ) -> None:
+        """Store a value with TTL without blocking the event loop (see ``get_async``)."""
+        if self.backend != "dragonfly":
+            self.set(key, value, tenant_id=tenant_id, ttl=ttl)
+            return
+
+        client = self._async_client()
+        if client is None:
+            await run_blocking(None, self.set, key, value, tenant_id, ttl)
+            return
+        if self.monitor is not None:
+            self.monitor.record_write(key, tenant_id=tenant_id)
+        await client.set(self._namespaced_key(key, tenant_id=tenant_id), value, ex=ttl or self.config.default_ttl)
+
     def delete(self, key: str, tenant_id: Optional[str] = None) -> None:
         namespaced = self._namespaced_key(key, tenant_id=tenant_id)
         if self.backend == "dragonfly":
             self._client.delete(namespaced)
         else:
-            self._store.pop(namespaced, None)
+            with self._lock:
+                self._mark_dirty(namespaced)
+                self._store.pop(namespaced, None)
+
+    def get_many(
+        self,
+        keys: Iterable[str],
+        tenant_id: Optional[str] = None,
+        track_access: bool = True
+    ) -> Dict[str, Optional[Any]]:
+        """
+        Retrieve several values in one round-trip.
+
+        Dragonfly uses a single MGET; the memory backend resolves every key
+        under one lock acquisition.
+
+        Args:
+            keys: Cache keys to look up
+            tenant_id: Optional tenant ID for tenant isolation
+            track_access: Whether to report the lookups to the attached monitor
+                (disable for internal checks such as cache warming)
+
+        Returns:
+            Dictionary mapping each requested key to its value (None on miss)
+        """
+        keys = list(dict.fromkeys(keys))  # de-duplicate, keep order
+        if not keys:
+            return {}
+        namespaced = [self._namespaced_key(key, tenant_id=tenant_id) for key in keys]
+
+        if self.backend == "dragonfly":
+            results = dict(zip(keys, self._client.mget(namespaced)))
+        else:
+            now = time.time()
+            with self._lock:
+                results = {key: self._get_locked(nk, now) for key, nk in zip(keys, namespaced)}
+
+        if self.monitor is not None and track_access:
+            for key, value in results.items():
+                self.monitor.record_access(key, value is not None, tenant_id=tenant_id)
+        return results
+
+    def set_many(
+        self,
+        items: Dict[str, Any],
+        tenant_id: Optional[str] = None,
+        ttl: Optional[int] = None
+    ) -> None:
+        """
+        Store several values with the same TTL in one round-trip.
+
+        Dragonfly sends all SETs through a single non-transactional pipeline;
+        the memory backend writes every entry under one lock acquisition and
+        evicts once at the end.
+
+        Args:
+            items: Mapping of cache key to value
+            tenant_id: Optional tenant ID for tenant isolation
+            ttl: Optional TTL override (seconds)
+        """
+        if not items:
+            return
+        ttl = ttl or self.config.default_ttl
+
+        if self.monitor is not None:
+            for key in items:
+                self.monitor.record_write(key, tenant_id=tenant_id)
+
+        if self.backend == "dragonfly":
+            pipe = self._client.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.set(self._namespaced_key(key, tenant_id=tenant_id), value, ex=ttl)
+            pipe.execute()
+            return
+
+        expires_at = time.time() + ttl
+        with self._lock:
+            for key, value in items.items():
+                namespaced = self._namespaced_key(key, tenant_id=tenant_id)
+                self._mark_dirty(namespaced)
+                self._store[namespaced] = (value, expires_at)
+                self._store.move_to_end(namespaced)
+            self._evict_if_needed()
+
+    def delete_many(self, keys: Iterable[str], tenant_id: Optional[str] = None) -> None:
+        """
+        Delete several keys in one round-trip.
+
+        Args:
+            keys: Cache keys to delete
+            tenant_id: Optional tenant ID for tenant isolation
+        """
+        namespaced: List[str] = [self._namespaced_key(key, tenant_id=tenant_id) for key in keys]
+        if not namespaced:
+            return
+
+        if self.backend == "dragonfly":
+            # DEL accepts multiple keys, so a single command suffices
+            self._client.delete(*namespaced)
+            return
+
+        with self._lock:
+            for nk in namespaced:
+                self._mark_dirty(nk)
+                self._store.pop(nk, None)
 
     def invalidate_pattern(self, pattern: str, tenant_id: Optional[str] = None) -> None:
         """
@@ -125,14 +362,158 @@ class CacheMechanism:
                 self._client.delete(*keys)
             return
 
-        to_delete = [k for k in self._store if pattern in k]
-        for k in to_delete:
-            self._store.pop(k, None)
+        with self._lock:
+            to_delete = [k for k in self._store if pattern in k]
+            to_delete += [k for k in self._snapshot_index if pattern in k and k not in self._store]
+            for k in to_delete:
+                self._mark_dirty(k)
+                self._store.pop(k, None)
 
     def _evict_if_needed(self) -> None:
         while len(self._store) > self.config.max_size:
             # Pop oldest (LRU)
-            self._store.popitem(last=False)
+            evicted, _ = self._store.popitem(last=False)
+            self._mark_dirty(evicted)
+
+    def _mark_dirty(self, namespaced: str) -> None:
+        """Record a change to a memory key for the next snapshot. Caller must hold ``_lock``."""
+        if self.config.snapshot_path:
+            self._snapshot_index.pop(namespaced, None)
+            self._dirty_keys.add(namespaced)
+
+    def _load_snapshot_entry(self, namespaced: str, now: float) -> Optional[Any]:
+        """Lazily restore one key from the mapped snapshot. Caller must hold ``_lock``."""
+        location = self._snapshot_index.get(namespaced)
+        if location is None or self._snapshot_map is None:
+            return None
+        offset, length, expires_at = location
+        if expires_at < now:
+            self._snapshot_index.pop(namespaced, None)
+            return None
+        try:
+            value = pickle.loads(self._snapshot_map[offset:offset + length])
+        except Exception:
+            logger.warning("Dropping unreadable snapshot entry %s", namespaced)
+            self._snapshot_index.pop(namespaced, None)
+            return None
+        self._store[namespaced] = (value, expires_at)
+        self._evict_if_needed()
+        return value
+
+    def _load_snapshot(self) -> None:
+        """Map the snapshot file and read its index; values load on first access."""
+        mapped = _open_snapshot(self.config.snapshot_path)
+        if mapped is None:
+            return
+        snapshot_map, index = mapped
+        now = time.time()
+        with self._lock:
+            self._snapshot_map = snapshot_map
+            # TTLs are stored as absolute expiry times, so expired keys drop out here
+            self._snapshot_index = {k: loc for k, loc in index.items() if loc[2] >= now}
+        logger.info("Restored cache snapshot with %d live entries", len(self._snapshot_index))
+
+    def _start_snapshotting(self) -> None:
+        """Start the periodic snapshot thread and snapshot once more at exit."""
+        atexit.register(self.close)
+        interval = self.config.snapshot_interval
+        if not interval:
+            return
+
+        def run() -> None:
+            while not self._snapshot_stop.wait(interval):
+                try:
+                    self.snapshot()
+                except Exception:
+                    logger.exception("Periodic cache snapshot failed")
+
+        self._snapshot_thread = threading.Thread(target=run, name="cache-snapshot", daemon=True)
+        self._snapshot_thread.start()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Write the memory store to ``config.snapshot_path`` for warm restarts.
+
+        Snapshots are incremental: entries unchanged since the previous
+        snapshot are copied as raw bytes from the mapped file and only changed
+        entries are pickled again. The file is written to a temporary path,
+        fsynced and atomically renamed, so readers never see a partial file.
+        Keys restored from the previous snapshot but not yet accessed are
+        carried over. Values are pickled, so the file must stay on trusted
+        local storage.
+
+        Returns:
+            Dictionary with entries, serialized, reused, bytes and elapsed
+        """
+        if self.backend != "memory" or not self.config.snapshot_path:
+            raise ValueError("Snapshots require the memory backend and CacheConfig.snapshot_path")
+
+        with self._snapshot_write_lock:
+            start = time.time()
+            with self._lock:
+                if not self._dirty_keys and self._snapshot_map is not None:
+                    return {"entries": len(self._snapshot_index), "serialized": 0, "reused": 0,
+                            "bytes": 0, "elapsed": 0.0}
+                # Cleared now so changes made during the write are caught;
+                # restored below if the write fails
+                written = set(self._dirty_keys)
+                self._dirty_keys.clear()
+                live = [(nk, value, expires_at) for nk, (value, expires_at) in self._store.items()
+                        if expires_at >= start]
+                pending = [(nk, loc) for nk, loc in self._snapshot_index.items()
+                           if nk not in self._store and loc[2] >= start]
+                clean = dict(self._snapshot_index)
+                source = self._snapshot_map
+
+            stats = {"serialized": 0, "reused": 0}
+
+            def records():
+                for nk, value, expires_at in live:
+                    location = clean.get(nk)
+                    if location is not None and source is not None:
+                        stats["reused"] += 1
+                        yield nk, source[location[0]:location[0] + location[1]], expires_at
+                        continue
+                    try:
+                        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+                    except Exception:
+                        logger.debug("Skipping unpicklable cache entry %s", nk)
+                        continue
+                    stats["serialized"] += 1
+                    yield nk, payload, expires_at
+                for nk, (offset, length, expires_at) in pending[:max(self.config.max_size - len(live), 0)]:
+                    stats["reused"] += 1
+                    yield nk, source[offset:offset + length], expires_at
+
+            try:
+                index, size = _write_snapshot(self.config.snapshot_path, records())
+                mapped = _open_snapshot(self.config.snapshot_path)
+            except BaseException:
+                # Otherwise the next snapshot (including the one at close) would see nothing to write
+                with self._lock:
+                    self._dirty_keys.update(written)
+                raise
+
+            with self._lock:
+                if self._snapshot_map is not None:
+                    self._snapshot_map.close()
+                self._snapshot_map = mapped[0] if mapped else None
+                # Keys changed while writing stay dirty and are not served from the new file
+                self._snapshot_index = {k: loc for k, loc in index.items() if k not in self._dirty_keys}
+
+            return {"entries": len(index), **stats, "bytes": size, "elapsed": time.time() - start}
+
+    def close(self) -> None:
+        """Stop periodic snapshotting and write a final snapshot."""
+        if self.backend != "memory" or not self.config.snapshot_path:
+            return
+        self._snapshot_stop.set()
+        if self._snapshot_thread is not None and self._snapshot_thread is not threading.current_thread():
+            self._snapshot_thread.join(timeout=5)
+        try:
+            self.snapshot()
+        except Exception:
+            logger.exception("Final cache snapshot failed")
     
     def cache_prompt_interpretation(
         self,
@@ -182,3 +563,48 @@ class CacheMechanism:
         return None
 
 
+def _write_snapshot(path: str, records: Iterable[Tuple[str, bytes, float]]) -> Tuple[Dict[str, Tuple[int, int, float]], int]:
+    """Write snapshot records to ``path`` atomically; returns the index and file size."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    index: Dict[str, Tuple[int, int, float]] = {}
+    try:
+        with open(tmp_path, "wb") as fh:
+            fh.write(b"\0" * _SNAPSHOT_HEADER.size)
+            offset = _SNAPSHOT_HEADER.size
+            for key, payload, expires_at in records:
+                fh.write(payload)
+                index[key] = (offset, len(payload), expires_at)
+                offset += len(payload)
+            index_bytes = pickle.dumps(index, protocol=pickle.HIGHEST_PROTOCOL)
+            fh.write(index_bytes)
+            fh.seek(0)
+            fh.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, offset, len(index_bytes)))
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return index, offset + len(index_bytes)
+
+
+def _open_snapshot(path: str) -> Optional[Tuple[mmap.mmap, Dict[str, Tuple[int, int, float]]]]:
+    """Memory-map a snapshot file and read its index; None if missing or invalid."""
+    try:
+        with open(path, "rb") as fh:
+            snapshot_map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):
+        return None
+    try:
+        magic, index_offset, index_length = _SNAPSHOT_HEADER.unpack_from(snapshot_map, 0)
+        if magic != _SNAPSHOT_MAGIC:
+            raise ValueError("bad snapshot magic")
+        index = pickle.loads(snapshot_map[index_offset:index_offset + index_length])
+    except Exception:
+        logger.warning("Ignoring invalid cache snapshot at %s", path)
+        snapshot_map.close()
+        return None
+    return snapshot_map, index
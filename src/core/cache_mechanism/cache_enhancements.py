@@ -4,14 +4,28 @@ Cache Enhancements
 Advanced cache features: warming, monitoring, sharding, auto-caching, validation, recovery.
 """
 
-from typing import Dict, Any, Optional, Callable, List
+from typing import Dict, Any, Optional, Callable, List, Tuple
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime
 import asyncio
 import hashlib
 import json
+import logging
+import math
 import psutil
 import os
+import random
+import threading
+import time
+import uuid
+from bisect import bisect_right
+
+from .cache import CacheConfig, CacheMechanism
+from ..utils.blocking_executor import run_blocking
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -21,6 +35,11 @@ class CacheWarmingConfig:
     warm_on_startup: bool = True
     warm_keys: List[str] = field(default_factory=list)
     warm_functions: List[Callable] = field(default_factory=list)
+    # Loads the value for a single key; enables warming hot keys seen by CacheMonitor
+    key_loader: Optional[Callable[[str], Any]] = None
+    max_concurrency: int = 8
+    time_budget: Optional[float] = 30.0  # seconds; None = no limit
+    max_hot_keys: int = 100
 
 
 @dataclass
@@ -29,67 +48,171 @@ class CacheShardingConfig:
     enabled: bool = False
     num_shards: int = 4
     shard_key_func: Optional[Callable[[str], int]] = None
+    # Dragonfly endpoints for ShardedCache (one connection pool per node)
+    nodes: List[str] = field(default_factory=list)
+    virtual_nodes: int = 160
+    max_connections_per_node: Optional[int] = None
 
 
 class CacheWarmer:
     """
     Cache warmer for pre-loading frequently accessed data.
+
+    Candidate keys come from ``warm_keys`` and from the access log of a
+    ``CacheMonitor``. They are ranked by expected benefit (access rate x
+    recompute cost) and loaded with bounded concurrency within a time budget,
+    so the most valuable keys are warm first when a service starts.
     """
     
-    def __init__(self, cache, config: Optional[CacheWarmingConfig] = None):
+    def __init__(self, cache, config: Optional[CacheWarmingConfig] = None, monitor: Optional["CacheMonitor"] = None):
         """
         Initialize cache warmer.
         
         Args:
             cache: Cache mechanism instance
             config: Warming configuration
+            monitor: Optional access monitor (defaults to the cache's attached monitor)
         """
         self.cache = cache
         self.config = config or CacheWarmingConfig()
+        self.monitor = monitor or getattr(cache, "monitor", None)
         self.warmed_keys: set = set()
     
-    async def warm_cache(self, tenant_id: Optional[str] = None) -> None:
+    def rank_keys(self, tenant_id: Optional[str] = None) -> List[str]:
+        """
+        Rank candidate keys by expected warming benefit.
+
+        Args:
+            tenant_id: Optional tenant ID
+
+        Returns:
+            Keys ordered from highest to lowest expected benefit
+        """
+        scores: Dict[str, float] = {key: 0.0 for key in self.config.warm_keys}
+        if self.monitor is not None and self.config.key_loader is not None:
+            for stats in self.monitor.get_hot_keys(limit=self.config.max_hot_keys, tenant_id=tenant_id):
+                scores[stats["key"]] = max(scores.get(stats["key"], 0.0), stats["benefit"])
+        # Stable sort keeps configured order among keys without statistics
+        return sorted(scores, key=lambda key: scores[key], reverse=True)
+
+    async def warm_cache(self, tenant_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Warm the cache by pre-loading data.
-        
+
+        Keys that are already cached are detected with a single ``get_many``
+        call. Missing keys (highest benefit first) and warm functions run
+        concurrently up to ``max_concurrency``; anything still running when
+        ``time_budget`` expires is cancelled. Produced values are written back
+        with one ``set_many`` call.
+
         Args:
             tenant_id: Optional tenant ID
+
+        Returns:
+            Summary with warmed, skipped, failed and timed_out counts and elapsed seconds
         """
+        start = time.time()
+        summary = {"warmed": 0, "skipped": 0, "failed": 0, "timed_out": 0, "elapsed": 0.0}
         if not self.config.enabled:
-            return
-        
-        # Warm predefined keys
-        for key in self.config.warm_keys:
-            if key not in self.warmed_keys:
-                # Try to get value (will be cached if function provided)
-                if key in self.config.warm_functions:
-                    func = self.config.warm_functions[self.config.warm_keys.index(key)]
-                    try:
-                        if asyncio.iscoroutinefunction(func):
-                            value = await func()
-                        else:
-                            value = func()
-                        self.cache.set(key, value, tenant_id=tenant_id)
-                        self.warmed_keys.add(key)
-                    except Exception as e:
-                        # Log error but continue
-                        pass
-        
-        # Warm using functions
-        for func in self.config.warm_functions:
+            return summary
+
+        # Skip keys that are already present in the cache
+        pending = [key for key in self.rank_keys(tenant_id) if key not in self.warmed_keys]
+        if pending:
+            cached = self.cache.get_many(pending, tenant_id=tenant_id, track_access=False)
+            present = {key for key, value in cached.items() if value is not None}
+            self.warmed_keys.update(present)
+            summary["skipped"] = len(present)
+            pending = [key for key in pending if key not in present]
+
+        jobs: List[Callable] = []
+        if self.config.key_loader is not None:
+            jobs.extend(self._key_job(key, tenant_id) for key in pending)
+        jobs.extend(self._function_job(func) for func in self.config.warm_functions)
+
+        semaphore = asyncio.Semaphore(max(1, self.config.max_concurrency))
+
+        async def bounded(job: Callable) -> Any:
+            async with semaphore:
+                return await job()
+
+        # Semaphore waiters are served FIFO, so jobs start in priority order
+        tasks = [asyncio.ensure_future(bounded(job)) for job in jobs]
+        done: set = set()
+        if tasks:
+            done, not_done = await asyncio.wait(tasks, timeout=self.config.time_budget)
+            for task in not_done:
+                task.cancel()
+            summary["timed_out"] = len(not_done)
+
+        # Jobs return a (key, value) tuple or a dict of key -> value
+        to_set: Dict[str, Any] = {}
+        for task in done:
+            result = task.result()
+            if isinstance(result, tuple) and len(result) == 2:
+                key, value = result
+                to_set[key] = value
+            elif isinstance(result, dict):
+                to_set.update(result)
+            else:
+                summary["failed"] += 1
+
+        to_set = {key: value for key, value in to_set.items() if key not in self.warmed_keys}
+        if to_set:
             try:
-                if asyncio.iscoroutinefunction(func):
-                    result = await func()
-                else:
-                    result = func()
-                # Function should return (key, value) tuple
-                if isinstance(result, tuple) and len(result) == 2:
-                    key, value = result
-                    self.cache.set(key, value, tenant_id=tenant_id)
-                    self.warmed_keys.add(key)
-            except Exception as e:
+                self.cache.set_many(to_set, tenant_id=tenant_id)
+                self.warmed_keys.update(to_set)
+                summary["warmed"] = len(to_set)
+            except Exception:
                 # Log error but continue
-                pass
+                summary["failed"] += len(to_set)
+
+        summary["elapsed"] = time.time() - start
+        return summary
+
+    async def warm_on_startup(self, tenant_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Warm the cache at service start if ``warm_on_startup`` is enabled.
+
+        Args:
+            tenant_id: Optional tenant ID
+
+        Returns:
+            Warming summary (empty counts if startup warming is disabled)
+        """
+        if not self.config.warm_on_startup:
+            return {"warmed": 0, "skipped": 0, "failed": 0, "timed_out": 0, "elapsed": 0.0}
+        return await self.warm_cache(tenant_id=tenant_id)
+
+    def _key_job(self, key: str, tenant_id: Optional[str]) -> Callable:
+        """Build a job loading one key and recording its recompute cost."""
+        async def job() -> Any:
+            started = time.time()
+            value = await self._run_warm_function(self.config.key_loader, key)
+            if value is None:
+                return None
+            if self.monitor is not None:
+                self.monitor.record_compute_cost(key, time.time() - started, tenant_id=tenant_id)
+            return key, value
+        return job
+
+    def _function_job(self, func: Callable) -> Callable:
+        """Build a job running a warm function."""
+        async def job() -> Any:
+            return await self._run_warm_function(func)
+        return job
+
+    async def _run_warm_function(self, func: Callable, *args: Any) -> Any:
+        """Run a warm function, returning None if it fails."""
+        try:
+            if asyncio.iscoroutinefunction(func):
+                return await func(*args)
+            # Run sync loaders off the event loop so they overlap
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, lambda: func(*args))
+        except Exception:
+            # Log error but continue
+            return None
     
     def add_warm_key(self, key: str, warm_func: Optional[Callable] = None) -> None:
         """
@@ -107,17 +230,33 @@ class CacheWarmer:
 
 class CacheMonitor:
     """
-    Memory usage monitor for cache.
+    Memory usage and access monitor for cache.
+
+    When attached to a cache, every get/set is reported here. Global hit and
+    miss counters are always updated; the per-key access log is sampled at
+    ``sample_rate`` and bounded to ``max_tracked_keys`` (least recently
+    accessed keys are dropped first).
     """
     
-    def __init__(self, cache):
+    def __init__(
+        self,
+        cache,
+        sample_rate: float = 1.0,
+        max_tracked_keys: int = 10000,
+        attach: bool = True
+    ):
         """
         Initialize cache monitor.
         
         Args:
             cache: Cache mechanism instance
+            sample_rate: Fraction of accesses recorded in the per-key log (0-1]
+            max_tracked_keys: Maximum number of keys kept in the access log
+            attach: Whether to attach to the cache's get/set path
         """
         self.cache = cache
+        self.sample_rate = sample_rate
+        self.max_tracked_keys = max_tracked_keys
         self.metrics: Dict[str, Any] = {
             "memory_usage_bytes": 0,
             "cache_size": 0,
@@ -128,6 +267,12 @@ class CacheMonitor:
             "misses": 0,
             "last_check": None
         }
+        self.access_log: "OrderedDict[Tuple[Optional[str], str], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._started_at = time.time()
+
+        if attach and hasattr(cache, "attach_monitor"):
+            cache.attach_monitor(self)
     
     def get_memory_usage(self) -> Dict[str, Any]:
         """
@@ -167,6 +312,101 @@ class CacheMonitor:
         self.metrics["misses"] += 1
         self.metrics["total_requests"] += 1
         self._update_rates()
+
+    def record_access(self, key: str, hit: bool, tenant_id: Optional[str] = None) -> None:
+        """
+        Record a cache lookup (called from the cache's get path).
+
+        Args:
+            key: Cache key
+            hit: Whether the lookup was a hit
+            tenant_id: Optional tenant ID
+        """
+        with self._lock:
+            if hit:
+                self.record_hit()
+            else:
+                self.record_miss()
+            if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+                return
+            entry = self._track((tenant_id, key))
+            entry["accesses"] += 1
+            entry["hits" if hit else "misses"] += 1
+            entry["last_access"] = time.time()
+
+    def record_write(self, key: str, tenant_id: Optional[str] = None) -> None:
+        """
+        Record a cache write (called from the cache's set path).
+
+        Args:
+            key: Cache key
+            tenant_id: Optional tenant ID
+        """
+        with self._lock:
+            entry = self.access_log.get((tenant_id, key))
+            if entry is not None:
+                entry["writes"] += 1
+
+    def record_compute_cost(self, key: str, seconds: float, tenant_id: Optional[str] = None) -> None:
+        """
+        Record how long it took to compute a key's value (moving average).
+
+        Args:
+            key: Cache key
+            seconds: Time spent computing the value
+            tenant_id: Optional tenant ID
+        """
+        with self._lock:
+            entry = self._track((tenant_id, key))
+            previous = entry["compute_cost"]
+            entry["compute_cost"] = seconds if previous is None else 0.7 * previous + 0.3 * seconds
+
+    def get_hot_keys(
+        self,
+        limit: int = 100,
+        tenant_id: Optional[str] = None,
+        default_cost: float = 1.0
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank observed keys by expected warming benefit.
+
+        Benefit is the estimated access rate (requests per second the key
+        would serve from cache once warm) times its recompute cost in seconds.
+        Keys with no recorded cost use ``default_cost``.
+
+        Args:
+            limit: Maximum number of keys to return
+            tenant_id: Only return keys for this tenant
+            default_cost: Recompute cost assumed for keys without measurements
+
+        Returns:
+            List of per-key statistics dictionaries, highest benefit first
+        """
+        window = max(time.time() - self._started_at, 1.0)
+        with self._lock:
+            ranked = []
+            for (entry_tenant, key), entry in self.access_log.items():
+                if entry_tenant != tenant_id:
+                    continue
+                access_rate = entry["accesses"] / self.sample_rate / window
+                cost = entry["compute_cost"] if entry["compute_cost"] is not None else default_cost
+                stats = dict(entry, key=key, tenant_id=entry_tenant, access_rate=access_rate)
+                stats["benefit"] = access_rate * cost
+                ranked.append(stats)
+        ranked.sort(key=lambda stats: stats["benefit"], reverse=True)
+        return ranked[:limit]
+
+    def _track(self, log_key: Tuple[Optional[str], str]) -> Dict[str, Any]:
+        """Get or create an access log entry. Caller must hold ``_lock``."""
+        entry = self.access_log.get(log_key)
+        if entry is None:
+            entry = {"accesses": 0, "hits": 0, "misses": 0, "writes": 0, "compute_cost": None, "last_access": None}
+            self.access_log[log_key] = entry
+            while len(self.access_log) > self.max_tracked_keys:
+                self.access_log.popitem(last=False)
+        else:
+            self.access_log.move_to_end(log_key)
+        return entry
     
     def _update_rates(self) -> None:
         """Update hit and miss rates."""
@@ -176,9 +416,115 @@ class CacheMonitor:
             self.metrics["miss_rate"] = self.metrics["misses"] / total
 
 
+def hash_tag(key: str) -> str:
+    """
+    Part of a key that decides its placement.
+
+    Follows the Redis Cluster hash tag rule: if the key has a non-empty
+    ``{...}`` section, only the text inside the first one is hashed, so keys
+    sharing a tag land on the same node (and slot).
+
+    Args:
+        key: Cache key
+
+    Returns:
+        The tag, or the whole key if it has none
+    """
+    start = key.find("{")
+    if start != -1:
+        end = key.find("}", start + 1)
+        if end > start + 1:
+            return key[start + 1:end]
+    return key
+
+
+class ConsistentHashRing:
+    """
+    Consistent-hash ring with virtual nodes.
+
+    Each node is placed on the ring ``virtual_nodes`` times, so load spreads
+    evenly and adding or removing a node only remaps the keys that fall into
+    its arcs (about 1/N of the keyspace) instead of every key. Keys are placed
+    by their ``hash_tag``.
+    """
+
+    def __init__(self, nodes: Optional[List[str]] = None, virtual_nodes: int = 160):
+        """
+        Initialize hash ring.
+
+        Args:
+            nodes: Initial node names
+            virtual_nodes: Number of ring positions per node
+        """
+        self.virtual_nodes = virtual_nodes
+        self._positions: List[int] = []
+        self._owners: Dict[int, str] = {}
+        self.nodes: List[str] = []
+        for node in nodes or []:
+            self.add_node(node)
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int(hashlib.md5(value.encode()).hexdigest()[:16], 16)
+
+    def add_node(self, node: str) -> None:
+        """Place a node on the ring."""
+        if node in self.nodes:
+            return
+        self.nodes.append(node)
+        for i in range(self.virtual_nodes):
+            position = self._hash(f"{node}#{i}")
+            if position not in self._owners:
+                self._owners[position] = node
+                self._positions.append(position)
+        self._positions.sort()
+
+    def remove_node(self, node: str) -> None:
+        """Remove a node and its virtual nodes from the ring."""
+        if node not in self.nodes:
+            return
+        self.nodes.remove(node)
+        self._owners = {pos: owner for pos, owner in self._owners.items() if owner != node}
+        self._positions = sorted(self._owners)
+
+    def get_node(self, key: str) -> str:
+        """
+        Get the node owning a key.
+
+        Args:
+            key: Key to place
+
+        Returns:
+            Node name
+        """
+        if not self._positions:
+            raise ValueError("Hash ring has no nodes")
+        index = bisect_right(self._positions, self._hash(hash_tag(key))) % len(self._positions)
+        return self._owners[self._positions[index]]
+
+    def group_keys(self, keys: List[str]) -> Dict[str, List[str]]:
+        """
+        Group keys by owning node.
+
+        Args:
+            keys: Keys to group
+
+        Returns:
+            Dictionary mapping node name to its keys (input order preserved)
+        """
+        groups: Dict[str, List[str]] = {}
+        for key in keys:
+            groups.setdefault(self.get_node(key), []).append(key)
+        return groups
+
+
 class CacheSharder:
     """
     Automatic cache sharding for improved performance and scalability.
+
+    Shard selection uses a consistent-hash ring over ``shard_0..shard_{n-1}``,
+    so changing ``num_shards`` only remaps the keys of added/removed shards.
+    For spreading keys across real Dragonfly nodes use ``ShardedCache``.
     """
     
     def __init__(self, cache, config: Optional[CacheShardingConfig] = None):
@@ -192,16 +538,16 @@ class CacheSharder:
         self.cache = cache
         self.config = config or CacheShardingConfig()
         self.shards: List[Any] = []
+        self.ring = ConsistentHashRing(virtual_nodes=self.config.virtual_nodes)
         
         if self.config.enabled:
             self._initialize_shards()
     
     def _initialize_shards(self) -> None:
         """Initialize cache shards."""
-        # Create shard instances (simplified - in production, these would be separate cache instances)
         for i in range(self.config.num_shards):
-            # In a real implementation, each shard would be a separate cache instance
             self.shards.append(f"shard_{i}")
+            self.ring.add_node(f"shard_{i}")
     
     def _get_shard(self, key: str) -> int:
         """
@@ -216,8 +562,10 @@ class CacheSharder:
         if self.config.shard_key_func:
             return self.config.shard_key_func(key) % self.config.num_shards
         
-        # Default: hash-based sharding
-        return int(hashlib.md5(key.encode()).hexdigest(), 16) % self.config.num_shards
+        # Default: consistent hashing
+        if not self.ring.nodes:
+            self._initialize_shards()
+        return int(self.ring.get_node(key).rsplit("_", 1)[1])
     
     def get_sharded_key(self, key: str) -> str:
         """
@@ -236,6 +584,157 @@ class CacheSharder:
         return f"shard_{shard}:{key}"
 
 
+class ShardedCache:
+    """
+    Client-side sharded Dragonfly cache.
+
+    Keys are placed on a consistent-hash ring of Dragonfly endpoints; each
+    node is a Dragonfly ``CacheMechanism`` with its own connection pool.
+    Multi-key operations are grouped by node so every node gets a single
+    MGET/pipeline/DEL. Exposes the same interface as ``CacheMechanism``.
+
+    Adding or removing a node only moves the keys in its ring arcs; moved
+    keys are not migrated and simply miss once on their new node.
+    """
+
+    def __init__(self, config: Optional[CacheConfig] = None, sharding: Optional[CacheShardingConfig] = None):
+        """
+        Initialize sharded cache.
+
+        Args:
+            config: Cache configuration shared by every node (TTL, namespace)
+            sharding: Sharding configuration listing the Dragonfly node URLs
+        """
+        self.config = config or CacheConfig(backend="dragonfly")
+        self.sharding = sharding or CacheShardingConfig(enabled=True)
+        self.backend = "dragonfly"
+        self.monitor: Optional[Any] = None
+        self.ring = ConsistentHashRing(virtual_nodes=self.sharding.virtual_nodes)
+        self.nodes: Dict[str, CacheMechanism] = {}
+        for url in self.sharding.nodes:
+            self.add_node(url)
+
+    def add_node(self, url: str) -> None:
+        """
+        Add a Dragonfly node to the ring.
+
+        Args:
+            url: Dragonfly connection URL
+        """
+        if url in self.nodes:
+            return
+        self.nodes[url] = CacheMechanism(CacheConfig(
+            backend="dragonfly",
+            default_ttl=self.config.default_ttl,
+            dragonfly_url=url,
+            namespace=self.config.namespace,
+            max_connections=self.sharding.max_connections_per_node,
+        ))
+        self.ring.add_node(url)
+
+    def remove_node(self, url: str) -> None:
+        """
+        Remove a Dragonfly node from the ring and close its connection pool.
+
+        Args:
+            url: Dragonfly connection URL
+        """
+        node = self.nodes.pop(url, None)
+        self.ring.remove_node(url)
+        if node is not None:
+            node._client.close()
+
+    def attach_monitor(self, monitor: Any) -> None:
+        """Attach an access monitor notified on every get and set."""
+        self.monitor = monitor
+
+    def _namespaced_key(self, key: str, tenant_id: Optional[str] = None) -> str:
+        """Create namespaced cache key with optional tenant isolation."""
+        if tenant_id:
+            return f"{self.config.namespace}:{tenant_id}:{key}"
+        return f"{self.config.namespace}:{key}"
+
+    def node_for(self, key: str, tenant_id: Optional[str] = None) -> CacheMechanism:
+        """Get the node owning a key."""
+        return self.nodes[self.ring.get_node(self._namespaced_key(key, tenant_id=tenant_id))]
+
+    def client_for(self, namespaced_key: str) -> Any:
+        """Get the Dragonfly client owning an already-namespaced key."""
+        return self.nodes[self.ring.get_node(namespaced_key)]._client
+
+    def _group(self, keys: List[str], tenant_id: Optional[str]) -> Dict[str, List[str]]:
+        groups: Dict[str, List[str]] = {}
+        for key in keys:
+            node = self.ring.get_node(self._namespaced_key(key, tenant_id=tenant_id))
+            groups.setdefault(node, []).append(key)
+        return groups
+
+    def set(self, key: str, value: Any, tenant_id: Optional[str] = None, ttl: Optional[int] = None) -> None:
+        """Store a value on the owning node."""
+        if self.monitor is not None:
+            self.monitor.record_write(key, tenant_id=tenant_id)
+        self.node_for(key, tenant_id).set(key, value, tenant_id=tenant_id, ttl=ttl)
+
+    def get(self, key: str, tenant_id: Optional[str] = None) -> Optional[Any]:
+        """Retrieve a value from the owning node."""
+        value = self.node_for(key, tenant_id).get(key, tenant_id=tenant_id)
+        if self.monitor is not None:
+            self.monitor.record_access(key, value is not None, tenant_id=tenant_id)
+        return value
+
+    async def get_async(self, key: str, tenant_id: Optional[str] = None) -> Optional[Any]:
+        """Retrieve a value from the owning node without blocking the event loop."""
+        value = await self.node_for(key, tenant_id).get_async(key, tenant_id=tenant_id)
+        if self.monitor is not None:
+            self.monitor.record_access(key, value is not None, tenant_id=tenant_id)
+        return value
+
+    async def set_async(self, key: str, value: Any, tenant_id: Optional[str] = None, ttl: Optional[int] = None) -> None:
+        """Store a value on the owning node without blocking the event loop."""
+        if self.monitor is not None:
+            self.monitor.record_write(key, tenant_id=tenant_id)
+        await self.node_for(key, tenant_id).set_async(key, value, tenant_id=tenant_id, ttl=ttl)
+
+    def delete(self, key: str, tenant_id: Optional[str] = None) -> None:
+        """Delete a key from the owning node."""
+        self.node_for(key, tenant_id).delete(key, tenant_id=tenant_id)
+
+    def get_many(
+        self,
+        keys: List[str],
+        tenant_id: Optional[str] = None,
+        track_access: bool = True
+    ) -> Dict[str, Optional[Any]]:
+        """Retrieve several values with one MGET per node."""
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, Optional[Any]] = {}
+        for node, node_keys in self._group(keys, tenant_id).items():
+            found.update(self.nodes[node].get_many(node_keys, tenant_id=tenant_id))
+        results = {key: found.get(key) for key in keys}
+        if self.monitor is not None and track_access:
+            for key, value in results.items():
+                self.monitor.record_access(key, value is not None, tenant_id=tenant_id)
+        return results
+
+    def set_many(self, items: Dict[str, Any], tenant_id: Optional[str] = None, ttl: Optional[int] = None) -> None:
+        """Store several values with one pipeline per node."""
+        if self.monitor is not None:
+            for key in items:
+                self.monitor.record_write(key, tenant_id=tenant_id)
+        for node, node_keys in self._group(list(items), tenant_id).items():
+            self.nodes[node].set_many({key: items[key] for key in node_keys}, tenant_id=tenant_id, ttl=ttl)
+
+    def delete_many(self, keys: List[str], tenant_id: Optional[str] = None) -> None:
+        """Delete several keys with one DEL per node."""
+        for node, node_keys in self._group(list(keys), tenant_id).items():
+            self.nodes[node].delete_many(node_keys, tenant_id=tenant_id)
+
+    def invalidate_pattern(self, pattern: str, tenant_id: Optional[str] = None) -> None:
+        """Invalidate keys matching a pattern on every node."""
+        for node in self.nodes.values():
+            node.invalidate_pattern(pattern, tenant_id=tenant_id)
+
+
 class CacheValidator:
     """
     Cache validation to ensure integrity of cached data.
@@ -368,82 +867,433 @@ class CacheRecovery:
         return self.failure_count >= 3
 
 
+class _KeyedLocks:
+    """
+    Per-key thread and asyncio locks for single-flight computation.
+
+    Entries are reference counted and dropped once no caller holds or waits
+    on them, so the registry does not grow with the key space.
+    """
+
+    def __init__(self):
+        self._guard = threading.Lock()
+        self._thread_locks: Dict[str, list] = {}
+        self._async_locks: Dict[str, list] = {}
+
+    def _checkout(self, registry: Dict[str, list], key: str, factory: Callable) -> list:
+        with self._guard:
+            entry = registry.get(key)
+            if entry is None:
+                entry = registry[key] = [factory(), 0]
+            entry[1] += 1
+            return entry
+
+    def _checkin(self, registry: Dict[str, list], key: str, entry: list) -> None:
+        with self._guard:
+            entry[1] -= 1
+            if entry[1] == 0 and registry.get(key) is entry:
+                del registry[key]
+
+    @contextmanager
+    def hold(self, key: str, blocking: bool = True, timeout: float = -1):
+        """Hold the thread lock for ``key``; yields whether it was acquired."""
+        entry = self._checkout(self._thread_locks, key, threading.Lock)
+        acquired = entry[0].acquire(blocking, timeout if blocking else -1)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                entry[0].release()
+            self._checkin(self._thread_locks, key, entry)
+
+    @asynccontextmanager
+    async def hold_async(self, key: str, blocking: bool = True, timeout: Optional[float] = None):
+        """Hold the asyncio lock for ``key``; yields whether it was acquired."""
+        entry = self._checkout(self._async_locks, key, asyncio.Lock)
+        lock: asyncio.Lock = entry[0]
+        acquired = False
+        try:
+            if not blocking:
+                if not lock.locked():
+                    await lock.acquire()
+                    acquired = True
+            else:
+                try:
+                    await asyncio.wait_for(lock.acquire(), timeout)
+                    acquired = True
+                except asyncio.TimeoutError:
+                    acquired = False
+            yield acquired
+        finally:
+            if acquired:
+                lock.release()
+            self._checkin(self._async_locks, key, entry)
+
+
+class _DragonflyLock:
+    """
+    Distributed single-flight lock using Dragonfly ``SET NX PX``.
+
+    Each holder writes a random token; release only deletes the lock if the
+    token still matches, so an expired holder cannot free someone else's lock.
+    """
+
+    _RELEASE_SCRIPT = (
+        "if redis.call('get', KEYS[1]) == ARGV[1] then "
+        "return redis.call('del', KEYS[1]) else return 0 end"
+    )
+
+    def __init__(self, client_for: Callable[[str], Any], lock_ttl: float):
+        self.client_for = client_for
+        self.lock_ttl_ms = max(1, int(lock_ttl * 1000))
+
+    def try_acquire(self, lock_key: str) -> Optional[str]:
+        token = uuid.uuid4().hex
+        if self.client_for(lock_key).set(lock_key, token, nx=True, px=self.lock_ttl_ms):
+            return token
+        return None
+
+    def release(self, lock_key: str, token: str) -> None:
+        try:
+            self.client_for(lock_key).eval(self._RELEASE_SCRIPT, 1, lock_key, token)
+        except Exception as e:
+            # Lock expires on its own after lock_ttl
+            logger.warning(f"Failed to release single-flight lock {lock_key}: {e}")
+
+
+_ENVELOPE_MARKER = "__auto_cache__"
+
+
 def auto_cache(
     cache,
     key_func: Optional[Callable] = None,
     ttl: Optional[int] = None,
-    tenant_id: Optional[str] = None
+    tenant_id: Optional[str] = None,
+    single_flight: bool = True,
+    lock_backend: str = "local",
+    lock_timeout: float = 10.0,
+    early_expiration_beta: float = 1.0,
+    stale_ttl: int = 0
 ):
     """
     Decorator for automatic caching of function results.
-    
+
+    Protects expensive functions (LLM calls) against cache stampedes:
+
+    - Single-flight: on a miss only one caller per key computes the value;
+      concurrent callers wait for it. Locks are per process (``"local"``) or
+      shared across workers through Dragonfly ``SET NX`` (``"dragonfly"``).
+    - Probabilistic early expiration (XFetch): a hit is refreshed early with
+      probability growing as expiry approaches, scaled by how long the value
+      took to compute, so popular keys are recomputed before they expire.
+    - Stale-while-revalidate: for ``stale_ttl`` seconds after expiry the old
+      value is still served while a single background task refreshes it.
+
     Args:
         cache: Cache mechanism instance
         key_func: Optional function to generate cache key from function args
         ttl: Optional TTL for cached value
         tenant_id: Optional tenant ID
-    
+        single_flight: Whether concurrent misses for a key share one computation
+        lock_backend: "local" (per process) or "dragonfly" (distributed)
+        lock_timeout: Seconds to wait for another caller's computation before
+            computing anyway (also the Dragonfly lock lease)
+        early_expiration_beta: XFetch aggressiveness (0 disables early expiration)
+        stale_ttl: Seconds to serve a stale value while refreshing in background
+
     Returns:
         Decorator function
     """
+    if lock_backend not in ("local", "dragonfly"):
+        raise ValueError(f"Unsupported lock_backend: {lock_backend}")
+    dragonfly_lock: Optional[_DragonflyLock] = None
+    if single_flight and lock_backend == "dragonfly":
+        if getattr(cache, "backend", None) != "dragonfly":
+            raise ValueError("lock_backend='dragonfly' requires a Dragonfly cache backend")
+        # Sharded caches route each lock key to its owning node
+        client_for = getattr(cache, "client_for", lambda lock_key: cache._client)
+        dragonfly_lock = _DragonflyLock(client_for, lock_timeout)
+
+    local_locks = _KeyedLocks()
+    background_tasks: set = set()
+    # Keys with a background refresh in flight in this process
+    refreshing: set = set()
+    refreshing_lock = threading.Lock()
+    poll_interval = 0.05
+    cache_get_async = getattr(cache, "get_async", None)
+    cache_set_async = getattr(cache, "set_async", None)
+
     def decorator(func: Callable) -> Callable:
-        async def async_wrapper(*args, **kwargs) -> Any:
-            # Generate cache key
+        def build_key(args: tuple, kwargs: dict) -> str:
             if key_func:
-                cache_key = key_func(*args, **kwargs)
+                return key_func(*args, **kwargs)
+            # Default: hash of function name and arguments
+            key_data = json.dumps({
+                "func": func.__name__,
+                "args": args,
+                "kwargs": kwargs
+            }, sort_keys=True, default=str)
+            return hashlib.md5(key_data.encode()).hexdigest()
+
+        def lock_key(cache_key: str) -> str:
+            # Hash-tagged with the data key, so the lock lives on the node (slot) that owns it
+            data_key = cache._namespaced_key(cache_key, tenant_id=tenant_id)
+            return cache._namespaced_key(f"lock:{{{hash_tag(data_key)}}}", tenant_id=tenant_id)
+
+        def load(cache_key: str) -> Optional[Tuple[Any, float, float]]:
+            """Return (value, delta, expires_at) or None on miss."""
+            return parse(cache.get(cache_key, tenant_id=tenant_id))
+
+        async def load_async(cache_key: str) -> Optional[Tuple[Any, float, float]]:
+            """``load`` without blocking the event loop."""
+            if cache_get_async is not None:
+                return parse(await cache_get_async(cache_key, tenant_id=tenant_id))
+            return await run_blocking(None, load, cache_key)
+
+        def parse(raw: Any) -> Optional[Tuple[Any, float, float]]:
+            if raw is None:
+                return None
+            entry = raw
+            if isinstance(raw, (bytes, str)):
+                try:
+                    entry = json.loads(raw)
+                except (ValueError, UnicodeDecodeError):
+                    entry = raw
+            if isinstance(entry, dict) and entry.get(_ENVELOPE_MARKER):
+                return entry["value"], entry["delta"], entry["expires_at"]
+            # Plain value written by someone else: treat as fresh
+            return raw, 0.0, float("inf")
+
+        def store(cache_key: str, value: Any, delta: float) -> None:
+            encoded = encode(cache_key, value, delta)
+            if encoded is not None:
+                cache.set(cache_key, encoded[0], tenant_id=tenant_id, ttl=encoded[1])
+
+        async def store_async(cache_key: str, value: Any, delta: float) -> None:
+            """``store`` without blocking the event loop."""
+            encoded = encode(cache_key, value, delta)
+            if encoded is None:
+                return
+            if cache_set_async is not None:
+                await cache_set_async(cache_key, encoded[0], tenant_id=tenant_id, ttl=encoded[1])
             else:
-                # Default: hash of function name and arguments
-                key_data = json.dumps({
-                    "func": func.__name__,
-                    "args": args,
-                    "kwargs": kwargs
-                }, sort_keys=True, default=str)
-                cache_key = hashlib.md5(key_data.encode()).hexdigest()
-            
-            # Check cache
-            cached_value = cache.get(cache_key, tenant_id=tenant_id)
-            if cached_value is not None:
-                return cached_value
-            
-            # Execute function
+                await run_blocking(None, cache.set, cache_key, encoded[0], tenant_id, encoded[1])
+
+        def encode(cache_key: str, value: Any, delta: float) -> Optional[Tuple[Any, int]]:
+            """Return (entry, physical TTL) to store, or None if the value cannot be cached."""
+            effective_ttl = ttl or cache.config.default_ttl
+            entry = {
+                _ENVELOPE_MARKER: True,
+                "value": value,
+                "delta": delta,
+                "expires_at": time.time() + effective_ttl,
+            }
+            if getattr(cache, "backend", None) == "dragonfly":
+                try:
+                    entry = json.dumps(entry)
+                except (TypeError, ValueError) as e:
+                    # Stored as-is it would come back as the wrong type; just don't cache it
+                    logger.warning(f"Result for cache key {cache_key} is not JSON-serializable, skipping cache: {e}")
+                    return None
+            monitor = getattr(cache, "monitor", None)
+            if monitor is not None:
+                monitor.record_compute_cost(cache_key, delta, tenant_id=tenant_id)
+            # Keep the entry physically alive through the stale window
+            return entry, effective_ttl + stale_ttl
+
+        def claim_refresh(cache_key: str) -> bool:
+            """Mark a background refresh in flight; False if one already is."""
+            with refreshing_lock:
+                if cache_key in refreshing:
+                    return False
+                refreshing.add(cache_key)
+                return True
+
+        def finish_refresh(cache_key: str) -> None:
+            with refreshing_lock:
+                refreshing.discard(cache_key)
+
+        def classify(entry: Optional[Tuple[Any, float, float]]) -> str:
+            """Classify a loaded entry as "fresh", "early", "stale" or "miss"."""
+            if entry is None:
+                return "miss"
+            _, delta, expires_at = entry
+            now = time.time()
+            if now >= expires_at:
+                return "stale" if stale_ttl > 0 and now < expires_at + stale_ttl else "miss"
+            if early_expiration_beta > 0 and delta > 0:
+                # XFetch: -log(U) for U in (0, 1] is an exponential sample
+                gap = -delta * early_expiration_beta * math.log(1.0 - random.random())
+                if now + gap >= expires_at:
+                    return "early"
+            return "fresh"
+
+        async def async_compute(cache_key: str, args: tuple, kwargs: dict) -> Any:
+            start = time.time()
             result = await func(*args, **kwargs)
-            
-            # Cache result
-            cache.set(cache_key, result, tenant_id=tenant_id, ttl=ttl)
-            
+            await store_async(cache_key, result, time.time() - start)
             return result
-        
-        def sync_wrapper(*args, **kwargs) -> Any:
-            # Generate cache key
-            if key_func:
-                cache_key = key_func(*args, **kwargs)
-            else:
-                # Default: hash of function name and arguments
-                key_data = json.dumps({
-                    "func": func.__name__,
-                    "args": args,
-                    "kwargs": kwargs
-                }, sort_keys=True, default=str)
-                cache_key = hashlib.md5(key_data.encode()).hexdigest()
-            
-            # Check cache
-            cached_value = cache.get(cache_key, tenant_id=tenant_id)
-            if cached_value is not None:
-                return cached_value
-            
-            # Execute function
+
+        def sync_compute(cache_key: str, args: tuple, kwargs: dict) -> Any:
+            start = time.time()
             result = func(*args, **kwargs)
-            
-            # Cache result
-            cache.set(cache_key, result, tenant_id=tenant_id, ttl=ttl)
-            
+            store(cache_key, result, time.time() - start)
             return result
-        
+
+        async def async_refresh(cache_key: str, args: tuple, kwargs: dict) -> None:
+            """Recompute in the background unless another caller already is."""
+            try:
+                if dragonfly_lock:
+                    token = await run_blocking(None, dragonfly_lock.try_acquire, lock_key(cache_key))
+                    if token is None:
+                        return
+                    try:
+                        await async_compute(cache_key, args, kwargs)
+                    finally:
+                        await run_blocking(None, dragonfly_lock.release, lock_key(cache_key), token)
+                    return
+                async with local_locks.hold_async(cache_key, blocking=False) as acquired:
+                    if acquired:
+                        await async_compute(cache_key, args, kwargs)
+            except Exception as e:
+                logger.warning(f"Background refresh failed for {cache_key}: {e}")
+
+        def sync_refresh(cache_key: str, args: tuple, kwargs: dict) -> None:
+            """Recompute unless another caller already is."""
+            try:
+                if dragonfly_lock:
+                    token = dragonfly_lock.try_acquire(lock_key(cache_key))
+                    if token is None:
+                        return
+                    try:
+                        sync_compute(cache_key, args, kwargs)
+                    finally:
+                        dragonfly_lock.release(lock_key(cache_key), token)
+                    return
+                with local_locks.hold(cache_key, blocking=False) as acquired:
+                    if acquired:
+                        sync_compute(cache_key, args, kwargs)
+            except Exception as e:
+                logger.warning(f"Background refresh failed for {cache_key}: {e}")
+
+        async def background_async_refresh(cache_key: str, args: tuple, kwargs: dict) -> None:
+            try:
+                await async_refresh(cache_key, args, kwargs)
+            finally:
+                finish_refresh(cache_key)
+
+        def background_sync_refresh(cache_key: str, args: tuple, kwargs: dict) -> None:
+            try:
+                sync_refresh(cache_key, args, kwargs)
+            finally:
+                finish_refresh(cache_key)
+
+        async def async_wrapper(*args, **kwargs) -> Any:
+            cache_key = build_key(args, kwargs)
+            entry = await load_async(cache_key)
+            state = classify(entry)
+
+            if state == "fresh":
+                return entry[0]
+            if state in ("early", "stale"):
+                if not single_flight:
+                    return await async_compute(cache_key, args, kwargs)
+                if stale_ttl > 0:
+                    # Serve the current value while one task refreshes it
+                    if claim_refresh(cache_key):
+                        task = asyncio.get_running_loop().create_task(
+                            background_async_refresh(cache_key, args, kwargs)
+                        )
+                        background_tasks.add(task)
+                        task.add_done_callback(background_tasks.discard)
+                else:
+                    await async_refresh(cache_key, args, kwargs)
+                    refreshed = await load_async(cache_key)
+                    if refreshed is not None:
+                        return refreshed[0]
+                return entry[0]
+
+            # Miss
+            if not single_flight:
+                return await async_compute(cache_key, args, kwargs)
+
+            if dragonfly_lock:
+                deadline = time.time() + lock_timeout
+                token = await run_blocking(None, dragonfly_lock.try_acquire, lock_key(cache_key))
+                while token is None and time.time() < deadline:
+                    await asyncio.sleep(poll_interval)
+                    entry = await load_async(cache_key)
+                    if classify(entry) != "miss":
+                        return entry[0]
+                    token = await run_blocking(None, dragonfly_lock.try_acquire, lock_key(cache_key))
+                try:
+                    return await async_compute(cache_key, args, kwargs)
+                finally:
+                    if token:
+                        await run_blocking(None, dragonfly_lock.release, lock_key(cache_key), token)
+
+            async with local_locks.hold_async(cache_key, timeout=lock_timeout):
+                # Another caller may have filled the key while we waited
+                entry = await load_async(cache_key)
+                if classify(entry) != "miss":
+                    return entry[0]
+                return await async_compute(cache_key, args, kwargs)
+
+        def sync_wrapper(*args, **kwargs) -> Any:
+            cache_key = build_key(args, kwargs)
+            entry = load(cache_key)
+            state = classify(entry)
+
+            if state == "fresh":
+                return entry[0]
+            if state in ("early", "stale"):
+                if not single_flight:
+                    return sync_compute(cache_key, args, kwargs)
+                if stale_ttl > 0:
+                    # Serve the current value while one thread refreshes it; a hot
+                    # stale key starts no new thread while a refresh is in flight
+                    if claim_refresh(cache_key):
+                        threading.Thread(
+                            target=background_sync_refresh,
+                            args=(cache_key, args, kwargs),
+                            daemon=True
+                        ).start()
+                else:
+                    sync_refresh(cache_key, args, kwargs)
+                    refreshed = load(cache_key)
+                    if refreshed is not None:
+                        return refreshed[0]
+                return entry[0]
+
+            # Miss
+            if not single_flight:
+                return sync_compute(cache_key, args, kwargs)
+
+            if dragonfly_lock:
+                deadline = time.time() + lock_timeout
+                token = dragonfly_lock.try_acquire(lock_key(cache_key))
+                while token is None and time.time() < deadline:
+                    time.sleep(poll_interval)
+                    entry = load(cache_key)
+                    if classify(entry) != "miss":
+                        return entry[0]
+                    token = dragonfly_lock.try_acquire(lock_key(cache_key))
+                try:
+                    return sync_compute(cache_key, args, kwargs)
+                finally:
+                    if token:
+                        dragonfly_lock.release(lock_key(cache_key), token)
+
+            with local_locks.hold(cache_key, timeout=lock_timeout):
+                # Another caller may have filled the key while we waited
+                entry = load(cache_key)
+                if classify(entry) != "miss":
+                    return entry[0]
+                return sync_compute(cache_key, args, kwargs)
+
         if asyncio.iscoroutinefunction(func):
             return async_wrapper
         else:
             return sync_wrapper
-    
-    return decorator
-
 
+    return decorator
@@ -4,8 +4,9 @@ Cache Mechanism - High-Level Functions
 Factory functions, convenience functions, and utilities for cache mechanism.
 """
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from .cache import CacheMechanism, CacheConfig
+from .cache_enhancements import CacheShardingConfig, ShardedCache
 
 
 # ============================================================================
@@ -111,6 +112,42 @@ def create_dragonfly_cache(
     )
 
 
+def create_sharded_cache(
+    nodes: List[str],
+    default_ttl: int = 300,
+    namespace: str = "sdk_cache",
+    virtual_nodes: int = 160,
+    max_connections_per_node: Optional[int] = None
+) -> ShardedCache:
+    """
+    Create a Dragonfly cache sharded across several nodes.
+    
+    Args:
+        nodes: Dragonfly connection URLs
+        default_ttl: Default TTL in seconds
+        namespace: Cache namespace
+        virtual_nodes: Ring positions per node
+        max_connections_per_node: Connection pool size for each node
+    
+    Returns:
+        ShardedCache instance
+    
+    Example:
+        >>> cache = create_sharded_cache([
+        ...     "dragonfly://cache-a:6379/0",
+        ...     "dragonfly://cache-b:6379/0",
+        ... ])
+    """
+    config = CacheConfig(backend="dragonfly", default_ttl=default_ttl, namespace=namespace)
+    sharding = CacheShardingConfig(
+        enabled=True,
+        nodes=list(nodes),
+        virtual_nodes=virtual_nodes,
+        max_connections_per_node=max_connections_per_node,
+    )
+    return ShardedCache(config, sharding)
+
+
 def configure_cache(
     backend: str = "memory",
     default_ttl: int = 300,
@@ -281,8 +318,7 @@ def batch_cache_set(
         >>> items = {"user:1": {"name": "John"}, "user:2": {"name": "Jane"}}
         >>> batch_cache_set(cache, items, ttl=600)
     """
-    for key, value in items.items():
-        cache.set(key, value, ttl=ttl)
+    cache.set_many(items, ttl=ttl)
 
 
 def batch_cache_get(
@@ -303,7 +339,7 @@ def batch_cache_get(
         >>> values = batch_cache_get(cache, ["user:1", "user:2", "user:3"])
         >>> print(values["user:1"])
     """
-    return {key: cache.get(key) for key in keys}
+    return cache.get_many(keys)
 
 
 __all__ = [
@@ -8,6 +8,7 @@ through LiteLLM, with support for streaming, function calling, and embeddings.
 # Standard library imports
 import asyncio
 import hashlib
+import inspect
 import json
 import logging
 import os
@@ -851,6 +852,71 @@ class LiteLLMGateway:
 
         return generate_response
 
+    async def generate_stream_async(
+        self,
+        prompt: str,
+        model: str = "gpt-4",
+        tenant_id: Optional[str] = None,
+        messages: Optional[List[Dict[str, Any]]] = None,
+        **kwargs: Any
+    ) -> AsyncIterator[str]:
+        """
+        Stream a text completion as text deltas.
+
+        The request goes through ``generate_async`` with ``stream=True`` (rate
+        limiting and circuit breaker apply), and the text of each chunk is
+        yielded as soon as it arrives.
+
+        Args:
+            prompt: Input prompt
+            model: Model identifier
+            tenant_id: Optional tenant ID for rate limiting and tracking
+            messages: Optional list of messages
+            **kwargs: Additional parameters
+
+        Yields:
+            Text deltas (empty deltas are skipped)
+        """
+        stream = await self.generate_async(
+            prompt=prompt,
+            model=model,
+            tenant_id=tenant_id,
+            messages=messages,
+            stream=True,
+            **kwargs
+        )
+        try:
+            if hasattr(stream, "__aiter__"):
+                async for chunk in stream:
+                    text = self._chunk_text(chunk)
+                    if text:
+                        yield text
+            else:
+                for chunk in stream:
+                    text = self._chunk_text(chunk)
+                    if text:
+                        yield text
+        finally:
+            # Release the provider connection if the consumer stops early
+            aclose = getattr(stream, "aclose", None)
+            if aclose is not None:
+                closing = aclose()
+                if inspect.isawaitable(closing):
+                    await closing
+
+    @staticmethod
+    def _chunk_text(chunk: Any) -> str:
+        """Extract the text delta from a streaming chunk (litellm object or dict)."""
+        if isinstance(chunk, dict):
+            choices = chunk.get("choices") or [{}]
+            return (choices[0].get("delta") or {}).get("content") or ""
+        choices = getattr(chunk, "choices", None)
+        if not choices:
+            return ""
+        delta = getattr(choices[0], "delta", None)
+        content = getattr(delta, "content", None) if delta is not None else None
+        return content if isinstance(content, str) else ""
+
     def embed(
         self,
         texts: List[str],
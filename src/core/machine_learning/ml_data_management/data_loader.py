@@ -4,7 +4,7 @@ Data Loader
 Loads data from various sources.
 """
 
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 import logging
 import pandas as pd
 
@@ -30,9 +30,37 @@ class DataLoader:
     def load_from_database(
         db: Any,
         query: str,
-        params: Optional[tuple] = None
+        params: Optional[tuple] = None,
+        batch_size: int = 10000
     ) -> pd.DataFrame:
-        """Load data from database."""
-        return pd.read_sql_query(query, db, params=params)
+        """
+        Load data from database.
+        
+        With a ``DatabaseConnection`` the rows are streamed through a
+        server-side cursor ``batch_size`` at a time, so only the resulting
+        DataFrame is held in memory; other DB-API/SQLAlchemy connections go
+        through ``pandas.read_sql_query``.
+        """
+        if not hasattr(db, "stream_batches"):
+            return pd.read_sql_query(query, db, params=params)
+        frames = list(DataLoader.iter_from_database(db, query, params, batch_size))
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+    
+    @staticmethod
+    def iter_from_database(
+        db: Any,
+        query: str,
+        params: Optional[tuple] = None,
+        batch_size: int = 10000
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream data from a ``DatabaseConnection`` as DataFrames of ``batch_size`` rows.
+        
+        Use it to train or preprocess incrementally on tables that do not fit in memory.
+        """
+        for rows in db.stream_batches(query, params, batch_size=batch_size, format="rows", read_only=True):
+            yield pd.DataFrame.from_records(rows)
 
 
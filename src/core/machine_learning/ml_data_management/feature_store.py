@@ -107,7 +107,7 @@ class FeatureStore:
             """
             params = (feature_name, self.tenant_id)
         
-        result = self.db.execute_query(query, params, fetch_one=True)
+        result = self.db.execute_query(query, params, fetch_one=True, read_only=True)
         return dict(result) if result else None
     
     def list_features(self) -> List[Dict[str, Any]]:
@@ -117,7 +117,7 @@ class FeatureStore:
         WHERE tenant_id = %s;
         """
         
-        results = self.db.execute_query(query, (self.tenant_id,))
+        results = self.db.execute_query(query, (self.tenant_id,), read_only=True)
         return [dict(row) for row in results]
 
 
@@ -4,19 +4,68 @@ PostgreSQL Database Integration
 PostgreSQL database with pgvector extension for vector operations.
 """
 
-from .connection import DatabaseConnection, DatabaseConfig
+from .connection import DatabaseConnection, DatabaseConfig, create_database_connection
+from .async_connection import AsyncDatabaseConnection, create_async_database_connection
 from .vector_index_manager import (
     VectorIndexManager,
     create_vector_index_manager,
     IndexType,
-    IndexDistance
+    IndexDistance,
+    QuantizationMode
+)
+from .vector_operations import SearchParams
+from .blocking_pool import BlockingConnectionPool, WaitHistogram
+from .full_text_search import FullTextSearch, text_search_config
+from .prepared_statements import PreparedStatementCache, PreparedStatementStats
+from .partitioning import (
+    PartitionStrategy,
+    TenantPartitionManager,
+    create_tenant_partition_manager
+)
+from .reindex_scheduler import (
+    ReindexCandidate,
+    ReindexPolicy,
+    ReindexScheduler,
+    create_reindex_scheduler
+)
+from .index_tuner import (
+    IndexAutotuner,
+    TunedSearchParams,
+    TuningPoint,
+    TuningResult,
+    create_index_autotuner,
+    load_search_params
 )
 
 __all__ = [
     "DatabaseConnection",
     "DatabaseConfig",
+    "create_database_connection",
+    "AsyncDatabaseConnection",
+    "create_async_database_connection",
     "VectorIndexManager",
     "create_vector_index_manager",
     "IndexType",
     "IndexDistance",
+    "QuantizationMode",
+    "SearchParams",
+    "BlockingConnectionPool",
+    "WaitHistogram",
+    "FullTextSearch",
+    "text_search_config",
+    "PreparedStatementCache",
+    "PreparedStatementStats",
+    "PartitionStrategy",
+    "TenantPartitionManager",
+    "create_tenant_partition_manager",
+    "ReindexCandidate",
+    "ReindexPolicy",
+    "ReindexScheduler",
+    "create_reindex_scheduler",
+    "IndexAutotuner",
+    "TunedSearchParams",
+    "TuningPoint",
+    "TuningResult",
+    "create_index_autotuner",
+    "load_search_params",
 ]
@@ -0,0 +1,243 @@
+"""
+Async Database Connection Management
+
+Handles PostgreSQL database connections with a native async connection pool
+(psycopg 3), so queries issued from async code never block the event loop.
+"""
+
+# Standard library imports
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence
+
+# Local application/library specific imports
+from .connection import DatabaseConfig
+from .vector_adapter import register_vector_types_async
+
+try:
+    import psycopg  # type: ignore
+    from psycopg.rows import dict_row  # type: ignore
+    from psycopg_pool import AsyncConnectionPool  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    psycopg = None
+    dict_row = None
+    AsyncConnectionPool = None
+
+
+class AsyncDatabaseConnection:
+    """
+    Async PostgreSQL connection manager backed by ``psycopg_pool.AsyncConnectionPool``.
+
+    Mirrors the ``DatabaseConnection`` API (same ``DatabaseConfig``, ``%s``
+    placeholders and dict rows) with awaitable methods.
+    """
+
+    def __init__(self, config: DatabaseConfig):
+        """
+        Initialize async database connection.
+
+        Args:
+            config: Database configuration
+        """
+        if AsyncConnectionPool is None:
+            raise ImportError("psycopg[pool] package is required for AsyncDatabaseConnection")
+        self.config = config
+        self.connection_pool: Optional[AsyncConnectionPool] = None
+        # Serializes lazy pool creation; created on first use inside the event loop
+        self._connect_lock: Optional[asyncio.Lock] = None
+
+    def _conninfo(self) -> str:
+        return psycopg.conninfo.make_conninfo(
+            host=self.config.host,
+            port=self.config.port,
+            dbname=self.config.database,
+            user=self.config.user,
+            password=self.config.password,
+        )
+
+    async def connect(self) -> None:
+        """Create and open the connection pool."""
+        try:
+            pool = AsyncConnectionPool(
+                conninfo=self._conninfo(),
+                min_size=self.config.min_connections,
+                max_size=self.config.max_connections,
+                timeout=self.config.connection_timeout,
+                kwargs={"row_factory": dict_row},
+                configure=register_vector_types_async,
+                open=False,
+            )
+            await pool.open(wait=True, timeout=self.config.connection_timeout)
+            # Published only once open, so concurrent callers never see a half-open pool
+            self.connection_pool = pool
+        except psycopg.Error as e:
+            self.connection_pool = None
+            raise ConnectionError(f"Failed to create async connection pool: {e}")
+        except Exception as e:
+            self.connection_pool = None
+            raise ConnectionError(f"Unexpected error creating async connection pool: {e}")
+
+    async def close(self) -> None:
+        """Close all connections in pool."""
+        if self.connection_pool:
+            await self.connection_pool.close()
+            self.connection_pool = None
+
+    @asynccontextmanager
+    async def get_connection(self) -> AsyncIterator[Any]:
+        """
+        Get a connection from the pool.
+
+        Yields:
+            Async database connection
+        """
+        if not self.connection_pool:
+            if self._connect_lock is None:
+                self._connect_lock = asyncio.Lock()
+            async with self._connect_lock:
+                # Another request may have opened the pool while this one waited
+                if not self.connection_pool:
+                    await self.connect()
+
+        async with self.connection_pool.connection() as conn:
+            yield conn
+
+    @asynccontextmanager
+    async def get_cursor(self) -> AsyncIterator[Any]:
+        """
+        Get a cursor inside a transaction; commits on success, rolls back on error.
+
+        Yields:
+            Async database cursor returning dict rows
+        """
+        async with self.get_connection() as conn:
+            async with conn.transaction():
+                async with conn.cursor() as cursor:
+                    yield cursor
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[Any]:
+        """
+        Run several statements atomically on one pooled connection.
+
+        Yields:
+            Async cursor whose statements commit or roll back together
+        """
+        async with self.get_cursor() as cursor:
+            yield cursor
+
+    async def execute_query(
+        self,
+        query: str,
+        params: Optional[Sequence[Any]] = None,
+        fetch_one: bool = False,
+        fetch_all: bool = True
+    ):
+        """
+        Execute a query.
+
+        Args:
+            query: SQL query
+            params: Query parameters
+            fetch_one: Return single row
+            fetch_all: Return all rows
+
+        Returns:
+            Query results
+        """
+        async with self.get_cursor() as cursor:
+            await cursor.execute(query, params)
+
+            if fetch_one:
+                return await cursor.fetchone()
+            elif fetch_all:
+                return await cursor.fetchall()
+            else:
+                return cursor.rowcount
+
+    async def execute_many(self, query: str, params_seq: Iterable[Sequence[Any]]) -> None:
+        """
+        Execute a statement once per parameter set in a single transaction.
+
+        psycopg 3 pipelines the statements, so the batch costs roughly one
+        network round-trip instead of one per row.
+
+        Args:
+            query: SQL statement
+            params_seq: Iterable of parameter tuples
+        """
+        async with self.get_cursor() as cursor:
+            await cursor.executemany(query, params_seq)
+
+    async def execute_transaction(self, queries: List[tuple]) -> None:
+        """
+        Execute multiple queries in a transaction.
+
+        Args:
+            queries: List of (query, params) tuples
+        """
+        async with self.transaction() as cursor:
+            for query, params in queries:
+                await cursor.execute(query, params)
+
+    async def cursor(
+        self,
+        query: str,
+        params: Optional[Sequence[Any]] = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream query results through a server-side cursor.
+
+        Rows are fetched ``batch_size`` at a time, so large result sets are
+        never materialized in memory.
+
+        Args:
+            query: SQL query
+            params: Query parameters
+            batch_size: Rows fetched per round-trip
+
+        Yields:
+            Result rows as dictionaries
+        """
+        async with self.get_connection() as conn:
+            async with conn.transaction():
+                async with conn.cursor(name="sdk_stream") as cursor:
+                    cursor.itersize = batch_size
+                    await cursor.execute(query, params)
+                    async for row in cursor:
+                        yield row
+
+    async def check_connection(self) -> bool:
+        """
+        Check if database connection is working.
+
+        Returns:
+            True if connection is valid
+        """
+        try:
+            await self.execute_query("SELECT 1", fetch_one=True)
+            return True
+        except Exception:
+            return False
+
+
+async def create_async_database_connection(
+    config: Optional[DatabaseConfig] = None,
+    database_url: Optional[str] = None
+) -> AsyncDatabaseConnection:
+    """
+    Create and connect an async database connection.
+
+    Args:
+        config: Database configuration (defaults to ``DatabaseConfig.from_env()``)
+        database_url: Optional ``postgresql://`` URL, used instead of ``config``
+
+    Returns:
+        Connected AsyncDatabaseConnection instance
+    """
+    if database_url:
+        config = DatabaseConfig.from_url(database_url)
+    connection = AsyncDatabaseConnection(config or DatabaseConfig.from_env())
+    await connection.connect()
+    return connection
@@ -0,0 +1,301 @@
+"""
+Blocking Connection Pool
+
+``ThreadedConnectionPool`` raises ``PoolError`` the moment every connection is
+checked out, so a burst of threadpool-offloaded requests fails instead of
+queueing. ``BlockingConnectionPool`` makes ``getconn`` wait (up to
+``acquire_timeout`` seconds) for a connection to be returned, and records:
+
+- an acquire-wait histogram (cumulative, Prometheus-style buckets),
+- time-weighted utilization (connections in use / pool size),
+- churn (connections opened and closed; psycopg2 closes every returned
+  connection beyond ``minconn`` idle ones).
+
+With ``autosize`` enabled the pool adjusts itself once per ``autosize_interval``
+from the waits and peak usage it measured: it grows the size limit (up to
+``max_size``) while the p95 acquire wait exceeds ``target_wait``, shrinks it
+(down to ``min_size``) when utilization is low, and keeps as many idle
+connections warm as the window's peak concurrency to cut churn.
+"""
+
+# Standard library imports
+import bisect
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Third-party imports
+from psycopg2 import pool
+
+logger = logging.getLogger(__name__)
+
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Window utilization under which the pool gives back a connection
+_SHRINK_UTILIZATION = 0.5
+
+
+@dataclass
+class WaitHistogram:
+    """Histogram of connection acquire waits, in seconds."""
+    buckets: Tuple[float, ...] = WAIT_BUCKETS
+    counts: List[int] = field(default_factory=lambda: [0] * (len(WAIT_BUCKETS) + 1))
+    total: float = 0.0
+    count: int = 0
+
+    def observe(self, seconds: float) -> None:
+        """Record one wait."""
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Approximate a quantile as the upper bound of the bucket holding it.
+
+        Args:
+            q: Quantile in [0, 1]
+
+        Returns:
+            Wait in seconds (the largest bucket bound for the overflow bucket; 0 when empty)
+        """
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for bound, bucket_count in zip(self.buckets + (self.buckets[-1],), self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return self.buckets[-1]
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return cumulative bucket counts (``le`` bounds), sum and count."""
+        cumulative, running = {}, 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            running += bucket_count
+            cumulative[str(bound)] = running
+        cumulative["+Inf"] = self.count
+        return {"buckets": cumulative, "sum": self.total, "count": self.count}
+
+
+class BlockingConnectionPool(pool.ThreadedConnectionPool):
+    """
+    Thread-safe psycopg2 pool whose ``getconn`` waits for a free connection.
+
+    ``maxconn`` is the current size limit; with autosizing it moves between
+    ``min_size`` and ``max_size``, and ``minconn`` (idle connections kept open)
+    follows the measured peak concurrency.
+    """
+
+    def __init__(
+        self,
+        minconn: int,
+        maxconn: int,
+        *args: Any,
+        acquire_timeout: Optional[float] = 30.0,
+        autosize: bool = False,
+        target_wait: float = 0.01,
+        autosize_interval: float = 30.0,
+        configure: Optional[Callable[[Any], None]] = None,
+        **kwargs: Any
+    ):
+        """
+        Initialize the pool (opens ``minconn`` connections).
+
+        Args:
+            minconn: Connections kept open; the lower size bound when autosizing
+            maxconn: Maximum connections; the upper size bound when autosizing
+            *args: psycopg2.connect arguments
+            acquire_timeout: Seconds ``getconn`` waits for a connection (None waits forever)
+            autosize: Adjust the size limit and warm connections from measured waits
+            target_wait: p95 acquire wait (seconds) above which the pool grows
+            autosize_interval: Seconds of measurements per autosizing decision
+            configure: Called with every new connection before it is pooled
+                (e.g. to register type casters on it)
+            **kwargs: psycopg2.connect keyword arguments
+        """
+        self.min_size = int(minconn)
+        self.max_size = int(maxconn)
+        self.acquire_timeout = acquire_timeout
+        self.autosize = autosize
+        self.target_wait = target_wait
+        self.autosize_interval = autosize_interval
+        self.configure = configure
+
+        self.acquire_wait = WaitHistogram()
+        self.acquired = 0
+        self.timeouts = 0
+        self.opened = 0
+        self.closed_connections = 0
+        self.resizes = 0
+        self._waiting = 0
+        self._window_wait = WaitHistogram()
+        self._window_peak = 0
+        self._window_start = self._last_change = time.monotonic()
+        self._busy_seconds = 0.0
+        self._utilization = 0.0
+
+        super().__init__(minconn, maxconn, *args, **kwargs)
+        self._available = threading.Condition(self._lock)
+
+    def _connect(self, key=None):
+        self.opened += 1
+        conn = super()._connect(key)
+        if self.configure is not None:
+            self.configure(conn)
+        return conn
+
+    def getconn(self, key=None, timeout: Optional[float] = None):
+        """
+        Get a connection, waiting for one to be returned if the pool is at its limit.
+
+        Args:
+            key: Optional psycopg2 pool key
+            timeout: Seconds to wait (defaults to ``acquire_timeout``)
+
+        Returns:
+            psycopg2 connection
+
+        Raises:
+            PoolError: If the pool is closed or no connection freed up in time
+        """
+        timeout = self.acquire_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        with self._available:
+            self._waiting += 1
+            try:
+                while not self.closed and key not in self._used and len(self._used) >= self.maxconn:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        self.timeouts += 1
+                        raise pool.PoolError(f"connection pool exhausted (waited {timeout:.1f}s)")
+                    self._available.wait(remaining)
+                conn = self._getconn(key)
+            finally:
+                self._waiting -= 1
+
+            now = time.monotonic()
+            self.acquired += 1
+            self.acquire_wait.observe(now - started)
+            self._window_wait.observe(now - started)
+            self._track_usage(now, len(self._used) - 1)
+            self._window_peak = max(self._window_peak, len(self._used))
+            return conn
+
+    def putconn(self, conn=None, key=None, close: bool = False) -> None:
+        """
+        Return a connection and wake one waiting thread.
+
+        Args:
+            conn: Connection to return
+            key: Optional psycopg2 pool key
+            close: Close the connection instead of keeping it idle
+        """
+        with self._available:
+            idle = len(self._pool)
+            self._track_usage(time.monotonic(), len(self._used))
+            self._putconn(conn, key, close)
+            if len(self._pool) <= idle:
+                self.closed_connections += 1
+            self._maybe_autosize()
+            self._available.notify()
+
+    def closeall(self) -> None:
+        """Close all connections and fail any waiting ``getconn``."""
+        with self._available:
+            self._closeall()
+            self._available.notify_all()
+
+    def resize(self, size: int, warm: Optional[int] = None) -> None:
+        """
+        Set the size limit (clamped to ``min_size``..``max_size``) and idle connections kept open.
+
+        Shrinking never interrupts connections in use; idle connections beyond
+        the warm set are closed, and new checkouts wait until usage drops
+        below the new limit.
+
+        Args:
+            size: New maximum number of connections
+            warm: Idle connections kept open (default: unchanged, capped at ``size``)
+        """
+        with self._available:
+            self._resize(size, warm)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report pool size, utilization, churn and the acquire-wait histogram.
+
+        Returns:
+            Dictionary of pool metrics
+        """
+        with self._available:
+            self._track_usage(time.monotonic(), len(self._used))
+            return {
+                "size": self.maxconn,
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "warm": self.minconn,
+                "in_use": len(self._used),
+                "idle": len(self._pool),
+                "waiting": self._waiting,
+                "utilization": self._window_utilization(),
+                "last_window_utilization": self._utilization,
+                "acquired": self.acquired,
+                "timeouts": self.timeouts,
+                "opened": self.opened,
+                "closed": self.closed_connections,
+                "resizes": self.resizes,
+                "acquire_wait": self.acquire_wait.as_dict(),
+            }
+
+    def _track_usage(self, now: float, in_use: int) -> None:
+        """Accumulate connection-seconds in use since the last change (``in_use`` before it)."""
+        self._busy_seconds += in_use * (now - self._last_change)
+        self._last_change = now
+
+    def _window_utilization(self) -> float:
+        elapsed = self._last_change - self._window_start
+        if elapsed <= 0 or not self.maxconn:
+            return 0.0
+        return min(self._busy_seconds / (elapsed * self.maxconn), 1.0)
+
+    def _maybe_autosize(self) -> None:
+        """Re-size once per window from its p95 wait, utilization and peak concurrency."""
+        if not self.autosize or self._last_change - self._window_start < self.autosize_interval:
+            return
+        p95_wait = self._window_wait.quantile(0.95)
+        utilization = self._window_utilization()
+        size = self.maxconn
+        if p95_wait > self.target_wait:
+            size += max(1, size // 4)
+        elif utilization < _SHRINK_UTILIZATION and not self._waiting:
+            size = max(self._window_peak, size - 1)
+        self._resize(size, self._window_peak)
+
+        if size != self.maxconn or p95_wait > self.target_wait:
+            logger.debug(
+                f"Connection pool window: p95 wait {p95_wait * 1000:.1f}ms, "
+                f"utilization {utilization:.0%}, size {self.maxconn}"
+            )
+        self._utilization = utilization
+        self._window_wait = WaitHistogram()
+        self._window_peak = len(self._used)
+        self._window_start = self._last_change
+        self._busy_seconds = 0.0
+
+    def _resize(self, size: int, warm: Optional[int] = None) -> None:
+        size = min(max(size, self.min_size, 1), self.max_size)
+        if size != self.maxconn:
+            self.resizes += 1
+            logger.info(f"Resizing connection pool: {self.maxconn} -> {size} connections")
+            if size > self.maxconn:
+                self._available.notify_all()
+        self.maxconn = size
+        self.minconn = min(max(self.min_size, self.minconn if warm is None else warm), size)
+        # Close idle connections beyond the warm set
+        while len(self._pool) > self.minconn:
+            self._pool.pop().close()
+            self.closed_connections += 1
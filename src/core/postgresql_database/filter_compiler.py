@@ -0,0 +1,173 @@
+"""
+Metadata Filter Compiler
+
+Compiles retrieval filter dictionaries into parameterized SQL predicates over
+``documents`` so filtering happens inside the similarity query (before its
+``LIMIT``) instead of in Python afterwards.
+
+Filter syntax::
+
+    {"category": "faq"}                          # equality
+    {"lang": {"$in": ["en", "de"]}}              # membership (a plain list works too)
+    {"year": {"$gte": 2020, "$lt": 2024}}        # range
+    {"tenant_id": "tenant_123"}                  # document column, not metadata
+
+Equality and membership compile to JSONB containment (``metadata @> ...``),
+which a ``jsonb_path_ops`` GIN index serves; ranges compile to
+``metadata ? 'key' AND (metadata->>'key')::numeric`` comparisons, which the
+partial expression indexes created by
+``VectorIndexManager.create_metadata_key_index`` serve.
+"""
+
+# Standard library imports
+import json
+import operator
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# Columns of ``documents`` that filters address directly instead of via metadata
+DOCUMENT_COLUMNS = {"tenant_id", "source"}
+
+_RANGE_OPERATORS = {"$gt": ">", "$gte": ">=", "$lt": "<", "$lte": "<="}
+_PY_RANGE_OPERATORS = {"$gt": operator.gt, "$gte": operator.ge, "$lt": operator.lt, "$lte": operator.le}
+_KEY_PATTERN = re.compile(r"^[A-Za-z0-9_\-.]+$")
+
+
+def _check_key(key: str) -> str:
+    """Metadata keys are inlined (so expression indexes match); only allow safe names."""
+    if not isinstance(key, str) or not _KEY_PATTERN.match(key):
+        raise ValueError(f"Invalid metadata filter key: {key!r}")
+    return key
+
+
+def _range_expression(alias: str, column: str, key: str, value: Any) -> str:
+    accessor = f"({alias}.{column}->>'{key}')"
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return accessor
+    return f"{accessor}::numeric"
+
+
+def compile_filters(
+    filters: Optional[Dict[str, Any]],
+    alias: str = "d",
+    column: str = "metadata"
+) -> Tuple[str, tuple]:
+    """
+    Compile a filter dictionary into a SQL predicate and its parameters.
+
+    Args:
+        filters: Filter dictionary (see module docstring)
+        alias: Alias of the ``documents`` table in the surrounding query
+        column: JSONB metadata column
+
+    Returns:
+        Tuple of (predicate SQL without a leading ``AND``/``WHERE``, params);
+        ``("", ())`` when there is nothing to filter
+
+    Raises:
+        ValueError: If a key or operator is not supported
+    """
+    if not filters:
+        return "", ()
+
+    clauses: List[str] = []
+    params: List[Any] = []
+    contains: Dict[str, Any] = {}
+
+    for key, condition in filters.items():
+        if key in DOCUMENT_COLUMNS:
+            values = condition.get("$in") if isinstance(condition, dict) else condition
+            if isinstance(values, (list, tuple, set)):
+                clauses.append(f"{alias}.{key} = ANY(%s)")
+                params.append(list(values))
+            else:
+                clauses.append(f"{alias}.{key} = %s")
+                params.append(values)
+            continue
+
+        key = _check_key(key)
+        if isinstance(condition, (list, tuple, set)):
+            condition = {"$in": list(condition)}
+        if not isinstance(condition, dict):
+            contains[key] = condition
+            continue
+
+        if any(op in _RANGE_OPERATORS for op in condition):
+            # Matches the predicate of the partial key index so the planner can use it
+            clauses.append(f"{alias}.{column} ? '{key}'")
+        for op, value in condition.items():
+            if op == "$eq":
+                contains[key] = value
+            elif op == "$in":
+                options = list(value)
+                if not options:
+                    clauses.append("FALSE")
+                    continue
+                clauses.append("(" + " OR ".join([f"{alias}.{column} @> %s::jsonb"] * len(options)) + ")")
+                params.extend(json.dumps({key: option}) for option in options)
+            elif op in _RANGE_OPERATORS:
+                clauses.append(f"{_range_expression(alias, column, key, value)} {_RANGE_OPERATORS[op]} %s")
+                params.append(value)
+            else:
+                raise ValueError(f"Unsupported filter operator {op!r} for key {key!r}")
+
+    if contains:
+        clauses.insert(0, f"{alias}.{column} @> %s::jsonb")
+        params.insert(0, json.dumps(contains))
+
+    return " AND ".join(clauses), tuple(params)
+
+
+def matches_filters(row: Dict[str, Any], filters: Optional[Dict[str, Any]]) -> bool:
+    """
+    Evaluate a filter dictionary against a result row in Python.
+
+    Mirrors ``compile_filters`` for rows that did not come through SQL
+    filtering. Document-column filters are skipped when the row lacks the column.
+
+    Args:
+        row: Result row with ``metadata`` (dict or JSON string)
+        filters: Filter dictionary
+
+    Returns:
+        True if the row satisfies every filter
+    """
+    if not filters:
+        return True
+    metadata = row.get("metadata") or {}
+    if isinstance(metadata, str):
+        try:
+            metadata = json.loads(metadata)
+        except ValueError:
+            metadata = {}
+
+    for key, condition in filters.items():
+        if key in DOCUMENT_COLUMNS:
+            if key not in row:
+                continue
+            actual = row[key]
+        elif key in metadata:
+            actual = metadata[key]
+        else:
+            return False
+
+        if isinstance(condition, (list, tuple, set)):
+            condition = {"$in": list(condition)}
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+
+        for op, value in condition.items():
+            if op == "$eq":
+                matched = actual == value
+            elif op == "$in":
+                matched = actual in value
+            elif op in _PY_RANGE_OPERATORS:
+                try:
+                    matched = _PY_RANGE_OPERATORS[op](actual, value)
+                except TypeError:
+                    matched = False
+            else:
+                raise ValueError(f"Unsupported filter operator {op!r} for key {key!r}")
+            if not matched:
+                return False
+    return True
@@ -0,0 +1,309 @@
+"""
+Chunk-Level Full-Text Search
+
+Keyword retrieval over document chunks with PostgreSQL full-text search.
+Chunk text lives in ``document_chunks`` next to a generated ``tsvector``
+column, parsed with each chunk's own text search configuration (language),
+and indexed with GIN, so a keyword query is an index lookup instead of a
+``LIKE`` scan over whole documents.
+
+Queries are parsed with ``websearch_to_tsquery`` (quoted phrases, ``OR``,
+``-term``) and ranked with ``ts_rank_cd`` (cover density) using length
+normalization, a BM25-style penalty for long chunks, scaled to [0, 1) so
+the score can be fused with vector similarities.
+"""
+
+# Standard library imports
+import logging
+import re
+import threading
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Local application/library specific imports
+from .connection import DatabaseConnection
+from .filter_compiler import compile_filters
+from .vector_index_manager import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+# ISO 639-1 codes of PostgreSQL's built-in text search configurations
+_LANGUAGE_CONFIGS = {
+    "ar": "arabic", "ca": "catalan", "da": "danish", "de": "german", "el": "greek",
+    "en": "english", "es": "spanish", "eu": "basque", "fi": "finnish", "fr": "french",
+    "ga": "irish", "hi": "hindi", "hu": "hungarian", "hy": "armenian", "id": "indonesian",
+    "it": "italian", "lt": "lithuanian", "nb": "norwegian", "ne": "nepali", "nl": "dutch",
+    "no": "norwegian", "pt": "portuguese", "ro": "romanian", "ru": "russian", "sr": "serbian",
+    "sv": "swedish", "ta": "tamil", "tr": "turkish", "yi": "yiddish",
+}
+
+_TABLE_NAME = re.compile(r"^[a-z_][a-z0-9_]{0,62}$")
+
+# ts_rank_cd normalization: 1 divides by 1 + log(length), 32 maps rank to rank / (rank + 1)
+_RANK_NORMALIZATION = 1 | 32
+
+# Chunk tables already created, per database connection, for the whole process
+_schema_lock = threading.Lock()
+_ready_tables: "weakref.WeakKeyDictionary[Any, set]" = weakref.WeakKeyDictionary()
+
+
+def text_search_config(language: Optional[str], default: str = "english") -> str:
+    """
+    Map a language name or code (``"de"``, ``"pt-BR"``, ``"french"``) to a text search configuration.
+
+    Args:
+        language: Language name or ISO 639-1 code (None uses ``default``)
+        default: Configuration for a missing language
+
+    Returns:
+        Built-in configuration name; ``"simple"`` (no stemming) for unknown languages
+    """
+    if not language:
+        return default
+    language = language.strip().lower()
+    if language == "simple" or language in _LANGUAGE_CONFIGS.values():
+        return language
+    return _LANGUAGE_CONFIGS.get(re.split(r"[-_]", language)[0], "simple")
+
+
+class FullTextSearch:
+    """
+    Chunk-level keyword index and search on PostgreSQL full-text search.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseConnection,
+        table_name: str = "document_chunks",
+        language: str = "english"
+    ):
+        """
+        Initialize full-text search.
+
+        Args:
+            db: Database connection
+            table_name: Chunk table
+            language: Default language for chunks and queries
+
+        Raises:
+            ValueError: If the table name is not a plain identifier
+        """
+        if not _TABLE_NAME.match(table_name):
+            raise ValueError(f"Invalid table name: {table_name!r}")
+        self.db = db
+        self.table_name = table_name
+        self.language = text_search_config(language)
+
+    def ensure_schema(self) -> None:
+        """
+        Create the chunk table once per process and database connection.
+
+        Every ``FullTextSearch`` on the same connection shares the check, so
+        short-lived instances (one per request) do not rerun the DDL.
+
+        Raises:
+            DatabaseError: If the DDL fails
+        """
+        with _schema_lock:
+            if self.table_name in _ready_tables.get(self.db, ()):
+                return
+            self.create_schema()
+
+    def create_schema(self) -> None:
+        """
+        Create the chunk table, its generated ``tsvector`` column and the GIN index.
+
+        Raises:
+            DatabaseError: If the DDL fails
+        """
+        queries = [
+            (f"""
+            CREATE TABLE IF NOT EXISTS {self.table_name} (
+                id BIGSERIAL PRIMARY KEY,
+                document_id INTEGER NOT NULL,
+                chunk_index INTEGER NOT NULL,
+                language REGCONFIG NOT NULL DEFAULT 'english',
+                content TEXT NOT NULL,
+                tsv TSVECTOR GENERATED ALWAYS AS (to_tsvector(language, content)) STORED
+            );
+            """, None),
+            (f"CREATE INDEX IF NOT EXISTS {self.table_name}_tsv_idx ON {self.table_name} USING GIN (tsv);", None),
+            (f"CREATE INDEX IF NOT EXISTS {self.table_name}_document_id_idx "
+             f"ON {self.table_name} (document_id);", None),
+        ]
+        try:
+            self.db.execute_transaction(queries)
+        except Exception as e:
+            error_msg = f"Failed to create full-text search table {self.table_name}: {str(e)}"
+            logger.error(error_msg)
+            raise DatabaseError(message=error_msg, operation="create_schema", original_error=e)
+        _ready_tables.setdefault(self.db, set()).add(self.table_name)
+
+    def index_chunks(
+        self,
+        document_id: Any,
+        chunks: Sequence[str],
+        language: Optional[str] = None
+    ) -> int:
+        """
+        Add a document's chunks to the keyword index (creating the table on first use).
+
+        Args:
+            document_id: Document ID
+            chunks: Chunk texts, in document order
+            language: Language name or code of the document (defaults to ``language``)
+
+        Returns:
+            Number of chunks indexed
+        """
+        if not chunks:
+            return 0
+        self.ensure_schema()
+        config = text_search_config(language, self.language)
+        values = [(int(document_id), index, config, content) for index, content in enumerate(chunks)]
+
+        from psycopg2.extras import execute_values
+        with self.db.get_cursor() as cursor:
+            execute_values(
+                cursor,
+                f"INSERT INTO {self.table_name} (document_id, chunk_index, language, content) VALUES %s",
+                values,
+                template="(%s, %s, %s::regconfig, %s)"
+            )
+        return len(values)
+
+    def delete_document(self, document_id: Any) -> int:
+        """
+        Remove a document's chunks from the keyword index.
+
+        Args:
+            document_id: Document ID
+
+        Returns:
+            Number of chunks removed
+        """
+        return self.db.execute_query(
+            f"DELETE FROM {self.table_name} WHERE document_id = %s;", (int(document_id),), fetch_all=False
+        )
+
+    def backfill(
+        self,
+        chunk: Callable[[Dict[str, Any]], Sequence[str]],
+        tenant_id: Optional[str] = None,
+        itersize: int = 500
+    ) -> int:
+        """
+        Index the stored documents that have no chunks in the keyword index yet.
+
+        Documents ingested before the chunk table existed are streamed from a
+        server-side cursor and split with ``chunk``; each document's
+        ``metadata["language"]`` selects its text search configuration. Safe
+        to rerun: indexed documents are skipped.
+
+        Args:
+            chunk: Splits a document row (``id``, ``content``, ``metadata``) into chunk texts
+            tenant_id: Only backfill this tenant's documents
+            itersize: Documents fetched per round-trip
+
+        Returns:
+            Number of documents indexed
+        """
+        self.ensure_schema()
+        query = f"""
+        SELECT d.id, d.content, d.metadata
+        FROM documents d
+        WHERE NOT EXISTS (SELECT 1 FROM {self.table_name} c WHERE c.document_id = d.id)
+        """
+        params: tuple = ()
+        if tenant_id is not None:
+            query += " AND d.tenant_id = %s"
+            params = (tenant_id,)
+        query += " ORDER BY d.id;"
+
+        indexed = 0
+        for row in self.db.stream_query(query, params, itersize=itersize):
+            try:
+                if self.index_chunks(row["id"], chunk(row), language=(row["metadata"] or {}).get("language")):
+                    indexed += 1
+            except Exception as e:
+                logger.error(f"Failed to backfill keyword index for document {row['id']}: {e}", exc_info=True)
+        logger.info(f"Backfilled keyword index for {indexed} documents")
+        return indexed
+
+    def _search_query(
+        self,
+        query: str,
+        top_k: int,
+        tenant_id: Optional[str],
+        language: Optional[str],
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, tuple]:
+        """Build the ranked keyword query and its parameters."""
+        if tenant_id:
+            filters = {**(filters or {}), "tenant_id": tenant_id}
+        filter_sql, filter_params = compile_filters(filters)
+        filter_clause = f"AND {filter_sql}" if filter_sql else ""
+        sql = f"""
+        SELECT
+            c.document_id AS id,
+            c.document_id,
+            c.id AS chunk_id,
+            c.chunk_index,
+            d.title,
+            c.content,
+            d.metadata,
+            d.source,
+            ts_rank_cd(c.tsv, q.query, {_RANK_NORMALIZATION}) AS rank
+        FROM websearch_to_tsquery(%s::regconfig, %s) AS q(query)
+        JOIN {self.table_name} c ON c.tsv @@ q.query
+        JOIN documents d ON d.id = c.document_id
+        WHERE TRUE {filter_clause}
+        ORDER BY rank DESC, c.id
+        LIMIT %s;
+        """
+        params = (text_search_config(language, self.language), query)
+        return sql, params + filter_params + (top_k,)
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 10,
+        tenant_id: Optional[str] = None,
+        language: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the chunks that best match a keyword query.
+
+        Metadata filters are compiled into the query (before its ``LIMIT``),
+        so ``top_k`` counts only matching chunks.
+
+        Args:
+            query: Search text (web search syntax: ``"exact phrase"``, ``or``, ``-exclude``)
+            top_k: Maximum number of chunks
+            tenant_id: Optional tenant filter
+            language: Query language (defaults to ``language``)
+            filters: Optional metadata filters (see ``filter_compiler.compile_filters``)
+
+        Returns:
+            Chunks with document fields and ``similarity`` (normalized rank in [0, 1))
+        """
+        if not query or not query.strip():
+            return []
+        sql, params = self._search_query(query, top_k, tenant_id, language, filters)
+        rows = self.db.execute_query(sql, params, fetch_all=True, read_only=True) or []
+        return [
+            {
+                "id": str(row["id"]),
+                "document_id": row["document_id"],
+                "chunk_id": row["chunk_id"],
+                "chunk_index": row["chunk_index"],
+                "title": row.get("title", ""),
+                "content": row.get("content", ""),
+                "metadata": row.get("metadata", {}),
+                "source": row.get("source"),
+                "similarity": float(row["rank"]),
+                "score_type": "keyword",
+            }
+            for row in rows
+        ]
@@ -0,0 +1,542 @@
+"""
+Vector Index Autotuning
+
+Measures recall@k against exact ground truth and query latency for pgvector
+indexes across query-time (``hnsw.ef_search`` / ``ivfflat.probes``) and,
+optionally, build-time (``m``/``ef_construction`` / ``lists``) parameters.
+The resulting curve and the chosen operating point are persisted per table
+and tenant so the search path can apply them at runtime.
+"""
+
+# Standard library imports
+import json
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+# Third-party imports
+import numpy as np
+from psycopg2.extras import RealDictCursor
+
+# Local application/library specific imports
+from .connection import DatabaseConnection
+from .vector_index_manager import DatabaseError, IndexDistance, IndexType, VectorIndexManager
+from .vector_operations import SearchParams, _SET_LOCAL_SQL
+from .vector_adapter import _parse_vector_text, to_vector
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EF_SEARCH_GRID = [10, 20, 40, 80, 160, 320]
+DEFAULT_PROBES_GRID = [1, 2, 4, 8, 16, 32]
+
+_TUNING_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS vector_index_tuning (
+    table_name TEXT NOT NULL,
+    tenant_id TEXT NOT NULL DEFAULT '',
+    index_type TEXT NOT NULL,
+    k INTEGER NOT NULL,
+    build_params JSONB NOT NULL,
+    search_params JSONB NOT NULL,
+    recall DOUBLE PRECISION NOT NULL,
+    latency_p95_ms DOUBLE PRECISION NOT NULL,
+    curve JSONB NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (table_name, tenant_id)
+);
+"""
+
+_SAVE_TUNING_SQL = """
+INSERT INTO vector_index_tuning
+    (table_name, tenant_id, index_type, k, build_params, search_params, recall, latency_p95_ms, curve)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+ON CONFLICT (table_name, tenant_id) DO UPDATE SET
+    index_type = EXCLUDED.index_type,
+    k = EXCLUDED.k,
+    build_params = EXCLUDED.build_params,
+    search_params = EXCLUDED.search_params,
+    recall = EXCLUDED.recall,
+    latency_p95_ms = EXCLUDED.latency_p95_ms,
+    curve = EXCLUDED.curve,
+    updated_at = now();
+"""
+
+_LOAD_TUNING_SQL = """
+SELECT search_params
+FROM vector_index_tuning
+WHERE table_name = %s AND tenant_id IN (%s, '')
+ORDER BY tenant_id DESC
+LIMIT 1;
+"""
+
+_DISTANCE_OPERATORS = {
+    IndexDistance.COSINE: "<=>",
+    IndexDistance.L2: "<->",
+    IndexDistance.INNER_PRODUCT: "<#>",
+}
+
+
+@dataclass
+class TuningPoint:
+    """One measured point of the recall/latency curve."""
+    build_params: Dict[str, int]
+    search_params: Dict[str, int]
+    recall: float
+    latency_p50_ms: float
+    latency_p95_ms: float
+    build_seconds: Optional[float] = None
+
+
+@dataclass
+class TuningResult:
+    """Recall@k versus latency curve for one table/tenant and the chosen point."""
+    table_name: str
+    tenant_id: Optional[str]
+    index_type: IndexType
+    k: int
+    target_recall: float
+    sample_size: int
+    curve: List[TuningPoint] = field(default_factory=list)
+    chosen: Optional[TuningPoint] = None
+
+    def search_params(self) -> SearchParams:
+        """Return the chosen operating point as ``SearchParams``."""
+        return SearchParams(**(self.chosen.search_params if self.chosen else {}))
+
+
+def recall_at_k(retrieved: Sequence[Any], ground_truth: Sequence[Any], k: int) -> float:
+    """
+    Fraction of the exact top-k neighbours found in the retrieved top-k.
+
+    Args:
+        retrieved: IDs returned by the approximate search
+        ground_truth: IDs returned by the exact search
+        k: Cut-off
+
+    Returns:
+        Recall in [0, 1]
+    """
+    truth = set(list(ground_truth)[:k])
+    if not truth:
+        return 1.0
+    return len(truth.intersection(list(retrieved)[:k])) / len(truth)
+
+
+def choose_operating_point(curve: Sequence[TuningPoint], target_recall: float) -> Optional[TuningPoint]:
+    """
+    Pick the fastest point that reaches ``target_recall``.
+
+    Falls back to the highest-recall point when no point reaches the target.
+
+    Args:
+        curve: Measured points
+        target_recall: Minimum acceptable recall@k
+
+    Returns:
+        Chosen point, or None for an empty curve
+    """
+    if not curve:
+        return None
+    eligible = [point for point in curve if point.recall >= target_recall]
+    if eligible:
+        return min(eligible, key=lambda point: (point.latency_p95_ms, -point.recall))
+    return max(curve, key=lambda point: (point.recall, -point.latency_p95_ms))
+
+
+class IndexAutotuner:
+    """
+    Sweeps pgvector index parameters and records recall@k versus latency.
+
+    Queries are sampled from the stored embeddings and held out of their own
+    ground truth (a query never counts itself as a neighbour). Ground truth is
+    computed with index scans disabled, so it is the exact top-k.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseConnection,
+        table_name: str = "embeddings",
+        column_name: str = "embedding",
+        index_type: IndexType = IndexType.HNSW,
+        distance: IndexDistance = IndexDistance.COSINE,
+        index_manager: Optional[VectorIndexManager] = None
+    ):
+        """
+        Initialize the autotuner.
+
+        Args:
+            db: Database connection
+            table_name: Table holding the vectors (must have ``id`` and ``document_id``)
+            column_name: Vector column
+            index_type: Index type being tuned
+            distance: Distance metric of the index
+            index_manager: Index manager used for build-parameter sweeps
+        """
+        self.db = db
+        self.table_name = table_name
+        self.column_name = column_name
+        self.index_type = index_type
+        self.distance = distance
+        self.index_manager = index_manager or VectorIndexManager(db)
+        self._operator = _DISTANCE_OPERATORS[distance]
+
+    def tune(
+        self,
+        k: int = 10,
+        sample_size: int = 100,
+        target_recall: float = 0.95,
+        search_grid: Optional[List[int]] = None,
+        build_grid: Optional[List[Dict[str, int]]] = None,
+        tenant_id: Optional[str] = None,
+        persist: bool = True
+    ) -> TuningResult:
+        """
+        Measure the recall/latency curve and choose an operating point.
+
+        Args:
+            k: Number of neighbours per query
+            sample_size: Number of held-out queries
+            target_recall: Minimum recall@k for the chosen point
+            search_grid: ``ef_search`` (HNSW) or ``probes`` (IVFFlat) values to sweep
+            build_grid: Optional build parameters to sweep, e.g.
+                ``[{"m": 16, "ef_construction": 64}, {"m": 32, "ef_construction": 128}]``
+                or ``[{"lists": 100}, {"lists": 400}]``. Each entry rebuilds the
+                table's index, so run build sweeps off-peak or on a copy.
+            tenant_id: Restrict queries and neighbours to one tenant's documents
+            persist: Save the result to ``vector_index_tuning``
+
+        Returns:
+            TuningResult with the full curve and the chosen point
+
+        Raises:
+            DatabaseError: If no embeddings are available to sample
+        """
+        search_key = "ef_search" if self.index_type == IndexType.HNSW else "probes"
+        search_grid = search_grid or (
+            DEFAULT_EF_SEARCH_GRID if self.index_type == IndexType.HNSW else DEFAULT_PROBES_GRID
+        )
+
+        queries = self.sample_queries(sample_size, tenant_id)
+        if not queries:
+            raise DatabaseError(
+                message=f"No embeddings to sample in {self.table_name}",
+                operation="autotune"
+            )
+        truth = {query_id: self.exact_neighbors(vector, k, query_id, tenant_id) for query_id, vector in queries}
+
+        result = TuningResult(
+            table_name=self.table_name,
+            tenant_id=tenant_id,
+            index_type=self.index_type,
+            k=k,
+            target_recall=target_recall,
+            sample_size=len(queries)
+        )
+        for build_params in build_grid or [{}]:
+            build_seconds = self._build_index(build_params) if build_params else None
+            for value in search_grid:
+                point = self._measure(queries, truth, k, {search_key: value}, tenant_id)
+                point.build_params = dict(build_params)
+                point.build_seconds = build_seconds
+                result.curve.append(point)
+                logger.info(
+                    f"{self.table_name} {build_params} {search_key}={value}: "
+                    f"recall@{k}={point.recall:.3f} p95={point.latency_p95_ms:.2f}ms"
+                )
+
+        result.chosen = choose_operating_point(result.curve, target_recall)
+        if build_grid and result.chosen and result.chosen.build_params != build_grid[-1]:
+            self._build_index(result.chosen.build_params)
+        if persist:
+            self.save(result)
+        return result
+
+    def sample_queries(self, sample_size: int, tenant_id: Optional[str] = None) -> List[tuple]:
+        """
+        Sample stored vectors to use as held-out queries.
+
+        Args:
+            sample_size: Number of queries
+            tenant_id: Optional tenant restriction
+
+        Returns:
+            List of (row id, float32 vector) tuples
+        """
+        join, where, params = self._tenant_filter(tenant_id)
+        query = f"""
+        SELECT e.id, e.{self.column_name} AS vector
+        FROM {self.table_name} e {join}
+        {where}
+        ORDER BY random()
+        LIMIT %s;
+        """
+        rows = self.db.execute_query(query, params + (sample_size,)) or []
+        # Vectors arrive as arrays once the adapters are registered, as text otherwise
+        return [
+            (row["id"], _parse_vector_text(row["vector"]) if isinstance(row["vector"], str) else to_vector(row["vector"]))
+            for row in rows
+        ]
+
+    def exact_neighbors(
+        self,
+        vector: np.ndarray,
+        k: int,
+        exclude_id: Any = None,
+        tenant_id: Optional[str] = None
+    ) -> List[Any]:
+        """
+        Exact top-k neighbour IDs (index scans disabled).
+
+        Args:
+            vector: Query vector
+            k: Number of neighbours
+            exclude_id: Row to leave out (the held-out query itself)
+            tenant_id: Optional tenant restriction
+
+        Returns:
+            Neighbour row IDs, nearest first
+        """
+        settings = [("enable_indexscan", "off"), ("enable_bitmapscan", "off")]
+        return self._neighbors(vector, k, exclude_id, tenant_id, settings)[0]
+
+    def ann_neighbors(
+        self,
+        vector: np.ndarray,
+        k: int,
+        search_params: SearchParams,
+        exclude_id: Any = None,
+        tenant_id: Optional[str] = None
+    ) -> tuple:
+        """
+        Approximate top-k neighbour IDs using the index.
+
+        Args:
+            vector: Query vector
+            k: Number of neighbours
+            search_params: Index settings for the query
+            exclude_id: Row to leave out
+            tenant_id: Optional tenant restriction
+
+        Returns:
+            Tuple of (neighbour row IDs, query latency in seconds)
+        """
+        return self._neighbors(vector, k, exclude_id, tenant_id, search_params.settings())
+
+    def save(self, result: TuningResult) -> None:
+        """
+        Persist a tuning result (one row per table and tenant).
+
+        Args:
+            result: Tuning result to store
+        """
+        chosen = result.chosen
+        if chosen is None:
+            return
+        self.db.execute_transaction([
+            (_TUNING_TABLE_SQL, None),
+            (_SAVE_TUNING_SQL, (
+                result.table_name,
+                result.tenant_id or "",
+                result.index_type.value,
+                result.k,
+                json.dumps(chosen.build_params),
+                json.dumps(chosen.search_params),
+                chosen.recall,
+                chosen.latency_p95_ms,
+                json.dumps([asdict(point) for point in result.curve]),
+            )),
+        ])
+
+    def _measure(
+        self,
+        queries: List[tuple],
+        truth: Dict[Any, List[Any]],
+        k: int,
+        search_params: Dict[str, int],
+        tenant_id: Optional[str]
+    ) -> TuningPoint:
+        """Run every held-out query at one setting and summarise recall and latency."""
+        params = SearchParams(**search_params)
+        recalls, latencies = [], []
+        for query_id, vector in queries:
+            ids, elapsed = self.ann_neighbors(vector, k, params, query_id, tenant_id)
+            recalls.append(recall_at_k(ids, truth[query_id], k))
+            latencies.append(elapsed * 1000)
+        return TuningPoint(
+            build_params={},
+            search_params=dict(search_params),
+            recall=float(np.mean(recalls)),
+            latency_p50_ms=float(np.percentile(latencies, 50)),
+            latency_p95_ms=float(np.percentile(latencies, 95))
+        )
+
+    def _neighbors(
+        self,
+        vector: np.ndarray,
+        k: int,
+        exclude_id: Any,
+        tenant_id: Optional[str],
+        settings: List[tuple]
+    ) -> tuple:
+        # Fetch one extra row and drop the query itself in Python: an ``id <> q``
+        # predicate would become an index-scan filter and skew the measurement
+        join, where, params = self._tenant_filter(tenant_id)
+        query = f"""
+        SELECT e.id
+        FROM {self.table_name} e {join}
+        {where}
+        ORDER BY e.{self.column_name} {self._operator} %s::vector
+        LIMIT %s;
+        """
+        with self.db.get_cursor(cursor_factory=RealDictCursor) as cursor:
+            for name, value in settings:
+                cursor.execute(_SET_LOCAL_SQL, (name, value))
+            start = time.perf_counter()
+            cursor.execute(query, params + (to_vector(vector), k + 1))
+            rows = cursor.fetchall()
+            elapsed = time.perf_counter() - start
+        return [row["id"] for row in rows if row["id"] != exclude_id][:k], elapsed
+
+    def _tenant_filter(self, tenant_id: Optional[str]) -> tuple:
+        if not tenant_id:
+            return "", "", ()
+        return "JOIN documents d ON e.document_id = d.id", "WHERE d.tenant_id = %s", (tenant_id,)
+
+    def _build_index(self, build_params: Dict[str, int]) -> float:
+        """Rebuild the table's index with ``build_params`` and return the build time."""
+        index_name = self.index_manager._get_index_name(self.table_name, self.column_name, self.index_type)
+        self.index_manager.drop_index(index_name)
+        start = time.perf_counter()
+        self.index_manager.create_index(
+            table_name=self.table_name,
+            column_name=self.column_name,
+            index_type=self.index_type,
+            distance=self.distance,
+            **build_params
+        )
+        self.db.execute_query(f"ANALYZE {self.table_name};", fetch_all=False)
+        return time.perf_counter() - start
+
+
+def load_search_params(
+    db: DatabaseConnection,
+    table_name: str = "embeddings",
+    tenant_id: Optional[str] = None
+) -> Optional[SearchParams]:
+    """
+    Load the persisted operating point for a table (tenant-specific first, then global).
+
+    Args:
+        db: Database connection
+        table_name: Tuned table
+        tenant_id: Optional tenant ID
+
+    Returns:
+        SearchParams to pass to ``VectorOperations``, or None if never tuned
+    """
+    try:
+        row = db.execute_query(_LOAD_TUNING_SQL, (table_name, tenant_id or ""), fetch_one=True)
+        if not row:
+            return None
+        params = row["search_params"]
+        if isinstance(params, str):
+            params = json.loads(params)
+        return SearchParams(**params)
+    except Exception as e:
+        logger.warning(f"Could not load tuned search params for {table_name}: {e}")
+        return None
+
+
+class TunedSearchParams:
+    """
+    Per-tenant tuned search parameters for the query path.
+
+    Resolves a tenant's saved operating point with ``load_search_params``
+    (tenant row, then the table-wide row) and falls back to ``default`` when
+    nothing was tuned. Lookups, including misses, are cached for ``ttl``
+    seconds so searches do not query ``vector_index_tuning`` every time.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseConnection,
+        table_name: str = "embeddings",
+        default: Optional[SearchParams] = None,
+        ttl: float = 300.0
+    ):
+        """
+        Initialize the resolver.
+
+        Args:
+            db: Database connection
+            table_name: Tuned table
+            default: Search parameters for tenants without a tuned operating point
+            ttl: Seconds a lookup is reused before it is reloaded
+        """
+        self.db = db
+        self.table_name = table_name
+        self.default = default
+        self.ttl = ttl
+        self._cache: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def is_cached(self, tenant_id: Optional[str] = None) -> bool:
+        """
+        Check whether ``get`` would answer without a database query.
+
+        Args:
+            tenant_id: Optional tenant ID
+
+        Returns:
+            True if a fresh lookup for the tenant is cached
+        """
+        with self._lock:
+            entry = self._cache.get(tenant_id or "")
+        return entry is not None and time.monotonic() - entry[0] < self.ttl
+
+    def get(self, tenant_id: Optional[str] = None) -> Optional[SearchParams]:
+        """
+        Get the search parameters to use for a tenant's queries.
+
+        Args:
+            tenant_id: Optional tenant ID
+
+        Returns:
+            Tuned SearchParams, or ``default`` if the table was never tuned
+        """
+        key = tenant_id or ""
+        with self._lock:
+            entry = self._cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            return entry[1]
+        params = load_search_params(self.db, self.table_name, tenant_id) or self.default
+        with self._lock:
+            self._cache[key] = (time.monotonic(), params)
+        return params
+
+    def clear(self) -> None:
+        """Forget cached lookups, e.g. after a new tuning run."""
+        with self._lock:
+            self._cache.clear()
+
+
+def create_index_autotuner(
+    db: DatabaseConnection,
+    table_name: str = "embeddings",
+    index_type: IndexType = IndexType.HNSW,
+    distance: IndexDistance = IndexDistance.COSINE
+) -> IndexAutotuner:
+    """
+    Create an index autotuner.
+
+    Args:
+        db: Database connection
+        table_name: Table holding the vectors
+        index_type: Index type being tuned
+        distance: Distance metric of the index
+
+    Returns:
+        IndexAutotuner instance
+    """
+    return IndexAutotuner(db, table_name=table_name, index_type=index_type, distance=distance)
@@ -0,0 +1,260 @@
+"""
+Tenant-Partitioned Embeddings
+
+Optional storage layout that partitions the ``embeddings`` table by
+``tenant_id`` (PostgreSQL declarative partitioning, LIST or HASH). The HNSW
+index is declared on the parent, so PostgreSQL builds one per partition
+(including partitions created later): small tenants search small graphs, and a
+tenant's index can be rebuilt without touching anyone else's.
+
+Searches that filter on ``tenant_id`` are pruned to a single partition when
+``VectorOperations`` is created with ``partitioned=True``.
+"""
+
+# Standard library imports
+import hashlib
+import logging
+import re
+from enum import Enum
+from typing import Any, Optional, Set
+
+# Local application/library specific imports
+from .connection import DatabaseConnection
+from .vector_index_manager import DatabaseError, IndexDistance, IndexType, VectorIndexManager
+
+logger = logging.getLogger(__name__)
+
+
+class PartitionStrategy(str, Enum):
+    """How tenants map to partitions."""
+    LIST = "list"  # One partition per tenant (plus a DEFAULT partition)
+    HASH = "hash"  # A fixed number of partitions, tenants hashed across them
+
+
+class TenantPartitionManager:
+    """
+    Creates and maintains the tenant-partitioned ``embeddings`` table.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseConnection,
+        strategy: PartitionStrategy = PartitionStrategy.LIST,
+        table_name: str = "embeddings",
+        hash_partitions: int = 16,
+        dimension: Optional[int] = None,
+        distance: IndexDistance = IndexDistance.COSINE,
+        m: int = 16,
+        ef_construction: int = 64,
+        index_manager: Optional[VectorIndexManager] = None
+    ):
+        """
+        Initialize the partition manager.
+
+        Args:
+            db: Database connection
+            strategy: LIST (partition per tenant) or HASH (fixed partition count)
+            table_name: Partitioned embeddings table
+            hash_partitions: Number of partitions for the HASH strategy
+            dimension: Optional fixed vector dimension for the column
+            distance: Distance metric of the per-partition HNSW indexes
+            m: HNSW ``m`` for the per-partition indexes
+            ef_construction: HNSW ``ef_construction`` for the per-partition indexes
+            index_manager: Index manager used to create the partitioned index
+        """
+        self.db = db
+        self.strategy = strategy
+        self.table_name = table_name
+        self.hash_partitions = hash_partitions
+        self.dimension = dimension
+        self.distance = distance
+        self.m = m
+        self.ef_construction = ef_construction
+        self.index_manager = index_manager or VectorIndexManager(db)
+        self._known_tenants: Set[str] = set()
+
+    @property
+    def default_partition(self) -> str:
+        """Name of the DEFAULT partition (LIST strategy)."""
+        return f"{self.table_name}_default"
+
+    def create_partitioned_table(self) -> None:
+        """
+        Create the partitioned table, its initial partitions and the HNSW index.
+
+        Raises:
+            DatabaseError: If the DDL fails
+        """
+        vector_type = f"vector({self.dimension})" if self.dimension else "vector"
+        queries = [(f"""
+        CREATE TABLE IF NOT EXISTS {self.table_name} (
+            id BIGSERIAL,
+            document_id INTEGER NOT NULL,
+            tenant_id TEXT NOT NULL DEFAULT '',
+            embedding {vector_type},
+            model TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (tenant_id, id)
+        ) PARTITION BY {self.strategy.value.upper()} (tenant_id);
+        """, None)]
+
+        if self.strategy == PartitionStrategy.HASH:
+            for remainder in range(self.hash_partitions):
+                queries.append((f"""
+                CREATE TABLE IF NOT EXISTS {self.table_name}_p{remainder}
+                PARTITION OF {self.table_name}
+                FOR VALUES WITH (MODULUS {self.hash_partitions}, REMAINDER {remainder});
+                """, None))
+        else:
+            queries.append((
+                f"CREATE TABLE IF NOT EXISTS {self.default_partition} PARTITION OF {self.table_name} DEFAULT;",
+                None
+            ))
+        queries.append((
+            f"CREATE INDEX IF NOT EXISTS {self.table_name}_document_id_idx ON {self.table_name} (document_id);",
+            None
+        ))
+
+        try:
+            self.db.execute_transaction(queries)
+        except Exception as e:
+            error_msg = f"Failed to create partitioned table {self.table_name}: {str(e)}"
+            logger.error(error_msg)
+            raise DatabaseError(message=error_msg, operation="create_partitioned_table", original_error=e)
+
+        # Declared on the parent: PostgreSQL creates one HNSW index per partition
+        self.index_manager.create_index(
+            table_name=self.table_name,
+            index_type=IndexType.HNSW,
+            distance=self.distance,
+            m=self.m,
+            ef_construction=self.ef_construction
+        )
+        logger.info(f"Created {self.strategy.value}-partitioned table {self.table_name}")
+
+    def partition_name(self, tenant_id: str) -> str:
+        """
+        Name of a tenant's LIST partition.
+
+        Tenant IDs are sanitized and suffixed with a short hash so distinct
+        tenants never collide and names stay within PostgreSQL's 63-byte limit.
+
+        Args:
+            tenant_id: Tenant ID
+
+        Returns:
+            Partition table name
+        """
+        slug = re.sub(r"[^a-z0-9_]", "_", tenant_id.lower())[:32]
+        digest = hashlib.md5(tenant_id.encode("utf-8")).hexdigest()[:8]
+        return f"{self.table_name}_t_{slug}_{digest}"
+
+    def ensure_tenant_partition(self, tenant_id: Optional[str]) -> Optional[str]:
+        """
+        Make sure a tenant has its own partition (LIST strategy).
+
+        Rows the tenant already has in the DEFAULT partition are moved into the
+        new partition in the same transaction. No-op for the HASH strategy.
+
+        Args:
+            tenant_id: Tenant ID
+
+        Returns:
+            Partition name, or None when the tenant needs no dedicated partition
+        """
+        if not tenant_id or self.strategy != PartitionStrategy.LIST:
+            return None
+        name = self.partition_name(tenant_id)
+        if tenant_id in self._known_tenants:
+            return name
+
+        if not self.partition_exists(name):
+            self._create_tenant_partition(tenant_id, name)
+            logger.info(f"Created partition {name} for tenant {tenant_id}")
+        self._known_tenants.add(tenant_id)
+        return name
+
+    def partition_exists(self, name: str) -> bool:
+        """
+        Check whether a partition of the table exists.
+
+        Args:
+            name: Partition table name
+
+        Returns:
+            True if the partition exists
+        """
+        query = """
+        SELECT EXISTS (
+            SELECT 1
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = %s::regclass AND c.relname = %s
+        );
+        """
+        result = self.db.execute_query(query, (self.table_name, name), fetch_one=True)
+        return result.get("exists", False) if result else False
+
+    def drop_tenant_partition(self, tenant_id: str) -> bool:
+        """
+        Drop a tenant's partition and all its embeddings (LIST strategy).
+
+        Args:
+            tenant_id: Tenant ID
+
+        Returns:
+            True if the partition was dropped
+        """
+        if self.strategy != PartitionStrategy.LIST:
+            return False
+        name = self.partition_name(tenant_id)
+        self.db.execute_transaction([(f"DROP TABLE IF EXISTS {name};", None)])
+        self._known_tenants.discard(tenant_id)
+        return True
+
+    def _create_tenant_partition(self, tenant_id: str, name: str) -> None:
+        """Create the partition, moving any rows parked in DEFAULT."""
+        has_default_rows = self.db.execute_query(
+            f"SELECT EXISTS (SELECT 1 FROM {self.default_partition} WHERE tenant_id = %s);",
+            (tenant_id,),
+            fetch_one=True
+        )
+        create = (f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {self.table_name} FOR VALUES IN (%s);", (tenant_id,))
+        if not (has_default_rows and has_default_rows.get("exists")):
+            queries = [create]
+        else:
+            # A new LIST partition may not overlap rows already in DEFAULT:
+            # detach DEFAULT, create the partition, move the rows, reattach.
+            queries = [
+                (f"ALTER TABLE {self.table_name} DETACH PARTITION {self.default_partition};", None),
+                create,
+                (f"INSERT INTO {self.table_name} SELECT * FROM {self.default_partition} WHERE tenant_id = %s;",
+                 (tenant_id,)),
+                (f"DELETE FROM {self.default_partition} WHERE tenant_id = %s;", (tenant_id,)),
+                (f"ALTER TABLE {self.table_name} ATTACH PARTITION {self.default_partition} DEFAULT;", None),
+            ]
+        try:
+            self.db.execute_transaction(queries)
+        except Exception as e:
+            error_msg = f"Failed to create partition {name} for tenant {tenant_id}: {str(e)}"
+            logger.error(error_msg)
+            raise DatabaseError(message=error_msg, operation="create_partition", original_error=e)
+
+
+def create_tenant_partition_manager(
+    db: DatabaseConnection,
+    strategy: PartitionStrategy = PartitionStrategy.LIST,
+    **kwargs: Any
+) -> TenantPartitionManager:
+    """
+    Create a tenant partition manager.
+
+    Args:
+        db: Database connection
+        strategy: LIST or HASH partitioning
+        **kwargs: Additional ``TenantPartitionManager`` options
+
+    Returns:
+        TenantPartitionManager instance
+    """
+    return TenantPartitionManager(db, strategy=strategy, **kwargs)
@@ -0,0 +1,257 @@
+"""
+Prepared Statement Cache
+
+Keeps a per-connection registry of server-side prepared statements for hot
+queries (similarity search, document insert, agent load), so PostgreSQL parses
+and analyzes them once per connection instead of on every call; once the
+server settles on a generic plan, planning is skipped as well.
+
+Statements are prepared lazily (``PREPARE`` on first use on a connection) and
+tracked by backend PID, so a connection that was closed, replaced by the pool
+or reconnected never reuses names from a previous session. A statement dropped
+behind our back (``DEALLOCATE``/``DISCARD ALL`` by a pooler) invalidates that
+connection's registry and is re-prepared on the next call.
+
+Per query type (the label passed by the caller) the cache records executions,
+prepares and a sampled planning time of the unprepared query, from which it
+reports the planning time saved.
+"""
+
+# Standard library imports
+import hashlib
+import json
+import logging
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+# Third-party imports
+from psycopg2 import errors
+
+logger = logging.getLogger(__name__)
+
+_PLACEHOLDER = re.compile(r"%%|%s")
+_LABEL_PATTERN = re.compile(r"^[a-z][a-z0-9_]{0,39}$")
+
+
+def to_server_placeholders(query: str) -> Tuple[str, int]:
+    """
+    Rewrite psycopg2 ``%s`` placeholders as ``$1, $2, ...`` for ``PREPARE``.
+
+    Args:
+        query: SQL query with positional ``%s`` placeholders
+
+    Returns:
+        Tuple of (rewritten query, number of parameters)
+
+    Raises:
+        ValueError: If the query uses named ``%(name)s`` placeholders
+    """
+    if "%(" in query:
+        raise ValueError("Prepared statements only support positional %s placeholders")
+    count = 0
+
+    def replace(match: "re.Match[str]") -> str:
+        nonlocal count
+        if match.group(0) == "%%":
+            return "%"
+        count += 1
+        return f"${count}"
+
+    return _PLACEHOLDER.sub(replace, query), count
+
+
+@dataclass
+class PreparedStatementStats:
+    """Usage of the prepared statements of one query type."""
+    label: str
+    executions: int = 0
+    prepares: int = 0
+    planning_ms: Optional[float] = None  # Sampled planning time of the unprepared query
+
+    @property
+    def reuses(self) -> int:
+        """Executions that reused an existing prepared statement."""
+        return max(self.executions - self.prepares, 0)
+
+    @property
+    def planning_ms_saved(self) -> float:
+        """
+        Estimated planning time saved.
+
+        Upper bound: PostgreSQL re-plans the first five executions of each
+        statement (custom plans) before it may switch to a generic plan.
+        """
+        return (self.planning_ms or 0.0) * self.reuses
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the statistics as a plain dictionary."""
+        return {
+            "executions": self.executions,
+            "prepares": self.prepares,
+            "reuses": self.reuses,
+            "planning_ms": self.planning_ms,
+            "planning_ms_saved": self.planning_ms_saved,
+        }
+
+
+class PreparedStatementCache:
+    """
+    Per-connection registry of prepared statements for psycopg2 connections.
+
+    A connection is only ever used by the thread holding it from the pool,
+    so registries need no locking; the shared statistics do.
+    """
+
+    def __init__(self, max_statements: int = 256, sample_planning: bool = True):
+        """
+        Initialize the cache.
+
+        Args:
+            max_statements: Prepared statements kept per connection (least recently used are deallocated)
+            sample_planning: Measure the planning time of each query type once, for the savings report
+        """
+        self.max_statements = max_statements
+        self.sample_planning = sample_planning
+        self._registries: Dict[int, Tuple[int, "OrderedDict[str, None]"]] = {}
+        self._statements: Dict[Tuple[str, str], Tuple[str, str, int]] = {}
+        self._stats: Dict[str, PreparedStatementStats] = {}
+        self._lock = threading.Lock()
+
+    def execute(self, cursor: Any, label: str, query: str, params: Optional[Sequence[Any]] = None) -> None:
+        """
+        Execute a query through a prepared statement on the cursor's connection.
+
+        Args:
+            cursor: psycopg2 cursor inside a transaction
+            label: Query type, used for the statement name and statistics
+            query: SQL query with ``%s`` placeholders
+            params: Query parameters
+
+        Raises:
+            ValueError: If the label is invalid or the parameter count does not match
+        """
+        name, server_query, count = self._statement(label, query)
+        params = tuple(params or ())
+        if len(params) != count:
+            raise ValueError(f"Query {label!r} expects {count} parameters, got {len(params)}")
+
+        conn = cursor.connection
+        registry = self._registry(conn)
+        stats = self._label_stats(label)
+        if name in registry:
+            registry.move_to_end(name)
+        else:
+            if self.sample_planning and stats.planning_ms is None:
+                stats.planning_ms = self._planning_time(cursor, query, params)
+            cursor.execute(f"PREPARE {name} AS {server_query}")
+            registry[name] = None
+            with self._lock:
+                stats.prepares += 1
+            self._evict(cursor, registry)
+
+        execute = f"EXECUTE {name} ({', '.join(['%s'] * count)})" if count else f"EXECUTE {name}"
+        try:
+            cursor.execute(execute, params)
+        except errors.InvalidSqlStatementName:
+            # Dropped server-side; forget this connection's statements so the next call re-prepares
+            self.forget(conn)
+            raise
+        with self._lock:
+            stats.executions += 1
+
+    def forget(self, conn: Any) -> None:
+        """
+        Drop the registry of a connection (closed, recycled or reset).
+
+        Args:
+            conn: psycopg2 connection
+        """
+        self._registries.pop(id(conn), None)
+
+    def clear(self) -> None:
+        """Drop every connection registry (e.g. when the pool is closed)."""
+        self._registries.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Report usage and planning time saved per query type.
+
+        Returns:
+            Mapping of query label to statistics
+        """
+        with self._lock:
+            return {label: stats.as_dict() for label, stats in self._stats.items()}
+
+    def _statement(self, label: str, query: str) -> Tuple[str, str, int]:
+        statement = self._statements.get((label, query))
+        if statement is None:
+            if not _LABEL_PATTERN.match(label):
+                raise ValueError(f"Invalid prepared statement label: {label!r}")
+            server_query, count = to_server_placeholders(query)
+            digest = hashlib.md5(query.encode("utf-8")).hexdigest()[:12]
+            statement = (f"sdk_{label}_{digest}", server_query.strip().rstrip(";"), count)
+            self._statements[(label, query)] = statement
+        return statement
+
+    def _registry(self, conn: Any) -> "OrderedDict[str, None]":
+        # The backend PID changes when a connection is re-established, and
+        # guards against a recycled connection object reusing an id()
+        pid = conn.get_backend_pid()
+        entry = self._registries.get(id(conn))
+        if entry is None or entry[0] != pid:
+            entry = (pid, OrderedDict())
+            self._registries[id(conn)] = entry
+        return entry[1]
+
+    def _label_stats(self, label: str) -> PreparedStatementStats:
+        with self._lock:
+            stats = self._stats.get(label)
+            if stats is None:
+                stats = self._stats[label] = PreparedStatementStats(label=label)
+            return stats
+
+    def _evict(self, cursor: Any, registry: "OrderedDict[str, None]") -> None:
+        while len(registry) > self.max_statements:
+            name, _ = registry.popitem(last=False)
+            cursor.execute(f"DEALLOCATE {name}")
+
+    @staticmethod
+    def _planning_time(cursor: Any, query: str, params: tuple) -> Optional[float]:
+        """Plan the unprepared query once (without running it) and return its planning time."""
+        cursor.execute("SAVEPOINT sdk_plan_sample")
+        try:
+            cursor.execute("EXPLAIN (SUMMARY, FORMAT JSON) " + query, params)
+            row = cursor.fetchone()
+            cursor.execute("RELEASE SAVEPOINT sdk_plan_sample")
+        except Exception as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT sdk_plan_sample")
+            logger.debug(f"Could not sample planning time: {e}")
+            return None
+        plan = row.get("QUERY PLAN") if isinstance(row, dict) else (row[0] if row else None)
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan[0].get("Planning Time") if plan else None
+
+
+def execute_prepared(db: Any, cursor: Any, label: str, query: str, params: Optional[Sequence[Any]] = None) -> None:
+    """
+    Execute a query on a cursor, through a prepared statement when ``db`` supports it.
+
+    Falls back to a plain ``cursor.execute`` for connections without a
+    statement cache or with prepared statements disabled.
+
+    Args:
+        db: Database connection that owns the cursor
+        cursor: Cursor inside a transaction
+        label: Query type, used for the statement name and statistics
+        query: SQL query with ``%s`` placeholders
+        params: Query parameters
+    """
+    cache = getattr(db, "statement_cache", None)
+    if isinstance(cache, PreparedStatementCache):
+        db.execute_prepared(cursor, label, query, params)
+    else:
+        cursor.execute(query, params)
@@ -0,0 +1,238 @@
+"""
+Read Replica Routing
+
+Keeps one connection pool per streaming replica and picks a replica for
+read-only queries. Replicas are health-checked by a background thread every
+``check_interval`` seconds, so picking a replica only reads the last result and
+an unreachable replica never stalls a read on its connect timeout. A replica
+that is unreachable, not in recovery, or whose replay lag exceeds ``max_lag``
+seconds is skipped until its next check, and ``DatabaseConnection`` falls back
+to the primary when no replica qualifies.
+"""
+
+# Standard library imports
+import logging
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+# Third-party imports
+import psycopg2
+from psycopg2 import pool
+
+logger = logging.getLogger(__name__)
+
+# Seconds since the last replayed transaction; 0 when the replica has replayed
+# everything it received (an idle primary produces no new transactions).
+_REPLICA_LAG_SQL = """
+SELECT
+    pg_is_in_recovery() AS in_recovery,
+    CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END AS lag
+"""
+
+
+class _ConfiguredConnectionPool(pool.ThreadedConnectionPool):
+    """Threaded pool that passes every new connection to ``configure``."""
+
+    def __init__(self, minconn: int, maxconn: int, configure: Optional[Callable[[Any], None]] = None, **kwargs: Any):
+        self.configure = configure
+        super().__init__(minconn, maxconn, **kwargs)
+
+    def _connect(self, key=None):
+        conn = super()._connect(key)
+        if self.configure is not None:
+            self.configure(conn)
+        return conn
+
+
+class ReplicaPool:
+    """Connection pool and health state of one read replica."""
+
+    def __init__(
+        self,
+        dsn: str,
+        min_connections: int = 1,
+        max_connections: int = 10,
+        configure: Optional[Callable[[Any], None]] = None
+    ):
+        """
+        Initialize the replica pool (connections are opened on first use).
+
+        Args:
+            dsn: Replica connection string or ``postgresql://`` URL
+            min_connections: Minimum pooled connections
+            max_connections: Maximum pooled connections
+            configure: Called with every new connection (e.g. to register type casters)
+        """
+        self.dsn = dsn
+        self.min_connections = min_connections
+        self.max_connections = max_connections
+        self.configure = configure
+        self.connection_pool: Optional[pool.ThreadedConnectionPool] = None
+        self.healthy = False
+        self.lag: Optional[float] = None
+        self.last_checked = 0.0
+        self.last_error: Optional[str] = None
+
+    def check(self, max_lag: float) -> bool:
+        """
+        Measure replication lag and update the health state.
+
+        Args:
+            max_lag: Maximum acceptable replay lag in seconds
+
+        Returns:
+            True if the replica can serve reads
+        """
+        self.last_checked = time.monotonic()
+        try:
+            if self.connection_pool is None:
+                self.connection_pool = _ConfiguredConnectionPool(
+                    minconn=self.min_connections,
+                    maxconn=self.max_connections,
+                    configure=self.configure,
+                    dsn=self.dsn
+                )
+            conn = self.connection_pool.getconn()
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(_REPLICA_LAG_SQL)
+                    in_recovery, lag = cursor.fetchone()
+                conn.rollback()
+            finally:
+                self.connection_pool.putconn(conn, close=bool(conn.closed))
+        except psycopg2.Error as e:
+            self.healthy, self.lag, self.last_error = False, None, str(e)
+            logger.warning(f"Read replica unavailable: {e}")
+            return False
+
+        self.lag = float(lag or 0)
+        self.last_error = None
+        if not in_recovery:
+            # A promoted replica is a primary now; keep reads off it until reconfigured
+            self.healthy, self.last_error = False, "not in recovery"
+        else:
+            self.healthy = self.lag <= max_lag
+        if not self.healthy:
+            logger.info(f"Skipping read replica (in_recovery={in_recovery}, lag={self.lag:.1f}s)")
+        return self.healthy
+
+    def mark_unhealthy(self, error: Exception) -> None:
+        """Take the replica out of rotation until its next health check."""
+        self.healthy = False
+        self.last_error = str(error)
+
+    def close(self) -> None:
+        """Close the replica's pooled connections."""
+        if self.connection_pool:
+            self.connection_pool.closeall()
+            self.connection_pool = None
+        self.healthy = False
+
+
+class ReplicaSet:
+    """
+    Round-robin selection over healthy read replicas.
+    """
+
+    def __init__(
+        self,
+        dsns: List[str],
+        min_connections: int = 1,
+        max_connections: int = 10,
+        max_lag: float = 5.0,
+        check_interval: float = 10.0,
+        configure: Optional[Callable[[Any], None]] = None
+    ):
+        """
+        Initialize the replica set.
+
+        Args:
+            dsns: Replica connection strings
+            min_connections: Minimum pooled connections per replica
+            max_connections: Maximum pooled connections per replica
+            max_lag: Maximum replay lag (seconds) for a replica to serve reads
+            check_interval: Seconds between health checks of a replica
+            configure: Called with every new replica connection
+        """
+        self.replicas = [ReplicaPool(dsn, min_connections, max_connections, configure) for dsn in dsns]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._next = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._checker: Optional[threading.Thread] = None
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def choose(self) -> Optional[ReplicaPool]:
+        """
+        Pick a replica for a read from the last health checks.
+
+        Never runs a check itself; the first call starts the background
+        checker, and reads use the primary until a replica has passed a check.
+
+        Returns:
+            A healthy replica, or None when reads should go to the primary
+        """
+        self._ensure_checker()
+        with self._lock:
+            healthy = [replica for replica in self.replicas if replica.healthy]
+            if not healthy:
+                return None
+            self._next = (self._next + 1) % len(healthy)
+            return healthy[self._next]
+
+    def check_stale(self) -> None:
+        """Health-check every replica whose last check is older than ``check_interval``."""
+        now = time.monotonic()
+        for replica in self.replicas:
+            if now - replica.last_checked < self.check_interval:
+                continue
+            try:
+                replica.check(self.max_lag)
+            except Exception as e:
+                replica.mark_unhealthy(e)
+                logger.warning(f"Read replica health check failed: {e}")
+
+    def _ensure_checker(self) -> None:
+        if self._checker is not None:
+            return
+        with self._lock:
+            if self._checker is None:
+                self._checker = threading.Thread(
+                    target=self._check_loop, args=(self._stop,), name="replica-health-check", daemon=True
+                )
+                self._checker.start()
+
+    def _check_loop(self, stop: threading.Event) -> None:
+        while not stop.is_set():
+            self.check_stale()
+            stop.wait(self.check_interval)
+
+    def status(self) -> List[dict]:
+        """
+        Report the last known state of every replica.
+
+        Returns:
+            List of dictionaries with ``healthy``, ``lag`` and ``last_error``
+        """
+        return [
+            {"replica": index, "healthy": r.healthy, "lag": r.lag, "last_error": r.last_error}
+            for index, r in enumerate(self.replicas)
+        ]
+
+    def close(self) -> None:
+        """Stop the health checker and close every replica pool."""
+        with self._lock:
+            checker, self._checker = self._checker, None
+            self._stop.set()
+            self._stop = threading.Event()
+        if checker is not None:
+            checker.join(timeout=1.0)
+        for replica in self.replicas:
+            replica.close()
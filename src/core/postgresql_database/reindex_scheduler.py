@@ -0,0 +1,319 @@
+"""
+Vector Reindex Scheduler
+
+Decides when vector indexes actually need rebuilding instead of reindexing
+after every ingest. Change volume comes from ``pg_stat_user_tables``
+(inserted/updated/deleted rows since the last rebuild, per table or
+partition); IVFFlat indexes are also checked for list drift (``lists`` far
+from ``sqrt(rows)`` as the table grows). Rebuilds run only inside maintenance
+windows and within a concurrency budget, from a background thread.
+"""
+
+# Standard library imports
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+# Third-party imports
+from pydantic import BaseModel, Field
+
+# Local application/library specific imports
+from .vector_index_manager import VectorIndexManager
+
+logger = logging.getLogger(__name__)
+
+_VECTOR_INDEX_STATS_SQL = """
+SELECT
+    ic.relname AS index_name,
+    tc.relname AS table_name,
+    am.amname AS index_type,
+    pg_get_indexdef(i.indexrelid) AS indexdef,
+    s.n_live_tup AS live_rows,
+    s.n_tup_ins AS inserted,
+    s.n_tup_upd AS updated,
+    s.n_tup_del AS deleted
+FROM pg_index i
+JOIN pg_class ic ON ic.oid = i.indexrelid
+JOIN pg_class tc ON tc.oid = i.indrelid
+JOIN pg_am am ON am.oid = ic.relam
+JOIN pg_stat_user_tables s ON s.relid = i.indrelid
+WHERE am.amname IN ('hnsw', 'ivfflat')
+    AND (i.indrelid = %s::regclass
+         OR i.indrelid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = %s::regclass))
+ORDER BY ic.relname;
+"""
+
+_LISTS_PATTERN = re.compile(r"lists\s*=\s*'?(\d+)")
+
+
+class ReindexPolicy(BaseModel):
+    """Thresholds, windows and budget for scheduled vector reindexing."""
+    min_changed_rows: int = Field(default=10000, description="Ignore tables with fewer changed rows")
+    changed_fraction: float = Field(default=0.2, description="Changed rows relative to rows at last rebuild")
+    ivfflat_lists_drift: float = Field(default=2.0, description="Max ratio between lists and sqrt(rows)")
+    maintenance_windows: List[Tuple[int, int]] = Field(
+        default_factory=list,
+        description="UTC (start_hour, end_hour) ranges; empty means any time"
+    )
+    max_concurrent: int = Field(default=1, description="Rebuilds allowed at the same time")
+    max_per_run: int = Field(default=2, description="Rebuilds started per scheduler pass")
+    check_interval: float = Field(default=300.0, description="Seconds between background checks")
+    concurrently: bool = Field(default=True, description="Use REINDEX CONCURRENTLY")
+
+
+@dataclass
+class ReindexCandidate:
+    """An index whose table changed enough to need a rebuild."""
+    index_name: str
+    table_name: str
+    index_type: str
+    changed_rows: int
+    live_rows: int
+    reason: str
+    target_lists: Optional[int] = None
+
+
+@dataclass
+class _Baseline:
+    inserted: int
+    updated: int
+    deleted: int
+    live_rows: int
+
+
+class ReindexScheduler:
+    """
+    Rebuilds vector indexes only when drift crosses the policy thresholds.
+
+    Baselines are the ``pg_stat_user_tables`` counters when an index was first
+    seen or last rebuilt, so only changes made since then count.
+    """
+
+    def __init__(
+        self,
+        index_manager: VectorIndexManager,
+        table_name: str = "embeddings",
+        policy: Optional[ReindexPolicy] = None
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            index_manager: Index manager used to run rebuilds
+            table_name: Table (or partitioned parent) whose vector indexes are watched
+            policy: Reindex thresholds, windows and budget
+        """
+        self.index_manager = index_manager
+        self.db = index_manager.db
+        self.table_name = table_name
+        self.policy = policy or ReindexPolicy()
+        self._baselines: Dict[str, _Baseline] = {}
+        self._budget = threading.BoundedSemaphore(self.policy.max_concurrent)
+        self._lock = threading.Lock()
+        self._last_check = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.history: List[Dict[str, Any]] = []
+
+    def evaluate(self) -> List[ReindexCandidate]:
+        """
+        Compare current table statistics with the baselines.
+
+        Returns:
+            Indexes past a threshold, most changed first
+        """
+        rows = self.db.execute_query(_VECTOR_INDEX_STATS_SQL, (self.table_name, self.table_name)) or []
+        candidates = []
+        with self._lock:
+            for row in rows:
+                baseline = self._baselines.get(row["index_name"])
+                if baseline is None:
+                    self._baselines[row["index_name"]] = self._baseline_from(row)
+                    continue
+                candidate = self._check(row, baseline)
+                if candidate:
+                    candidates.append(candidate)
+        candidates.sort(key=lambda c: c.changed_rows, reverse=True)
+        return candidates
+
+    def in_maintenance_window(self, now: Optional[datetime] = None) -> bool:
+        """
+        Check whether rebuilds are allowed now.
+
+        Args:
+            now: Time to check (defaults to current UTC time)
+
+        Returns:
+            True inside a window, or always when no windows are configured
+        """
+        if not self.policy.maintenance_windows:
+            return True
+        hour = (now or datetime.now(timezone.utc)).hour
+        for start, end in self.policy.maintenance_windows:
+            if (start <= hour < end) if start <= end else (hour >= start or hour < end):
+                return True
+        return False
+
+    def run_pending(self, now: Optional[datetime] = None) -> List[str]:
+        """
+        Rebuild indexes past their thresholds, within the window and budget.
+
+        Args:
+            now: Time used for the maintenance-window check
+
+        Returns:
+            Names of the rebuilt indexes
+        """
+        self._last_check = time.monotonic()
+        if not self.in_maintenance_window(now):
+            return []
+
+        rebuilt = []
+        for candidate in self.evaluate()[:self.policy.max_per_run]:
+            if not self._budget.acquire(blocking=False):
+                logger.info("Reindex budget exhausted; deferring remaining rebuilds")
+                break
+            try:
+                self._rebuild(candidate)
+                rebuilt.append(candidate.index_name)
+            except Exception as e:
+                logger.warning(f"Scheduled reindex of {candidate.index_name} failed: {str(e)}")
+            finally:
+                self._budget.release()
+        return rebuilt
+
+    def notify_change(self) -> bool:
+        """
+        Hint that rows changed (e.g. after an ingest); cheap to call often.
+
+        Starts a background pass if ``check_interval`` has elapsed since the
+        last one; never blocks the caller on statistics queries or rebuilds.
+
+        Returns:
+            True if a background pass was started
+        """
+        with self._lock:
+            if time.monotonic() - self._last_check < self.policy.check_interval:
+                return False
+            self._last_check = time.monotonic()
+        threading.Thread(target=self._safe_run, name="vector-reindex-check", daemon=True).start()
+        return True
+
+    def start(self) -> None:
+        """Run scheduler passes every ``check_interval`` seconds in a daemon thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="vector-reindex-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background thread."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.policy.check_interval):
+            self._safe_run()
+
+    def _safe_run(self) -> None:
+        try:
+            self.run_pending()
+        except Exception as e:
+            logger.warning(f"Reindex scheduler pass failed: {str(e)}")
+
+    def _check(self, row: Dict[str, Any], baseline: _Baseline) -> Optional[ReindexCandidate]:
+        changed = (
+            (row["inserted"] - baseline.inserted)
+            + (row["updated"] - baseline.updated)
+            + (row["deleted"] - baseline.deleted)
+        )
+        live = row["live_rows"] or 0
+        candidate = ReindexCandidate(
+            index_name=row["index_name"],
+            table_name=row["table_name"],
+            index_type=row["index_type"],
+            changed_rows=changed,
+            live_rows=live,
+            reason=""
+        )
+
+        if row["index_type"] == "ivfflat":
+            match = _LISTS_PATTERN.search(row["indexdef"] or "")
+            if match:
+                lists = int(match.group(1))
+                target = max(100, int(live ** 0.5)) if live > 0 else 100
+                drift = max(lists / target, target / lists)
+                if drift >= self.policy.ivfflat_lists_drift:
+                    candidate.reason = f"ivfflat lists={lists} vs target {target}"
+                    candidate.target_lists = target
+                    return candidate
+
+        if changed >= self.policy.min_changed_rows and changed >= self.policy.changed_fraction * max(baseline.live_rows, 1):
+            candidate.reason = f"{changed} rows changed since last rebuild ({baseline.live_rows} rows then)"
+            return candidate
+        return None
+
+    def _rebuild(self, candidate: ReindexCandidate) -> None:
+        started = time.perf_counter()
+        if candidate.target_lists:
+            # REINDEX keeps the storage parameters; update lists first
+            self.db.execute_query(
+                f"ALTER INDEX {candidate.index_name} SET (lists = {int(candidate.target_lists)});",
+                fetch_all=False
+            )
+        self.index_manager.reindex(candidate.index_name, concurrently=self.policy.concurrently)
+        elapsed = time.perf_counter() - started
+
+        rows = self.db.execute_query(_VECTOR_INDEX_STATS_SQL, (self.table_name, self.table_name)) or []
+        with self._lock:
+            for row in rows:
+                if row["index_name"] == candidate.index_name:
+                    self._baselines[candidate.index_name] = self._baseline_from(row)
+        self.history.append({
+            "index_name": candidate.index_name,
+            "reason": candidate.reason,
+            "changed_rows": candidate.changed_rows,
+            "elapsed": elapsed,
+            "at": datetime.now(timezone.utc).isoformat(),
+        })
+        logger.info(f"Rebuilt {candidate.index_name} in {elapsed:.1f}s ({candidate.reason})")
+
+    @staticmethod
+    def _baseline_from(row: Dict[str, Any]) -> _Baseline:
+        return _Baseline(
+            inserted=row["inserted"] or 0,
+            updated=row["updated"] or 0,
+            deleted=row["deleted"] or 0,
+            live_rows=row["live_rows"] or 0
+        )
+
+
+def create_reindex_scheduler(
+    index_manager: VectorIndexManager,
+    table_name: str = "embeddings",
+    policy: Optional[ReindexPolicy] = None,
+    start: bool = False
+) -> ReindexScheduler:
+    """
+    Create a reindex scheduler.
+
+    Args:
+        index_manager: Index manager used to run rebuilds
+        table_name: Table (or partitioned parent) to watch
+        policy: Reindex thresholds, windows and budget
+        start: Start the background thread immediately
+
+    Returns:
+        ReindexScheduler instance
+    """
+    scheduler = ReindexScheduler(index_manager, table_name=table_name, policy=policy)
+    if start:
+        scheduler.start()
+    return scheduler
@@ -0,0 +1,77 @@
+"""
+Record Batch Conversion
+
+Turns batches of rows fetched from a server-side cursor into column-oriented
+NumPy or Arrow record batches for ``DatabaseConnection.stream_batches``.
+pgvector columns (decoded to float32 arrays by the vector adapters) become
+2-D float32 matrices, or Arrow fixed-size lists.
+"""
+
+# Standard library imports
+from typing import Any, Dict, List, Sequence
+
+# Third-party imports
+import numpy as np
+
+try:
+    import pyarrow as pa  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    pa = None
+
+BATCH_FORMATS = ("rows", "numpy", "arrow")
+
+
+def _is_vector_column(values: Sequence[Any]) -> bool:
+    return bool(values) and all(isinstance(v, np.ndarray) and v.ndim == 1 for v in values) \
+        and len({v.shape[0] for v in values}) == 1
+
+
+def _numpy_column(values: List[Any]) -> np.ndarray:
+    if _is_vector_column(values):
+        return np.stack(values).astype(np.float32, copy=False)
+    if any(v is None for v in values) or any(isinstance(v, (dict, list)) for v in values):
+        column = np.empty(len(values), dtype=object)
+        column[:] = values
+        return column
+    return np.asarray(values)
+
+
+def to_numpy_batch(columns: Sequence[str], rows: Sequence[Sequence[Any]]) -> Dict[str, np.ndarray]:
+    """
+    Convert a batch of tuple rows into a dictionary of NumPy columns.
+
+    Args:
+        columns: Column names, in row order
+        rows: Rows as tuples
+
+    Returns:
+        Mapping of column name to array (vector columns as ``(n, dim)`` float32)
+    """
+    return {name: _numpy_column([row[i] for row in rows]) for i, name in enumerate(columns)}
+
+
+def to_arrow_batch(columns: Sequence[str], rows: Sequence[Sequence[Any]]) -> Any:
+    """
+    Convert a batch of tuple rows into a ``pyarrow.RecordBatch``.
+
+    Args:
+        columns: Column names, in row order
+        rows: Rows as tuples
+
+    Returns:
+        pyarrow.RecordBatch (vector columns as fixed-size float32 lists)
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    if pa is None:
+        raise ImportError("pyarrow package is required for Arrow record batches")
+    arrays = []
+    for i in range(len(columns)):
+        values = [row[i] for row in rows]
+        if _is_vector_column(values):
+            matrix = np.stack(values).astype(np.float32, copy=False)
+            arrays.append(pa.FixedSizeListArray.from_arrays(pa.array(matrix.ravel()), matrix.shape[1]))
+        else:
+            arrays.append(pa.array(values))
+    return pa.RecordBatch.from_arrays(arrays, names=list(columns))
@@ -0,0 +1,160 @@
+"""
+pgvector Type Adapters
+
+Registers driver adapters so vectors travel as NumPy float32 arrays instead of
+hand-built ``'[0.1,0.2,...]'`` strings:
+
+- psycopg 3 (``AsyncDatabaseConnection``): ``to_vector`` arrays are sent as binary
+  ``vector`` parameters and ``vector`` columns are decoded with
+  ``np.frombuffer`` (binary results) or ``np.fromstring`` (text results).
+- psycopg2 (``DatabaseConnection``): the driver only speaks text, so arrays
+  from ``to_vector`` are rendered as vector literals and ``vector`` columns are
+  parsed in C by NumPy.
+
+Nothing is installed process-wide: only ``Vector`` arrays (from ``to_vector``)
+are sent as vectors, and the result typecasters are registered on the pools'
+own connections, so other NumPy parameters and queries are unaffected.
+"""
+
+# Standard library imports
+import logging
+import struct
+from typing import Any, Optional, Sequence
+
+# Third-party imports
+import numpy as np
+from psycopg2.extensions import QuotedString, new_type, register_adapter, register_type
+
+try:
+    from psycopg.adapt import Dumper, Loader  # type: ignore
+    from psycopg.pq import Format  # type: ignore
+    from psycopg.types import TypeInfo  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    Dumper = Loader = object
+    Format = None
+    TypeInfo = None
+
+logger = logging.getLogger(__name__)
+
+_VECTOR_HEADER = struct.Struct(">HH")  # dimensions, unused
+
+
+class Vector(np.ndarray):
+    """float32 NumPy array marked to be sent as a pgvector ``vector`` parameter."""
+
+
+def to_vector(embedding: Sequence[float]) -> Vector:
+    """
+    Convert an embedding (list or array) to the float32 array the adapters send as ``vector``.
+
+    Args:
+        embedding: Embedding values
+
+    Returns:
+        1-D float32 ``Vector`` array
+    """
+    return np.asarray(embedding, dtype=np.float32).view(Vector)
+
+
+def _parse_vector_text(value: str) -> np.ndarray:
+    """Parse pgvector's text output (``[1,2,3]``) into a float32 array."""
+    return np.fromstring(value[1:-1], dtype=np.float32, sep=",")
+
+
+# ---------------------------------------------------------------------------
+# psycopg2 (text protocol)
+# ---------------------------------------------------------------------------
+
+def _adapt_vector(vector: Vector) -> Any:
+    """Render a ``to_vector`` array as a vector literal."""
+    return QuotedString("[" + ",".join(map(str, np.asarray(vector).ravel())) + "]")
+
+
+# Scoped to the Vector marker type; plain ndarrays keep psycopg2's default handling
+register_adapter(Vector, _adapt_vector)
+
+
+def _cast_vector(value: Optional[str], cursor: Any) -> Optional[np.ndarray]:
+    if value is None:
+        return None
+    return _parse_vector_text(value)
+
+
+def register_vector_types(conn: Any, oid: Optional[int] = None) -> Optional[int]:
+    """
+    Register the ``vector`` result typecaster on one psycopg2 connection.
+
+    Args:
+        conn: psycopg2 connection
+        oid: Known ``vector`` type OID (looked up on ``conn`` when None)
+
+    Returns:
+        The type OID, or None if the pgvector extension is not installed
+    """
+    if oid is None:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT to_regtype('vector')::oid")
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+            conn.rollback()
+        oid = row[0] if row else None
+    if not oid:
+        return None
+    register_type(new_type((oid,), "VECTOR", _cast_vector), conn)
+    return oid
+
+
+# ---------------------------------------------------------------------------
+# psycopg 3 (binary protocol)
+# ---------------------------------------------------------------------------
+
+class _VectorBinaryDumper(Dumper):
+    """Send ``to_vector`` arrays as binary ``vector`` parameters."""
+
+    format = Format.BINARY if Format is not None else None
+
+    def dump(self, obj: Any) -> bytes:
+        values = np.asarray(obj, dtype=">f4")
+        return _VECTOR_HEADER.pack(values.shape[0], 0) + values.tobytes()
+
+
+class _VectorBinaryLoader(Loader):
+    """Decode binary ``vector`` columns into float32 arrays."""
+
+    format = Format.BINARY if Format is not None else None
+
+    def load(self, data: Any) -> np.ndarray:
+        dim, _ = _VECTOR_HEADER.unpack_from(data)
+        # View the big-endian payload in place; the one copy converts to native order
+        return np.frombuffer(data, dtype=">f4", count=dim, offset=_VECTOR_HEADER.size).astype(np.float32)
+
+
+class _VectorTextLoader(Loader):
+    """Decode text ``vector`` columns into float32 arrays."""
+
+    def load(self, data: Any) -> np.ndarray:
+        return _parse_vector_text(bytes(data).decode())
+
+
+async def register_vector_types_async(conn: Any) -> None:
+    """
+    Register ``vector`` adapters on a psycopg 3 async connection.
+
+    Used as the ``configure`` hook of ``AsyncConnectionPool``, so every pooled
+    connection gets the adapters once when it is created.
+
+    Args:
+        conn: psycopg 3 async connection
+    """
+    info = await TypeInfo.fetch(conn, "vector")
+    await conn.commit()
+    if info is None:
+        logger.warning("pgvector extension not installed; vector adapters not registered")
+        return
+
+    dumper = type("VectorBinaryDumper", (_VectorBinaryDumper,), {"oid": info.oid})
+    conn.adapters.register_dumper(Vector, dumper)
+    conn.adapters.register_loader(info.oid, _VectorBinaryLoader)
+    conn.adapters.register_loader(info.oid, _VectorTextLoader)
@@ -4,6 +4,6 @@ Vector Database
 Vector database operations using pgvector.
 """
 
-from ..vector_operations import VectorOperations
+from ..vector_operations import AsyncVectorOperations, VectorOperations
 
-__all__ = ["VectorOperations"]
+__all__ = ["VectorOperations", "AsyncVectorOperations"]
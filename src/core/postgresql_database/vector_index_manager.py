@@ -7,11 +7,13 @@ monitoring, and reindexing of IVFFlat and HNSW indexes.
 
 # Standard library imports
 import logging
+import re
 from enum import Enum
 from typing import Any, Dict, List, Optional, Tuple
 
 # Local application/library specific imports
 from .connection import DatabaseConnection
+from .filter_compiler import _check_key
 
 
 class DatabaseError(Exception):
@@ -48,6 +50,43 @@ class IndexDistance(str, Enum):
     INNER_PRODUCT = "inner_product"
 
 
+class QuantizationMode(str, Enum):
+    """
+    How the vector index stores embeddings.
+
+    The full-precision ``vector`` column is kept in the table either way; a
+    quantized mode only indexes a compact expression of it, and searches
+    re-rank the index candidates against the full-precision vectors.
+    """
+    NONE = "none"        # Index the float32 vectors
+    HALFVEC = "halfvec"  # Index ``embedding::halfvec(dim)`` (float16, half the size)
+    BINARY = "binary"    # Index ``binary_quantize(embedding)::bit(dim)`` (1 bit per dimension, Hamming)
+
+
+def quantized_expression(column_name: str, quantization: QuantizationMode, dimension: Optional[int]) -> str:
+    """
+    SQL expression indexed (and searched) for a quantization mode.
+
+    Args:
+        column_name: Full-precision vector column (may be qualified, e.g. ``e.embedding``)
+        quantization: Quantization mode
+        dimension: Vector dimension (required by the ``halfvec``/``bit`` casts)
+
+    Returns:
+        SQL expression
+
+    Raises:
+        ValueError: If a quantized mode is used without a dimension
+    """
+    if quantization == QuantizationMode.NONE:
+        return column_name
+    if not dimension:
+        raise ValueError(f"{quantization.value} quantization requires the vector dimension")
+    if quantization == QuantizationMode.HALFVEC:
+        return f"({column_name}::halfvec({int(dimension)}))"
+    return f"(binary_quantize({column_name})::bit({int(dimension)}))"
+
+
 class VectorIndexManager:
     """
     Manages vector indexes for optimal search performance.
@@ -74,7 +113,9 @@ class VectorIndexManager:
         lists: Optional[int] = None,  # For IVFFlat
         m: Optional[int] = None,  # For HNSW
         ef_construction: Optional[int] = None,  # For HNSW
-        tenant_id: Optional[str] = None
+        tenant_id: Optional[str] = None,
+        quantization: QuantizationMode = QuantizationMode.NONE,
+        dimension: Optional[int] = None
     ) -> bool:
         """
         Create a vector index on the specified table and column.
@@ -88,14 +129,21 @@ class VectorIndexManager:
             m: M parameter for HNSW (default: 16)
             ef_construction: ef_construction for HNSW (default: 64)
             tenant_id: Optional tenant ID for multi-tenancy
+            quantization: Index a ``halfvec`` or binary (Hamming) expression of
+                the column instead of the float32 vectors
+            dimension: Vector dimension (required for quantized indexes)
         
         Returns:
             True if index created successfully
         
         Raises:
             DatabaseError: If index creation fails
+            ValueError: If a quantized index is requested without a dimension
         """
         index_name = self._get_index_name(table_name, column_name, index_type, tenant_id)
+        if quantization != QuantizationMode.NONE:
+            index_name = f"{index_name}_{quantization.value}"
+        indexed = quantized_expression(column_name, quantization, dimension)
         
         # Check if index already exists
         if self.index_exists(index_name):
@@ -114,30 +162,27 @@ class VectorIndexManager:
             ef_construction = ef_construction or 64
         
         # Build index creation query
-        if index_type == IndexType.IVFFLAT:
+        if quantization == QuantizationMode.BINARY:
+            opclass = "bit_hamming_ops"  # Distance applies when re-ranking, not to the bit codes
+        else:
+            prefix = "halfvec" if quantization == QuantizationMode.HALFVEC else "vector"
             if distance == IndexDistance.COSINE:
-                opclass = "vector_cosine_ops"
+                opclass = f"{prefix}_cosine_ops"
             elif distance == IndexDistance.L2:
-                opclass = "vector_l2_ops"
+                opclass = f"{prefix}_l2_ops"
             else:  # inner_product
-                opclass = "vector_ip_ops"
-            
+                opclass = f"{prefix}_ip_ops"
+        
+        if index_type == IndexType.IVFFLAT:
             query = f"""
             CREATE INDEX IF NOT EXISTS {index_name}
-            ON {table_name} USING ivfflat ({column_name} {opclass})
+            ON {table_name} USING ivfflat ({indexed} {opclass})
             WITH (lists = {lists});
             """
         else:  # HNSW
-            if distance == IndexDistance.COSINE:
-                opclass = "vector_cosine_ops"
-            elif distance == IndexDistance.L2:
-                opclass = "vector_l2_ops"
-            else:  # inner_product
-                opclass = "vector_ip_ops"
-            
             query = f"""
             CREATE INDEX IF NOT EXISTS {index_name}
-            ON {table_name} USING hnsw ({column_name} {opclass})
+            ON {table_name} USING hnsw ({indexed} {opclass})
             WITH (m = {m}, ef_construction = {ef_construction});
             """
         
@@ -156,6 +201,101 @@ class VectorIndexManager:
             logger.error(error_msg)
             raise DatabaseError(message=error_msg, operation="create_index", original_error=e)
     
+    def create_metadata_index(
+        self,
+        table_name: str = "documents",
+        column_name: str = "metadata",
+        opclass: str = "jsonb_path_ops"
+    ) -> bool:
+        """
+        Create a GIN index serving metadata equality and ``$in`` filters.
+        
+        The filter compiler emits JSONB containment (``metadata @> ...``),
+        which ``jsonb_path_ops`` indexes compactly.
+        
+        Args:
+            table_name: Table with the JSONB column
+            column_name: JSONB metadata column
+            opclass: GIN operator class (``jsonb_path_ops`` or ``jsonb_ops``)
+        
+        Returns:
+            True if index created successfully
+        
+        Raises:
+            DatabaseError: If index creation fails
+        """
+        index_name = f"{table_name}_{column_name}_gin_idx"
+        query = f"""
+        CREATE INDEX IF NOT EXISTS {index_name}
+        ON {table_name} USING gin ({column_name} {opclass});
+        """
+        return self._create_auxiliary_index(index_name, query)
+    
+    def create_metadata_key_index(
+        self,
+        key: str,
+        numeric: bool = True,
+        table_name: str = "documents",
+        column_name: str = "metadata"
+    ) -> bool:
+        """
+        Create a partial expression index serving range filters on one metadata key.
+        
+        Indexes ``(metadata->>'key')`` (cast to numeric when ``numeric``), the
+        exact expression the filter compiler emits, only for rows that have the key.
+        
+        Args:
+            key: Metadata key
+            numeric: Index the value as numeric (numeric range filters) or as text
+            table_name: Table with the JSONB column
+            column_name: JSONB metadata column
+        
+        Returns:
+            True if index created successfully
+        
+        Raises:
+            DatabaseError: If index creation fails
+        """
+        key = _check_key(key)
+        expression = f"({column_name}->>'{key}')"
+        if numeric:
+            expression = f"{expression}::numeric"
+        index_name = f"{table_name}_{column_name}_{re.sub(r'[^A-Za-z0-9_]', '_', key)}_idx"
+        query = f"""
+        CREATE INDEX IF NOT EXISTS {index_name}
+        ON {table_name} (({expression}))
+        WHERE {column_name} ? '{key}';
+        """
+        return self._create_auxiliary_index(index_name, query)
+    
+    def create_tenant_index(self, table_name: str = "documents") -> bool:
+        """
+        Create a B-tree index on ``tenant_id`` for tenant filters.
+        
+        Args:
+            table_name: Table with the ``tenant_id`` column
+        
+        Returns:
+            True if index created successfully
+        
+        Raises:
+            DatabaseError: If index creation fails
+        """
+        index_name = f"{table_name}_tenant_id_idx"
+        query = f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} (tenant_id);"
+        return self._create_auxiliary_index(index_name, query)
+    
+    def _create_auxiliary_index(self, index_name: str, query: str) -> bool:
+        """Run a filter-support index DDL statement."""
+        try:
+            self.db.execute_query(query, fetch_all=False)
+            logger.info(f"Created filter index {index_name}")
+            return True
+        except Exception as e:
+            error_msg = f"Failed to create index {index_name}: {str(e)}"
+            logger.error(error_msg)
+            raise DatabaseError(message=error_msg, operation="create_index", original_error=e)
+    
     def index_exists(self, index_name: str) -> bool:
         """
         Check if an index exists.
@@ -271,12 +411,12 @@ class VectorIndexManager:
         
         try:
             if concurrently:
-                # CONCURRENTLY requires separate transaction
                 query = f"REINDEX INDEX CONCURRENTLY {index_name};"
             else:
                 query = f"REINDEX INDEX {index_name};"
             
-            self.db.execute_query(query)
+            # REINDEX returns no rows, and CONCURRENTLY is rejected inside a transaction block
+            self.db.execute_autocommit(query)
             logger.info(f"Reindexed {index_name} (concurrent: {concurrently})")
             return True
         except Exception as e:
@@ -315,6 +455,69 @@ class VectorIndexManager:
         
         return reindexed
     
+    def list_partitions(self, table_name: str = "embeddings") -> List[Dict[str, Any]]:
+        """
+        List the partitions of a partitioned table.
+        
+        Args:
+            table_name: Partitioned (parent) table
+        
+        Returns:
+            List of dictionaries with ``partition``, ``bound`` and estimated ``rows``
+        """
+        query = """
+        SELECT
+            c.relname AS partition,
+            pg_get_expr(c.relpartbound, c.oid) AS bound,
+            c.reltuples::bigint AS rows
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = %s::regclass
+        ORDER BY c.relname;
+        """
+        return self.db.execute_query(query, (table_name,)) or []
+    
+    def get_tenant_partition(self, tenant_id: str, table_name: str = "embeddings") -> Optional[str]:
+        """
+        Find the partition holding a tenant's rows (LIST or HASH layout).
+        
+        Args:
+            tenant_id: Tenant ID
+            table_name: Partitioned (parent) table
+        
+        Returns:
+            Partition name, or None if the tenant has no rows
+        """
+        query = f"SELECT tableoid::regclass::text AS partition FROM {table_name} WHERE tenant_id = %s LIMIT 1;"
+        result = self.db.execute_query(query, (tenant_id,), fetch_one=True)
+        return result.get("partition") if result else None
+    
+    def reindex_tenant(
+        self,
+        tenant_id: str,
+        table_name: str = "embeddings",
+        concurrently: bool = True
+    ) -> List[str]:
+        """
+        Rebuild only the vector indexes of one tenant's partition.
+        
+        Other tenants' partitions (and their indexes) are untouched, so a
+        rebuild for one tenant does not lock out the rest.
+        
+        Args:
+            tenant_id: Tenant ID
+            table_name: Partitioned (parent) table
+            concurrently: Whether to rebuild concurrently
+        
+        Returns:
+            List of reindexed index names
+        """
+        partition = self.get_tenant_partition(tenant_id, table_name)
+        if partition is None:
+            logger.info(f"No partition with rows for tenant {tenant_id} in {table_name}")
+            return []
+        return self.reindex_table(partition, concurrently=concurrently)
+    
     def drop_index(self, index_name: str, if_exists: bool = True) -> bool:
         """
         Drop an index.
@@ -348,9 +551,12 @@ class VectorIndexManager:
         tenant_id: Optional[str] = None
     ) -> bool:
         """
-        Automatically reindex when embeddings change significantly.
+        Reindex immediately after embeddings change.
         
-        This should be called after bulk embedding updates or model changes.
+        Rebuilds every vector index on the table unconditionally; for routine
+        ingestion use ``ReindexScheduler``, which rebuilds only past drift
+        thresholds and inside maintenance windows. Reserve this for explicit
+        events such as an embedding model change.
         
         Args:
             table_name: Name of the embeddings table
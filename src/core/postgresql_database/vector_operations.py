@@ -4,21 +4,384 @@ Vector Operations with pgvector
 Provides functions for similarity search and vector operations using pgvector.
 """
 
-from typing import List, Dict, Any, Optional, Tuple
+import json
+import logging
+import struct
+import time
+from dataclasses import dataclass, replace
+from typing import List, Dict, Any, Iterator, Optional, Sequence, Tuple, TYPE_CHECKING
+
+import numpy as np
+from psycopg2.extras import RealDictCursor
+
 from .connection import DatabaseConnection
+from .filter_compiler import compile_filters
+from .prepared_statements import execute_prepared
+from .vector_index_manager import QuantizationMode, quantized_expression
+from .vector_adapter import to_vector
+
+if TYPE_CHECKING:
+    from .async_connection import AsyncDatabaseConnection
+
+logger = logging.getLogger(__name__)
+
+
+_INSERT_EMBEDDING_SQL = """
+INSERT INTO embeddings (document_id, embedding, model)
+VALUES (%s, %s::vector, %s)
+RETURNING id;
+"""
+
+# Tenant-partitioned layout (see partitioning.py): the partition key is copied
+# from the document so inserts are routed without changing callers
+_PARTITIONED_INSERT_EMBEDDING_SQL = """
+WITH v (document_id, embedding, model) AS (VALUES (%s, %s::vector, %s))
+INSERT INTO embeddings (document_id, tenant_id, embedding, model)
+SELECT v.document_id, COALESCE(d.tenant_id, ''), v.embedding, v.model
+FROM v LEFT JOIN documents d ON d.id = v.document_id
+RETURNING id;
+"""
+_PARTITIONED_BATCH_INSERT_SQL = """
+INSERT INTO embeddings (document_id, tenant_id, embedding, model)
+SELECT v.document_id, COALESCE(d.tenant_id, ''), v.embedding::vector, v.model
+FROM (VALUES %s) AS v (document_id, embedding, model)
+LEFT JOIN documents d ON d.id = v.document_id
+"""
+
+
+# Binary COPY (https://www.postgresql.org/docs/current/sql-copy.html#id-1.9.3.55.9.4):
+# signature, flags and header-extension length, then one tuple per row, then -1.
+_COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+_COPY_TRAILER = struct.pack(">h", -1)
+_COPY_EMBEDDINGS_SQL = "COPY embeddings (document_id, embedding, model) FROM STDIN WITH (FORMAT binary)"
+# Partitioned layout: COPY into a session-local staging table, then route by tenant
+_COPY_STAGE_SQL = "COPY embeddings_stage (document_id, embedding, model) FROM STDIN WITH (FORMAT binary)"
+_CREATE_STAGE_SQL = (
+    "CREATE TEMP TABLE IF NOT EXISTS embeddings_stage "
+    "(document_id {id_type}, embedding vector, model TEXT) ON COMMIT DELETE ROWS"
+)
+_FLUSH_STAGE_SQL = """
+INSERT INTO embeddings (document_id, tenant_id, embedding, model)
+SELECT s.document_id, COALESCE(d.tenant_id, ''), s.embedding, s.model
+FROM embeddings_stage s LEFT JOIN documents d ON d.id = s.document_id
+"""
+_COPY_ENCODE_BATCH = 512  # rows encoded per buffer handed to the server
+_COPY_READ_SIZE = 1 << 16
+
+# Binary COPY needs the exact integer width of document_id
+_DOCUMENT_ID_TYPE_SQL = """
+SELECT format_type(a.atttypid, a.atttypmod) AS type
+FROM pg_attribute a
+WHERE a.attrelid = 'embeddings'::regclass
+    AND a.attname = 'document_id'
+    AND NOT a.attisdropped;
+"""
+_DOCUMENT_ID_FORMATS = {"smallint": "h", "integer": "i", "bigint": "q"}
+
+
+def _document_id_format(type_name: Optional[str]) -> str:
+    """Map the document_id column type to a struct format character."""
+    if type_name not in _DOCUMENT_ID_FORMATS:
+        raise ValueError(f"Binary COPY does not support document_id type: {type_name}")
+    return _DOCUMENT_ID_FORMATS[type_name]
+
+
+def _as_float32_matrix(embeddings: Any) -> np.ndarray:
+    """Coerce embeddings (ndarray or list of lists) to a 2-D float32 matrix."""
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    if matrix.ndim != 2:
+        raise ValueError("embeddings must be a 2-D array of shape (rows, dimensions)")
+    return matrix
+
+
+def _encode_copy_rows(
+    document_ids: Sequence[int],
+    matrix: np.ndarray,
+    model: str,
+    id_format: str
+) -> bytes:
+    """
+    Encode rows as binary COPY tuples.
+
+    The vector field uses pgvector's binary representation (int16 dimensions,
+    int16 unused, float4 values, all big-endian); the byte swap is done once
+    for the whole block by NumPy.
+    """
+    dim = matrix.shape[1]
+    big_endian = matrix.astype(">f4")
+    row_prefix = struct.Struct(">hi" + id_format)  # field count, id length, id
+    id_size = struct.calcsize(">" + id_format)
+    vector_header = struct.pack(">iHH", 4 + 4 * dim, dim, 0)
+    model_bytes = model.encode("utf-8")
+    model_field = struct.pack(">i", len(model_bytes)) + model_bytes
+
+    parts = []
+    for doc_id, vector in zip(document_ids, big_endian):
+        parts.append(row_prefix.pack(3, id_size, int(doc_id)))
+        parts.append(vector_header)
+        parts.append(vector.tobytes())
+        parts.append(model_field)
+    return b"".join(parts)
+
+
+def _copy_payload(
+    document_ids: Sequence[int],
+    matrix: np.ndarray,
+    model: str,
+    id_format: str
+) -> Iterator[bytes]:
+    """Yield a complete binary COPY stream in bounded buffers."""
+    yield _COPY_HEADER
+    for offset in range(0, len(matrix), _COPY_ENCODE_BATCH):
+        end = offset + _COPY_ENCODE_BATCH
+        yield _encode_copy_rows(document_ids[offset:end], matrix[offset:end], model, id_format)
+    yield _COPY_TRAILER
+
+
+class _CopyStream:
+    """File-like reader over a byte iterator, for psycopg2 ``copy_expert``."""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._view = memoryview(b"")
+        self._pos = 0
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            data = bytes(self._view[self._pos:]) + b"".join(self._chunks)
+            self._view, self._pos = memoryview(b""), 0
+            return data
+        while self._pos >= len(self._view):
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return b""
+            self._view, self._pos = memoryview(chunk), 0
+        data = self._view[self._pos:self._pos + size]
+        self._pos += len(data)
+        return bytes(data)
+
+
+def _load_stats(rows: int, chunks: int, started: float) -> Dict[str, float]:
+    elapsed = time.perf_counter() - started
+    stats = {
+        "rows": rows,
+        "chunks": chunks,
+        "elapsed": elapsed,
+        "rows_per_sec": rows / elapsed if elapsed > 0 else float(rows),
+    }
+    logger.info(f"Bulk loaded {rows} embeddings in {elapsed:.2f}s ({stats['rows_per_sec']:.0f} rows/sec)")
+    return stats
+
+
+@dataclass
+class SearchParams:
+    """
+    Per-query ANN index settings, applied with ``SET LOCAL`` semantics.
+
+    Attributes:
+        ef_search: HNSW candidate list size (``hnsw.ef_search``); higher = better recall, slower
+        probes: IVFFlat lists probed (``ivfflat.probes``); higher = better recall, slower
+        iterative_scan: pgvector >= 0.8 iterative index scans (``"relaxed_order"`` or
+            ``"strict_order"``), so filtered searches keep scanning the index until
+            ``limit`` rows pass the filter
+    """
+    ef_search: Optional[int] = None
+    probes: Optional[int] = None
+    iterative_scan: Optional[str] = None
+
+    def settings(self) -> List[Tuple[str, str]]:
+        """Return the (GUC name, value) pairs to set for this query."""
+        settings = []
+        if self.ef_search is not None:
+            settings.append(("hnsw.ef_search", str(self.ef_search)))
+        if self.probes is not None:
+            settings.append(("ivfflat.probes", str(self.probes)))
+        if self.iterative_scan is not None:
+            settings.append(("hnsw.iterative_scan", self.iterative_scan))
+            settings.append(("ivfflat.iterative_scan", self.iterative_scan))
+        return settings
+
+
+_SET_LOCAL_SQL = "SELECT set_config(%s, %s, true)"
+
+# pgvector's upper bound for hnsw.ef_search
+_MAX_EF_SEARCH = 1000
+
+
+def _check_quantization(
+    quantization: QuantizationMode,
+    dimension: Optional[int],
+    rerank_factor: int
+) -> Tuple[QuantizationMode, Optional[int], int]:
+    """Validate quantized-search options."""
+    quantization = QuantizationMode(quantization)
+    if quantization != QuantizationMode.NONE and not dimension:
+        raise ValueError(f"{quantization.value} quantization requires the vector dimension")
+    if rerank_factor < 1:
+        raise ValueError("rerank_factor must be at least 1")
+    return quantization, dimension, rerank_factor
+
+
+def _query_options(ops: Any, limit: int) -> Dict[str, Any]:
+    """``_similarity_query`` layout options of a (sync or async) VectorOperations."""
+    return {
+        "partitioned": ops.partitioned,
+        "quantization": ops.quantization,
+        "dimension": ops.dimension,
+        "candidates": limit * ops.rerank_factor,
+    }
+
+
+def _candidate_search_params(
+    search_params: SearchParams,
+    quantization: QuantizationMode,
+    candidates: int
+) -> SearchParams:
+    """Raise ``ef_search`` so an HNSW scan can return all re-rank candidates."""
+    if quantization == QuantizationMode.NONE:
+        return search_params
+    if search_params.ef_search is not None and search_params.ef_search >= candidates:
+        return search_params
+    return replace(search_params, ef_search=min(candidates, _MAX_EF_SEARCH))
+
+
+def _similarity_query(
+    query_embedding: List[float],
+    limit: int,
+    threshold: float,
+    model: Optional[str],
+    filters: Optional[Dict[str, Any]] = None,
+    partitioned: bool = False,
+    quantization: QuantizationMode = QuantizationMode.NONE,
+    dimension: Optional[int] = None,
+    candidates: Optional[int] = None
+) -> Tuple[str, tuple]:
+    """
+    Build the cosine similarity search query and its parameters.
+
+    The inner query is a plain ``ORDER BY embedding <=> q LIMIT k`` over
+    ``embeddings`` so the planner can serve it from an HNSW/IVFFlat index;
+    putting the similarity threshold in that WHERE clause would force a
+    sequential scan. The threshold is applied to the nearest rows afterwards
+    (equivalent, since similarity decreases with distance) and documents are
+    joined only for the surviving rows. The query vector is bound once.
+
+    Metadata/tenant filters are compiled into the inner query, so ``LIMIT``
+    counts only matching rows. With the tenant-partitioned layout the tenant
+    filter is placed on ``embeddings.tenant_id`` (the partition key), so the
+    scan is pruned to that tenant's partition and its HNSW index.
+
+    In a quantized mode the inner query orders by the indexed ``halfvec`` or
+    binary expression (Hamming distance ``<~>`` for bits) and keeps
+    ``candidates`` rows; those are re-ranked by exact cosine distance against
+    the full-precision ``embedding`` column before ``LIMIT``.
+    """
+    conditions, partition_params = [], ()
+    if partitioned and filters and "tenant_id" in filters:
+        filters = dict(filters)
+        conditions.append("e.tenant_id = %s")
+        partition_params = (filters.pop("tenant_id"),)
+    filter_sql, filter_params = compile_filters(filters)
+    conditions += (["e.model = %s"] if model else []) + ([filter_sql] if filter_sql else [])
+    where = "WHERE " + " AND ".join(conditions) if conditions else ""
+    join = "JOIN documents d ON e.document_id = d.id" if filter_sql else ""
+    vector = to_vector(query_embedding)
+    inner_params = partition_params + ((model,) if model else ()) + filter_params
+
+    if quantization != QuantizationMode.NONE:
+        indexed = quantized_expression("e.embedding", quantization, dimension)
+        if quantization == QuantizationMode.HALFVEC:
+            candidate_order = f"{indexed} <=> %s::halfvec({int(dimension)})"
+        else:
+            candidate_order = f"{indexed} <~> binary_quantize(%s::vector)::bit({int(dimension)})"
+        query = f"""
+    SELECT 
+        nearest.id,
+        nearest.document_id,
+        d.title,
+        d.content,
+        d.metadata,
+        d.source,
+        1 - nearest.distance AS similarity
+    FROM (
+        SELECT c.id, c.document_id, c.embedding <=> %s::vector AS distance
+        FROM (
+            SELECT e.id, e.document_id, e.embedding
+            FROM embeddings e
+            {join}
+            {where}
+            ORDER BY {candidate_order}
+            LIMIT %s
+        ) c
+        ORDER BY distance
+        LIMIT %s
+    ) nearest
+    JOIN documents d ON nearest.document_id = d.id
+    WHERE 1 - nearest.distance >= %s
+    ORDER BY nearest.distance;
+    """
+        params = (vector,) + inner_params + (vector, max(candidates or limit, limit), limit, threshold)
+        return query, params
+
+    query = f"""
+    SELECT 
+        nearest.id,
+        nearest.document_id,
+        d.title,
+        d.content,
+        d.metadata,
+        d.source,
+        1 - nearest.distance AS similarity
+    FROM (
+        SELECT e.id, e.document_id, e.embedding <=> %s::vector AS distance
+        FROM embeddings e
+        {join}
+        {where}
+        ORDER BY distance
+        LIMIT %s
+    ) nearest
+    JOIN documents d ON nearest.document_id = d.id
+    WHERE 1 - nearest.distance >= %s
+    ORDER BY nearest.distance;
+    """
+    params = (vector,) + inner_params + (limit, threshold)
+    return query, params
 
 
 class VectorOperations:
     """Vector operations using pgvector."""
     
-    def __init__(self, db: DatabaseConnection):
+    def __init__(
+        self,
+        db: DatabaseConnection,
+        search_params: Optional[SearchParams] = None,
+        partitioned: bool = False,
+        quantization: QuantizationMode = QuantizationMode.NONE,
+        dimension: Optional[int] = None,
+        rerank_factor: int = 4
+    ):
         """
         Initialize vector operations.
         
         Args:
             db: Database connection
+            search_params: Default ANN index settings for similarity searches
+            partitioned: ``embeddings`` uses the tenant-partitioned layout (see ``partitioning.py``)
+            quantization: Search a quantized index (``halfvec``/binary) and re-rank
+                with the full-precision vectors; must match the index built by
+                ``VectorIndexManager.create_index(quantization=...)``
+            dimension: Vector dimension (required for quantized search)
+            rerank_factor: Candidates fetched from the quantized index per requested result
+        
+        Raises:
+            ValueError: If a quantized mode is used without a dimension
         """
         self.db = db
+        self.search_params = search_params or SearchParams()
+        self.partitioned = partitioned
+        self.quantization, self.dimension, self.rerank_factor = _check_quantization(
+            quantization, dimension, rerank_factor
+        )
     
     def insert_embedding(
         self,
@@ -37,19 +400,11 @@ class VectorOperations:
         Returns:
             Embedding ID
         """
-        query = """
-        INSERT INTO embeddings (document_id, embedding, model)
-        VALUES (%s, %s::vector, %s)
-        RETURNING id;
-        """
-        
-        # Convert list to string format for pgvector
-        embedding_str = "[" + ",".join(map(str, embedding)) + "]"
-        
         result = self.db.execute_query(
-            query,
-            (document_id, embedding_str, model),
-            fetch_one=True
+            _PARTITIONED_INSERT_EMBEDDING_SQL if self.partitioned else _INSERT_EMBEDDING_SQL,
+            (document_id, to_vector(embedding), model),
+            fetch_one=True,
+            prepare="vector_insert_embedding"
         )
         return result['id']
     
@@ -58,7 +413,9 @@ class VectorOperations:
         query_embedding: List[float],
         limit: int = 10,
         threshold: float = 0.0,
-        model: Optional[str] = None
+        model: Optional[str] = None,
+        search_params: Optional[SearchParams] = None,
+        filters: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
         """
         Perform similarity search using cosine distance.
@@ -68,49 +425,99 @@ class VectorOperations:
             limit: Maximum number of results
             threshold: Minimum similarity threshold (0-1)
             model: Optional model filter
+            search_params: ANN index settings for this query (defaults to ``self.search_params``)
+            filters: Optional metadata/tenant filters, applied inside the query
+                (see ``filter_compiler.compile_filters``)
         
         Returns:
             List of similar documents with similarity scores
         """
-        embedding_str = "[" + ",".join(map(str, query_embedding)) + "]"
+        query, params = _similarity_query(
+            query_embedding, limit, threshold, model, filters, **_query_options(self, limit)
+        )
+        search_params = _candidate_search_params(
+            search_params or self.search_params, self.quantization, limit * self.rerank_factor
+        )
+        return self._execute_search(query, params, search_params, prepare="vector_similarity_search")
+    
+    def explain_similarity_search(
+        self,
+        query_embedding: List[float],
+        limit: int = 10,
+        threshold: float = 0.0,
+        model: Optional[str] = None,
+        search_params: Optional[SearchParams] = None,
+        analyze: bool = False,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Return the query plan of a similarity search.
         
-        if model:
-            query = """
-            SELECT 
-                e.id,
-                e.document_id,
-                d.title,
-                d.content,
-                d.metadata,
-                d.source,
-                1 - (e.embedding <=> %s::vector) as similarity
-            FROM embeddings e
-            JOIN documents d ON e.document_id = d.id
-            WHERE e.model = %s
-                AND 1 - (e.embedding <=> %s::vector) >= %s
-            ORDER BY e.embedding <=> %s::vector
-            LIMIT %s;
-            """
-            params = (embedding_str, model, embedding_str, threshold, embedding_str, limit)
-        else:
-            query = """
-            SELECT 
-                e.id,
-                e.document_id,
-                d.title,
-                d.content,
-                d.metadata,
-                d.source,
-                1 - (e.embedding <=> %s::vector) as similarity
-            FROM embeddings e
-            JOIN documents d ON e.document_id = d.id
-            WHERE 1 - (e.embedding <=> %s::vector) >= %s
-            ORDER BY e.embedding <=> %s::vector
-            LIMIT %s;
-            """
-            params = (embedding_str, embedding_str, threshold, embedding_str, limit)
+        Useful to confirm the ANN index is used (an ``Index Scan`` on the
+        vector index rather than a ``Seq Scan`` on ``embeddings``).
+        
+        Args:
+            query_embedding: Query embedding vector
+            limit: Maximum number of results
+            threshold: Minimum similarity threshold (0-1)
+            model: Optional model filter
+            search_params: ANN index settings for this query
+            analyze: Run the query and include actual timings
+            filters: Optional metadata/tenant filters
+        
+        Returns:
+            Root plan node from ``EXPLAIN (FORMAT JSON)``
+        """
+        query, params = _similarity_query(
+            query_embedding, limit, threshold, model, filters, **_query_options(self, limit)
+        )
+        explain = "EXPLAIN (ANALYZE, FORMAT JSON) " if analyze else "EXPLAIN (FORMAT JSON) "
+        search_params = _candidate_search_params(
+            search_params or self.search_params, self.quantization, limit * self.rerank_factor
+        )
+        rows = self._execute_search(explain + query, params, search_params)
+        plan = rows[0]["QUERY PLAN"]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan[0]["Plan"]
+    
+    def _execute_search(
+        self,
+        query: str,
+        params: tuple,
+        search_params: SearchParams,
+        prepare: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Run a read-only search query, applying index settings in the same transaction."""
+        settings = search_params.settings()
+        if not settings:
+            return self.db.execute_query(query, params, prepare=prepare, read_only=True)
+        
+        def search(cursor) -> List[Dict[str, Any]]:
+            for name, value in settings:
+                cursor.execute(_SET_LOCAL_SQL, (name, value))
+            if prepare:
+                execute_prepared(self.db, cursor, prepare, query, params)
+            else:
+                cursor.execute(query, params)
+            return cursor.fetchall()
         
-        return self.db.execute_query(query, params)
+        # Retried on the primary if the replica fails
+        return self.db.run_read(search, cursor_factory=RealDictCursor)
+    
+    def delete_embeddings(self, document_id: Any) -> int:
+        """
+        Delete all embeddings of a document.
+        
+        Args:
+            document_id: Document ID
+        
+        Returns:
+            Number of embeddings deleted
+        """
+        return self.db.execute_query(
+            "DELETE FROM embeddings WHERE document_id = %s;", (document_id,), fetch_all=False
+        )
     
     def batch_insert_embeddings(
         self,
@@ -122,22 +529,232 @@ class VectorOperations:
         Args:
             embeddings: List of (document_id, embedding, model) tuples
         """
-        query = """
-        INSERT INTO embeddings (document_id, embedding, model)
-        VALUES %s;
-        """
-        
         # Prepare data for batch insert
         values = []
         for doc_id, embedding, model in embeddings:
-            embedding_str = "[" + ",".join(map(str, embedding)) + "]"
-            values.append((doc_id, embedding_str, model))
+            values.append((doc_id, to_vector(embedding), model))
         
         with self.db.get_cursor() as cursor:
             from psycopg2.extras import execute_values
             execute_values(
                 cursor,
-                "INSERT INTO embeddings (document_id, embedding, model) VALUES %s",
+                _PARTITIONED_BATCH_INSERT_SQL if self.partitioned
+                else "INSERT INTO embeddings (document_id, embedding, model) VALUES %s",
                 values
             )
 
+    
+    def bulk_load_embeddings(
+        self,
+        document_ids: Sequence[int],
+        embeddings: Any,
+        model: str = "text-embedding-3-small",
+        chunk_size: int = 10000
+    ) -> Dict[str, float]:
+        """
+        Bulk load embeddings with binary ``COPY ... FROM STDIN``.
+
+        Vectors are encoded straight from a float32 matrix into pgvector's
+        binary format instead of text literals, and streamed to the server in
+        small buffers. Every ``chunk_size`` rows are committed separately, so a
+        failure only rolls back the chunk in flight.
+
+        Args:
+            document_ids: Document ID for each row
+            embeddings: 2-D array (or list of lists) of shape (rows, dimensions)
+            model: Model used to generate the embeddings
+            chunk_size: Rows per COPY / commit
+
+        Returns:
+            Dictionary with rows, chunks, elapsed seconds and rows_per_sec
+        """
+        matrix = _as_float32_matrix(embeddings)
+        if len(document_ids) != len(matrix):
+            raise ValueError("document_ids and embeddings must have the same length")
+
+        started = time.perf_counter()
+        chunks = 0
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(_DOCUMENT_ID_TYPE_SQL)
+                row = cursor.fetchone()
+                id_format = _document_id_format(row[0] if row else None)
+                copy_sql = _COPY_EMBEDDINGS_SQL
+                if self.partitioned:
+                    cursor.execute(_CREATE_STAGE_SQL.format(id_type=row[0]))
+                    copy_sql = _COPY_STAGE_SQL
+                for offset in range(0, len(matrix), chunk_size):
+                    end = offset + chunk_size
+                    payload = _copy_payload(document_ids[offset:end], matrix[offset:end], model, id_format)
+                    cursor.copy_expert(copy_sql, _CopyStream(payload), size=_COPY_READ_SIZE)
+                    if self.partitioned:
+                        cursor.execute(_FLUSH_STAGE_SQL)
+                    conn.commit()
+                    chunks += 1
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+
+        return _load_stats(len(matrix), chunks, started)
+
+
+class AsyncVectorOperations:
+    """Vector operations using pgvector over an async connection pool."""
+
+    def __init__(
+        self,
+        db: "AsyncDatabaseConnection",
+        search_params: Optional[SearchParams] = None,
+        partitioned: bool = False,
+        quantization: QuantizationMode = QuantizationMode.NONE,
+        dimension: Optional[int] = None,
+        rerank_factor: int = 4
+    ):
+        """
+        Initialize async vector operations.
+
+        Args:
+            db: Async database connection
+            search_params: Default ANN index settings for similarity searches
+            partitioned: ``embeddings`` uses the tenant-partitioned layout (see ``partitioning.py``)
+            quantization: Search a quantized index and re-rank with full-precision vectors
+            dimension: Vector dimension (required for quantized search)
+            rerank_factor: Candidates fetched from the quantized index per requested result
+        """
+        self.db = db
+        self.search_params = search_params or SearchParams()
+        self.partitioned = partitioned
+        self.quantization, self.dimension, self.rerank_factor = _check_quantization(
+            quantization, dimension, rerank_factor
+        )
+
+    async def insert_embedding(
+        self,
+        document_id: int,
+        embedding: List[float],
+        model: str = "text-embedding-3-small"
+    ) -> int:
+        """
+        Insert an embedding vector.
+
+        Args:
+            document_id: Document ID
+            embedding: Embedding vector
+            model: Model used to generate embedding
+
+        Returns:
+            Embedding ID
+        """
+        result = await self.db.execute_query(
+            _PARTITIONED_INSERT_EMBEDDING_SQL if self.partitioned else _INSERT_EMBEDDING_SQL,
+            (document_id, to_vector(embedding), model),
+            fetch_one=True
+        )
+        return result['id']
+
+    async def similarity_search(
+        self,
+        query_embedding: List[float],
+        limit: int = 10,
+        threshold: float = 0.0,
+        model: Optional[str] = None,
+        search_params: Optional[SearchParams] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Perform similarity search using cosine distance.
+
+        Args:
+            query_embedding: Query embedding vector
+            limit: Maximum number of results
+            threshold: Minimum similarity threshold (0-1)
+            model: Optional model filter
+            search_params: ANN index settings for this query (defaults to ``self.search_params``)
+            filters: Optional metadata/tenant filters, applied inside the query
+
+        Returns:
+            List of similar documents with similarity scores
+        """
+        query, params = _similarity_query(
+            query_embedding, limit, threshold, model, filters, **_query_options(self, limit)
+        )
+        settings = _candidate_search_params(
+            search_params or self.search_params, self.quantization, limit * self.rerank_factor
+        ).settings()
+        if not settings:
+            return await self.db.execute_query(query, params)
+
+        async with self.db.transaction() as cursor:
+            for name, value in settings:
+                await cursor.execute(_SET_LOCAL_SQL, (name, value))
+            await cursor.execute(query, params)
+            return await cursor.fetchall()
+
+    async def batch_insert_embeddings(
+        self,
+        embeddings: List[Tuple[int, List[float], str]]
+    ) -> None:
+        """
+        Batch insert multiple embeddings.
+
+        Args:
+            embeddings: List of (document_id, embedding, model) tuples
+        """
+        await self.db.execute_many(
+            _PARTITIONED_INSERT_EMBEDDING_SQL if self.partitioned
+            else "INSERT INTO embeddings (document_id, embedding, model) VALUES (%s, %s::vector, %s)",
+            [(doc_id, to_vector(embedding), model) for doc_id, embedding, model in embeddings]
+        )
+
+    async def bulk_load_embeddings(
+        self,
+        document_ids: Sequence[int],
+        embeddings: Any,
+        model: str = "text-embedding-3-small",
+        chunk_size: int = 10000
+    ) -> Dict[str, float]:
+        """
+        Bulk load embeddings with binary ``COPY ... FROM STDIN``.
+
+        Same encoding and chunked commits as ``VectorOperations.bulk_load_embeddings``.
+
+        Args:
+            document_ids: Document ID for each row
+            embeddings: 2-D array (or list of lists) of shape (rows, dimensions)
+            model: Model used to generate the embeddings
+            chunk_size: Rows per COPY / commit
+
+        Returns:
+            Dictionary with rows, chunks, elapsed seconds and rows_per_sec
+        """
+        matrix = _as_float32_matrix(embeddings)
+        if len(document_ids) != len(matrix):
+            raise ValueError("document_ids and embeddings must have the same length")
+
+        started = time.perf_counter()
+        chunks = 0
+        async with self.db.get_connection() as conn:
+            async with conn.transaction():
+                async with conn.cursor() as cursor:
+                    await cursor.execute(_DOCUMENT_ID_TYPE_SQL)
+                    row = await cursor.fetchone()
+                    if self.partitioned and row:
+                        await cursor.execute(_CREATE_STAGE_SQL.format(id_type=row["type"]))
+            id_format = _document_id_format(row["type"] if row else None)
+            copy_sql = _COPY_STAGE_SQL if self.partitioned else _COPY_EMBEDDINGS_SQL
+
+            for offset in range(0, len(matrix), chunk_size):
+                end = offset + chunk_size
+                async with conn.transaction():
+                    async with conn.cursor() as cursor:
+                        async with cursor.copy(copy_sql) as copy:
+                            for part in _copy_payload(document_ids[offset:end], matrix[offset:end], model, id_format):
+                                await copy.write(part)
+                        if self.partitioned:
+                            await cursor.execute(_FLUSH_STAGE_SQL)
+                chunks += 1
+
+        return _load_stats(len(matrix), chunks, started)
@@ -9,6 +9,11 @@ from .document_processor import DocumentProcessor
 from .multimodal_loader import MultiModalLoader, create_multimodal_loader
 from .document_processor import DocumentChunk
 from .retriever import Retriever
+from .hybrid_retrieval import FusionMethod, HybridResult, fuse_results
+from .embedding_cache import QueryEmbeddingCache
+from .answer_cache import AnswerCache, AnswerLookup
+from .vector_store import VectorStore, DocumentCatalog
+from .numpy_vector_store import NumpyVectorStore
 from .generator import RAGGenerator
 from .hallucination_detector import (
     HallucinationDetector,
@@ -35,6 +40,18 @@ __all__ = [
     "DocumentProcessor",
     "DocumentChunk",
     "Retriever",
+    # Hybrid retrieval
+    "FusionMethod",
+    "HybridResult",
+    "fuse_results",
+    # Query embedding and answer caches
+    "QueryEmbeddingCache",
+    "AnswerCache",
+    "AnswerLookup",
+    # Vector stores
+    "VectorStore",
+    "DocumentCatalog",
+    "NumpyVectorStore",
     "RAGGenerator",
     "MultiModalLoader",
     # Hallucination Detection
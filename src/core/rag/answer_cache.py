@@ -0,0 +1,336 @@
+"""
+RAG Answer Cache
+
+Caches full RAG answers and invalidates exactly the entries a document change
+affects, so answers can live for hours instead of minutes.
+
+Each entry records the documents (with their version tokens) and chunks its
+retrieved context came from. Two mechanisms keep entries fresh:
+
+- A reverse index (``{prefix}:deps:{document_id}`` -> answer keys) lets
+  ``invalidate_documents`` delete the dependent entries eagerly.
+- Every document mutation also writes a new version token for the document.
+  A hit is only served if the versions recorded in the entry still match,
+  which covers reverse-index updates lost to concurrent writers or trimming.
+
+Ingesting a document cannot be traced to the answers it would change, so it
+bumps a per-tenant generation instead (``invalidate_tenant``); answers cached
+for that tenant, and unscoped answers, stop validating.
+
+A global mutation epoch is read with the lookup and again before the answer
+is stored; if any document changed while the query was running, the answer
+is returned but not cached (it may have been built from the old content).
+
+Entries and reverse-index lists are stored as JSON, so nothing read back from
+a shared cache is unpickled.
+"""
+
+# Standard library imports
+import hashlib
+import json
+import logging
+import threading
+import uuid
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+# Local application/library specific imports
+from ..utils.blocking_executor import run_blocking
+from .embedding_cache import normalize_query
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AnswerLookup:
+    """Result of an answer cache lookup, passed back to ``put`` on a miss."""
+    key: str
+    result: Optional[Dict[str, Any]] = None
+    # Mutation epoch and cache/tenant generations seen at lookup time
+    epoch: Optional[bytes] = None
+    generation: Optional[bytes] = None
+    tenant_generation: Optional[bytes] = None
+    tenant_id: Optional[str] = None
+
+    @property
+    def hit(self) -> bool:
+        """Whether a valid cached answer was found."""
+        return self.result is not None
+
+
+def answer_dependencies(documents: Sequence[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """
+    Collect the document and chunk IDs an answer was built from.
+
+    Args:
+        documents: Retrieved documents (vector, keyword or fused rows)
+
+    Returns:
+        Dictionary with sorted ``documents`` and ``chunks`` ID lists
+    """
+    document_ids, chunk_ids = set(), set()
+    for doc in documents:
+        document_id = doc.get("document_id", doc.get("id"))
+        if document_id is not None:
+            document_ids.add(str(document_id))
+        # Keyword rows carry chunk_id; vector rows are one embedding per chunk
+        chunk_id = doc.get("chunk_id", doc.get("id") if "document_id" in doc else None)
+        if chunk_id is not None:
+            chunk_ids.add(str(chunk_id))
+    return {"documents": sorted(document_ids), "chunks": sorted(chunk_ids)}
+
+
+def _token(value: Any) -> Optional[str]:
+    """Version/generation token as text (Dragonfly returns the stored bytes)."""
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value).decode("utf-8", "replace")
+    return value
+
+
+class AnswerCache:
+    """
+    Version-aware RAG answer cache with reverse-index invalidation.
+    """
+
+    def __init__(
+        self,
+        cache: Any,
+        ttl: int = 3600,
+        key_prefix: str = "rag:answer",
+        max_index_entries: int = 1000,
+        executor: Optional[Executor] = None
+    ):
+        """
+        Initialize the answer cache.
+
+        Args:
+            cache: Shared cache with ``get_many``/``set``/``set_many``/``delete_many``
+                (``CacheMechanism`` or ``ShardedCache``)
+            ttl: Answer TTL in seconds (also used for versions and the reverse index)
+            key_prefix: Cache key prefix
+            max_index_entries: Most recent answer keys kept per document in the
+                reverse index (older entries are still caught by the version check)
+            executor: Executor for the async methods (None uses the shared RAG executor)
+        """
+        self.cache = cache
+        self.ttl = ttl
+        self.key_prefix = key_prefix
+        self.max_index_entries = max_index_entries
+        self.executor = executor
+        self._epoch_key = f"{key_prefix}:epoch"
+        self._generation_key = f"{key_prefix}:generation"
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "stale": 0, "skipped": 0, "invalidated": 0}
+
+    def key(self, query: str, tenant_id: Optional[str] = None, **params: Any) -> str:
+        """
+        Build the cache key for a query.
+
+        Args:
+            query: Query text (normalized before hashing)
+            tenant_id: Optional tenant ID
+            **params: Other inputs the answer depends on (top_k, models, ...)
+
+        Returns:
+            Cache key
+        """
+        material = json.dumps(
+            [tenant_id or "global", normalize_query(query), sorted(params.items())],
+            default=str
+        )
+        return f"{self.key_prefix}:{hashlib.sha256(material.encode('utf-8')).hexdigest()}"
+
+    def lookup(self, key: str, tenant_id: Optional[str] = None) -> AnswerLookup:
+        """
+        Look up an answer, dropping it if a document it depends on has changed.
+
+        Args:
+            key: Cache key from ``key``
+            tenant_id: Tenant the answer is scoped to (the one passed to ``key``)
+
+        Returns:
+            AnswerLookup (``result`` is None on a miss)
+        """
+        tenant_key = self._tenant_key(tenant_id)
+        values = self.cache.get_many([key, self._epoch_key, self._generation_key, tenant_key])
+        lookup = AnswerLookup(key=key, epoch=values.get(self._epoch_key),
+                              generation=values.get(self._generation_key),
+                              tenant_generation=values.get(tenant_key), tenant_id=tenant_id)
+        entry = self._decode(values.get(key))
+        if not isinstance(entry, dict):
+            self._count("misses")
+            return lookup
+
+        versions = entry.get("versions") or {}
+        current = self.cache.get_many([self._version_key(doc_id) for doc_id in versions]) if versions else {}
+        if (entry.get("generation") != _token(lookup.generation)
+                or entry.get("tenant_generation") != _token(lookup.tenant_generation)
+                or any(_token(current.get(self._version_key(doc_id))) != version
+                       for doc_id, version in versions.items())):
+            self.cache.delete_many([key])
+            self._count("stale")
+            return lookup
+
+        self._count("hits")
+        lookup.result = entry["result"]
+        return lookup
+
+    async def lookup_async(self, key: str, tenant_id: Optional[str] = None) -> AnswerLookup:
+        """Look up an answer without blocking the event loop (see ``lookup``)."""
+        return await run_blocking(self.executor, self.lookup, key, tenant_id)
+
+    def put(self, lookup: AnswerLookup, result: Dict[str, Any], documents: Sequence[Dict[str, Any]]) -> bool:
+        """
+        Store an answer with the document versions it was built from.
+
+        Args:
+            lookup: The miss returned by ``lookup`` for this query
+            result: Answer to cache
+            documents: Retrieved documents the answer was generated from
+
+        Returns:
+            True if stored, False if a document changed while the query ran
+            or the result could not be serialized
+        """
+        dependencies = answer_dependencies(documents)
+        version_keys = {doc_id: self._version_key(doc_id) for doc_id in dependencies["documents"]}
+        tenant_key = self._tenant_key(lookup.tenant_id)
+        current = self.cache.get_many(
+            list(version_keys.values()) + [self._epoch_key, self._generation_key, tenant_key]
+        )
+        if (current.get(self._epoch_key) != lookup.epoch
+                or current.get(self._generation_key) != lookup.generation
+                or current.get(tenant_key) != lookup.tenant_generation):
+            self._count("skipped")
+            return False
+
+        entry = {
+            "result": result,
+            "versions": {doc_id: _token(current.get(key)) for doc_id, key in version_keys.items()},
+            "chunks": dependencies["chunks"],
+            "generation": _token(lookup.generation),
+            "tenant_generation": _token(lookup.tenant_generation),
+        }
+        try:
+            data = json.dumps(entry).encode("utf-8")
+        except (TypeError, ValueError) as e:
+            # A result that cannot be serialized is simply not cached
+            logger.warning(f"Answer for cache key {lookup.key} is not serializable, skipping cache: {e}")
+            self._count("skipped")
+            return False
+        self.cache.set(lookup.key, data, ttl=self.ttl)
+
+        if version_keys:
+            index_keys = [self._index_key(doc_id) for doc_id in version_keys]
+            indexes = self.cache.get_many(index_keys)
+            updated = {}
+            for index_key in index_keys:
+                keys = [k for k in self._decode_keys(indexes.get(index_key)) if k != lookup.key]
+                keys.append(lookup.key)
+                updated[index_key] = json.dumps(keys[-self.max_index_entries:]).encode("utf-8")
+            self.cache.set_many(updated, ttl=self.ttl)
+        return True
+
+    async def put_async(
+        self,
+        lookup: AnswerLookup,
+        result: Dict[str, Any],
+        documents: Sequence[Dict[str, Any]]
+    ) -> bool:
+        """Store an answer without blocking the event loop (see ``put``)."""
+        return await run_blocking(self.executor, self.put, lookup, result, documents)
+
+    def invalidate_documents(self, document_ids: Iterable[Any]) -> int:
+        """
+        Invalidate every answer built from any of the given documents.
+
+        Call after the document change is committed.
+
+        Args:
+            document_ids: Changed or deleted document IDs
+
+        Returns:
+            Number of answer entries deleted through the reverse index
+        """
+        doc_ids = list(dict.fromkeys(str(doc_id) for doc_id in document_ids))
+        if not doc_ids:
+            return 0
+
+        # New versions first: entries missed by the reverse index fail validation
+        token = uuid.uuid4().hex.encode()
+        versions = {self._version_key(doc_id): token for doc_id in doc_ids}
+        self.cache.set_many({**versions, self._epoch_key: token}, ttl=self.ttl)
+
+        index_keys = [self._index_key(doc_id) for doc_id in doc_ids]
+        answer_keys = set()
+        for data in self.cache.get_many(index_keys).values():
+            answer_keys.update(self._decode_keys(data))
+        self.cache.delete_many(sorted(answer_keys) + index_keys)
+        self._count("invalidated", len(answer_keys))
+        return len(answer_keys)
+
+    def invalidate_tenant(self, tenant_id: Optional[str] = None) -> None:
+        """
+        Invalidate the answers a newly ingested document could change.
+
+        Bumps the tenant's generation and the unscoped one (unscoped queries
+        search every tenant), plus the mutation epoch so in-flight queries do
+        not store answers built without the new document.
+
+        Args:
+            tenant_id: Tenant the document was ingested for (None for unscoped documents)
+        """
+        token = uuid.uuid4().hex.encode()
+        keys = {self._tenant_key(None), self._tenant_key(tenant_id), self._epoch_key}
+        self.cache.set_many(dict.fromkeys(keys, token), ttl=self.ttl)
+
+    def invalidate_all(self) -> None:
+        """Invalidate every cached answer (e.g. after re-embedding the corpus)."""
+        token = uuid.uuid4().hex.encode()
+        self.cache.set_many({self._generation_key: token, self._epoch_key: token}, ttl=self.ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report cache effectiveness.
+
+        Returns:
+            Dictionary with hits, misses, stale (dropped on a version mismatch),
+            skipped (not stored because a document changed mid-query or the
+            answer could not be serialized),
+            invalidated and hit_rate
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+        lookups = stats["hits"] + stats["misses"] + stats["stale"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def _version_key(self, document_id: str) -> str:
+        return f"{self.key_prefix}:version:{document_id}"
+
+    def _index_key(self, document_id: str) -> str:
+        return f"{self.key_prefix}:deps:{document_id}"
+
+    def _tenant_key(self, tenant_id: Optional[str]) -> str:
+        return f"{self.key_prefix}:tenant:{tenant_id or 'global'}"
+
+    @staticmethod
+    def _decode(data: Any) -> Optional[Any]:
+        """Parse a stored JSON entry or index (None for missing or foreign values)."""
+        if not isinstance(data, (bytes, bytearray, str)):
+            return None
+        try:
+            return json.loads(data)
+        except ValueError:
+            return None
+
+    @classmethod
+    def _decode_keys(cls, data: Any) -> List[str]:
+        """Parse a reverse-index list (empty for missing or foreign values)."""
+        keys = cls._decode(data)
+        return [key for key in keys if isinstance(key, str)] if isinstance(keys, list) else []
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += amount
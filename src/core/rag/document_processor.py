@@ -536,7 +536,9 @@ class DocumentProcessor:
             )
             chunks.append(chunk)
             
-            start = end - self.chunk_overlap
+            if end >= len(content):
+                break
+            start = max(end - self.chunk_overlap, start + 1)
             chunk_index += 1
         
         return chunks
@@ -0,0 +1,211 @@
+"""
+Query Embedding Cache
+
+Caches query embeddings so repeated queries (dashboards, FAQ bots, retries)
+skip the embedding API call and only pay for the database search.
+
+Entries are keyed on the embedding model and a hash of the normalized query
+text (Unicode NFKC, case-folded, whitespace collapsed), so trivially
+different spellings of the same question share one embedding. Vectors are
+stored as raw float32 bytes (4 bytes per dimension, about a quarter of a
+pickled float list) in a small in-process LRU that sits in front of the
+shared cache (``CacheMechanism`` or ``ShardedCache``), which lets other
+workers reuse an embedding one of them paid for.
+"""
+
+# Standard library imports
+import hashlib
+import inspect
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence
+
+# Third-party imports
+import numpy as np
+
+# Local application/library specific imports
+from ..utils.blocking_executor import run_blocking
+
+
+def normalize_query(text: str) -> str:
+    """
+    Normalize query text for cache lookups.
+
+    Args:
+        text: Query text
+
+    Returns:
+        NFKC-normalized, case-folded text with single spaces
+    """
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+class QueryEmbeddingCache:
+    """
+    Two-level (in-process LRU, then shared cache) store of query embeddings.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[Any] = None,
+        max_entries: int = 1024,
+        ttl: int = 86_400,
+        key_prefix: str = "rag:qemb"
+    ):
+        """
+        Initialize the query embedding cache.
+
+        Args:
+            cache: Optional shared cache with ``get``/``set`` (e.g. ``CacheMechanism``)
+            max_entries: Embeddings kept in the in-process LRU (0 disables it)
+            ttl: Shared cache TTL in seconds
+            key_prefix: Shared cache key prefix
+        """
+        self.cache = cache
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.key_prefix = key_prefix
+        self._lru: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    def key(self, text: str, model: str) -> str:
+        """
+        Build the cache key for a query and embedding model.
+
+        Args:
+            text: Query text
+            model: Embedding model
+
+        Returns:
+            Cache key
+        """
+        digest = hashlib.sha256(normalize_query(text).encode("utf-8")).hexdigest()
+        return f"{self.key_prefix}:{model}:{digest}"
+
+    def get(self, text: str, model: str) -> Optional[np.ndarray]:
+        """
+        Look up a query embedding (in-process LRU first, then the shared cache).
+
+        Args:
+            text: Query text
+            model: Embedding model
+
+        Returns:
+            float32 embedding, or None on a miss
+        """
+        key = self.key(text, model)
+        vector = self._get_local(key)
+        if vector is not None or self.cache is None:
+            return self._record(vector, shared=False)
+        return self._record(self._promote(key, self.cache.get(key)), shared=True)
+
+    async def get_async(self, text: str, model: str) -> Optional[np.ndarray]:
+        """Look up a query embedding without blocking the event loop (see ``get``)."""
+        key = self.key(text, model)
+        vector = self._get_local(key)
+        if vector is not None or self.cache is None:
+            return self._record(vector, shared=False)
+        get_async = getattr(self.cache, "get_async", None)
+        if inspect.iscoroutinefunction(get_async):
+            data = await get_async(key)
+        else:
+            data = await run_blocking(None, self.cache.get, key)
+        return self._record(self._promote(key, data), shared=True)
+
+    def put(self, text: str, model: str, embedding: Sequence[float]) -> np.ndarray:
+        """
+        Store a query embedding in both levels.
+
+        Args:
+            text: Query text
+            model: Embedding model
+            embedding: Embedding values
+
+        Returns:
+            The embedding as a float32 array
+        """
+        key, vector, data = self._encode(text, model, embedding)
+        if self.cache is not None:
+            self.cache.set(key, data, ttl=self.ttl)
+        return vector
+
+    async def put_async(self, text: str, model: str, embedding: Sequence[float]) -> np.ndarray:
+        """Store a query embedding without blocking the event loop (see ``put``)."""
+        key, vector, data = self._encode(text, model, embedding)
+        if self.cache is not None:
+            set_async = getattr(self.cache, "set_async", None)
+            if inspect.iscoroutinefunction(set_async):
+                await set_async(key, data, ttl=self.ttl)
+            else:
+                await run_blocking(None, self.cache.set, key, data, ttl=self.ttl)
+        return vector
+
+    def clear(self) -> None:
+        """Drop the in-process entries (shared entries expire by TTL)."""
+        with self._lock:
+            self._lru.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report hit rates per level.
+
+        Returns:
+            Dictionary with lookups, memory_hits, shared_hits, misses,
+            hit_rate, memory_hit_rate and entries
+        """
+        with self._lock:
+            lookups = self.memory_hits + self.shared_hits + self.misses
+            return {
+                "lookups": lookups,
+                "memory_hits": self.memory_hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "hit_rate": (self.memory_hits + self.shared_hits) / lookups if lookups else 0.0,
+                "memory_hit_rate": self.memory_hits / lookups if lookups else 0.0,
+                "entries": len(self._lru),
+            }
+
+    def _encode(self, text: str, model: str, embedding: Sequence[float]):
+        key = self.key(text, model)
+        vector = np.ascontiguousarray(embedding, dtype=np.float32)
+        data = vector.tobytes()
+        self._put_local(key, data)
+        return key, vector, data
+
+    def _get_local(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            data = self._lru.get(key)
+            if data is None:
+                return None
+            self._lru.move_to_end(key)
+        return np.frombuffer(data, dtype=np.float32)
+
+    def _put_local(self, key: str, data: bytes) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._lru[key] = data
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def _promote(self, key: str, data: Optional[bytes]) -> Optional[np.ndarray]:
+        """Decode a shared-cache value and copy it into the LRU."""
+        if not isinstance(data, (bytes, bytearray)) or not data or len(data) % 4:
+            return None
+        self._put_local(key, bytes(data))
+        return np.frombuffer(data, dtype=np.float32)
+
+    def _record(self, vector: Optional[np.ndarray], shared: bool) -> Optional[np.ndarray]:
+        with self._lock:
+            if vector is None:
+                self.misses += 1
+            elif shared:
+                self.shared_hits += 1
+            else:
+                self.memory_hits += 1
+        return vector
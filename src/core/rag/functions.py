@@ -16,7 +16,7 @@ from ..litellm_gateway import LiteLLMGateway
 # ============================================================================
 
 def create_rag_system(
-    db: DatabaseConnection,
+    db: Optional[DatabaseConnection],
     gateway: LiteLLMGateway,
     embedding_model: str = "text-embedding-3-small",
     generation_model: str = "gpt-4",
@@ -28,13 +28,13 @@ def create_rag_system(
     Create and configure a RAG system with default settings.
 
     Args:
-        db: Database connection instance
+        db: Database connection instance (may be None with an in-process ``vector_store``)
         gateway: LiteLLM Gateway instance
         embedding_model: Model for embeddings
         generation_model: Model for generation
         enable_memory: Enable memory for conversation context
         memory_config: Optional memory configuration
-        **kwargs: Additional RAG system configuration
+        **kwargs: Additional RAG system configuration (e.g. ``vector_store``)
 
     Returns:
         Configured RAGSystem instance
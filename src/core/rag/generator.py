@@ -4,7 +4,7 @@ Generator
 Handles LLM generation with retrieved context.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 from ..litellm_gateway import LiteLLMGateway
 from .hallucination_detector import HallucinationDetector, create_hallucination_detector, HallucinationResult
 
@@ -149,6 +149,61 @@ class RAGGenerator:
         
         return result
     
+    async def generate_stream_async(
+        self,
+        query: str,
+        context_documents: List[Dict[str, Any]],
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        check_hallucination: Optional[bool] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Generate a response as a stream of token deltas.
+
+        Yields ``{"type": "delta", "text": ...}`` for each delta from the
+        gateway stream, then one ``{"type": "result", "result": ...}`` with the
+        same dictionary ``generate_async`` returns. The hallucination check runs
+        on the full text after the last delta.
+
+        Args:
+            query: User query
+            context_documents: Retrieved context documents
+            max_tokens: Maximum tokens to generate
+            temperature: Generation temperature
+            check_hallucination: Whether to check for hallucinations (default: uses instance setting)
+
+        Yields:
+            Delta events followed by a final result event
+        """
+        context = self._build_context(context_documents)
+        prompt = self._build_prompt(query, context)
+
+        parts: List[str] = []
+        async for text in self.gateway.generate_stream_async(
+            prompt=prompt,
+            model=self.model,
+            max_tokens=max_tokens,
+            temperature=temperature
+        ):
+            parts.append(text)
+            yield {"type": "delta", "text": text}
+
+        response_text = "".join(parts)
+        # Streams carry no usage block unless the provider is asked for one
+        result: Dict[str, Any] = {"response": response_text, "model": self.model, "usage": None}
+
+        should_check = check_hallucination if check_hallucination is not None else self.enable_hallucination_detection
+        if should_check and self.hallucination_detector:
+            hallucination_result = await self.hallucination_detector.detect_async(
+                response=response_text,
+                context_documents=context_documents,
+                query=query
+            )
+            result["hallucination_result"] = hallucination_result.to_dict()
+            result["is_hallucination"] = hallucination_result.is_hallucination
+
+        yield {"type": "result", "result": result}
+
     def _build_context(self, documents: List[Dict[str, Any]]) -> str:
         """
         Build context string from documents.
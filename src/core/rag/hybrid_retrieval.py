@@ -0,0 +1,128 @@
+"""
+Hybrid Retrieval Fusion
+
+Rank fusion for the vector and keyword retrieval branches. Cosine similarity
+and ``ts_rank_cd`` live on different scales, so adding weighted raw scores
+lets whichever branch happens to produce larger numbers dominate. Two fusion
+methods avoid that:
+
+- Reciprocal Rank Fusion (default): a document scores ``weight / (k + rank)``
+  in each branch that returned it, so only ranks matter.
+- Calibrated score fusion: each branch's scores are min-max normalized to
+  [0, 1] over its own result list before the weighted sum.
+"""
+
+# Standard library imports
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, List, Sequence, Tuple
+
+# Conventional RRF smoothing constant (Cormack et al.)
+DEFAULT_RRF_K = 60
+
+
+class FusionMethod(str, Enum):
+    """How hybrid retrieval merges the vector and keyword branches."""
+    RRF = "rrf"
+    CALIBRATED = "calibrated"
+
+
+@dataclass
+class HybridResult:
+    """Fused hybrid retrieval results with per-branch timings."""
+    documents: List[Dict[str, Any]]
+    fusion: FusionMethod
+    # Seconds: embedding, vector_search, keyword_search, fusion, total
+    timings: Dict[str, float] = field(default_factory=dict)
+    vector_hits: int = 0
+    keyword_hits: int = 0
+
+
+def _document_key(result: Dict[str, Any]) -> str:
+    """Vector rows are embeddings and keyword rows chunks; both fuse per document."""
+    return str(result.get("document_id", result.get("id", "")))
+
+
+def _ranked(results: Sequence[Dict[str, Any]]) -> List[Tuple[str, int, Dict[str, Any]]]:
+    """(document key, 1-based rank, best row) per document, in branch order."""
+    ranked, seen = [], set()
+    for result in results:
+        key = _document_key(result)
+        if key not in seen:
+            seen.add(key)
+            ranked.append((key, len(ranked) + 1, result))
+    return ranked
+
+
+def _calibrate(results: Sequence[Dict[str, Any]]) -> Dict[str, float]:
+    """Min-max normalize a branch's scores to [0, 1] (a lone or tied list scores 1)."""
+    scores = {}
+    for key, _, result in _ranked(results):
+        scores[key] = float(result.get("similarity", 0.0))
+    if not scores:
+        return {}
+    low, high = min(scores.values()), max(scores.values())
+    if high <= low:
+        return {key: 1.0 for key in scores}
+    return {key: (score - low) / (high - low) for key, score in scores.items()}
+
+
+def fuse_results(
+    vector_results: Sequence[Dict[str, Any]],
+    keyword_results: Sequence[Dict[str, Any]],
+    method: FusionMethod = FusionMethod.RRF,
+    vector_weight: float = 0.7,
+    keyword_weight: float = 0.3,
+    rrf_k: int = DEFAULT_RRF_K
+) -> List[Dict[str, Any]]:
+    """
+    Merge vector and keyword results into one ranking, one row per document.
+
+    Each fused row keeps the branches' raw scores (``vector_score``,
+    ``keyword_score``) and ranks (``vector_rank``, ``keyword_rank``; None if
+    the branch missed the document); ``similarity`` is the fused score.
+
+    Args:
+        vector_results: Vector similarity results, best first
+        keyword_results: Keyword search results, best first
+        method: Fusion method
+        vector_weight: Weight of the vector branch
+        keyword_weight: Weight of the keyword branch
+        rrf_k: RRF smoothing constant (larger flattens the rank curve)
+
+    Returns:
+        Fused results sorted by fused score
+
+    Raises:
+        ValueError: If the method is unknown or ``rrf_k`` is negative
+    """
+    method = FusionMethod(method)
+    if rrf_k < 0:
+        raise ValueError(f"rrf_k must be non-negative, got {rrf_k}")
+
+    branches = (
+        ("vector", vector_weight, vector_results),
+        ("keyword", keyword_weight, keyword_results),
+    )
+    fused: Dict[str, Dict[str, Any]] = {}
+    for name, weight, results in branches:
+        calibrated = _calibrate(results) if method == FusionMethod.CALIBRATED else {}
+        for key, rank, result in _ranked(results):
+            row = fused.get(key)
+            if row is None:
+                row = fused[key] = result.copy()
+                row.update(vector_score=0.0, keyword_score=0.0, vector_rank=None, keyword_rank=None)
+                row["similarity"] = 0.0
+            row[f"{name}_score"] = result.get("similarity", 0.0)
+            row[f"{name}_rank"] = rank
+            if method == FusionMethod.RRF:
+                row["similarity"] += weight / (rrf_k + rank)
+            else:
+                row["similarity"] += weight * calibrated[key]
+
+    combined = list(fused.values())
+    for row in combined:
+        row["score_type"] = "hybrid"
+    # Stable sort: ties keep vector order, then keyword order
+    combined.sort(key=lambda row: row["similarity"], reverse=True)
+    return combined
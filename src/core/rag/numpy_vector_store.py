@@ -0,0 +1,589 @@
+"""
+In-Process Vector Store
+
+NumPy implementation of ``VectorStore`` (and ``DocumentCatalog``) for edge and
+offline deployments where PostgreSQL/pgvector is not available.
+
+Embeddings are stored L2-normalized in a float32 matrix, memory-mapped from
+``<path>/vectors.f32`` when a path is given, that grows by doubling: appends
+never rewrite existing rows and the OS pages the corpus in on demand. Searches
+score blocks of rows against a batch of queries with one matrix product and
+keep a running top-k with ``argpartition``. Once the corpus reaches
+``ivf_min_rows`` embeddings, a spherical k-means coarse quantizer (IVF) limits
+each query to the rows of its ``n_probe`` nearest lists; rows appended later
+are assigned to a list on insert, and the quantizer is retrained when the
+corpus has grown fourfold. Deletes are tombstones.
+
+``flush()`` persists row bookkeeping and document payloads next to the vector
+file; a store opened on the same path resumes where the last flush left off.
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..postgresql_database.filter_compiler import matches_filters
+
+logger = logging.getLogger(__name__)
+
+_VECTORS_FILE = "vectors.f32"
+_INDEX_FILE = "index.npz"
+_DOCUMENTS_FILE = "documents.json"
+
+# Retrain the coarse quantizer once the corpus has grown by this factor
+_RETRAIN_GROWTH = 4
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class NumpyVectorStore:
+    """
+    In-process cosine-similarity vector store backed by (memory-mapped) NumPy arrays.
+
+    Safe to share between threads: writes are serialized, and searches only
+    read rows that were fully written before they started.
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        path: Optional[str] = None,
+        ivf_min_rows: int = 50_000,
+        n_lists: Optional[int] = None,
+        n_probe: int = 8,
+        block_size: int = 65_536,
+        initial_capacity: int = 1024
+    ):
+        """
+        Initialize the store, reopening an existing one at ``path``.
+
+        Args:
+            dimension: Embedding dimension
+            path: Directory for the memory-mapped vectors and flushed state
+                (None keeps everything in memory)
+            ivf_min_rows: Corpus size at which the IVF coarse quantizer is
+                trained (0 disables it; searches are then exact)
+            n_lists: IVF lists (default: ``sqrt(rows)``)
+            n_probe: IVF lists searched per query (``SearchParams.probes`` overrides)
+            block_size: Rows scored per matrix product
+            initial_capacity: Rows allocated up front
+
+        Raises:
+            ValueError: If the dimension does not match an existing store at ``path``
+        """
+        if dimension <= 0:
+            raise ValueError("dimension must be positive")
+        self.dimension = dimension
+        self.path = path
+        self.ivf_min_rows = ivf_min_rows
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.block_size = block_size
+
+        self._lock = threading.RLock()
+        self._train_lock = threading.Lock()
+        self._vectors: Optional[np.ndarray] = None
+        self._document_ids = np.zeros(0, dtype=np.int64)
+        self._models = np.zeros(0, dtype=np.int32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._lists = np.zeros(0, dtype=np.int32)
+        self._count = 0
+        self._alive_count = 0
+        self._capacity = 0
+        self._model_names: List[str] = []
+        self._documents: Dict[int, Dict[str, Any]] = {}
+        self._next_document_id = 1
+        self._centroids: Optional[np.ndarray] = None
+        self._trained_rows = 0
+
+        if path:
+            os.makedirs(path, exist_ok=True)
+            if os.path.exists(os.path.join(path, _INDEX_FILE)):
+                self._load()
+        if self._vectors is None:
+            self._grow(max(initial_capacity, 1))
+
+    def __len__(self) -> int:
+        return self._alive_count
+
+    # Embeddings (VectorStore)
+
+    def insert_embedding(
+        self,
+        document_id: int,
+        embedding: List[float],
+        model: str = "text-embedding-3-small"
+    ) -> int:
+        """
+        Append one embedding.
+
+        Args:
+            document_id: Document ID
+            embedding: Embedding vector
+            model: Model used to generate the embedding
+
+        Returns:
+            Embedding ID (row number)
+        """
+        return self.batch_insert_embeddings([(document_id, embedding, model)])[0]
+
+    def batch_insert_embeddings(self, embeddings: List[Tuple[int, List[float], str]]) -> List[int]:
+        """
+        Append embeddings.
+
+        Args:
+            embeddings: List of (document_id, embedding, model) tuples
+
+        Returns:
+            Embedding IDs of the appended rows
+
+        Raises:
+            ValueError: If an embedding has the wrong dimension
+        """
+        if not embeddings:
+            return []
+        matrix = np.asarray([embedding for _, embedding, _ in embeddings], dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[1] != self.dimension:
+            raise ValueError(f"Expected embeddings of dimension {self.dimension}")
+        matrix = _normalize(matrix)
+
+        with self._lock:
+            start, end = self._count, self._count + len(matrix)
+            if end > self._capacity:
+                self._grow(max(end, 2 * self._capacity))
+            self._vectors[start:end] = matrix
+            self._document_ids[start:end] = [int(document_id) for document_id, _, _ in embeddings]
+            self._models[start:end] = [self._model_code(model) for _, _, model in embeddings]
+            self._alive[start:end] = True
+            if self._centroids is not None:
+                self._lists[start:end] = np.argmax(matrix @ self._centroids.T, axis=1)
+            self._count = end
+            self._alive_count += len(matrix)
+        return list(range(start, end))
+
+    def delete_embeddings(self, document_id: Any) -> int:
+        """
+        Delete a document's embeddings.
+
+        Args:
+            document_id: Document ID
+
+        Returns:
+            Number of embeddings deleted
+        """
+        with self._lock:
+            n = self._count
+            rows = np.flatnonzero(self._alive[:n] & (self._document_ids[:n] == int(document_id)))
+            self._alive[rows] = False
+            self._alive_count -= len(rows)
+        return len(rows)
+
+    def similarity_search(
+        self,
+        query_embedding: List[float],
+        limit: int = 10,
+        threshold: float = 0.0,
+        model: Optional[str] = None,
+        search_params: Optional[Any] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the embeddings most similar to a query (cosine similarity).
+
+        Args:
+            query_embedding: Query embedding vector
+            limit: Maximum number of results
+            threshold: Minimum similarity threshold
+            model: Optional model filter
+            search_params: Optional ``SearchParams``; ``probes`` sets the IVF lists searched
+            filters: Optional metadata/tenant filters (see ``filter_compiler.matches_filters``)
+
+        Returns:
+            Rows shaped like ``VectorOperations.similarity_search`` results
+        """
+        return self.search_batch([query_embedding], limit, threshold, model, search_params, filters)[0]
+
+    def search_batch(
+        self,
+        query_embeddings: Sequence[Sequence[float]],
+        limit: int = 10,
+        threshold: float = 0.0,
+        model: Optional[str] = None,
+        search_params: Optional[Any] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Run several similarity searches with shared matrix products.
+
+        Args:
+            query_embeddings: Query embedding vectors
+            limit: Maximum number of results per query
+            threshold: Minimum similarity threshold
+            model: Optional model filter
+            search_params: Optional ``SearchParams``; ``probes`` sets the IVF lists searched
+            filters: Optional metadata/tenant filters
+
+        Returns:
+            One result list per query
+        """
+        queries = np.asarray(query_embeddings, dtype=np.float32).reshape(-1, self.dimension)
+        queries = _normalize(queries)
+        if limit <= 0 or not len(queries):
+            return [[] for _ in range(len(queries))]
+
+        self._maybe_train()
+        with self._lock:
+            n = self._count
+            vectors = self._vectors
+            mask = self._alive[:n].copy()
+            if model is not None:
+                code = self._model_names.index(model) if model in self._model_names else -1
+                mask &= self._models[:n] == code
+            if filters:
+                allowed = [doc_id for doc_id, doc in self._documents.items() if matches_filters(doc, filters)]
+                mask &= np.isin(self._document_ids[:n], allowed)
+            document_ids = self._document_ids[:n].copy()
+            centroids = self._centroids
+            lists = self._lists[:n].copy() if centroids is not None else None
+
+        probed = None
+        if centroids is not None:
+            n_probe = getattr(search_params, "probes", None) or self.n_probe
+            probes = np.argsort(-(queries @ centroids.T), axis=1)[:, :min(n_probe, len(centroids))]
+            mask &= np.isin(lists, probes) | (lists < 0)
+            if len(queries) > 1:
+                # Candidates are the union of every query's lists; score each query on its own lists only
+                member = np.zeros((len(queries), len(centroids) + 1), dtype=bool)
+                member[np.arange(len(queries))[:, None], probes] = True
+                member[:, -1] = True  # unassigned rows (list -1)
+                probed = member[:, lists[mask]]
+
+        candidates = np.flatnonzero(mask)
+        scores, rows = self._top_k(queries, vectors, candidates, probed, min(limit, len(candidates)), n)
+        with self._lock:
+            return [self._result_rows(s, r, document_ids, threshold) for s, r in zip(scores, rows)]
+
+    # Documents (DocumentCatalog)
+
+    def put_document(
+        self,
+        title: str,
+        content: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        source: Optional[str] = None,
+        tenant_id: Optional[str] = None,
+        document_id: Optional[int] = None
+    ) -> int:
+        """
+        Insert or replace a document payload.
+
+        Args:
+            title: Document title
+            content: Document content
+            metadata: Optional metadata
+            source: Optional source URL/path
+            tenant_id: Optional tenant ID
+            document_id: ID to store the document under (assigned when None)
+
+        Returns:
+            Document ID
+        """
+        with self._lock:
+            if document_id is None:
+                document_id = self._next_document_id
+            document_id = int(document_id)
+            self._next_document_id = max(self._next_document_id, document_id + 1)
+            self._documents[document_id] = {
+                "title": title,
+                "content": content,
+                "metadata": metadata or {},
+                "source": source,
+                "tenant_id": tenant_id,
+            }
+        return document_id
+
+    def get_document(self, document_id: Any) -> Optional[Dict[str, Any]]:
+        """Return a stored document payload, or None."""
+        document = self._documents.get(int(document_id))
+        return {"id": int(document_id), **document} if document is not None else None
+
+    def iter_documents(self, tenant_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield stored document payloads in ID order.
+
+        Args:
+            tenant_id: Only yield this tenant's documents
+
+        Yields:
+            Document payloads with their ``id``
+        """
+        with self._lock:
+            document_ids = sorted(
+                document_id for document_id, document in self._documents.items()
+                if tenant_id is None or document["tenant_id"] == tenant_id
+            )
+        for document_id in document_ids:
+            document = self.get_document(document_id)
+            if document is not None:
+                yield document
+
+    def update_document(self, document_id: Any, **fields: Any) -> bool:
+        """
+        Update fields (``title``, ``content``, ``metadata``, ``source``) of a stored document.
+
+        Args:
+            document_id: Document ID
+            **fields: Field values to replace
+
+        Returns:
+            False if the document is unknown
+        """
+        with self._lock:
+            document = self._documents.get(int(document_id))
+            if document is None:
+                return False
+            document.update({key: value for key, value in fields.items() if key in document})
+        return True
+
+    def remove_document(self, document_id: Any) -> bool:
+        """
+        Remove a document payload and its embeddings.
+
+        Args:
+            document_id: Document ID
+
+        Returns:
+            True if the document existed
+        """
+        self.delete_embeddings(document_id)
+        with self._lock:
+            return self._documents.pop(int(document_id), None) is not None
+
+    # Index maintenance
+
+    def train(self, n_lists: Optional[int] = None, iterations: int = 10, sample_size: Optional[int] = None) -> int:
+        """
+        Train the IVF coarse quantizer (spherical k-means) and assign every row to a list.
+
+        Args:
+            n_lists: Number of lists (default: ``n_lists`` or ``sqrt(rows)``)
+            iterations: k-means iterations
+            sample_size: Rows sampled for training (default: 64 per list)
+
+        Returns:
+            Number of lists (0 if the store is empty)
+        """
+        with self._lock:
+            n = self._count
+            alive = np.flatnonzero(self._alive[:n])
+            vectors = self._vectors
+        if not len(alive):
+            return 0
+        n_lists = min(n_lists or self.n_lists or max(int(np.sqrt(len(alive))), 1), len(alive))
+        rng = np.random.default_rng(0)
+        sample = np.sort(rng.choice(alive, min(len(alive), sample_size or 64 * n_lists), replace=False))
+        data = np.asarray(vectors[sample])
+
+        centroids = data[rng.choice(len(data), n_lists, replace=False)]
+        for _ in range(iterations):
+            assignment = np.argmax(data @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, data)
+            counts = np.bincount(assignment, minlength=n_lists)
+            # Empty lists keep their previous centroid
+            centroids = np.where(counts[:, None] > 0, _normalize(sums), centroids)
+
+        lists = np.empty(n, dtype=np.int32)
+        for start in range(0, n, self.block_size):
+            block = vectors[start:min(start + self.block_size, n)]
+            lists[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+
+        with self._lock:
+            # Rows appended while training get assigned with the new centroids
+            tail = np.asarray(self._vectors[n:self._count])
+            self._lists[:n] = lists
+            self._lists[n:self._count] = np.argmax(tail @ centroids.T, axis=1) if len(tail) else []
+            self._centroids = centroids.astype(np.float32)
+            self._trained_rows = len(alive)
+        logger.info(f"Trained IVF quantizer: {n_lists} lists over {len(alive)} embeddings")
+        return n_lists
+
+    def flush(self) -> None:
+        """Persist vectors, row bookkeeping and document payloads to ``path`` (no-op in memory)."""
+        if not self.path:
+            return
+        with self._lock:
+            self._vectors.flush()
+            n = self._count
+            index_file = os.path.join(self.path, _INDEX_FILE)
+            with open(index_file + ".tmp", "wb") as f:
+                np.savez(
+                    f,
+                    count=n,
+                    document_ids=self._document_ids[:n],
+                    models=self._models[:n],
+                    alive=self._alive[:n],
+                    lists=self._lists[:n],
+                    centroids=self._centroids if self._centroids is not None else np.zeros((0, self.dimension)),
+                    trained_rows=self._trained_rows,
+                )
+            documents_file = os.path.join(self.path, _DOCUMENTS_FILE)
+            with open(documents_file + ".tmp", "w", encoding="utf-8") as f:
+                json.dump({
+                    "dimension": self.dimension,
+                    "model_names": self._model_names,
+                    "next_document_id": self._next_document_id,
+                    "documents": {str(k): v for k, v in self._documents.items()},
+                }, f)
+            os.replace(documents_file + ".tmp", documents_file)
+            os.replace(index_file + ".tmp", index_file)
+
+    def close(self) -> None:
+        """Flush and release the memory map."""
+        self.flush()
+        with self._lock:
+            self._vectors = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report the store size and index state.
+
+        Returns:
+            Dictionary with row counts, IVF lists and vector bytes
+        """
+        return {
+            "embeddings": self._alive_count,
+            "rows": self._count,
+            "documents": len(self._documents),
+            "ivf_lists": 0 if self._centroids is None else len(self._centroids),
+            "vector_bytes": self._count * self.dimension * 4,
+        }
+
+    # Internals
+
+    def _maybe_train(self) -> None:
+        if not self.ivf_min_rows or self._alive_count < self.ivf_min_rows:
+            return
+        if self._centroids is not None and self._alive_count < _RETRAIN_GROWTH * self._trained_rows:
+            return
+        # One trainer at a time; concurrent searches use the previous quantizer (or none)
+        if self._train_lock.acquire(blocking=False):
+            try:
+                self.train()
+            finally:
+                self._train_lock.release()
+
+    def _top_k(
+        self,
+        queries: np.ndarray,
+        vectors: np.ndarray,
+        candidates: np.ndarray,
+        probed: Optional[np.ndarray],
+        k: int,
+        n: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Blockwise top-k over candidate rows, keeping ``k`` best per query with ``argpartition``."""
+        m = len(queries)
+        best_scores = np.empty((m, 0), dtype=np.float32)
+        best_rows = np.empty((m, 0), dtype=np.int64)
+        if k <= 0:
+            return best_scores, best_rows
+        contiguous = len(candidates) == n
+        for start in range(0, len(candidates), self.block_size):
+            rows = candidates[start:start + self.block_size]
+            block = vectors[start:start + len(rows)] if contiguous else vectors[rows]
+            scores = queries @ np.asarray(block).T
+            if probed is not None:
+                scores[~probed[:, start:start + len(rows)]] = -np.inf
+            scores = np.concatenate([best_scores, scores], axis=1)
+            row_ids = np.concatenate([best_rows, np.broadcast_to(rows, (m, len(rows)))], axis=1)
+            if scores.shape[1] > k:
+                keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                scores = np.take_along_axis(scores, keep, axis=1)
+                row_ids = np.take_along_axis(row_ids, keep, axis=1)
+            best_scores, best_rows = scores, row_ids
+        order = np.argsort(-best_scores, axis=1, kind="stable")
+        return np.take_along_axis(best_scores, order, axis=1), np.take_along_axis(best_rows, order, axis=1)
+
+    def _result_rows(
+        self,
+        scores: np.ndarray,
+        rows: np.ndarray,
+        document_ids: np.ndarray,
+        threshold: float
+    ) -> List[Dict[str, Any]]:
+        results = []
+        for score, row in zip(scores, rows):
+            if not np.isfinite(score) or score < threshold:
+                continue
+            document_id = int(document_ids[row])
+            document = self._documents.get(document_id, {})
+            results.append({
+                "id": int(row),
+                "document_id": document_id,
+                "title": document.get("title"),
+                "content": document.get("content"),
+                "metadata": document.get("metadata", {}),
+                "source": document.get("source"),
+                "similarity": float(score),
+            })
+        return results
+
+    def _model_code(self, model: str) -> int:
+        if model not in self._model_names:
+            self._model_names.append(model)
+        return self._model_names.index(model)
+
+    def _grow(self, capacity: int) -> None:
+        """Reallocate for ``capacity`` rows; a memory-mapped file is extended in place."""
+        if self.path:
+            vectors_file = os.path.join(self.path, _VECTORS_FILE)
+            if self._vectors is not None:
+                self._vectors.flush()
+            with open(vectors_file, "ab") as f:
+                f.truncate(capacity * self.dimension * 4)
+            vectors = np.memmap(vectors_file, dtype=np.float32, mode="r+", shape=(capacity, self.dimension))
+        else:
+            vectors = np.zeros((capacity, self.dimension), dtype=np.float32)
+            if self._vectors is not None:
+                vectors[:self._count] = self._vectors[:self._count]
+        # Searches in flight keep reading the previous arrays
+        self._vectors = vectors
+        for name, fill in (("_document_ids", 0), ("_models", 0), ("_alive", False), ("_lists", -1)):
+            old = getattr(self, name)
+            new = np.full(capacity, fill, dtype=old.dtype)
+            new[:self._count] = old[:self._count]
+            setattr(self, name, new)
+        self._capacity = capacity
+
+    def _load(self) -> None:
+        with open(os.path.join(self.path, _DOCUMENTS_FILE), encoding="utf-8") as f:
+            state = json.load(f)
+        if state["dimension"] != self.dimension:
+            raise ValueError(f"Store at {self.path} has dimension {state['dimension']}, not {self.dimension}")
+        self._model_names = state["model_names"]
+        self._next_document_id = state["next_document_id"]
+        self._documents = {int(k): v for k, v in state["documents"].items()}
+
+        with np.load(os.path.join(self.path, _INDEX_FILE)) as index:
+            self._count = int(index["count"])
+            self._document_ids = index["document_ids"].astype(np.int64)
+            self._models = index["models"].astype(np.int32)
+            self._alive = index["alive"].astype(bool)
+            self._lists = index["lists"].astype(np.int32)
+            centroids = index["centroids"].astype(np.float32)
+            self._centroids = centroids if len(centroids) else None
+            self._trained_rows = int(index["trained_rows"])
+        self._alive_count = int(self._alive.sum())
+
+        # Rows written after the last flush are past ``count`` and get overwritten
+        capacity = os.path.getsize(os.path.join(self.path, _VECTORS_FILE)) // (self.dimension * 4)
+        self._grow(max(capacity, self._count, 1))
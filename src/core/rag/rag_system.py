@@ -6,23 +6,33 @@ Complete Retrieval-Augmented Generation system.
 
 # Standard library imports
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 # Local application/library specific imports
 from ..agno_agent_framework.memory import AgentMemory, MemoryType
 from ..cache_mechanism import CacheConfig, CacheMechanism
 from ..litellm_gateway import LiteLLMGateway
+from ..postgresql_database.async_connection import AsyncDatabaseConnection
 from ..postgresql_database.connection import DatabaseConnection
-from ..postgresql_database.vector_operations import VectorOperations
+from ..postgresql_database.full_text_search import FullTextSearch
+from ..postgresql_database.index_tuner import TunedSearchParams
+from ..postgresql_database.reindex_scheduler import create_reindex_scheduler
+from ..postgresql_database.vector_operations import AsyncVectorOperations, VectorOperations
 from ..postgresql_database.vector_index_manager import (
     VectorIndexManager,
     create_vector_index_manager,
     IndexType,
-    IndexDistance
+    IndexDistance,
+    QuantizationMode
 )
+from .answer_cache import AnswerCache
+from ..utils.blocking_executor import get_blocking_executor, run_blocking
 from .document_processor import DocumentChunk, DocumentProcessor
+from .embedding_cache import QueryEmbeddingCache
 from .generator import RAGGenerator
 from .retriever import Retriever
+from .hybrid_retrieval import DEFAULT_RRF_K, FusionMethod
+from .vector_store import DocumentCatalog, VectorStore
 
 # Set up logger
 logger = logging.getLogger(__name__)
@@ -37,7 +47,7 @@ class RAGSystem:
 
     def __init__(
         self,
-        db: DatabaseConnection,
+        db: Optional[DatabaseConnection],
         gateway: LiteLLMGateway,
         embedding_model: str = "text-embedding-3-small",
         generation_model: str = "gpt-4",
@@ -45,13 +55,14 @@ class RAGSystem:
         cache_config: Optional[CacheConfig] = None,
         enable_memory: bool = True,
         memory_config: Optional[Dict[str, Any]] = None,
+        async_db: Optional[AsyncDatabaseConnection] = None,
         **kwargs: Any
     ):
         """
         Initialize RAG system.
 
         Args:
-            db: Database connection
+            db: Database connection (may be None with an in-process ``vector_store``)
             gateway: LiteLLM gateway
             embedding_model: Model for embeddings
             generation_model: Model for generation
@@ -59,6 +70,8 @@ class RAGSystem:
             cache_config: Optional cache configuration
             enable_memory: Enable memory for conversation context
             memory_config: Optional memory configuration
+            async_db: Optional async database connection used by ``query_async``
+                so vector search does not block the event loop
             **kwargs: Additional configuration options:
                 - chunk_size: Document chunk size (default: 1000)
                 - chunk_overlap: Chunk overlap size (default: 200)
@@ -68,12 +81,46 @@ class RAGSystem:
                 - enable_preprocessing: Enable preprocessing (default: True)
                 - enable_metadata_extraction: Enable metadata extraction (default: True)
                 - enable_multimodal: Enable multimodal support (default: True)
+                - search_params: ANN ``SearchParams`` operating point
+                - tuned_search_params: Apply each tenant's ``IndexAutotuner`` operating
+                  point, falling back to ``search_params`` (default: True with pgvector);
+                  a ``TunedSearchParams`` instance can be passed to share its cache
+                - partition_manager: ``TenantPartitionManager`` when ``embeddings``
+                  uses the tenant-partitioned layout
+                - reindex_policy: ``ReindexPolicy`` for background index rebuilds
+                - reindex_scheduler: Shared ``ReindexScheduler`` (overrides reindex_policy)
+                - quantization: ``QuantizationMode`` of the vector index (halfvec/binary
+                  candidates re-ranked at full precision); requires ``embedding_dimension``
+                - embedding_dimension: Vector dimension of the embedding model
+                - rerank_factor: Quantized-index candidates per result (default: 4)
+                - full_text_search: Index chunks in ``document_chunks`` for keyword
+                  and hybrid retrieval (default: True)
+                - text_search_language: Default text search language; a document's
+                  ``metadata["language"]`` overrides it (default: "english")
+                - hybrid_fusion: Hybrid retrieval fusion, "rrf" (Reciprocal Rank
+                  Fusion) or "calibrated" (min-max normalized scores) (default: "rrf")
+                - rrf_k: Reciprocal Rank Fusion smoothing constant (default: 60)
+                - executor: Bounded executor for the sync work left on the async
+                  path (default: the shared RAG executor, ``RAG_BLOCKING_WORKERS`` threads)
+                - query_embedding_cache: Cache query embeddings in an in-process LRU
+                  in front of ``cache`` (default: True); a ``QueryEmbeddingCache``
+                  instance can be passed to share one across RAG systems
+                - query_embedding_cache_size: In-process LRU entries (default: 1024)
+                - query_embedding_cache_ttl: Shared cache TTL in seconds (default: 86400)
+                - answer_cache_ttl: Answer cache TTL in seconds (default: 3600); entries
+                  are invalidated precisely when their documents change
+                - answer_cache: ``AnswerCache`` instance to share across RAG systems
+                  (default: one over ``cache``)
+                - vector_store: ``VectorStore`` to use instead of pgvector, e.g.
+                  ``NumpyVectorStore``; if it is also a ``DocumentCatalog``,
+                  documents are registered with it and ``db`` is optional
         """
         self.db = db
         self.gateway = gateway
         self.embedding_model = embedding_model
         self.generation_model = generation_model
         self.cache = cache or CacheMechanism(cache_config or CacheConfig())
+        self.executor = kwargs.get("executor") or get_blocking_executor()
 
         # Initialize memory for conversation context
         self.memory: Optional[AgentMemory] = None
@@ -88,10 +135,34 @@ class RAGSystem:
             )
 
         # Initialize components
-        self.vector_ops = VectorOperations(db)
+        # Optional ANN operating point, e.g. from postgresql_database.load_search_params()
+        search_params = kwargs.get("search_params")
+        self.partition_manager = kwargs.get("partition_manager")
+        vector_options = {
+            "search_params": search_params,
+            "partitioned": self.partition_manager is not None,
+            "quantization": kwargs.get("quantization", QuantizationMode.NONE),
+            "dimension": kwargs.get("embedding_dimension"),
+            "rerank_factor": kwargs.get("rerank_factor", 4),
+        }
+        vector_store: Optional[VectorStore] = kwargs.get("vector_store")
+        self.vector_ops = vector_store if vector_store is not None else VectorOperations(db, **vector_options)
+        self.document_catalog = vector_store if isinstance(vector_store, DocumentCatalog) else None
+        if db is None and self.document_catalog is None:
+            raise ValueError("A database connection is required unless vector_store is a DocumentCatalog")
+        self.async_db = async_db
+        self.async_vector_ops = (
+            AsyncVectorOperations(async_db, **vector_options) if async_db and vector_store is None else None
+        )
         
-        # Initialize vector index manager
+        # Initialize vector index manager (pgvector indexes only)
         self.index_manager = create_vector_index_manager(db)
+        self.reindex_scheduler = None
+        if vector_store is None:
+            self.reindex_scheduler = kwargs.get("reindex_scheduler") or create_reindex_scheduler(
+                self.index_manager,
+                policy=kwargs.get("reindex_policy")
+            )
         
         # Initialize document processor with multimodal support
         processor_kwargs = {
@@ -107,10 +178,45 @@ class RAGSystem:
         }
         self.document_processor = DocumentProcessor(**processor_kwargs)
         
+        # Repeated queries reuse their embedding instead of calling the API
+        embedding_cache = kwargs.get("query_embedding_cache", True)
+        if embedding_cache is True:
+            embedding_cache = QueryEmbeddingCache(
+                self.cache,
+                max_entries=kwargs.get("query_embedding_cache_size", 1024),
+                ttl=kwargs.get("query_embedding_cache_ttl", 86_400)
+            )
+        self.embedding_cache: Optional[QueryEmbeddingCache] = embedding_cache or None
+
+        # Answers record the document versions they were built from
+        self.answer_cache: AnswerCache = kwargs.get("answer_cache") or AnswerCache(
+            self.cache,
+            ttl=kwargs.get("answer_cache_ttl", 3600),
+            executor=self.executor
+        )
+
+        # Tenants' autotuned operating points, falling back to search_params
+        tuned_search_params = kwargs.get("tuned_search_params", True)
+        if tuned_search_params is True:
+            tuned_search_params = TunedSearchParams(db, default=search_params) if vector_store is None else None
+        self.tuned_search_params: Optional[TunedSearchParams] = tuned_search_params or None
+
+        # Chunk-level keyword index for hybrid retrieval
+        self.full_text = None
+        if db is not None and kwargs.get("full_text_search", True):
+            self.full_text = FullTextSearch(db, language=kwargs.get("text_search_language", "english"))
+
         self.retriever = Retriever(
             vector_ops=self.vector_ops,
             gateway=gateway,
-            embedding_model=embedding_model
+            embedding_model=embedding_model,
+            async_vector_ops=self.async_vector_ops,
+            full_text=self.full_text,
+            fusion=kwargs.get("hybrid_fusion", FusionMethod.RRF),
+            rrf_k=kwargs.get("rrf_k", DEFAULT_RRF_K),
+            executor=self.executor,
+            embedding_cache=self.embedding_cache,
+            tuned_search_params=self.tuned_search_params
         )
         self.generator = RAGGenerator(
             gateway=gateway,
@@ -161,23 +267,7 @@ class RAGSystem:
         if not content:
             raise ValueError("Either 'content' or 'file_path' must be provided")
         
-        # Insert document with tenant_id
-        query = """
-        INSERT INTO documents (title, content, metadata, source, tenant_id)
-        VALUES (%s, %s, %s::jsonb, %s, %s)
-        RETURNING id;
-        """
-
-        import json
-        metadata_json = json.dumps(metadata or {})
-
-        result = self.db.execute_query(
-            query,
-            (title, content, metadata_json, source, tenant_id),
-            fetch_one=True
-        )
-
-        document_id = str(result['id'])
+        document_id = self._insert_document(title, content, metadata, source, tenant_id)
 
         # Process and chunk document
         chunks = self.document_processor.chunk_document(
@@ -189,6 +279,9 @@ class RAGSystem:
         if not chunks:
             return document_id
 
+        # Keyword index (full-text search at chunk granularity)
+        self._index_chunks(document_id, chunks, metadata)
+
         # Batch processing: Collect all chunk texts
         chunk_texts = [chunk.content for chunk in chunks]
 
@@ -237,19 +330,116 @@ class RAGSystem:
 
         # Batch insert embeddings
         if embeddings_data:
+            if self.partition_manager is not None:
+                self.partition_manager.ensure_tenant_partition(tenant_id)
             self.vector_ops.batch_insert_embeddings(embeddings_data)
             
-            # Auto-reindex after batch insert (non-blocking)
-            try:
-                self.index_manager.auto_reindex_on_embedding_change(
-                    table_name="embeddings",
-                    column_name="embedding"
-                )
-            except Exception as e:
-                logger.warning(f"Auto-reindexing failed (non-critical): {str(e)}")
+            # Rebuilds are left to the scheduler (thresholds, windows, budget)
+            self._notify_change()
+
+        # Cached answers for this tenant were built without the new document
+        self.answer_cache.invalidate_tenant(tenant_id)
 
         return document_id
 
+    def _insert_document(
+        self,
+        title: str,
+        content: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        source: Optional[str] = None,
+        tenant_id: Optional[str] = None
+    ) -> str:
+        """
+        Store a document row and register it with the vector store's document catalog.
+
+        Args:
+            title: Document title
+            content: Document content
+            metadata: Optional metadata
+            source: Optional source URL/path
+            tenant_id: Optional tenant ID
+
+        Returns:
+            Document ID
+        """
+        document_id = None
+        if self.db is not None:
+            query = """
+            INSERT INTO documents (title, content, metadata, source, tenant_id)
+            VALUES (%s, %s, %s::jsonb, %s, %s)
+            RETURNING id;
+            """
+
+            import json
+            metadata_json = json.dumps(metadata or {})
+
+            result = self.db.execute_query(
+                query,
+                (title, content, metadata_json, source, tenant_id),
+                fetch_one=True,
+                prepare="document_insert"
+            )
+            document_id = result['id']
+
+        if self.document_catalog is not None:
+            # Mirrors the database ID when there is one
+            document_id = self.document_catalog.put_document(
+                title, content, metadata, source, tenant_id, document_id=document_id
+            )
+
+        return str(document_id)
+
+    def _index_chunks(
+        self,
+        document_id: str,
+        chunks: List[DocumentChunk],
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Add chunks to the full-text keyword index in the document's language.
+
+        Args:
+            document_id: Document ID
+            chunks: Document chunks
+            metadata: Optional document metadata (``language`` selects the text search configuration)
+        """
+        if self.full_text is None:
+            return
+        try:
+            self.full_text.index_chunks(
+                document_id, [chunk.content for chunk in chunks], language=(metadata or {}).get("language")
+            )
+        except Exception as e:
+            # Vector retrieval still works; keyword search just misses this document
+            logger.warning(f"Failed to index chunks of document {document_id} for keyword search: {e}")
+
+    def _answer_key(
+        self,
+        query: str,
+        tenant_id: Optional[str],
+        top_k: int,
+        threshold: float,
+        max_tokens: int,
+        retrieval_strategy: str
+    ) -> str:
+        """Answer cache key for a (rewritten) query and everything the answer depends on."""
+        return self.answer_cache.key(
+            query,
+            tenant_id,
+            top_k=top_k,
+            threshold=threshold,
+            max_tokens=max_tokens,
+            retrieval_strategy=retrieval_strategy,
+            embedding_model=self.embedding_model,
+            generation_model=self.generation_model
+        )
+
+    def _notify_change(self) -> None:
+        """Tell the reindex scheduler that embeddings changed (pgvector only)."""
+        if self.reindex_scheduler is not None:
+            self.reindex_scheduler.notify_change()
+
     def _rewrite_query(self, query: str) -> str:
         """
         Rewrite query to improve retrieval quality.
@@ -332,20 +522,23 @@ class RAGSystem:
             query = self._rewrite_query(query)
 
         # Include tenant_id in cache key for tenant isolation
-        cache_key = f"rag:query:{tenant_id or 'global'}:{query}:{top_k}:{threshold}:{max_tokens}:{retrieval_strategy}"
-        cached = self.cache.get(cache_key, tenant_id=tenant_id)
-        if cached:
-            return cached
+        cached = self.answer_cache.lookup(self._answer_key(
+            query, tenant_id, top_k, threshold, max_tokens, retrieval_strategy
+        ), tenant_id)
+        if cached.hit:
+            return cached.result
 
         try:
             # Use hybrid retrieval if specified
+            retrieval_timings = None
             if retrieval_strategy == "hybrid":
-                retrieved_docs = self.retriever.retrieve_hybrid(
+                hybrid = self.retriever.search_hybrid(
                     query=query,
                     top_k=top_k,
                     threshold=threshold,
                     tenant_id=tenant_id
                 )
+                retrieved_docs, retrieval_timings = hybrid.documents, hybrid.timings
             else:
                 retrieved_docs = self.retriever.retrieve(
                     query=query,
@@ -375,9 +568,11 @@ class RAGSystem:
                 "original_query": original_query,
                 "memory_used": len(memories) if memories else 0
             }
+            if retrieval_timings is not None:
+                result["retrieval_timings"] = retrieval_timings
 
-            # Store in cache
-            self.cache.set(cache_key, result, ttl=300, tenant_id=tenant_id)
+            # Store in cache, tagged with the versions of the retrieved documents
+            self.answer_cache.put(cached, result, retrieved_docs)
 
             # Store in memory for future context
             if self.memory:
@@ -453,21 +648,14 @@ class RAGSystem:
         """
         # RAG QUERY PROCESS: Step-by-step retrieval and generation
 
+        # Nothing below runs blocking I/O on the event loop: embedding, generation,
+        # the async DB pool and the cache are awaited, and the remaining sync work
+        # (in-process memory, sync DB fallbacks) goes to the bounded executor.
+
         # STEP 1: Retrieve relevant conversation memories (if memory enabled)
         # This provides context from previous conversations to improve answer relevance
         # Cost impact: Memory retrieval is free (no API call), improves answer quality
-        memories = []
-        memory_context = ""
-        if self.memory:
-            memories = self.memory.retrieve(
-                query=query,
-                limit=5,
-                memory_types=[MemoryType.EPISODIC, MemoryType.SEMANTIC]
-            )
-            if memories:
-                memory_context = "\n".join([
-                    f"- {mem.content}" for mem in memories[:3]
-                ])
+        memories, memory_context = await self._memory_context_async(query)
 
         # STEP 2: Query rewriting for optimization
         # Rewrites user query to be more effective for vector search
@@ -479,40 +667,25 @@ class RAGSystem:
         # STEP 3: Check cache for previous identical queries
         # COST OPTIMIZATION: Cache hits avoid expensive embedding + generation calls
         # Cost saved per cache hit: ~$0.003-0.03 (embedding + generation)
-        cache_key = f"rag:query:{tenant_id or 'global'}:{query}:{top_k}:{threshold}:{max_tokens}:{retrieval_strategy}"
-        cached = self.cache.get(cache_key, tenant_id=tenant_id)
-        if cached:
-            return cached
+        # Entries are dropped when a document they were built from changes
+        cached = await self.answer_cache.lookup_async(self._answer_key(
+            query, tenant_id, top_k, threshold, max_tokens, retrieval_strategy
+        ), tenant_id)
+        if cached.hit:
+            return cached.result
 
         try:
             # STEP 4: Document retrieval (vector search in database)
             # This finds the most relevant document chunks for the query
             # Cost: ~$0.0001-0.001 per query (embedding generation for query)
-            if retrieval_strategy == "hybrid":
-                # Hybrid: Combines vector search + keyword search for better results
-                retrieved_docs = self.retriever.retrieve_hybrid(
-                    query=query,
-                    top_k=top_k,
-                    threshold=threshold,
-                    tenant_id=tenant_id
-                )
-            else:
-                # Vector-only: Fast, semantic similarity search
-                retrieved_docs = self.retriever.retrieve(
-                    query=query,
-                    top_k=top_k,
-                    threshold=threshold,
-                    tenant_id=tenant_id
-                )
+            retrieved_docs, retrieval_timings = await self._retrieve_async(
+                query, tenant_id, top_k, threshold, retrieval_strategy
+            )
 
             # STEP 5: Enhance context with memory if available
             # Combines retrieved documents with conversation memory for richer context
             # This enables RAG to answer questions using both documents and conversation history
-            enhanced_context = retrieved_docs
-            if memory_context:
-                enhanced_context = [
-                    {"title": "Previous Context", "content": memory_context, "source": "memory"}
-                ] + retrieved_docs
+            enhanced_context = self._with_memory_context(retrieved_docs, memory_context)
 
             # STEP 6: Generate answer using LLM with retrieved context
             # This is the generation step: LLM creates answer from retrieved documents
@@ -532,23 +705,14 @@ class RAGSystem:
                 "original_query": original_query,
                 "memory_used": len(memories) if memories else 0
             }
+            if retrieval_timings is not None:
+                result["retrieval_timings"] = retrieval_timings
 
-            # Store in cache
-            self.cache.set(cache_key, result, ttl=300, tenant_id=tenant_id)
+            # Store in cache, tagged with the versions of the retrieved documents
+            await self.answer_cache.put_async(cached, result, retrieved_docs)
 
             # Store in memory for future context
-            if self.memory:
-                self.memory.store(
-                    content=f"Query: {original_query}\nAnswer: {answer}",
-                    memory_type=MemoryType.EPISODIC,
-                    importance=0.7,
-                    metadata={
-                        "user_id": user_id,
-                        "conversation_id": conversation_id,
-                        "tenant_id": tenant_id,
-                        "num_documents": len(retrieved_docs)
-                    }
-                )
+            await self._store_memory_async(original_query, answer, retrieved_docs, tenant_id, user_id, conversation_id)
 
             return result
         except (ConnectionError, TimeoutError) as e:
@@ -579,6 +743,201 @@ class RAGSystem:
                 "error": f"An error occurred: {str(e)}",
             }
 
+    async def query_stream_async(
+        self,
+        query: str,
+        tenant_id: Optional[str] = None,
+        top_k: int = 5,
+        threshold: float = 0.7,
+        max_tokens: int = 1000,
+        use_query_rewriting: bool = True,
+        retrieval_strategy: str = "vector",
+        user_id: Optional[str] = None,
+        conversation_id: Optional[str] = None,
+        check_hallucination: Optional[bool] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Query the RAG system, streaming the answer as it is generated.
+
+        Events are ``{"event": name, "data": {...}}`` dictionaries, in order:
+
+        - ``sources``: retrieved documents, sent before generation starts
+        - ``delta``: one per token delta from the gateway stream (``text``)
+        - ``hallucination``: the verdict, if detection ran
+        - ``done``: the full answer, as ``query_async`` returns it in ``answer``
+        - ``error``: replaces the remaining events if the query fails
+
+        Cached answers are replayed as a single delta. Streamed answers are
+        cached and shared with ``query``/``query_async``.
+
+        Args:
+            query: User query
+            tenant_id: Optional tenant ID for multi-tenant SaaS
+            top_k: Number of documents to retrieve
+            threshold: Similarity threshold
+            max_tokens: Maximum tokens in response
+            use_query_rewriting: Whether to rewrite query
+            retrieval_strategy: Retrieval strategy
+            user_id: Optional user ID for memory context
+            conversation_id: Optional conversation ID for memory context
+            check_hallucination: Whether to check for hallucinations (default: generator setting)
+
+        Yields:
+            Stream events
+        """
+        try:
+            memories, memory_context = await self._memory_context_async(query)
+            original_query = query
+            if use_query_rewriting:
+                query = self._rewrite_query(query)
+            query_used = query if use_query_rewriting else original_query
+
+            cached = await self.answer_cache.lookup_async(self._answer_key(
+                query, tenant_id, top_k, threshold, max_tokens, retrieval_strategy
+            ), tenant_id)
+            if cached.hit:
+                yield self._sources_event(cached.result["retrieved_documents"], query_used,
+                                          cached.result.get("retrieval_timings"), cached=True)
+                answer = cached.result["answer"]
+                text = answer.get("response", "") if isinstance(answer, dict) else str(answer or "")
+                if text:
+                    yield {"event": "delta", "data": {"text": text}}
+                if isinstance(answer, dict) and "hallucination_result" in answer:
+                    yield {"event": "hallucination", "data": answer["hallucination_result"]}
+                yield {"event": "done", "data": {"answer": answer, "cached": True}}
+                return
+
+            retrieved_docs, retrieval_timings = await self._retrieve_async(
+                query, tenant_id, top_k, threshold, retrieval_strategy
+            )
+            # Sources go out before generation, so clients can render them immediately
+            yield self._sources_event(retrieved_docs, query_used, retrieval_timings, cached=False)
+
+            answer: Dict[str, Any] = {}
+            async for event in self.generator.generate_stream_async(
+                query=original_query,
+                context_documents=self._with_memory_context(retrieved_docs, memory_context),
+                max_tokens=max_tokens,
+                check_hallucination=check_hallucination
+            ):
+                if event["type"] == "delta":
+                    yield {"event": "delta", "data": {"text": event["text"]}}
+                else:
+                    answer = event["result"]
+            if "hallucination_result" in answer:
+                yield {"event": "hallucination", "data": answer["hallucination_result"]}
+
+            result = {
+                "answer": answer,
+                "retrieved_documents": retrieved_docs,
+                "num_documents": len(retrieved_docs),
+                "query_used": query_used,
+                "original_query": original_query,
+                "memory_used": len(memories) if memories else 0
+            }
+            if retrieval_timings is not None:
+                result["retrieval_timings"] = retrieval_timings
+            await self.answer_cache.put_async(cached, result, retrieved_docs)
+            await self._store_memory_async(original_query, answer, retrieved_docs, tenant_id, user_id, conversation_id)
+
+            yield {"event": "done", "data": {"answer": answer, "cached": False}}
+        except Exception as e:
+            # Headers are already sent, so errors travel in-band as the last event
+            logger.error(f"Error during streaming RAG query: {e}", exc_info=True)
+            yield {"event": "error", "data": {"error": f"An error occurred: {str(e)}"}}
+
+    async def _memory_context_async(self, query: str) -> Tuple[List[Any], str]:
+        """Retrieve conversation memories off the event loop, with a prompt-ready summary."""
+        if not self.memory:
+            return [], ""
+        memories = await run_blocking(
+            self.executor,
+            self.memory.retrieve,
+            query=query,
+            limit=5,
+            memory_types=[MemoryType.EPISODIC, MemoryType.SEMANTIC]
+        )
+        memory_context = "\n".join([f"- {mem.content}" for mem in memories[:3]]) if memories else ""
+        return memories or [], memory_context
+
+    async def _retrieve_async(
+        self,
+        query: str,
+        tenant_id: Optional[str],
+        top_k: int,
+        threshold: float,
+        retrieval_strategy: str
+    ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, float]]]:
+        """Retrieve documents for a query (with branch timings for hybrid retrieval)."""
+        if retrieval_strategy == "hybrid":
+            # Hybrid: vector and keyword search run concurrently and are rank-fused
+            hybrid = await self.retriever.search_hybrid_async(
+                query=query,
+                top_k=top_k,
+                threshold=threshold,
+                tenant_id=tenant_id
+            )
+            return hybrid.documents, hybrid.timings
+        # Vector-only: Fast, semantic similarity search
+        retrieved_docs = await self.retriever.retrieve_async(
+            query=query,
+            top_k=top_k,
+            threshold=threshold,
+            tenant_id=tenant_id
+        )
+        return retrieved_docs, None
+
+    @staticmethod
+    def _with_memory_context(documents: List[Dict[str, Any]], memory_context: str) -> List[Dict[str, Any]]:
+        """Prepend conversation memory to the generation context, if any."""
+        if not memory_context:
+            return documents
+        return [{"title": "Previous Context", "content": memory_context, "source": "memory"}] + documents
+
+    async def _store_memory_async(
+        self,
+        original_query: str,
+        answer: Any,
+        retrieved_docs: List[Dict[str, Any]],
+        tenant_id: Optional[str],
+        user_id: Optional[str],
+        conversation_id: Optional[str]
+    ) -> None:
+        """Store the exchange in conversation memory off the event loop."""
+        if not self.memory:
+            return
+        await run_blocking(
+            self.executor,
+            self.memory.store,
+            content=f"Query: {original_query}\nAnswer: {answer}",
+            memory_type=MemoryType.EPISODIC,
+            importance=0.7,
+            metadata={
+                "user_id": user_id,
+                "conversation_id": conversation_id,
+                "tenant_id": tenant_id,
+                "num_documents": len(retrieved_docs)
+            }
+        )
+
+    @staticmethod
+    def _sources_event(
+        documents: List[Dict[str, Any]],
+        query_used: str,
+        retrieval_timings: Optional[Dict[str, float]],
+        cached: bool
+    ) -> Dict[str, Any]:
+        """Build the ``sources`` stream event."""
+        data: Dict[str, Any] = {
+            "documents": documents,
+            "num_documents": len(documents),
+            "query_used": query_used,
+            "cached": cached
+        }
+        if retrieval_timings is not None:
+            data["retrieval_timings"] = retrieval_timings
+        return {"event": "sources", "data": data}
+
     async def ingest_document_async(
         self,
         title: str,
@@ -598,26 +957,13 @@ class RAGSystem:
         Returns:
             Document ID
         """
-        # Insert document
-        query = """
-        INSERT INTO documents (title, content, metadata, source)
-        VALUES (%s, %s, %s::jsonb, %s)
-        RETURNING id;
-        """
-
-        import json
-        metadata_json = json.dumps(metadata or {})
-
-        result = self.db.execute_query(
-            query,
-            (title, content, metadata_json, source),
-            fetch_one=True
-        )
-
-        document_id = str(result['id'])
+        # Database writes and chunking are synchronous; keep them off the event loop
+        document_id = await run_blocking(self.executor, self._insert_document, title, content, metadata, source)
 
         # Process and chunk document
-        chunks = self.document_processor.chunk_document(
+        chunks = await run_blocking(
+            self.executor,
+            self.document_processor.chunk_document,
             content=content,
             document_id=document_id,
             metadata=metadata
@@ -626,6 +972,9 @@ class RAGSystem:
         if not chunks:
             return document_id
 
+        # Keyword index (full-text search at chunk granularity)
+        await run_blocking(self.executor, self._index_chunks, document_id, chunks, metadata)
+
         # Batch processing: Collect all chunk texts
         chunk_texts = [chunk.content for chunk in chunks]
 
@@ -674,16 +1023,16 @@ class RAGSystem:
 
         # Batch insert embeddings
         if embeddings_data:
-            self.vector_ops.batch_insert_embeddings(embeddings_data)
+            if self.async_vector_ops is not None:
+                await self.async_vector_ops.batch_insert_embeddings(embeddings_data)
+            else:
+                await run_blocking(self.executor, self.vector_ops.batch_insert_embeddings, embeddings_data)
             
-            # Auto-reindex after batch insert (non-blocking)
-            try:
-                self.index_manager.auto_reindex_on_embedding_change(
-                    table_name="embeddings",
-                    column_name="embedding"
-                )
-            except Exception as e:
-                logger.warning(f"Auto-reindexing failed (non-critical): {str(e)}")
+            # Rebuilds are left to the scheduler (thresholds, windows, budget)
+            self._notify_change()
+
+        # Cached answers were built without the new document
+        await run_blocking(self.executor, self.answer_cache.invalidate_tenant)
 
         return document_id
 
@@ -868,7 +1217,13 @@ class RAGSystem:
                 updates.append("metadata = %s::jsonb")
                 params.append(json.dumps(metadata))
 
-            if updates:
+            if self.document_catalog is not None:
+                fields = {"title": title, "metadata": metadata, "content": content}
+                self.document_catalog.update_document(
+                    document_id, **{key: value for key, value in fields.items() if value is not None}
+                )
+
+            if updates and self.db is not None:
                 query = f"""
                 UPDATE documents
                 SET {', '.join(updates)}
@@ -879,53 +1234,19 @@ class RAGSystem:
 
             # If content changed, re-process document
             if content is not None:
-                # Delete old chunks and embeddings
-                self._delete_document_chunks(document_id)
-
-                # Re-process and re-embed
-                chunks = self.document_processor.chunk_document(
-                    content=content,
-                    document_id=document_id,
-                    metadata=metadata
-                )
-
-                if chunks:
-                    chunk_texts = [chunk.content for chunk in chunks]
-
-                    # Generate embeddings in batch
-                    embedding_response = self.gateway.embed(
-                        texts=chunk_texts,
-                        model=self.embedding_model
-                    )
-
-                    if embedding_response.embeddings:
-                        embeddings_data = []
-                        for i, embedding in enumerate(embedding_response.embeddings):
-                            if i < len(chunks):
-                                embeddings_data.append((
-                                    int(document_id),
-                                    embedding,
-                                    self.embedding_model
-                                ))
-
-                        if embeddings_data:
-                            self.vector_ops.batch_insert_embeddings(embeddings_data)
-            
-            # Auto-reindex after batch insert (non-blocking)
-            try:
-                self.index_manager.auto_reindex_on_embedding_change(
-                    table_name="embeddings",
-                    column_name="embedding"
-                )
-            except Exception as e:
-                logger.warning(f"Auto-reindexing failed (non-critical): {str(e)}")
+                self._reembed_document(document_id, content, metadata)
 
                 # Update content in database
-                query = "UPDATE documents SET content = %s WHERE id = %s;"
-                self.db.execute_query(query, (content, document_id))
+                if self.db is not None:
+                    query = "UPDATE documents SET content = %s WHERE id = %s;"
+                    self.db.execute_query(query, (content, document_id))
+
+                # Rebuilds are left to the scheduler (thresholds, windows, budget)
+                self._notify_change()
 
-            # Invalidate cache for this document
+            # Invalidate cache for this document and the answers built from it
             self.cache.invalidate_pattern(f"rag:doc:{document_id}")
+            self.answer_cache.invalidate_documents([document_id])
 
             return True
         except (ConnectionError, ValueError) as e:
@@ -937,6 +1258,138 @@ class RAGSystem:
             logger.error(f"Unexpected error updating document {document_id}: {e}", exc_info=True)
             return False
 
+    def reembed_documents(
+        self,
+        tenant_id: Optional[str] = None,
+        embedding_model: Optional[str] = None,
+        itersize: int = 500
+    ) -> int:
+        """
+        Re-chunk and re-embed stored documents (e.g. after an embedding model change).
+
+        Documents are streamed from a server-side cursor ``itersize`` rows at a
+        time instead of being loaded into memory all at once (or read from the
+        ``vector_store`` document catalog when there is no database).
+
+        Args:
+            tenant_id: Only re-embed this tenant's documents
+            embedding_model: New embedding model (defaults to the current one)
+            itersize: Documents fetched per round-trip
+
+        Returns:
+            Number of documents re-embedded
+        """
+        if embedding_model:
+            # Queries must be embedded and matched (``e.model``) under the new model too
+            self.embedding_model = embedding_model
+            self.retriever.embedding_model = embedding_model
+
+        if self.db is not None:
+            query = "SELECT id, content, metadata FROM documents"
+            params: tuple = ()
+            if tenant_id is not None:
+                query += " WHERE tenant_id = %s"
+                params = (tenant_id,)
+            query += " ORDER BY id;"
+            rows = self.db.stream_query(query, params, itersize=itersize)
+        else:
+            rows = self.document_catalog.iter_documents(tenant_id=tenant_id)
+
+        reembedded = 0
+        for row in rows:
+            try:
+                self._reembed_document(str(row["id"]), row["content"] or "", row["metadata"])
+                reembedded += 1
+            except Exception as e:
+                logger.error(f"Failed to re-embed document {row['id']}: {e}", exc_info=True)
+
+        if reembedded:
+            self._notify_change()
+            self.answer_cache.invalidate_all()
+        return reembedded
+
+    def backfill_keyword_index(
+        self,
+        tenant_id: Optional[str] = None,
+        itersize: int = 500
+    ) -> int:
+        """
+        Add stored documents that predate the chunk keyword index to it.
+
+        Documents are chunked with the current document processor; run once
+        after upgrading (it skips documents that already have chunks).
+
+        Args:
+            tenant_id: Only backfill this tenant's documents
+            itersize: Documents fetched per round-trip
+
+        Returns:
+            Number of documents indexed
+        """
+        if self.full_text is None:
+            return 0
+
+        def chunk(row: Dict[str, Any]) -> List[str]:
+            chunks = self.document_processor.chunk_document(
+                content=row["content"] or "",
+                document_id=str(row["id"]),
+                metadata=row["metadata"]
+            )
+            return [chunk.content for chunk in chunks]
+
+        indexed = self.full_text.backfill(chunk, tenant_id=tenant_id, itersize=itersize)
+        if indexed:
+            # Keyword and hybrid answers may now include these documents
+            self.answer_cache.invalidate_all()
+        return indexed
+
+    def _reembed_document(
+        self,
+        document_id: str,
+        content: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Replace a document's embeddings with fresh ones for ``content``.
+
+        Args:
+            document_id: Document ID
+            content: Document content to chunk and embed
+            metadata: Optional metadata passed to the chunker
+        """
+        # Delete old chunks and embeddings
+        self._delete_document_chunks(document_id)
+
+        # Re-process and re-embed
+        chunks = self.document_processor.chunk_document(
+            content=content,
+            document_id=document_id,
+            metadata=metadata
+        )
+
+        if chunks:
+            self._index_chunks(document_id, chunks, metadata)
+            chunk_texts = [chunk.content for chunk in chunks]
+
+            # Generate embeddings in batch
+            embedding_response = self.gateway.embed(
+                texts=chunk_texts,
+                model=self.embedding_model
+            )
+
+            if embedding_response.embeddings:
+                embeddings_data = []
+                for i, embedding in enumerate(embedding_response.embeddings):
+                    if i < len(chunks):
+                        embeddings_data.append((
+                            int(document_id),
+                            embedding,
+                            self.embedding_model
+                        ))
+
+                if embeddings_data:
+                    self.vector_ops.batch_insert_embeddings(embeddings_data)
+
     def delete_document(self, document_id: str) -> bool:
         """
         Delete a document and its associated chunks/embeddings from the RAG system.
@@ -952,12 +1405,15 @@ class RAGSystem:
             self._delete_document_chunks(document_id)
 
             # Delete document
-            query = "DELETE FROM documents WHERE id = %s;"
-            self.db.execute_query(query, (document_id,))
+            if self.document_catalog is not None:
+                self.document_catalog.remove_document(document_id)
+            if self.db is not None:
+                query = "DELETE FROM documents WHERE id = %s;"
+                self.db.execute_query(query, (document_id,), fetch_all=False)
 
-            # Invalidate cache
+            # Invalidate cache and the answers built from this document
             self.cache.invalidate_pattern(f"rag:doc:{document_id}")
-            self.cache.invalidate_pattern(f"rag:query:*")
+            self.answer_cache.invalidate_documents([document_id])
 
             return True
         except (ConnectionError, ValueError) as e:
@@ -977,10 +1433,9 @@ class RAGSystem:
             document_id: Document ID
         """
         # Delete embeddings
-        query = "DELETE FROM embeddings WHERE document_id = %s;"
-        self.db.execute_query(query, (document_id,))
+        self.vector_ops.delete_embeddings(document_id)
 
-        # Note: If you have a chunks table, delete from there too
-        # query = "DELETE FROM chunks WHERE document_id = %s;"
-        # self.db.execute_query(query, (document_id,))
+        # Delete keyword-indexed chunks
+        if self.full_text is not None:
+            self.full_text.delete_document(document_id)
 
@@ -4,9 +4,22 @@ Retriever
 Handles document retrieval using vector similarity search.
 """
 
-from typing import List, Dict, Any, Optional
-from ..postgresql_database.vector_operations import VectorOperations
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor
+from typing import List, Dict, Any, Optional, Union
+from ..postgresql_database.full_text_search import FullTextSearch
+from ..postgresql_database.index_tuner import TunedSearchParams
+from ..postgresql_database.vector_operations import AsyncVectorOperations
 from ..litellm_gateway import LiteLLMGateway
+from ..utils.blocking_executor import get_blocking_executor, run_blocking
+from .embedding_cache import QueryEmbeddingCache
+from .exceptions import EmbeddingError
+from .hybrid_retrieval import DEFAULT_RRF_K, FusionMethod, HybridResult, fuse_results
+from .vector_store import VectorStore
+
+logger = logging.getLogger(__name__)
 
 
 class Retriever:
@@ -18,23 +31,51 @@ class Retriever:
 
     def __init__(
         self,
-        vector_ops: VectorOperations,
+        vector_ops: VectorStore,
         gateway: Optional[LiteLLMGateway] = None,
-        embedding_model: str = "text-embedding-3-small"
+        embedding_model: str = "text-embedding-3-small",
+        async_vector_ops: Optional[AsyncVectorOperations] = None,
+        full_text: Optional[FullTextSearch] = None,
+        fusion: Union[FusionMethod, str] = FusionMethod.RRF,
+        rrf_k: int = DEFAULT_RRF_K,
+        executor: Optional[Executor] = None,
+        embedding_cache: Optional[QueryEmbeddingCache] = None,
+        tuned_search_params: Optional[TunedSearchParams] = None
     ):
         """
         Initialize retriever.
 
         Args:
-            vector_ops: Vector operations instance
+            vector_ops: Vector store (pgvector ``VectorOperations`` or an
+                in-process store such as ``NumpyVectorStore``)
             gateway: Optional LiteLLM gateway for embedding generation
             embedding_model: Model to use for embeddings
+            async_vector_ops: Optional async vector operations used by the
+                ``*_async`` methods (falls back to running ``vector_ops`` on ``executor``)
+            full_text: Chunk-level full-text search for keyword retrieval
+                (defaults to ``FullTextSearch`` on the vector store's database)
+            fusion: Default hybrid fusion method ("rrf" or "calibrated")
+            rrf_k: Reciprocal Rank Fusion smoothing constant
+            executor: Bounded executor for blocking searches: keyword branches
+                of hybrid searches and sync vector searches on the async path
+                (defaults to the shared RAG executor)
+            embedding_cache: Optional cache of query embeddings, so repeated
+                queries skip the embedding API call
+            tuned_search_params: Optional per-tenant ANN operating points
+                (``IndexAutotuner`` results) applied to each vector search
         """
         self.vector_ops = vector_ops
         self.gateway = gateway
         self.embedding_model = embedding_model
+        self.async_vector_ops = async_vector_ops
         # Access database connection from vector_ops for keyword search
         self.db = vector_ops.db if hasattr(vector_ops, 'db') else None
+        self.full_text = full_text or (FullTextSearch(self.db) if self.db is not None else None)
+        self.fusion = FusionMethod(fusion)
+        self.rrf_k = rrf_k
+        self.executor = executor or get_blocking_executor()
+        self.embedding_cache = embedding_cache
+        self.tuned_search_params = tuned_search_params
 
     def retrieve(
         self,
@@ -62,24 +103,23 @@ class Retriever:
 
         # Add tenant_id to filters for tenant isolation
         if tenant_id:
-            if filters is None:
-                filters = {}
-            filters['tenant_id'] = tenant_id
+            filters = {**(filters or {}), 'tenant_id': tenant_id}
 
-        # Perform similarity search
-        results = self.vector_ops.similarity_search(
+        # Perform similarity search; filters are applied in SQL before the LIMIT
+        return self.vector_ops.similarity_search(
             query_embedding=query_embedding,
             limit=top_k,
             threshold=threshold,
             model=self.embedding_model,
-            filters=filters
+            filters=filters,
+            **self._search_options(tenant_id)
         )
 
-        # Apply additional filters if provided
-        if filters:
-            results = self._apply_filters(results, filters)
-
-        return results
+    def _search_options(self, tenant_id: Optional[str]) -> Dict[str, Any]:
+        """Tenant's tuned ``search_params`` for the vector search, if configured."""
+        if self.tuned_search_params is None:
+            return {}
+        return {"search_params": self.tuned_search_params.get(tenant_id)}
 
     def _get_embedding(self, text: str) -> List[float]:
         """
@@ -89,8 +129,13 @@ class Retriever:
             text: Text to embed
 
         Returns:
-            Embedding vector
+            Embedding vector (a float32 array when ``embedding_cache`` is set)
         """
+        if self.embedding_cache is not None:
+            cached = self.embedding_cache.get(text, self.embedding_model)
+            if cached is not None:
+                return cached
+
         if not self.gateway:
             raise EmbeddingError(
                 message="Gateway not available for embedding generation",
@@ -103,6 +148,8 @@ class Retriever:
         )
 
         if response.embeddings and len(response.embeddings) > 0:
+            if self.embedding_cache is not None:
+                return self.embedding_cache.put(text, self.embedding_model, response.embeddings[0])
             return response.embeddings[0]
 
         raise EmbeddingError(
@@ -111,18 +158,16 @@ class Retriever:
             model=self.embedding_model
         )
 
-    def retrieve_hybrid(
+    async def retrieve_async(
         self,
         query: str,
         tenant_id: Optional[str] = None,
         top_k: int = 5,
         threshold: float = 0.7,
-        filters: Optional[Dict[str, Any]] = None,
-        vector_weight: float = 0.7,
-        keyword_weight: float = 0.3
+        filters: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
         """
-        Hybrid retrieval combining vector similarity and keyword search.
+        Retrieve relevant documents for a query without blocking the event loop.
 
         Args:
             query: Query text
@@ -130,228 +175,337 @@ class Retriever:
             top_k: Number of results to return
             threshold: Minimum similarity threshold
             filters: Optional metadata filters
-            vector_weight: Weight for vector similarity (0-1)
-            keyword_weight: Weight for keyword matching (0-1)
 
         Returns:
-            List of relevant documents with combined scores
+            List of relevant documents with similarity scores
         """
-        # Add tenant_id to filters for tenant isolation
+        query_embedding = await self._get_embedding_async(query)
+
         if tenant_id:
-            if filters is None:
-                filters = {}
-            filters['tenant_id'] = tenant_id
+            filters = {**(filters or {}), 'tenant_id': tenant_id}
 
-        # Vector-based retrieval
-        query_embedding = self._get_embedding(query)
-        vector_results = self.vector_ops.similarity_search(
-            query_embedding=query_embedding,
-            limit=top_k * 2,  # Get more for re-ranking
-            threshold=threshold * 0.8,  # Lower threshold for hybrid
-            model=self.embedding_model,
-            filters=filters
-        )
+        return await self._similarity_search_async(query_embedding, top_k, threshold, filters)
 
-        # Keyword-based retrieval (simple text search)
-        keyword_results = self._keyword_search(query, tenant_id=tenant_id, top_k=top_k * 2)
+    async def _get_embedding_async(self, text: str) -> List[float]:
+        """
+        Get embedding for text asynchronously.
 
-        # Combine and re-rank results
-        combined = self._combine_results(
-            vector_results,
-            keyword_results,
-            vector_weight,
-            keyword_weight
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding vector (a float32 array when ``embedding_cache`` is set)
+        """
+        if self.embedding_cache is not None:
+            cached = await self.embedding_cache.get_async(text, self.embedding_model)
+            if cached is not None:
+                return cached
+
+        if not self.gateway:
+            raise EmbeddingError(
+                message="Gateway not available for embedding generation",
+                model=self.embedding_model
+            )
+
+        response = await self.gateway.embed_async(
+            texts=[text],
+            model=self.embedding_model
         )
 
-        # Apply filters if provided
-        if filters:
-            combined = self._apply_filters(combined, filters)
+        if response.embeddings and len(response.embeddings) > 0:
+            if self.embedding_cache is not None:
+                return await self.embedding_cache.put_async(text, self.embedding_model, response.embeddings[0])
+            return response.embeddings[0]
 
-        # Return top_k results
-        return combined[:top_k]
+        raise EmbeddingError(
+            message="Failed to generate embedding: No embeddings returned",
+            text=text,
+            model=self.embedding_model
+        )
 
-    def _keyword_search(
+    async def _similarity_search_async(
+        self,
+        query_embedding: List[float],
+        limit: int,
+        threshold: float,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Run the similarity search on the async pool, or in a worker thread."""
+        tenant_id = (filters or {}).get("tenant_id")
+        if self.tuned_search_params is not None and not self.tuned_search_params.is_cached(tenant_id):
+            # Loading the tuned operating point is a sync query
+            options = await run_blocking(self.executor, self._search_options, tenant_id)
+        else:
+            options = self._search_options(tenant_id)
+        if self.async_vector_ops is not None:
+            return await self.async_vector_ops.similarity_search(
+                query_embedding=query_embedding,
+                limit=limit,
+                threshold=threshold,
+                model=self.embedding_model,
+                filters=filters,
+                **options
+            )
+        return await run_blocking(
+            self.executor,
+            self.vector_ops.similarity_search,
+            query_embedding=query_embedding,
+            limit=limit,
+            threshold=threshold,
+            model=self.embedding_model,
+            filters=filters,
+            **options
+        )
+
+    def retrieve_hybrid(
         self,
         query: str,
         tenant_id: Optional[str] = None,
-        top_k: int = 10
+        top_k: int = 5,
+        threshold: float = 0.7,
+        filters: Optional[Dict[str, Any]] = None,
+        vector_weight: float = 0.7,
+        keyword_weight: float = 0.3,
+        fusion: Optional[Union[FusionMethod, str]] = None
     ) -> List[Dict[str, Any]]:
         """
-        Perform keyword-based search on document content.
+        Hybrid retrieval combining vector similarity and keyword search.
 
         Args:
             query: Query text
             tenant_id: Optional tenant ID for multi-tenant SaaS (filters documents by tenant)
-            top_k: Maximum number of results
+            top_k: Number of results to return
+            threshold: Minimum similarity threshold
+            filters: Optional metadata filters
+            vector_weight: Weight of the vector branch in the fusion
+            keyword_weight: Weight of the keyword branch in the fusion
+            fusion: Fusion method (defaults to the retriever's ``fusion``)
 
         Returns:
-            List of documents matching keywords
+            List of relevant documents with fused scores
         """
-        # Extract keywords from query
-        keywords = query.lower().split()
+        return self.search_hybrid(
+            query, tenant_id, top_k, threshold, filters, vector_weight, keyword_weight, fusion
+        ).documents
+
+    def search_hybrid(
+        self,
+        query: str,
+        tenant_id: Optional[str] = None,
+        top_k: int = 5,
+        threshold: float = 0.7,
+        filters: Optional[Dict[str, Any]] = None,
+        vector_weight: float = 0.7,
+        keyword_weight: float = 0.3,
+        fusion: Optional[Union[FusionMethod, str]] = None
+    ) -> HybridResult:
+        """
+        Hybrid retrieval with the vector and keyword branches running concurrently.
+
+        The keyword search runs on a worker thread while this thread embeds
+        the query and runs the vector search; each branch checks out its own
+        pooled connection, so the slower branch sets the latency instead of
+        the sum of both. Do not call it from a thread of ``executor`` (the
+        keyword branch would queue behind it); async code should use
+        ``search_hybrid_async``.
+
+        Args:
+            query: Query text
+            tenant_id: Optional tenant ID for multi-tenant SaaS (filters documents by tenant)
+            top_k: Number of results to return
+            threshold: Minimum similarity threshold
+            filters: Optional metadata filters
+            vector_weight: Weight of the vector branch in the fusion
+            keyword_weight: Weight of the keyword branch in the fusion
+            fusion: Fusion method (defaults to the retriever's ``fusion``)
 
-        # Simple keyword matching query with tenant filtering
-        # In production, you might use full-text search (tsvector in PostgreSQL)
+        Returns:
+            HybridResult with fused documents and per-branch timings
+        """
+        started = time.perf_counter()
         if tenant_id:
-            query_sql = """
-            SELECT d.id, d.title, d.content, d.metadata, d.source,
-                   COUNT(*) as keyword_matches
-            FROM documents d
-            WHERE (LOWER(d.content) LIKE ANY(ARRAY[%s])
-               OR LOWER(d.title) LIKE ANY(ARRAY[%s]))
-              AND d.tenant_id = %s
-            GROUP BY d.id, d.title, d.content, d.metadata, d.source
-            ORDER BY keyword_matches DESC, d.id
-            LIMIT %s;
-            """
-        else:
-            query_sql = """
-            SELECT d.id, d.title, d.content, d.metadata, d.source,
-                   COUNT(*) as keyword_matches
-            FROM documents d
-            WHERE LOWER(d.content) LIKE ANY(ARRAY[%s])
-               OR LOWER(d.title) LIKE ANY(ARRAY[%s])
-            GROUP BY d.id, d.title, d.content, d.metadata, d.source
-            ORDER BY keyword_matches DESC, d.id
-            LIMIT %s;
-            """
-
-        # Create LIKE patterns for each keyword
-        like_patterns = [f"%{keyword}%" for keyword in keywords]
-
-        # Get database connection from vector_ops
-        db = getattr(self.vector_ops, 'db', None)
-        if not db:
-            # Fallback: try to get from vector_ops connection attribute
-            db = getattr(self.vector_ops, 'connection', None)
-
-        if not db:
-            return []  # Cannot perform keyword search without database
+            filters = {**(filters or {}), 'tenant_id': tenant_id}
 
-        try:
-            results = db.execute_query(
-                query_sql,
-                (like_patterns, like_patterns, limit),
-                fetch_all=True
-            )
+        keyword_future = self.executor.submit(
+            self._timed_keyword_search, query, tenant_id, top_k * 2, filters
+        )
 
-            # Format results similar to vector search
-            formatted_results = []
-            for row in results:
-                formatted_results.append({
-                    "id": str(row["id"]),
-                    "title": row.get("title", ""),
-                    "content": row.get("content", ""),
-                    "metadata": row.get("metadata", {}),
-                    "source": row.get("source"),
-                    "similarity": row.get("keyword_matches", 0) / len(keywords),  # Normalize score
-                    "score_type": "keyword"
-                })
-
-            return formatted_results
-        except Exception:
-            # Fallback to empty results if keyword search fails
-            return []
+        # Vector-based retrieval, with more candidates and a lower threshold for fusion
+        timings = {}
+        query_embedding = self._get_embedding(query)
+        timings["embedding"] = time.perf_counter() - started
+        vector_started = time.perf_counter()
+        vector_results = self.vector_ops.similarity_search(
+            query_embedding=query_embedding,
+            limit=top_k * 2,
+            threshold=threshold * 0.8,
+            model=self.embedding_model,
+            filters=filters,
+            **self._search_options(tenant_id)
+        )
+        timings["vector_search"] = time.perf_counter() - vector_started
+
+        keyword_results, timings["keyword_search"] = keyword_future.result()
+        return self._fuse(
+            vector_results, keyword_results, top_k,
+            vector_weight, keyword_weight, fusion, timings, started
+        )
 
-    def _combine_results(
+    async def retrieve_hybrid_async(
         self,
-        vector_results: List[Dict[str, Any]],
-        keyword_results: List[Dict[str, Any]],
-        vector_weight: float,
-        keyword_weight: float
+        query: str,
+        tenant_id: Optional[str] = None,
+        top_k: int = 5,
+        threshold: float = 0.7,
+        filters: Optional[Dict[str, Any]] = None,
+        vector_weight: float = 0.7,
+        keyword_weight: float = 0.3,
+        fusion: Optional[Union[FusionMethod, str]] = None
     ) -> List[Dict[str, Any]]:
         """
-        Combine and re-rank vector and keyword results.
+        Hybrid retrieval without blocking the event loop.
 
         Args:
-            vector_results: Vector similarity results
-            keyword_results: Keyword search results
-            vector_weight: Weight for vector scores
-            keyword_weight: Weight for keyword scores
+            query: Query text
+            tenant_id: Optional tenant ID for multi-tenant SaaS (filters documents by tenant)
+            top_k: Number of results to return
+            threshold: Minimum similarity threshold
+            filters: Optional metadata filters
+            vector_weight: Weight of the vector branch in the fusion
+            keyword_weight: Weight of the keyword branch in the fusion
+            fusion: Fusion method (defaults to the retriever's ``fusion``)
 
         Returns:
-            Combined and re-ranked results
+            List of relevant documents with fused scores
         """
-        # Create a map of document_id -> result
-        combined_map = {}
-
-        # Add vector results
-        for result in vector_results:
-            doc_id = str(result.get("id", ""))
-            if doc_id not in combined_map:
-                combined_map[doc_id] = result.copy()
-                combined_map[doc_id]["vector_score"] = result.get("similarity", 0.0)
-                combined_map[doc_id]["keyword_score"] = 0.0
-            else:
-                combined_map[doc_id]["vector_score"] = max(
-                    combined_map[doc_id].get("vector_score", 0.0),
-                    result.get("similarity", 0.0)
-                )
-
-        # Add keyword results
-        for result in keyword_results:
-            doc_id = str(result.get("id", ""))
-            if doc_id not in combined_map:
-                combined_map[doc_id] = result.copy()
-                combined_map[doc_id]["vector_score"] = 0.0
-                combined_map[doc_id]["keyword_score"] = result.get("similarity", 0.0)
-            else:
-                combined_map[doc_id]["keyword_score"] = max(
-                    combined_map[doc_id].get("keyword_score", 0.0),
-                    result.get("similarity", 0.0)
-                )
-
-        # Calculate combined scores
-        combined_results = []
-        for doc_id, result in combined_map.items():
-            combined_score = (
-                result.get("vector_score", 0.0) * vector_weight +
-                result.get("keyword_score", 0.0) * keyword_weight
-            )
-            result["similarity"] = combined_score
-            result["score_type"] = "hybrid"
-            combined_results.append(result)
-
-        # Sort by combined score
-        combined_results.sort(key=lambda x: x.get("similarity", 0.0), reverse=True)
-
-        return combined_results
+        result = await self.search_hybrid_async(
+            query, tenant_id, top_k, threshold, filters, vector_weight, keyword_weight, fusion
+        )
+        return result.documents
 
-    def _apply_filters(
+    async def search_hybrid_async(
         self,
-        results: List[Dict[str, Any]],
-        filters: Dict[str, Any]
-    ) -> List[Dict[str, Any]]:
+        query: str,
+        tenant_id: Optional[str] = None,
+        top_k: int = 5,
+        threshold: float = 0.7,
+        filters: Optional[Dict[str, Any]] = None,
+        vector_weight: float = 0.7,
+        keyword_weight: float = 0.3,
+        fusion: Optional[Union[FusionMethod, str]] = None
+    ) -> HybridResult:
         """
-        Apply metadata filters to results.
+        Hybrid retrieval without blocking the event loop.
+
+        The vector branch (embedding, then search on the async pool) and the
+        keyword branch (on a worker thread with its own connection) run concurrently.
 
         Args:
-            results: Search results
-            filters: Filter criteria
+            query: Query text
+            tenant_id: Optional tenant ID for multi-tenant SaaS (filters documents by tenant)
+            top_k: Number of results to return
+            threshold: Minimum similarity threshold
+            filters: Optional metadata filters
+            vector_weight: Weight of the vector branch in the fusion
+            keyword_weight: Weight of the keyword branch in the fusion
+            fusion: Fusion method (defaults to the retriever's ``fusion``)
 
         Returns:
-            Filtered results
+            HybridResult with fused documents and per-branch timings
         """
-        filtered = []
+        started = time.perf_counter()
+        if tenant_id:
+            filters = {**(filters or {}), 'tenant_id': tenant_id}
+        timings = {}
+
+        async def vector_branch() -> List[Dict[str, Any]]:
+            query_embedding = await self._get_embedding_async(query)
+            timings["embedding"] = time.perf_counter() - started
+            vector_started = time.perf_counter()
+            results = await self._similarity_search_async(query_embedding, top_k * 2, threshold * 0.8, filters)
+            timings["vector_search"] = time.perf_counter() - vector_started
+            return results
+
+        vector_results, (keyword_results, timings["keyword_search"]) = await asyncio.gather(
+            vector_branch(),
+            run_blocking(self.executor, self._timed_keyword_search, query, tenant_id, top_k * 2, filters)
+        )
+        return self._fuse(
+            vector_results, keyword_results, top_k,
+            vector_weight, keyword_weight, fusion, timings, started
+        )
+
+    def _timed_keyword_search(
+        self,
+        query: str,
+        tenant_id: Optional[str],
+        top_k: int,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> tuple:
+        """Run the keyword branch and return (results, elapsed seconds)."""
+        started = time.perf_counter()
+        results = self._keyword_search(query, tenant_id=tenant_id, top_k=top_k, filters=filters)
+        return results, time.perf_counter() - started
 
-        for result in results:
-            metadata = result.get('metadata', {})
-            if isinstance(metadata, str):
-                import json
-                try:
-                    metadata = json.loads(metadata)
-                except:
-                    metadata = {}
+    def _fuse(
+        self,
+        vector_results: List[Dict[str, Any]],
+        keyword_results: List[Dict[str, Any]],
+        top_k: int,
+        vector_weight: float,
+        keyword_weight: float,
+        fusion: Optional[Union[FusionMethod, str]],
+        timings: Dict[str, float],
+        started: float
+    ) -> HybridResult:
+        """Fuse both branches and record the remaining timings."""
+        method = FusionMethod(fusion or self.fusion)
+        fusion_started = time.perf_counter()
+        combined = fuse_results(
+            vector_results,
+            keyword_results,
+            method=method,
+            vector_weight=vector_weight,
+            keyword_weight=keyword_weight,
+            rrf_k=self.rrf_k
+        )
 
-            match = True
+        finished = time.perf_counter()
+        timings["fusion"] = finished - fusion_started
+        timings["total"] = finished - started
+        return HybridResult(
+            documents=combined[:top_k],
+            fusion=method,
+            timings=timings,
+            vector_hits=len(vector_results),
+            keyword_hits=len(keyword_results)
+        )
 
-            for key, value in filters.items():
-                if key not in metadata or metadata[key] != value:
-                    match = False
-                    break
+    def _keyword_search(
+        self,
+        query: str,
+        tenant_id: Optional[str] = None,
+        top_k: int = 10,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Perform full-text keyword search over document chunks.
 
-            if match:
-                filtered.append(result)
+        Args:
+            query: Query text (web search syntax: quoted phrases, ``or``, ``-exclude``)
+            tenant_id: Optional tenant ID for multi-tenant SaaS (filters documents by tenant)
+            top_k: Maximum number of results
+            filters: Optional metadata filters, applied in SQL before the ``LIMIT``
 
-        return filtered
+        Returns:
+            Matching chunks ranked by ``ts_rank_cd``, shaped like vector search results
+        """
+        if self.full_text is None:
+            return []  # Cannot perform keyword search without database
 
+        try:
+            return self.full_text.search(query, top_k=top_k, tenant_id=tenant_id, filters=filters)
+        except Exception as e:
+            # Keyword matches are a complement to vector search; degrade to none
+            logger.warning(f"Keyword search failed: {e}")
+            return []
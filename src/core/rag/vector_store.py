@@ -0,0 +1,72 @@
+"""
+Vector Store Protocol
+
+The storage interface ``RAGSystem`` and ``Retriever`` use for embeddings.
+``postgresql_database.VectorOperations`` (pgvector) implements it, as does
+the in-process ``NumpyVectorStore`` for deployments without PostgreSQL.
+
+Stores that also hold document payloads (title, content, metadata) implement
+``DocumentCatalog``; ``RAGSystem`` then registers documents with the store, and
+can run without a database connection at all.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from typing_extensions import Protocol, runtime_checkable
+
+
+@runtime_checkable
+class VectorStore(Protocol):
+    """Embedding storage with cosine similarity search."""
+
+    def batch_insert_embeddings(self, embeddings: List[Tuple[int, List[float], str]]) -> None:
+        """Insert (document_id, embedding, model) tuples."""
+        ...
+
+    def similarity_search(
+        self,
+        query_embedding: List[float],
+        limit: int = 10,
+        threshold: float = 0.0,
+        model: Optional[str] = None,
+        search_params: Optional[Any] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Return the nearest embeddings as rows with ``id``, ``document_id``,
+        ``title``, ``content``, ``metadata``, ``source`` and ``similarity``.
+        """
+        ...
+
+    def delete_embeddings(self, document_id: Any) -> int:
+        """Delete a document's embeddings and return how many were removed."""
+        ...
+
+
+@runtime_checkable
+class DocumentCatalog(Protocol):
+    """Document payload storage for vector stores that live outside PostgreSQL."""
+
+    def put_document(
+        self,
+        title: str,
+        content: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        source: Optional[str] = None,
+        tenant_id: Optional[str] = None,
+        document_id: Optional[int] = None
+    ) -> int:
+        """Insert or replace a document; assigns an ID when ``document_id`` is None."""
+        ...
+
+    def update_document(self, document_id: Any, **fields: Any) -> bool:
+        """Update stored document fields; returns False for unknown documents."""
+        ...
+
+    def remove_document(self, document_id: Any) -> bool:
+        """Remove a document and its embeddings."""
+        ...
+
+    def iter_documents(self, tenant_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield stored documents (``id``, ``content``, ``metadata``, ...) in ID order."""
+        ...
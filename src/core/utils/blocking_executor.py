@@ -0,0 +1,72 @@
+"""
+Blocking Work Executor
+
+Bounded thread pool for the synchronous work left on async paths: psycopg2
+queries without an async pool, keyword search, in-process memory and document
+processing in RAG, and Dragonfly calls when only the sync redis client is
+installed. ``asyncio.to_thread`` uses the loop's default executor, which is
+shared with everything else in the process; a dedicated, bounded pool caps
+how many connections and threads these calls can tie up and keeps a burst of
+slow queries from starving unrelated work.
+
+RAG systems are often created per request, so they share one process-wide
+pool unless given their own.
+"""
+
+# Standard library imports
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_blocking_executor() -> ThreadPoolExecutor:
+    """
+    Get the shared RAG executor, creating it on first use.
+
+    Its size comes from ``RAG_BLOCKING_WORKERS`` (default: 8).
+
+    Returns:
+        Process-wide bounded thread pool
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=int(os.getenv("RAG_BLOCKING_WORKERS", "8")),
+                    thread_name_prefix="rag-blocking"
+                )
+    return _executor
+
+
+async def run_blocking(
+    executor: Optional[Executor],
+    func: Callable[..., T],
+    *args: Any,
+    **kwargs: Any
+) -> T:
+    """
+    Run a synchronous callable on a bounded executor and await its result.
+
+    Args:
+        executor: Executor to use (None uses the shared RAG executor)
+        func: Callable to run
+        *args: Positional arguments
+        **kwargs: Keyword arguments
+
+    Returns:
+        The callable's return value
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor or get_blocking_executor(),
+        functools.partial(func, *args, **kwargs)
+    )
@@ -0,0 +1,133 @@
+"""
+Event Loop Lag Probe
+
+Measures how late the event loop wakes a task that asked to sleep for a fixed
+interval. Any synchronous call running on the loop (a blocking DB query, a
+sync HTTP call, heavy CPU work) delays every wake-up by its duration, so the
+lag distribution shows whether request handlers are blocking the loop.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class EventLoopLagProbe:
+    """
+    Background task that samples event loop scheduling lag.
+
+    Usage::
+
+        async with EventLoopLagProbe(interval=0.01) as probe:
+            await run_load()
+        print(probe.stats()["p99"])
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.01,
+        max_samples: int = 10_000,
+        warn_threshold: Optional[float] = None
+    ):
+        """
+        Initialize the probe.
+
+        Args:
+            interval: Seconds between samples
+            max_samples: Most recent samples kept for percentiles
+            warn_threshold: Log a warning for lags above this many seconds (None disables)
+
+        Raises:
+            ValueError: If interval is not positive
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.interval = interval
+        self.warn_threshold = warn_threshold
+        self.samples: Deque[float] = deque(maxlen=max_samples)
+        self.max_lag = 0.0
+        self.total_samples = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the probe task is running."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start sampling on the running event loop (no-op if already running)."""
+        if not self.running:
+            loop = asyncio.get_running_loop()
+            self._task = loop.create_task(self._run(loop.time()))
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def reset(self) -> None:
+        """Drop collected samples."""
+        self.samples.clear()
+        self.max_lag = 0.0
+        self.total_samples = 0
+
+    async def __aenter__(self) -> "EventLoopLagProbe":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+    async def _run(self, scheduled: float) -> None:
+        loop = asyncio.get_running_loop()
+        # First sample: how long the new task waited to be scheduled at all
+        self.record(max(0.0, loop.time() - scheduled))
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, loop.time() - expected))
+
+    def record(self, lag: float) -> None:
+        """
+        Record one lag sample.
+
+        Args:
+            lag: Seconds the wake-up was late
+        """
+        self.samples.append(lag)
+        self.total_samples += 1
+        self.max_lag = max(self.max_lag, lag)
+        if self.warn_threshold is not None and lag > self.warn_threshold:
+            logger.warning(f"Event loop blocked for {lag * 1000:.1f}ms")
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Summarize the recorded lag.
+
+        Returns:
+            Dictionary with samples, mean, p50, p95, p99 and max lag in seconds
+        """
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {"samples": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+
+        def percentile(q: float) -> float:
+            return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+        return {
+            "samples": self.total_samples,
+            "mean": sum(ordered) / len(ordered),
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+            "max": self.max_lag,
+        }
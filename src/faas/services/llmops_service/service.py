@@ -348,7 +348,7 @@ def create_llmops_service(
         Configured FastAPI application
     """
     config = load_config(service_name, config_overrides)
-    db_connection = get_database_connection(config.database_url)
+    db_connection = get_database_connection(config.database_url).get_connection()
 
     # Initialize integrations
     nats_client = create_nats_client(config.nats_url) if config.enable_nats else None
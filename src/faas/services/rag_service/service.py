@@ -4,18 +4,30 @@ RAG Service - Main service implementation.
 Handles document ingestion, query processing, document management, and vector search.
 """
 
+import json
 import logging
 from typing import Any, Dict, Optional
 
 import httpx
 from fastapi import FastAPI, HTTPException, Header, status
+from fastapi.responses import StreamingResponse
 
+from ....core.cache_mechanism import CacheConfig, CacheMechanism
 from ....core.rag import create_rag_system, quick_rag_query_async
+from ....core.rag.answer_cache import AnswerCache
+from ....core.rag.embedding_cache import QueryEmbeddingCache
 from ....core.rag.rag_system import RAGSystem
 from ....core.litellm_gateway import create_gateway
+from ....core.postgresql_database import (
+    AsyncDatabaseConnection,
+    TunedSearchParams,
+    create_reindex_scheduler,
+    create_vector_index_manager,
+)
+from ....core.utils.event_loop_lag import EventLoopLagProbe
 from ...shared.config import ServiceConfig, load_config
 from ...shared.contracts import ServiceResponse, extract_headers
-from ...shared.database import get_database_connection
+from ...shared.database import DatabaseManager, get_database_connection
 from ...shared.exceptions import NotFoundError, DependencyError
 from ...shared.middleware import setup_middleware
 from .models import (
@@ -34,6 +46,11 @@ from ...integrations.codec import create_codec_manager
 logger = logging.getLogger(__name__)
 
 
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
 class RAGService:
     """
     RAG Service for document-based Q&A.
@@ -52,26 +69,49 @@ class RAGService:
         nats_client: Optional[Any] = None,
         otel_tracer: Optional[Any] = None,
         codec_manager: Optional[Any] = None,
+        db_manager: Optional[DatabaseManager] = None,
     ):
         """
         Initialize RAG Service.
 
         Args:
             config: Service configuration
-            db_connection: Database connection
+            db_connection: Sync database connection
             nats_client: NATS client (optional)
             otel_tracer: OTEL tracer (optional)
             codec_manager: Codec manager (optional)
+            db_manager: Database manager whose async pool is opened at startup
+                and passed to RAG systems as ``async_db`` (optional)
         """
         self.config = config
         self.db = db_connection
+        self.db_manager = db_manager
+        # Async pool for the query path; awaited in the startup hook
+        self.async_db: Optional[AsyncDatabaseConnection] = None
         self.nats_client = nats_client
         self.otel_tracer = otel_tracer
         self.codec_manager = codec_manager or create_codec_manager()
 
+        # Samples event loop lag so a handler blocking the loop shows up in /health
+        self.loop_lag = EventLoopLagProbe(interval=0.05, warn_threshold=0.1)
+
         # RAG systems are created on-demand per request (stateless)
         # No in-memory caching to ensure statelessness
 
+        # The reindex scheduler keeps bloat baselines between passes, so it is
+        # shared by the per-request RAG systems instead of rebuilt each time
+        self.reindex_scheduler = create_reindex_scheduler(create_vector_index_manager(db_connection))
+        # Tenants' tuned ANN parameters, cached across requests
+        self.tuned_search_params = TunedSearchParams(db_connection)
+        # Answer and query embedding caches live for the process, so the
+        # per-request RAG systems get hits; Dragonfly shares them across replicas
+        self.cache = CacheMechanism(
+            CacheConfig(backend="dragonfly", dragonfly_url=config.redis_url)
+            if config.redis_url else CacheConfig()
+        )
+        self.answer_cache = AnswerCache(self.cache)
+        self.query_embedding_cache = QueryEmbeddingCache(self.cache)
+
         # Create FastAPI app
         self.app = FastAPI(
             title="RAG Service",
@@ -102,9 +142,15 @@ class RAGService:
         # Create RAG system
         rag_system = create_rag_system(
             db=self.db,
+            async_db=self.async_db,
             gateway=gateway,
             embedding_model="text-embedding-3-small",
             generation_model="gpt-4",
+            reindex_scheduler=self.reindex_scheduler,
+            tuned_search_params=self.tuned_search_params,
+            cache=self.cache,
+            answer_cache=self.answer_cache,
+            query_embedding_cache=self.query_embedding_cache,
         )
 
         return rag_system
@@ -132,6 +178,25 @@ class RAGService:
     def _register_routes(self):
         """Register FastAPI routes."""
 
+        @self.app.on_event("startup")
+        async def start_loop_lag_probe():
+            self.loop_lag.start()
+
+        @self.app.on_event("shutdown")
+        async def stop_loop_lag_probe():
+            await self.loop_lag.stop()
+
+        @self.app.on_event("startup")
+        async def open_async_pool():
+            if self.db_manager is not None:
+                self.async_db = await self.db_manager.get_async_connection()
+
+        @self.app.on_event("shutdown")
+        async def close_database():
+            if self.db_manager is not None:
+                await self.db_manager.close()
+                self.async_db = None
+
         @self.app.post("/api/v1/rag/documents", response_model=ServiceResponse, status_code=status.HTTP_201_CREATED)
         async def ingest_document(
             request: IngestDocumentRequest,
@@ -238,6 +303,53 @@ class RAGService:
                 if span:
                     span.end()
 
+        @self.app.post("/api/v1/rag/query/stream")
+        async def query_stream(
+            request: QueryRequest,
+            headers: dict = Header(...),
+        ):
+            """Process a RAG query, streaming sources, answer tokens and the hallucination verdict (SSE)."""
+            standard_headers = extract_headers(**headers)
+
+            try:
+                # Get RAG system (created on-demand, stateless)
+                rag_system = await self._get_rag_system(standard_headers.tenant_id)
+            except Exception as e:
+                logger.error(f"Error processing streaming query: {str(e)}", exc_info=True)
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Failed to process query: {str(e)}",
+                )
+
+            async def event_stream():
+                span = None
+                if self.otel_tracer:
+                    span = self.otel_tracer.start_span("rag_query_stream")
+                    span.set_attribute("query.length", len(request.query))
+                    span.set_attribute("tenant.id", standard_headers.tenant_id)
+
+                try:
+                    # sources -> delta... -> hallucination -> done (or error)
+                    async for event in rag_system.query_stream_async(
+                        query=request.query,
+                        tenant_id=standard_headers.tenant_id,
+                        top_k=request.top_k,
+                        threshold=request.threshold if request.threshold is not None else 0.7,
+                        use_query_rewriting=request.enable_rewrite,
+                        check_hallucination=request.enable_hallucination_detection,
+                    ):
+                        yield _sse_event(event["event"], event["data"])
+                finally:
+                    if span:
+                        span.end()
+
+            return StreamingResponse(
+                event_stream(),
+                media_type="text/event-stream",
+                # Proxies must not buffer the stream, or time-to-first-token is lost
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
+
         @self.app.post("/api/v1/rag/search", response_model=ServiceResponse)
         async def search(
             request: SearchRequest,
@@ -389,7 +501,11 @@ class RAGService:
         @self.app.get("/health")
         async def health_check():
             """Health check endpoint."""
-            return {"status": "healthy", "service": "rag-service"}
+            return {
+                "status": "healthy",
+                "service": "rag-service",
+                "event_loop_lag": self.loop_lag.stats(),
+            }
 
 
 def create_rag_service(
@@ -423,6 +539,7 @@ def create_rag_service(
         db_connection=db_connection,
         nats_client=nats_client,
         otel_tracer=otel_tracer,
+        db_manager=db_manager,
     )
 
     logger.info(f"RAG Service created: {service_name}")
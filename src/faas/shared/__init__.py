@@ -40,7 +40,7 @@ from .http_client import (
     ServiceUnavailableError,
     ServiceTimeoutError,
 )
-from .agent_storage import AgentStorage
+from .agent_storage import AgentStorage, AsyncAgentStorage
 
 __all__ = [
     # Contracts
@@ -69,6 +69,7 @@ __all__ = [
     "ServiceTimeoutError",
     # Agent Storage
     "AgentStorage",
+    "AsyncAgentStorage",
     # Exceptions
     "ServiceException",
     "ValidationError",
@@ -12,9 +12,123 @@ from datetime import datetime
 from ...core.agno_agent_framework import Agent, create_agent
 from ...core.litellm_gateway import LiteLLMGateway
 from ...core.postgresql_database.connection import DatabaseConnection
+from ...core.postgresql_database.prepared_statements import execute_prepared
 
 logger = logging.getLogger(__name__)
 
+_CREATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS agents (
+        agent_id VARCHAR(255) PRIMARY KEY,
+        tenant_id VARCHAR(255) NOT NULL,
+        name VARCHAR(255) NOT NULL,
+        description TEXT,
+        llm_model VARCHAR(255),
+        llm_provider VARCHAR(255),
+        system_prompt TEXT,
+        capabilities JSONB,
+        config JSONB,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+_CREATE_INDEX_SQL = "CREATE INDEX IF NOT EXISTS idx_tenant_id ON agents(tenant_id)"
+
+_SAVE_AGENT_SQL = """
+    INSERT INTO agents (
+        agent_id, tenant_id, name, description,
+        llm_model, llm_provider, system_prompt,
+        capabilities, config, updated_at
+    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
+    ON CONFLICT (agent_id) DO UPDATE SET
+        name = EXCLUDED.name,
+        description = EXCLUDED.description,
+        llm_model = EXCLUDED.llm_model,
+        llm_provider = EXCLUDED.llm_provider,
+        system_prompt = EXCLUDED.system_prompt,
+        capabilities = EXCLUDED.capabilities,
+        config = EXCLUDED.config,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+_LOAD_AGENT_SQL = """
+    SELECT 
+        agent_id, name, description,
+        llm_model, llm_provider, system_prompt,
+        capabilities, config
+    FROM agents
+    WHERE agent_id = %s AND tenant_id = %s
+"""
+
+_LIST_AGENTS_SQL = """
+    SELECT 
+        agent_id, name, description,
+        llm_model, llm_provider,
+        created_at, updated_at
+    FROM agents
+    WHERE tenant_id = %s
+    ORDER BY created_at DESC
+    LIMIT %s OFFSET %s
+"""
+
+_DELETE_AGENT_SQL = """
+    DELETE FROM agents
+    WHERE agent_id = %s AND tenant_id = %s
+"""
+
+_AGENT_EXISTS_SQL = """
+    SELECT 1 FROM agents
+    WHERE agent_id = %s AND tenant_id = %s
+    LIMIT 1
+"""
+
+
+def _agent_key(tenant_id: str, agent_id: str) -> tuple:
+    """Read-after-write key of one agent (see ``DatabaseConnection.mark_written``)."""
+    return ("agent", tenant_id, agent_id)
+
+
+def _agent_list_key(tenant_id: str) -> tuple:
+    """Read-after-write key of a tenant's agent list."""
+    return ("agents", tenant_id)
+
+
+def _agent_params(agent: Agent, tenant_id: str) -> tuple:
+    """Build the parameters for ``_SAVE_AGENT_SQL``."""
+    return (
+        agent.agent_id,
+        tenant_id,
+        agent.name,
+        agent.description,
+        agent.llm_model,
+        agent.llm_provider,
+        agent.system_prompt,
+        json.dumps(list(agent.capabilities.keys()) if hasattr(agent, 'capabilities') else []),
+        json.dumps(agent.config if hasattr(agent, 'config') else {}),
+    )
+
+
+def _agent_from_row(row: Dict[str, Any], tenant_id: str, gateway: LiteLLMGateway) -> Agent:
+    """Recreate an Agent instance from a stored row."""
+    agent = create_agent(
+        agent_id=row['agent_id'],
+        name=row['name'],
+        description=row['description'],
+        gateway=gateway,
+        llm_model=row['llm_model'],
+        llm_provider=row['llm_provider'],
+        system_prompt=row['system_prompt'],
+        tenant_id=tenant_id,
+    )
+
+    # Restore capabilities
+    if row['capabilities']:
+        capabilities = json.loads(row['capabilities']) if isinstance(row['capabilities'], str) else row['capabilities']
+        for capability in capabilities:
+            agent.add_capability(capability, f"Capability: {capability}")
+
+    return agent
+
 
 class AgentStorage:
     """
@@ -37,24 +151,10 @@ class AgentStorage:
         """Ensure agents table exists."""
         try:
             with self.db.get_cursor() as cursor:
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS agents (
-                        agent_id VARCHAR(255) PRIMARY KEY,
-                        tenant_id VARCHAR(255) NOT NULL,
-                        name VARCHAR(255) NOT NULL,
-                        description TEXT,
-                        llm_model VARCHAR(255),
-                        llm_provider VARCHAR(255),
-                        system_prompt TEXT,
-                        capabilities JSONB,
-                        config JSONB,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
+                cursor.execute(_CREATE_TABLE_SQL)
                 # Create index separately (MySQL syntax)
                 try:
-                    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tenant_id ON agents(tenant_id)")
+                    cursor.execute(_CREATE_INDEX_SQL)
                 except Exception:
                     # Index might already exist or syntax differs
                     pass
@@ -74,32 +174,10 @@ class AgentStorage:
             tenant_id: Tenant ID
         """
         with self.db.get_cursor() as cursor:
-            cursor.execute("""
-                INSERT INTO agents (
-                    agent_id, tenant_id, name, description,
-                    llm_model, llm_provider, system_prompt,
-                    capabilities, config, updated_at
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (agent_id) DO UPDATE SET
-                    name = EXCLUDED.name,
-                    description = EXCLUDED.description,
-                    llm_model = EXCLUDED.llm_model,
-                    llm_provider = EXCLUDED.llm_provider,
-                    system_prompt = EXCLUDED.system_prompt,
-                    capabilities = EXCLUDED.capabilities,
-                    config = EXCLUDED.config,
-                    updated_at = CURRENT_TIMESTAMP
-            """, (
-                agent.agent_id,
-                tenant_id,
-                agent.name,
-                agent.description,
-                agent.llm_model,
-                agent.llm_provider,
-                agent.system_prompt,
-                json.dumps(list(agent.capabilities.keys()) if hasattr(agent, 'capabilities') else []),
-                json.dumps(agent.config if hasattr(agent, 'config') else {}),
-            ))
+            execute_prepared(self.db, cursor, "agent_save", _SAVE_AGENT_SQL, _agent_params(agent, tenant_id))
+        # Replicas may lag behind; this process reads the agent from the primary for a while
+        self.db.mark_written(_agent_key(tenant_id, agent.agent_id))
+        self.db.mark_written(_agent_list_key(tenant_id))
     
     def load_agent(
         self,
@@ -118,39 +196,16 @@ class AgentStorage:
         Returns:
             Agent instance or None if not found
         """
-        with self.db.get_cursor() as cursor:
-            cursor.execute("""
-                SELECT 
-                    agent_id, name, description,
-                    llm_model, llm_provider, system_prompt,
-                    capabilities, config
-                FROM agents
-                WHERE agent_id = %s AND tenant_id = %s
-            """, (agent_id, tenant_id))
-            
-            row = cursor.fetchone()
-            if not row:
-                return None
-            
-            # Recreate agent
-            agent = create_agent(
-                agent_id=row['agent_id'],
-                name=row['name'],
-                description=row['description'],
-                gateway=gateway,
-                llm_model=row['llm_model'],
-                llm_provider=row['llm_provider'],
-                system_prompt=row['system_prompt'],
-                tenant_id=tenant_id,
-            )
-            
-            # Restore capabilities
-            if row['capabilities']:
-                capabilities = json.loads(row['capabilities']) if isinstance(row['capabilities'], str) else row['capabilities']
-                for capability in capabilities:
-                    agent.add_capability(capability, f"Capability: {capability}")
-            
-            return agent
+        def load(cursor):
+            execute_prepared(self.db, cursor, "agent_load", _LOAD_AGENT_SQL, (agent_id, tenant_id))
+            return cursor.fetchone()
+        
+        # A miss on a replica may be an agent it has not replayed yet
+        row = self.db.run_read(load, key=_agent_key(tenant_id, agent_id), retry_if=lambda row: row is None)
+        if not row:
+            return None
+        
+        return _agent_from_row(row, tenant_id, gateway)
     
     def list_agents(
         self,
@@ -169,19 +224,11 @@ class AgentStorage:
         Returns:
             List of agent dictionaries
         """
-        with self.db.get_cursor() as cursor:
-            cursor.execute("""
-                SELECT 
-                    agent_id, name, description,
-                    llm_model, llm_provider,
-                    created_at, updated_at
-                FROM agents
-                WHERE tenant_id = %s
-                ORDER BY created_at DESC
-                LIMIT %s OFFSET %s
-            """, (tenant_id, limit, offset))
-            
+        def list_rows(cursor):
+            execute_prepared(self.db, cursor, "agent_list", _LIST_AGENTS_SQL, (tenant_id, limit, offset))
             return [dict(row) for row in cursor.fetchall()]
+        
+        return self.db.run_read(list_rows, key=_agent_list_key(tenant_id))
     
     def delete_agent(
         self,
@@ -199,12 +246,12 @@ class AgentStorage:
             True if deleted, False if not found
         """
         with self.db.get_cursor() as cursor:
-            cursor.execute("""
-                DELETE FROM agents
-                WHERE agent_id = %s AND tenant_id = %s
-            """, (agent_id, tenant_id))
-            
-            return cursor.rowcount > 0
+            execute_prepared(self.db, cursor, "agent_delete", _DELETE_AGENT_SQL, (agent_id, tenant_id))
+            deleted = cursor.rowcount > 0
+        
+        self.db.mark_written(_agent_key(tenant_id, agent_id))
+        self.db.mark_written(_agent_list_key(tenant_id))
+        return deleted
     
     def agent_exists(
         self,
@@ -221,12 +268,124 @@ class AgentStorage:
         Returns:
             True if exists, False otherwise
         """
-        with self.db.get_cursor() as cursor:
-            cursor.execute("""
-                SELECT 1 FROM agents
-                WHERE agent_id = %s AND tenant_id = %s
-                LIMIT 1
-            """, (agent_id, tenant_id))
-            
+        def exists(cursor):
+            execute_prepared(self.db, cursor, "agent_exists", _AGENT_EXISTS_SQL, (agent_id, tenant_id))
             return cursor.fetchone() is not None
+        
+        return self.db.run_read(exists, key=_agent_key(tenant_id, agent_id), retry_if=lambda found: not found)
 
+
+class AsyncAgentStorage:
+    """
+    Database-backed agent storage over an async connection pool.
+    
+    Same storage layout as ``AgentStorage``; every method is awaitable so
+    FaaS handlers never block the event loop on agent lookups.
+    """
+    
+    def __init__(self, db_connection: Any):
+        """
+        Initialize async agent storage.
+        
+        Args:
+            db_connection: Async database connection (AsyncDatabaseConnection instance)
+        """
+        self.db = db_connection
+        self._table_ready = False
+    
+    async def _ensure_table(self):
+        """Ensure agents table exists (once per instance)."""
+        if self._table_ready:
+            return
+        try:
+            async with self.db.get_cursor() as cursor:
+                await cursor.execute(_CREATE_TABLE_SQL)
+                await cursor.execute(_CREATE_INDEX_SQL)
+        except Exception as e:
+            logger.warning(f"Could not create agents table (may already exist): {e}")
+        self._table_ready = True
+    
+    async def save_agent(self, agent: Agent, tenant_id: str) -> None:
+        """
+        Save agent to database.
+        
+        Args:
+            agent: Agent instance
+            tenant_id: Tenant ID
+        """
+        await self._ensure_table()
+        await self.db.execute_query(_SAVE_AGENT_SQL, _agent_params(agent, tenant_id), fetch_all=False)
+    
+    async def load_agent(
+        self,
+        agent_id: str,
+        tenant_id: str,
+        gateway: LiteLLMGateway,
+    ) -> Optional[Agent]:
+        """
+        Load agent from database and recreate Agent instance.
+        
+        Args:
+            agent_id: Agent ID
+            tenant_id: Tenant ID
+            gateway: LiteLLM Gateway instance
+            
+        Returns:
+            Agent instance or None if not found
+        """
+        await self._ensure_table()
+        row = await self.db.execute_query(_LOAD_AGENT_SQL, (agent_id, tenant_id), fetch_one=True)
+        if not row:
+            return None
+        return _agent_from_row(row, tenant_id, gateway)
+    
+    async def list_agents(
+        self,
+        tenant_id: str,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> list[Dict[str, Any]]:
+        """
+        List agents for a tenant.
+        
+        Args:
+            tenant_id: Tenant ID
+            limit: Maximum number of agents
+            offset: Offset for pagination
+            
+        Returns:
+            List of agent dictionaries
+        """
+        await self._ensure_table()
+        rows = await self.db.execute_query(_LIST_AGENTS_SQL, (tenant_id, limit, offset))
+        return [dict(row) for row in rows]
+    
+    async def delete_agent(self, agent_id: str, tenant_id: str) -> bool:
+        """
+        Delete agent from database.
+        
+        Args:
+            agent_id: Agent ID
+            tenant_id: Tenant ID
+            
+        Returns:
+            True if deleted, False if not found
+        """
+        await self._ensure_table()
+        deleted = await self.db.execute_query(_DELETE_AGENT_SQL, (agent_id, tenant_id), fetch_all=False)
+        return deleted > 0
+    
+    async def agent_exists(self, agent_id: str, tenant_id: str) -> bool:
+        """
+        Check if agent exists.
+        
+        Args:
+            agent_id: Agent ID
+            tenant_id: Tenant ID
+            
+        Returns:
+            True if exists, False otherwise
+        """
+        await self._ensure_table()
+        row = await self.db.execute_query(_AGENT_EXISTS_SQL, (agent_id, tenant_id), fetch_one=True)
+        return row is not None
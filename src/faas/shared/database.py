@@ -2,13 +2,24 @@
 Database connection utilities for FaaS services.
 """
 
-from typing import Any, Optional
+import asyncio
+from typing import Optional
 
-from ..core.postgresql_database import DatabaseConnection, create_database_connection
+from ...core.postgresql_database import (
+    AsyncDatabaseConnection,
+    DatabaseConnection,
+    create_async_database_connection,
+    create_database_connection,
+)
 
 
 class DatabaseManager:
-    """Database connection manager."""
+    """
+    Database connection manager.
+
+    Hands out one sync ``DatabaseConnection`` (the ``db=`` the core components
+    take) and one async pool (their ``async_db=``), opened at service startup.
+    """
 
     def __init__(self, database_url: str):
         """
@@ -19,22 +30,46 @@ class DatabaseManager:
         """
         self.database_url = database_url
         self._connection: Optional[DatabaseConnection] = None
+        self._async_connection: Optional[AsyncDatabaseConnection] = None
+        self._async_lock: Optional[asyncio.Lock] = None
 
-    async def get_connection(self) -> DatabaseConnection:
+    def get_connection(self) -> DatabaseConnection:
         """
-        Get database connection (creates if not exists).
+        Get the sync database connection (creates if not exists).
+
+        The pool is opened on first use.
 
         Returns:
             Database connection instance
         """
         if self._connection is None:
-            self._connection = await create_database_connection(self.database_url)
+            self._connection = create_database_connection(database_url=self.database_url)
         return self._connection
 
+    async def get_async_connection(self) -> AsyncDatabaseConnection:
+        """
+        Get the async database connection, opening its pool once.
+
+        Returns:
+            Connected async database connection instance
+        """
+        if self._async_connection is None:
+            if self._async_lock is None:
+                self._async_lock = asyncio.Lock()
+            async with self._async_lock:
+                if self._async_connection is None:
+                    self._async_connection = await create_async_database_connection(
+                        database_url=self.database_url
+                    )
+        return self._async_connection
+
     async def close(self):
-        """Close database connection."""
+        """Close database connections."""
+        if self._async_connection:
+            await self._async_connection.close()
+            self._async_connection = None
         if self._connection:
-            await self._connection.close()
+            self._connection.close()
             self._connection = None
 
 
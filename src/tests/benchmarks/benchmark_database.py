@@ -4,14 +4,23 @@ Performance Benchmarks for PostgreSQL Database
 Measures query performance and vector search speed.
 """
 
+import asyncio
+import os
 import time
+
+import numpy as np
+from contextlib import asynccontextmanager
 from typing import Dict, List
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 
+from src.core.postgresql_database.async_connection import AsyncDatabaseConnection
 from src.core.postgresql_database.connection import DatabaseConnection, DatabaseConfig
+from src.core.postgresql_database.full_text_search import FullTextSearch
 from src.core.postgresql_database.vector_operations import VectorOperations
 
+DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
 
 class BenchmarkDatabase:
     """Benchmark suite for Database."""
@@ -173,3 +182,276 @@ class TestDatabaseBenchmarks:
         # Connection pool should be very fast
         assert stats["avg"] < 0.01  # < 10ms
 
+    def test_pool_burst_blocking_vs_fail_fast(self):
+        """Benchmark a request burst larger than the pool: fail-fast vs blocking acquisition."""
+        from concurrent.futures import ThreadPoolExecutor
+        from psycopg2 import pool as pg_pool
+        from src.core.postgresql_database.blocking_pool import BlockingConnectionPool
+
+        query_latency, pool_size, workers, requests = 0.005, 4, 16, 160
+
+        def connect(*args, **kwargs):
+            conn = MagicMock()
+            conn.closed = 0
+            conn.info.transaction_status = 0
+            return conn
+
+        def run(connection_pool):
+            def request(_):
+                try:
+                    conn = connection_pool.getconn()
+                except pg_pool.PoolError:
+                    return False
+                time.sleep(query_latency)
+                connection_pool.putconn(conn)
+                return True
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                return sum(executor.map(request, range(requests)))
+
+        with patch('psycopg2.pool.psycopg2.connect', side_effect=connect):
+            fail_fast = run(pg_pool.ThreadedConnectionPool(1, pool_size))
+            blocking_pool = BlockingConnectionPool(1, pool_size, acquire_timeout=5)
+            start = time.perf_counter()
+            blocking = run(blocking_pool)
+            elapsed = time.perf_counter() - start
+        stats = blocking_pool.stats()
+
+        print(f"\nPool Burst ({workers} workers, {pool_size} connections, {requests} requests):")
+        print(f"  ThreadedConnectionPool: {fail_fast}/{requests} succeeded")
+        print(f"  BlockingConnectionPool: {blocking}/{requests} succeeded in {elapsed:.2f}s, "
+              f"mean wait {stats['acquire_wait']['sum'] / stats['acquired'] * 1000:.1f}ms, "
+              f"utilization {stats['utilization']:.0%}, churn {stats['opened']} opened / {stats['closed']} closed")
+
+        assert blocking == requests
+        assert fail_fast < requests
+        assert stats["timeouts"] == 0
+
+    def test_concurrent_query_throughput_async(self):
+        """Benchmark concurrent query throughput: sync pool vs async pool."""
+        query_latency = 0.005  # simulated server round-trip
+        concurrency = 20
+        total_queries = 200
+        config = DatabaseConfig(max_connections=concurrency)
+
+        # Sync pool: each query blocks the event loop for the round-trip
+        sync_cursor = MagicMock()
+        sync_cursor.execute.side_effect = lambda *args: time.sleep(query_latency)
+        sync_cursor.fetchall.return_value = [{"id": 1}]
+        sync_db = DatabaseConnection(config)
+        sync_db.connection_pool = MagicMock()
+        sync_db.connection_pool.getconn.return_value.cursor.return_value = sync_cursor
+
+        # Async pool: the round-trip is awaited, bounded by max_connections
+        class AsyncCursor:
+            rowcount = 1
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            async def execute(self, query, params=None):
+                await asyncio.sleep(query_latency)
+
+            async def fetchall(self):
+                return [{"id": 1}]
+
+        class AsyncPool:
+            def __init__(self, size):
+                self.slots = asyncio.Semaphore(size)
+
+            @asynccontextmanager
+            async def connection(self):
+                async with self.slots:
+                    conn = MagicMock()
+
+                    @asynccontextmanager
+                    async def transaction():
+                        yield
+
+                    conn.transaction = transaction
+                    conn.cursor = lambda name=None: AsyncCursor()
+                    yield conn
+
+        async_db = AsyncDatabaseConnection(config)
+
+        async def run_sync():
+            async def one():
+                sync_db.execute_query("SELECT 1")
+            await asyncio.gather(*(one() for _ in range(total_queries)))
+
+        async def run_async():
+            async_db.connection_pool = AsyncPool(concurrency)
+            await asyncio.gather(*(async_db.execute_query("SELECT 1") for _ in range(total_queries)))
+
+        throughput = {}
+        for name, runner in (("sync_pool", run_sync), ("async_pool", run_async)):
+            start = time.time()
+            asyncio.run(runner())
+            throughput[name] = total_queries / (time.time() - start)
+
+        print(f"\nConcurrent Query Throughput ({concurrency} connections, {query_latency*1000:.0f}ms/query):")
+        for name, qps in throughput.items():
+            print(f"  {name}: {qps:.0f} queries/second")
+
+        assert throughput["async_pool"] > throughput["sync_pool"] * 5
+
+    def test_bulk_load_binary_copy(self):
+        """Benchmark binary COPY bulk loading against text-literal encoding."""
+        rows, dim = 2000, 1536
+        vectors = np.random.rand(rows, dim).astype(np.float32)
+        document_ids = list(range(rows))
+
+        # Text path: what batch_insert_embeddings sends per row
+        start = time.time()
+        text_bytes = sum(len("[" + ",".join(map(str, vector)) + "]") for vector in vectors.tolist())
+        text_elapsed = time.time() - start
+
+        # Binary COPY path: drain the stream the server would receive
+        db = MagicMock()
+        cursor = db.get_connection.return_value.__enter__.return_value.cursor.return_value
+        cursor.fetchone.return_value = ("integer",)
+        sent = []
+        cursor.copy_expert.side_effect = lambda sql, stream, size=8192: sent.append(
+            sum(len(chunk) for chunk in iter(lambda: stream.read(size), b""))
+        )
+        stats = VectorOperations(db).bulk_load_embeddings(document_ids, vectors, chunk_size=1000)
+        binary_bytes = sum(sent)
+
+        print(f"\nBulk Load ({rows} x {dim}):")
+        print(f"  Text literals: {text_bytes / 1e6:.1f} MB, {rows / text_elapsed:.0f} rows/second")
+        print(f"  Binary COPY:   {binary_bytes / 1e6:.1f} MB, {stats['rows_per_sec']:.0f} rows/second")
+
+        assert stats["chunks"] == 2
+        assert binary_bytes < text_bytes / 2
+        assert stats["rows_per_sec"] > rows / text_elapsed
+
+    def test_quantized_recall_vs_memory(self):
+        """Benchmark recall@10 and index bytes per vector for float32, halfvec and binary quantization."""
+        rng = np.random.default_rng(0)
+        rows, dim, queries_n, k = 5000, 1536, 50, 10
+
+        # Clustered, unit-norm embeddings (zero-centred, like real embedding models)
+        centers = rng.standard_normal((50, dim))
+        corpus = (centers[rng.integers(0, 50, rows)] + rng.standard_normal((rows, dim))).astype(np.float32)
+        corpus /= np.linalg.norm(corpus, axis=1, keepdims=True)
+        queries = corpus[rng.choice(rows, queries_n, replace=False)]
+        queries = queries + 0.3 * rng.standard_normal((queries_n, dim)).astype(np.float32) / np.sqrt(dim)
+        queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+        exact = np.argsort(-(queries @ corpus.T), axis=1)[:, :k]
+
+        # Candidate distances as the quantized index sees them
+        halfvec_scores = -(queries.astype(np.float16) @ corpus.astype(np.float16).T).astype(np.float32)
+        popcount = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+        codes = np.packbits(corpus > 0, axis=1)
+        hamming = np.stack([popcount[np.bitwise_xor(codes, q)].sum(axis=1) for q in np.packbits(queries > 0, axis=1)])
+
+        def recall_after_rerank(distances, candidates):
+            # Top candidates from the quantized index, re-ranked with full-precision vectors
+            found = 0
+            for query, row, truth in zip(queries, distances, exact):
+                pool = np.argpartition(row, candidates)[:candidates]
+                top = pool[np.argsort(-(corpus[pool] @ query))[:k]]
+                found += len(set(top) & set(truth))
+            return found / (queries_n * k)
+
+        index_bytes = {"float32": dim * 4, "halfvec": dim * 2, "binary": dim // 8}
+        print(f"\nQuantized Search ({rows} x {dim}, recall@{k} after full-precision re-rank):")
+        print(f"  float32  {index_bytes['float32']:>5} B/vector  recall 1.000")
+        recalls = {}
+        for factor in (1, 4, 10):
+            recalls[("halfvec", factor)] = recall_after_rerank(halfvec_scores, k * factor)
+            recalls[("binary", factor)] = recall_after_rerank(hamming, k * factor)
+        for mode in ("halfvec", "binary"):
+            curve = "  ".join(f"x{factor}: {recalls[(mode, factor)]:.3f}" for factor in (1, 4, 10))
+            print(f"  {mode:<8} {index_bytes[mode]:>5} B/vector  {curve}")
+
+        assert recalls[("halfvec", 4)] >= 0.99
+        assert recalls[("binary", 10)] > recalls[("binary", 1)]
+        assert recalls[("binary", 10)] >= 0.85
+        assert index_bytes["binary"] * 32 == index_bytes["float32"]
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(not DATABASE_URL, reason="TEST_DATABASE_URL not set")
+class TestKeywordSearchBenchmarks:
+    """Keyword search latency on a large chunk corpus (real PostgreSQL)."""
+
+    SCHEMA = "sdk_keyword_benchmark"
+    CHUNKS = int(os.getenv("KEYWORD_BENCHMARK_CHUNKS", "1000000"))
+    DOCUMENTS = 100_000
+
+    @pytest.fixture(scope="class")
+    def fts(self):
+        """Scratch schema with CHUNKS synthetic chunks of 40 Zipf-distributed terms."""
+        db = DatabaseConnection(DatabaseConfig.from_url(DATABASE_URL, min_connections=1, max_connections=1))
+        db.execute_transaction([
+            (f"DROP SCHEMA IF EXISTS {self.SCHEMA} CASCADE", None),
+            (f"CREATE SCHEMA {self.SCHEMA}", None),
+            (f"SET search_path TO {self.SCHEMA}, public", None),
+            ("CREATE TABLE documents (id SERIAL PRIMARY KEY, title TEXT, content TEXT, "
+             "metadata JSONB, source TEXT, tenant_id TEXT)", None),
+            ("INSERT INTO documents (title, tenant_id) SELECT 'doc ' || i, 'tenant_' || (i % 10) "
+             f"FROM generate_series(1, {self.DOCUMENTS}) i", None),
+        ])
+        fts = FullTextSearch(db)
+        fts.create_schema()
+        start = time.perf_counter()
+        db.execute_transaction([
+            (f"""
+            INSERT INTO document_chunks (document_id, chunk_index, language, content)
+            SELECT i % {self.DOCUMENTS} + 1, i / {self.DOCUMENTS}, 'english', t.body
+            FROM generate_series(0, {self.CHUNKS - 1}) i,
+            LATERAL (
+                SELECT string_agg('term' || floor(power(random(), 3) * 5000)::int, ' ') AS body
+                FROM generate_series(1, 40) WHERE i IS NOT NULL
+            ) t
+            """, None),
+            ("ANALYZE documents", None),
+            ("ANALYZE document_chunks", None),
+        ])
+        print(f"\nLoaded {self.CHUNKS} chunks with GIN index in {time.perf_counter() - start:.1f}s")
+        yield fts
+        db.execute_transaction([(f"DROP SCHEMA IF EXISTS {self.SCHEMA} CASCADE", None)])
+        db.close()
+
+    def test_keyword_search_latency(self, fts):
+        """Benchmark ts_rank_cd keyword search against the LIKE scan it replaces."""
+        benchmark = BenchmarkDatabase()
+        queries = {
+            "rare": "term4711 term4242",
+            "common": "term1 term2",
+            "phrase": '"term3 term5"',
+            "tenant": "term4000",
+        }
+        for name, query in queries.items():
+            tenant_id = "tenant_3" if name == "tenant" else None
+            fts.search(query, top_k=10, tenant_id=tenant_id)  # warm up
+            for _ in range(20):
+                start = time.perf_counter()
+                fts.search(query, top_k=10, tenant_id=tenant_id)
+                benchmark.record_latency(name, time.perf_counter() - start)
+
+        for _ in range(3):
+            start = time.perf_counter()
+            fts.db.execute_query(
+                "SELECT id FROM document_chunks WHERE LOWER(content) LIKE ANY(ARRAY[%s]) LIMIT 10",
+                (["% term4711 %", "% term4242 %"],)
+            )
+            benchmark.record_latency("like_scan", time.perf_counter() - start)
+
+        plan = fts.db.execute_query(
+            "EXPLAIN (FORMAT JSON) SELECT id FROM document_chunks "
+            "WHERE tsv @@ websearch_to_tsquery('english', 'term4711 term4242')",
+            fetch_one=True
+        )["QUERY PLAN"]
+
+        print(f"\nKeyword Search ({self.CHUNKS} chunks, top-10):")
+        for name in list(queries) + ["like_scan"]:
+            stats = benchmark.get_stats(name)
+            print(f"  {name:<10} p50 {stats['p50'] * 1000:8.2f}ms  p95 {stats['p95'] * 1000:8.2f}ms")
+
+        assert "document_chunks_tsv_idx" in str(plan)
+        assert benchmark.get_stats("rare")["p95"] < benchmark.get_stats("like_scan")["avg"]
@@ -11,6 +11,11 @@ import pytest
 from unittest.mock import Mock, patch, MagicMock, AsyncMock
 
 from src.core.rag import RAGSystem
+from src.core.rag.answer_cache import AnswerCache
+from src.core.rag.embedding_cache import QueryEmbeddingCache
+from src.core.rag.numpy_vector_store import NumpyVectorStore
+from src.core.rag.retriever import Retriever
+from src.core.utils.event_loop_lag import EventLoopLagProbe
 from src.core.postgresql_database.connection import DatabaseConnection, DatabaseConfig
 from src.core.litellm_gateway import LiteLLMGateway, GatewayConfig
 from src.core.cache_mechanism import CacheMechanism, CacheConfig
@@ -228,3 +233,226 @@ class TestRAGBenchmarks:
         
         assert throughput > 0.5  # Should handle at least 0.5 queries/sec
 
+    def test_hybrid_branch_concurrency(self):
+        """Benchmark concurrent hybrid branches against running them back to back."""
+        benchmark = BenchmarkRAG()
+        iterations = 10
+        embed_latency, vector_latency, keyword_latency = 0.02, 0.03, 0.04
+
+        def embed(**kwargs):
+            time.sleep(embed_latency)
+            return MagicMock(embeddings=[[0.1] * 1536])
+
+        def vector_search(**kwargs):
+            time.sleep(vector_latency)
+            return [{"document_id": i, "similarity": 0.9 - i / 100} for i in range(10)]
+
+        def keyword_search(*args, **kwargs):
+            time.sleep(keyword_latency)
+            return [{"document_id": i, "similarity": 0.05 - i / 1000} for i in range(5, 15)]
+
+        gateway = MagicMock()
+        gateway.embed.side_effect = embed
+        vector_ops = MagicMock()
+        vector_ops.similarity_search.side_effect = vector_search
+        full_text = MagicMock()
+        full_text.search.side_effect = keyword_search
+        retriever = Retriever(vector_ops=vector_ops, gateway=gateway, full_text=full_text)
+
+        for _ in range(iterations):
+            start = time.perf_counter()
+            retriever._get_embedding("query")
+            vector_ops.similarity_search(query_embedding=None)
+            retriever._keyword_search("query", top_k=10)
+            benchmark.record_latency("sequential", time.perf_counter() - start)
+
+            result = retriever.search_hybrid("query", top_k=5)
+            benchmark.record_latency("concurrent", result.timings["total"])
+
+        sequential = benchmark.get_stats("sequential")
+        concurrent = benchmark.get_stats("concurrent")
+        print(f"\nHybrid Retrieval (embed {embed_latency * 1000:.0f}ms, vector {vector_latency * 1000:.0f}ms, "
+              f"keyword {keyword_latency * 1000:.0f}ms):")
+        print(f"  Sequential p50: {sequential['p50'] * 1000:.1f}ms")
+        print(f"  Concurrent p50: {concurrent['p50'] * 1000:.1f}ms")
+        print(f"  Last timings: { {k: round(v * 1000, 1) for k, v in result.timings.items()} }")
+
+        # Latency is bounded by the slower branch (embed + vector), not the sum
+        assert concurrent["p50"] < sequential["p50"] * 0.8
+
+    @pytest.mark.asyncio
+    async def test_event_loop_lag_under_load(self):
+        """Benchmark event loop lag while serving concurrent queries: blocking vs async pipeline."""
+        import gc
+        from concurrent.futures import ThreadPoolExecutor
+
+        io_latency, concurrent_requests = 0.02, 25
+
+        def blocking(result):
+            def call(*args, **kwargs):
+                time.sleep(io_latency)
+                return result
+            return call
+
+        async def non_blocking(*args, **kwargs):
+            await asyncio.sleep(io_latency)
+            return MagicMock(embeddings=[[0.1] * 8])
+
+        gateway = MagicMock()
+        gateway.embed.side_effect = blocking(MagicMock(embeddings=[[0.1] * 8]))
+        gateway.embed_async.side_effect = non_blocking
+        cache = MagicMock()
+        cache.get.side_effect = blocking(None)
+        cache.set.side_effect = blocking(None)
+        executor = ThreadPoolExecutor(max_workers=32)
+        rag = RAGSystem(db=MagicMock(), gateway=gateway, cache=cache, enable_memory=False, executor=executor)
+        rag.memory = MagicMock()
+        rag.memory.retrieve.side_effect = blocking([])
+        rag.memory.store.side_effect = blocking(None)
+        rag.vector_ops.similarity_search = MagicMock(side_effect=blocking([{"document_id": 1, "similarity": 0.9}]))
+        rag.generator.generate = MagicMock(return_value="answer")
+        rag.generator.generate_async = AsyncMock(return_value="answer")
+
+        async def blocking_query(i):
+            # Sync dependencies called straight from a coroutine, as the old pipeline did
+            return rag.query(f"question {i}")
+
+        print(f"\nEvent Loop Lag ({concurrent_requests} concurrent queries, {io_latency * 1000:.0f}ms per sync call):")
+        measured = {}
+        for name, handler in (("blocking", blocking_query), ("async", rag.query_async)):
+            gc.collect()  # keep a full collection from landing in the measured window
+            async with EventLoopLagProbe(interval=0.005) as probe:
+                start = time.perf_counter()
+                await asyncio.gather(*[handler(f"question {i}") for i in range(concurrent_requests)])
+                elapsed = time.perf_counter() - start
+                await asyncio.sleep(probe.interval * 2)  # let the probe take a final sample
+            measured[name] = probe.stats()
+            print(f"  {name:<8} wall {elapsed * 1000:7.0f}ms  lag p50 {measured[name]['p50'] * 1000:6.1f}ms  "
+                  f"p99 {measured[name]['p99'] * 1000:6.1f}ms  max {measured[name]['max'] * 1000:6.1f}ms")
+        executor.shutdown()
+
+        assert measured["blocking"]["max"] >= io_latency
+        assert measured["async"]["p99"] < io_latency
+
+    def test_repeated_query_embedding_cache(self):
+        """Benchmark retrieval of repeated queries with the query-embedding cache."""
+        benchmark = BenchmarkRAG()
+        embed_latency, db_latency = 0.03, 0.003
+        queries = [f"faq question {i}" for i in range(10)]
+
+        def embed(**kwargs):
+            time.sleep(embed_latency)
+            return MagicMock(embeddings=[[0.1] * 1536])
+
+        def similarity_search(**kwargs):
+            time.sleep(db_latency)
+            return []
+
+        gateway = MagicMock()
+        gateway.embed.side_effect = embed
+        vector_ops = MagicMock()
+        vector_ops.similarity_search.side_effect = similarity_search
+        shared = CacheMechanism(CacheConfig(backend="memory"))
+        retriever = Retriever(vector_ops=vector_ops, gateway=gateway, embedding_cache=QueryEmbeddingCache(shared))
+
+        for round_name in ("first", "repeat", "repeat", "repeat"):
+            for query in queries:
+                start = time.perf_counter()
+                retriever.retrieve(query.upper() if round_name == "repeat" else query)
+                benchmark.record_latency(round_name, time.perf_counter() - start)
+
+        first, repeat = benchmark.get_stats("first"), benchmark.get_stats("repeat")
+        stats = retriever.embedding_cache.stats()
+        print(f"\nQuery Embedding Cache (embed {embed_latency * 1000:.0f}ms, db {db_latency * 1000:.0f}ms):")
+        print(f"  First query p50:    {first['p50'] * 1000:.2f}ms")
+        print(f"  Repeated query p50: {repeat['p50'] * 1000:.2f}ms")
+        print(f"  Hit rate: {stats['hit_rate']:.0%}  ({stats['memory_hits']} memory, {stats['shared_hits']} shared)")
+
+        assert gateway.embed.call_count == len(queries)
+        # Repeats pay only for the database search
+        assert repeat["p50"] < db_latency + 0.002
+
+    def test_answer_cache_precise_invalidation(self):
+        """Benchmark answer-cache hit rate under document updates: precise vs flush-all invalidation."""
+        import random
+        benchmark = BenchmarkRAG()
+        num_documents, num_queries, requests, update_every = 200, 500, 5000, 25
+        # Each query's answer is built from three documents; popular queries repeat (Zipf-like)
+        dependencies = {
+            q: [{"document_id": d} for d in random.Random(q).sample(range(num_documents), 3)]
+            for q in range(num_queries)
+        }
+        weights = [1 / (rank + 1) for rank in range(num_queries)]
+
+        hit_rates = {}
+        for mode in ("flush_all", "precise"):
+            rng = random.Random(42)
+            answer_cache = AnswerCache(CacheMechanism(CacheConfig(backend="memory", max_size=100_000)))
+            for i, q in enumerate(rng.choices(range(num_queries), weights=weights, k=requests)):
+                start = time.perf_counter()
+                lookup = answer_cache.lookup(answer_cache.key(f"question {q}"))
+                benchmark.record_latency(f"{mode}_lookup", time.perf_counter() - start)
+                if not lookup.hit:
+                    answer_cache.put(lookup, {"answer": f"answer {q}"}, dependencies[q])
+                if i % update_every == 0:
+                    if mode == "precise":
+                        answer_cache.invalidate_documents([rng.randrange(num_documents)])
+                    else:
+                        answer_cache.invalidate_all()
+            hit_rates[mode] = answer_cache.stats()["hit_rate"]
+
+        print(f"\nAnswer Cache Invalidation ({requests} queries, one document update every {update_every}):")
+        for mode in ("flush_all", "precise"):
+            stats = benchmark.get_stats(f"{mode}_lookup")
+            print(f"  {mode:<10} hit rate: {hit_rates[mode]:.1%}  lookup p50: {stats['p50'] * 1e6:.0f}us")
+
+        assert hit_rates["precise"] > hit_rates["flush_all"] + 0.2
+
+    @pytest.mark.asyncio
+    async def test_streaming_time_to_first_token(self):
+        """Benchmark perceived latency: full answer (query_async) vs first streamed token."""
+        benchmark = BenchmarkRAG()
+        first_token_latency, token_interval, num_tokens = 0.05, 0.005, 40
+
+        async def generate_async(**kwargs):
+            await asyncio.sleep(first_token_latency + token_interval * num_tokens)
+            return MagicMock(text="token " * num_tokens, model="gpt-4", usage={})
+
+        async def generate_stream_async(**kwargs):
+            await asyncio.sleep(first_token_latency)
+            for _ in range(num_tokens):
+                yield "token "
+                await asyncio.sleep(token_interval)
+
+        gateway = MagicMock()
+        gateway.embed_async = AsyncMock(return_value=MagicMock(embeddings=[[1.0, 0.0, 0.0, 0.0]]))
+        gateway.generate_async = generate_async
+        gateway.generate_stream_async = generate_stream_async
+        rag = RAGSystem(db=None, gateway=gateway, enable_memory=False, vector_store=NumpyVectorStore(dimension=4))
+        rag.generator.enable_hallucination_detection = False
+        doc_id = rag.vector_ops.put_document("Doc", "Content")
+        rag.vector_ops.batch_insert_embeddings([(doc_id, [1.0, 0.0, 0.0, 0.0], rag.embedding_model)])
+
+        for i in range(5):
+            start = time.perf_counter()
+            await rag.query_async(f"blocking question {i}", threshold=0.5)
+            benchmark.record_latency("full_answer", time.perf_counter() - start)
+
+            start, first_token = time.perf_counter(), None
+            async for event in rag.query_stream_async(f"streaming question {i}", threshold=0.5):
+                if event["event"] == "sources":
+                    benchmark.record_latency("sources", time.perf_counter() - start)
+                elif event["event"] == "delta" and first_token is None:
+                    first_token = time.perf_counter() - start
+                    benchmark.record_latency("first_token", first_token)
+            benchmark.record_latency("stream_complete", time.perf_counter() - start)
+
+        stats = {name: benchmark.get_stats(name) for name in ("full_answer", "sources", "first_token", "stream_complete")}
+        print(f"\nRAG Streaming ({num_tokens} tokens, {first_token_latency * 1000:.0f}ms to first token):")
+        print(f"  query_async full answer p50:   {stats['full_answer']['p50'] * 1000:.1f}ms")
+        print(f"  stream sources p50:            {stats['sources']['p50'] * 1000:.1f}ms")
+        print(f"  stream first token p50:        {stats['first_token']['p50'] * 1000:.1f}ms")
+        print(f"  stream complete p50:           {stats['stream_complete']['p50'] * 1000:.1f}ms")
+
+        # Perceived latency drops to time-to-first-token
+        assert stats["first_token"]["p50"] < stats["full_answer"]["p50"] / 2
@@ -0,0 +1,93 @@
+"""
+Performance Benchmarks for the In-Process Vector Store
+
+Measures NumpyVectorStore append throughput, exact and IVF search latency and
+recall. Runs entirely in process: no database is required.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from src.core.rag.numpy_vector_store import NumpyVectorStore
+
+
+def _clustered_corpus(rows: int, dim: int, seed: int = 0) -> np.ndarray:
+    """Clustered embeddings, roughly like a real embedding model's output."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((64, dim))
+    return (centers[rng.integers(0, 64, rows)] + rng.standard_normal((rows, dim))).astype(np.float32)
+
+
+@pytest.mark.benchmark
+class TestVectorStoreBenchmarks:
+    """Performance benchmarks for NumpyVectorStore."""
+
+    ROWS, DIM, QUERIES, K = 50_000, 384, 100, 10
+
+    @pytest.fixture(scope="class")
+    def corpus(self):
+        """Corpus and held-out queries with exact top-k neighbours."""
+        corpus = _clustered_corpus(self.ROWS, self.DIM)
+        rng = np.random.default_rng(1)
+        queries = corpus[rng.choice(self.ROWS, self.QUERIES, replace=False)]
+        queries = queries + 0.5 * rng.standard_normal(queries.shape).astype(np.float32)
+
+        normalized = corpus / np.linalg.norm(corpus, axis=1, keepdims=True)
+        scores = (queries / np.linalg.norm(queries, axis=1, keepdims=True)) @ normalized.T
+        exact = np.argsort(-scores, axis=1)[:, :self.K]
+        return corpus, queries, exact
+
+    @staticmethod
+    def _load(store: NumpyVectorStore, corpus: np.ndarray, batch: int = 1000) -> float:
+        start = time.perf_counter()
+        for offset in range(0, len(corpus), batch):
+            store.batch_insert_embeddings([
+                (offset + i, vector, "bench") for i, vector in enumerate(corpus[offset:offset + batch])
+            ])
+        return time.perf_counter() - start
+
+    def _recall(self, results, exact) -> float:
+        return float(np.mean([
+            len({r["id"] for r in rows} & set(truth.tolist())) / self.K for rows, truth in zip(results, exact)
+        ]))
+
+    def test_append_throughput(self, corpus, tmp_path):
+        """Benchmark incremental appends into the memory-mapped store."""
+        vectors, _, _ = corpus
+        store = NumpyVectorStore(self.DIM, path=str(tmp_path), ivf_min_rows=0)
+        elapsed = self._load(store, vectors)
+        store.flush()
+
+        print(f"\nAppend ({self.ROWS} x {self.DIM}, memory-mapped): {self.ROWS / elapsed:,.0f} rows/sec")
+        assert len(store) == self.ROWS
+
+    def test_exact_vs_ivf_search(self, corpus):
+        """Benchmark exact blockwise top-k against IVF probing, single and batched queries."""
+        vectors, queries, exact = corpus
+        exact_store = NumpyVectorStore(self.DIM, ivf_min_rows=0)
+        ivf_store = NumpyVectorStore(self.DIM, ivf_min_rows=10_000, n_probe=16)
+        self._load(exact_store, vectors)
+        self._load(ivf_store, vectors)
+        ivf_store.train()
+
+        print(f"\nVector Store Search ({self.ROWS} x {self.DIM}, top-{self.K}):")
+        measured = {}
+        for name, store in (("exact", exact_store), ("ivf", ivf_store)):
+            start = time.perf_counter()
+            single = [store.similarity_search(q, limit=self.K, threshold=-1.0) for q in queries]
+            single_ms = (time.perf_counter() - start) * 1000 / self.QUERIES
+
+            start = time.perf_counter()
+            batched = store.search_batch(queries, limit=self.K, threshold=-1.0)
+            batched_ms = (time.perf_counter() - start) * 1000 / self.QUERIES
+
+            measured[name] = (single_ms, batched_ms, self._recall(single, exact))
+            assert [[r["id"] for r in rows] for rows in batched] == [[r["id"] for r in rows] for rows in single]
+            print(f"  {name:<5} {single_ms:7.2f} ms/query  batched {batched_ms:6.2f} ms/query  "
+                  f"recall@{self.K} {measured[name][2]:.3f}")
+
+        assert measured["exact"][2] == pytest.approx(1.0)
+        assert measured["ivf"][0] < measured["exact"][0]
+        assert measured["ivf"][2] >= 0.8
@@ -0,0 +1,138 @@
+"""
+Integration Tests for Vector Index Usage
+
+Plan regression tests for similarity search against a real PostgreSQL with
+pgvector. They check that the ANN index serves the search (no sequential scan
+of ``embeddings``) and are skipped unless ``TEST_DATABASE_URL`` is set.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from src.core.postgresql_database.connection import DatabaseConfig, DatabaseConnection
+from src.core.postgresql_database.index_tuner import IndexAutotuner, load_search_params
+from src.core.postgresql_database.partitioning import PartitionStrategy, TenantPartitionManager
+from src.core.postgresql_database.vector_operations import SearchParams, VectorOperations
+
+DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+SCHEMA = "sdk_vector_index_test"
+DIMENSION = 32
+ROWS = 2000
+
+
+def _plan_nodes(plan):
+    """Yield every node of an EXPLAIN (FORMAT JSON) plan tree."""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+@pytest.mark.integration
+@pytest.mark.skipif(not DATABASE_URL, reason="TEST_DATABASE_URL not set")
+class TestVectorIndexPlans:
+    """EXPLAIN-based regression tests for index-friendly similarity search."""
+
+    @pytest.fixture(scope="class")
+    def db(self):
+        """Scratch schema with documents, embeddings and an HNSW index."""
+        # A single pooled connection keeps the search_path for every query
+        db = DatabaseConnection(DatabaseConfig.from_url(DATABASE_URL, min_connections=1, max_connections=1))
+        db.execute_transaction([
+            ("CREATE EXTENSION IF NOT EXISTS vector", None),
+            (f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE", None),
+            (f"CREATE SCHEMA {SCHEMA}", None),
+            (f"SET search_path TO {SCHEMA}, public", None),
+            ("CREATE TABLE documents (id SERIAL PRIMARY KEY, title TEXT, content TEXT, "
+             "metadata JSONB, source TEXT)", None),
+            (f"CREATE TABLE embeddings (id SERIAL PRIMARY KEY, document_id INT REFERENCES documents(id), "
+             f"embedding vector({DIMENSION}), model TEXT)", None),
+            ("INSERT INTO documents (title, content) SELECT 'doc ' || i, 'content ' || i "
+             f"FROM generate_series(1, {ROWS}) i", None),
+        ])
+        rng = np.random.default_rng(0)
+        VectorOperations(db).bulk_load_embeddings(
+            list(range(1, ROWS + 1)), rng.standard_normal((ROWS, DIMENSION)), model="test"
+        )
+        db.execute_transaction([
+            ("CREATE INDEX ON embeddings USING hnsw (embedding vector_cosine_ops)", None),
+            ("ANALYZE documents", None),
+            ("ANALYZE embeddings", None),
+        ])
+        yield db
+        db.execute_transaction([(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE", None)])
+        db.close()
+
+    def test_threshold_search_uses_index(self, db):
+        """A similarity threshold must not turn the ANN scan into a sequential scan."""
+        vector_ops = VectorOperations(db)
+        plan = vector_ops.explain_similarity_search([0.1] * DIMENSION, limit=10, threshold=0.5)
+
+        nodes = list(_plan_nodes(plan))
+        assert any(n["Node Type"] == "Index Scan" and n.get("Relation Name") == "embeddings" for n in nodes)
+        assert not any(n["Node Type"] == "Seq Scan" and n.get("Relation Name") == "embeddings" for n in nodes)
+
+    def test_search_params_return_results(self, db):
+        """Per-query ef_search still returns the requested number of neighbours."""
+        vector_ops = VectorOperations(db, search_params=SearchParams(ef_search=100))
+
+        results = vector_ops.similarity_search([0.1] * DIMENSION, limit=10)
+
+        assert len(results) == 10
+        similarities = [row["similarity"] for row in results]
+        assert similarities == sorted(similarities, reverse=True)
+
+    def test_autotuner_curve_and_operating_point(self, db):
+        """The recall/latency sweep persists an operating point the search path can load."""
+        result = IndexAutotuner(db).tune(k=10, sample_size=20, target_recall=0.9, search_grid=[10, 40, 200])
+
+        assert len(result.curve) == 3
+        assert result.curve[-1].recall >= result.curve[0].recall
+        assert all(point.latency_p95_ms > 0 for point in result.curve)
+        assert load_search_params(db) == result.search_params()
+
+
+@pytest.mark.integration
+@pytest.mark.skipif(not DATABASE_URL, reason="TEST_DATABASE_URL not set")
+class TestTenantPartitionPlans:
+    """Partition pruning for the tenant-partitioned layout."""
+
+    SCHEMA = "sdk_vector_partition_test"
+
+    @pytest.fixture(scope="class")
+    def db(self):
+        """Scratch schema with LIST partitions for two tenants."""
+        db = DatabaseConnection(DatabaseConfig.from_url(DATABASE_URL, min_connections=1, max_connections=1))
+        db.execute_transaction([
+            ("CREATE EXTENSION IF NOT EXISTS vector", None),
+            (f"DROP SCHEMA IF EXISTS {self.SCHEMA} CASCADE", None),
+            (f"CREATE SCHEMA {self.SCHEMA}", None),
+            (f"SET search_path TO {self.SCHEMA}, public", None),
+            ("CREATE TABLE documents (id SERIAL PRIMARY KEY, title TEXT, content TEXT, "
+             "metadata JSONB, source TEXT, tenant_id TEXT)", None),
+            ("INSERT INTO documents (title, tenant_id) SELECT 'doc ' || i, "
+             "CASE WHEN i % 2 = 0 THEN 'tenant_a' ELSE 'tenant_b' END FROM generate_series(1, 200) i", None),
+        ])
+        manager = TenantPartitionManager(db, strategy=PartitionStrategy.LIST, dimension=DIMENSION)
+        manager.create_partitioned_table()
+        manager.ensure_tenant_partition("tenant_a")
+        manager.ensure_tenant_partition("tenant_b")
+        rng = np.random.default_rng(1)
+        VectorOperations(db, partitioned=True).batch_insert_embeddings(
+            [(i, rng.standard_normal(DIMENSION), "test") for i in range(1, 201)]
+        )
+        yield db, manager
+        db.execute_transaction([(f"DROP SCHEMA IF EXISTS {self.SCHEMA} CASCADE", None)])
+        db.close()
+
+    def test_tenant_search_scans_one_partition(self, db):
+        """A tenant-filtered search only touches that tenant's partition."""
+        db, manager = db
+        vector_ops = VectorOperations(db, partitioned=True)
+
+        plan = vector_ops.explain_similarity_search([0.1] * DIMENSION, filters={"tenant_id": "tenant_a"})
+
+        relations = {n.get("Relation Name") for n in _plan_nodes(plan)} - {None, "documents"}
+        assert relations == {manager.partition_name("tenant_a")}
+        assert len(vector_ops.similarity_search([0.1] * DIMENSION, limit=5, filters={"tenant_id": "tenant_a"})) == 5
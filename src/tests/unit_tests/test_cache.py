@@ -4,10 +4,22 @@ Unit Tests for Cache Component
 Tests caching operations for LLM responses and embeddings.
 """
 
+import asyncio
+import threading
 import pytest
 import time
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from src.core.cache_mechanism import CacheMechanism, CacheConfig
+from src.core.cache_mechanism.cache_enhancements import (
+    auto_cache,
+    CacheMonitor,
+    CacheWarmer,
+    CacheWarmingConfig,
+    CacheShardingConfig,
+    ConsistentHashRing,
+    ShardedCache,
+    hash_tag,
+)
 
 
 class TestCacheMechanism:
@@ -80,6 +92,463 @@ class TestCacheMechanism:
         assert value is not None
 
 
+class TestCacheAsync:
+    """Test the non-blocking get_async/set_async API."""
+
+    def test_memory_async_round_trip(self):
+        """Test the memory backend serves async calls in place."""
+        cache = CacheMechanism(config=CacheConfig(backend="memory"))
+
+        async def run():
+            await cache.set_async("key1", {"v": 1}, tenant_id="t1")
+            return await cache.get_async("key1", tenant_id="t1"), await cache.get_async("key1")
+
+        assert asyncio.run(run()) == ({"v": 1}, None)
+
+    @patch('src.core.cache_mechanism.cache.redis_asyncio')
+    @patch('src.core.cache_mechanism.cache.redis')
+    def test_dragonfly_async_uses_async_client(self, mock_redis_module, mock_redis_asyncio):
+        """Test Dragonfly async calls go through one redis.asyncio client per event loop."""
+        sync_client = Mock()
+        mock_redis_module.Redis.from_url.return_value = sync_client
+        async_client = Mock(get=AsyncMock(return_value=b"v"), set=AsyncMock())
+        mock_redis_asyncio.Redis.from_url.return_value = async_client
+        cache = CacheMechanism(config=CacheConfig(
+            backend="dragonfly", dragonfly_url="redis://df:6379/0", namespace="ns", max_connections=7
+        ))
+
+        async def run():
+            await cache.set_async("key1", b"v", ttl=30)
+            return await cache.get_async("key1")
+
+        assert asyncio.run(run()) == b"v"
+        async_client.set.assert_awaited_once_with("ns:key1", b"v", ex=30)
+        async_client.get.assert_awaited_once_with("ns:key1")
+        mock_redis_asyncio.Redis.from_url.assert_called_once_with("redis://df:6379/0", max_connections=7)
+        sync_client.get.assert_not_called()
+
+    @patch('src.core.cache_mechanism.cache.redis_asyncio', None)
+    @patch('src.core.cache_mechanism.cache.redis')
+    def test_dragonfly_async_falls_back_to_blocking_executor(self, mock_redis_module):
+        """Test without redis.asyncio the sync client runs on the shared bounded executor."""
+        threads = []
+        sync_client = Mock()
+        sync_client.get.side_effect = lambda key: threads.append(threading.current_thread().name) or b"v"
+        sync_client.set.side_effect = lambda *args, **kwargs: threads.append(threading.current_thread().name)
+        mock_redis_module.Redis.from_url.return_value = sync_client
+        cache = CacheMechanism(config=CacheConfig(backend="dragonfly", namespace="ns"))
+
+        async def run():
+            await cache.set_async("key1", b"v", ttl=30)
+            return await cache.get_async("key1")
+
+        assert asyncio.run(run()) == b"v"
+        sync_client.set.assert_called_once_with("ns:key1", b"v", ex=30)
+        assert len(threads) == 2 and all(name.startswith("rag-blocking") for name in threads)
+
+
+class TestCacheBatchOperations:
+    """Test batched get_many/set_many/delete_many."""
+
+    def test_set_many_get_many(self):
+        """Test batched set and get on the memory backend."""
+        cache = CacheMechanism(config=CacheConfig(backend="memory"))
+
+        cache.set_many({"k1": "v1", "k2": "v2"}, tenant_id="tenant_1")
+        values = cache.get_many(["k1", "k2", "missing"], tenant_id="tenant_1")
+
+        assert values == {"k1": "v1", "k2": "v2", "missing": None}
+        assert cache.get_many(["k1"], tenant_id="tenant_2") == {"k1": None}
+
+    def test_set_many_ttl_and_eviction(self):
+        """Test batched set honours TTL and LRU max_size."""
+        cache = CacheMechanism(config=CacheConfig(backend="memory", max_size=2))
+
+        cache.set_many({"a": 1, "b": 2, "c": 3}, ttl=1)
+        assert cache.get_many(["a", "b", "c"]) == {"a": None, "b": 2, "c": 3}
+
+        time.sleep(1.1)
+        assert cache.get_many(["b", "c"]) == {"b": None, "c": None}
+
+    def test_delete_many(self):
+        """Test batched delete."""
+        cache = CacheMechanism(config=CacheConfig(backend="memory"))
+
+        cache.set_many({"k1": "v1", "k2": "v2", "k3": "v3"})
+        cache.delete_many(["k1", "k3"])
+
+        assert cache.get_many(["k1", "k2", "k3"]) == {"k1": None, "k2": "v2", "k3": None}
+
+    @patch('src.core.cache_mechanism.cache.redis')
+    def test_dragonfly_batch_round_trips(self, mock_redis_module):
+        """Test Dragonfly batches use MGET, one pipeline and one DEL."""
+        mock_client = Mock()
+        mock_redis_module.Redis.from_url.return_value = mock_client
+        mock_client.mget.return_value = [b"v1", None]
+        mock_pipe = Mock()
+        mock_client.pipeline.return_value = mock_pipe
+
+        cache = CacheMechanism(config=CacheConfig(backend="dragonfly", namespace="ns"))
+
+        assert cache.get_many(["k1", "k2"]) == {"k1": b"v1", "k2": None}
+        mock_client.mget.assert_called_once_with(["ns:k1", "ns:k2"])
+
+        cache.set_many({"k1": "v1", "k2": "v2"}, ttl=60)
+        mock_client.pipeline.assert_called_once_with(transaction=False)
+        assert mock_pipe.set.call_count == 2
+        mock_pipe.execute.assert_called_once()
+
+        cache.delete_many(["k1", "k2"])
+        mock_client.delete.assert_called_once_with("ns:k1", "ns:k2")
+
+
+class TestAutoCache:
+    """Test stampede protection in the auto_cache decorator."""
+
+    def test_single_flight_sync(self):
+        """Test concurrent misses run the function once."""
+        cache = CacheMechanism(config=CacheConfig(backend="memory"))
+        calls = []
+
+        @auto_cache(cache, key_func=lambda x: f"sf:{x}", ttl=60)
+        def expensive(x):
+            calls.append(x)
+            time.sleep(0.1)
+            return x * 2
+
+        threads = [threading.Thread(target=expensive, args=(21,)) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert expensive(21) == 42
+
+    def test_single_flight_async(self):
+        """Test concurrent async misses run the coroutine once."""
+        cache = CacheMechanism(config=CacheConfig(backend="memory"))
+        calls = []
+
+        @auto_cache(cache, ttl=60)
+        async def expensive(x):
+            calls.append(x)
+            await asyncio.sleep(0.05)
+            return x * 2
+
+        async def run():
+            return await asyncio.gather(*[expensive(5) for _ in range(10)])
+
+        assert asyncio.run(run()) == [10] * 10
+        assert len(calls) == 1
+
+    def test_stale_while_revalidate(self):
+        """Test a stale value is served while one background refresh runs."""
+        cache = CacheMechanism(config=CacheConfig(backend="memory"))
+        calls = []
+
+        @auto_cache(cache, key_func=lambda: "swr", ttl=1, stale_ttl=10, early_expiration_beta=0)
+        def expensive():
+            calls.append(1)
+            return len(calls)
+
+        assert expensive() == 1
+        time.sleep(1.1)
+
+        assert expensive() == 1  # stale value served immediately
+        time.sleep(0.2)
+        assert expensive() == 2  # refreshed in background
+        assert len(calls) == 2
+
+    def test_hot_stale_key_starts_one_refresh_thread(self):
+        """Test requests for a stale key start no new thread while its refresh is in flight."""
+        from src.core.cache_mechanism import cache_enhancements
+        cache = CacheMechanism(config=CacheConfig(backend="memory"))
+        release = threading.Event()
+        calls = []
+
+        @auto_cache(cache, key_func=lambda: "hot", ttl=1, stale_ttl=10, early_expiration_beta=0)
+        def expensive():
+            calls.append(1)
+            if len(calls) > 1:
+                release.wait(5)
+            return len(calls)
+
+        assert expensive() == 1
+        time.sleep(1.1)
+
+        with patch.object(cache_enhancements.threading, "Thread", wraps=threading.Thread) as thread:
+            assert [expensive() for _ in range(50)] == [1] * 50
+            release.set()
+        time.sleep(0.2)
+
+        assert thread.call_count == 1
+        assert expensive() == 2
+        assert len(calls) == 2
+
+    @patch('src.core.cache_mechanism.cache.redis_asyncio')
+    @patch('src.core.cache_mechanism.cache.redis')
+    def test_async_wrapper_keeps_cache_and_lock_calls_off_the_loop(self, mock_redis_module, mock_redis_asyncio):
+        """Test async callers use the async client and run SET NX lock calls on the blocking executor."""
+        lock_threads = []
+        sync_client = Mock()
+        sync_client.set.side_effect = lambda *args, **kwargs: lock_threads.append(threading.current_thread().name) or True
+        sync_client.eval.side_effect = lambda *args: lock_threads.append(threading.current_thread().name)
+        mock_redis_module.Redis.from_url.return_value = sync_client
+        async_client = Mock(get=AsyncMock(return_value=None), set=AsyncMock())
+        mock_redis_asyncio.Redis.from_url.return_value = async_client
+        cache = CacheMechanism(config=CacheConfig(backend="dragonfly", namespace="ns"))
+
+        @auto_cache(cache, key_func=lambda: "k", ttl=60, lock_backend="dragonfly")
+        async def expensive():
+            return "value"
+
+        assert asyncio.run(expensive()) == "value"
+        sync_client.get.assert_not_called()
+        async_client.get.assert_awaited_with("ns:k")
+        assert async_client.set.await_args.args[0] == "ns:k"
+        assert len(lock_threads) == 2 and all(name.startswith("rag-blocking") for name in lock_threads)
+
+    @patch('src.core.cache_mechanism.cache.redis')
+    def test_non_json_result_not_cached_on_dragonfly(self, mock_redis_module):
+        """Test results JSON cannot round-trip are returned but never stored as their str()."""
+        from datetime import datetime
+        mock_client = Mock()
+        mock_redis_module.Redis.from_url.return_value = mock_client
+        mock_client.get.return_value = None
+        cache = CacheMechanism(config=CacheConfig(backend="dragonfly", namespace="ns"))
+        results = {"k1": datetime(2024, 1, 1), "k2": b"raw", "k3": {"answer": "ok"}}
+
+        @auto_cache(cache, key_func=lambda key: key, ttl=60)
+        def expensive(key):
+            return results[key]
+
+        assert [expensive(key) for key in results] == list(results.values())
+        assert [call.args[0] for call in mock_client.set.call_args_list] == ["ns:k3"]
+
+    def test_dragonfly_lock_requires_dragonfly_backend(self):
+        """Test distributed locks are rejected on the memory backend."""
+        cache = CacheMechanism(config=CacheConfig(backend="memory"))
+        with pytest.raises(ValueError):
+            auto_cache(cache, lock_backend="dragonfly")
+
+    @patch('src.core.cache_mechanism.cache.redis')
+    def test_dragonfly_lock_uses_set_nx(self, mock_redis_module):
+        """Test the Dragonfly lock is taken with SET NX and released by token."""
+        mock_client = Mock()
+        mock_redis_module.Redis.from_url.return_value = mock_client
+        mock_client.get.return_value = None
+        cache = CacheMechanism(config=CacheConfig(backend="dragonfly", namespace="ns"))
+
+        @auto_cache(cache, key_func=lambda: "k", ttl=60, lock_backend="dragonfly")
+        def expensive():
+            return "value"
+
+        assert expensive() == "value"
+        lock_call = mock_client.set.call_args_list[0]
+        assert lock_call.args[0] == "ns:lock:{ns:k}"
+        assert lock_call.kwargs["nx"] is True
+        mock_client.eval.assert_called_once()
+
+
+class TestCacheWarming:
+    """Test access statistics and priority-driven cache warming."""
+
+    def test_monitor_wired_into_get_set(self):
+        """Test an attached monitor sees hits, misses and writes."""
+        cache = CacheMechanism(config=CacheConfig(backend="memory"))
+        monitor = CacheMonitor(cache)
+
+        cache.get("k1")
+        cache.set("k1", "v1")
+        cache.get_many(["k1", "k2"])
+
+        assert monitor.metrics["hits"] == 1
+        assert monitor.metrics["misses"] == 2
+        assert monitor.access_log[(None, "k1")]["writes"] == 1
+
+    def test_hot_keys_ranked_by_benefit(self):
+        """Test keys are ranked by access rate times recompute cost."""
+        cache = CacheMechanism(config=CacheConfig(backend="memory"))
+        monitor = CacheMonitor(cache)
+
+        for _ in range(5):
+            cache.get("frequent")
+        cache.get("expensive")
+        monitor.record_compute_cost("expensive", 20.0)
+
+        ranked = [stats["key"] for stats in monitor.get_hot_keys()]
+        assert ranked == ["expensive", "frequent"]
+
+    def test_warm_cache_priority_and_budget(self):
+        """Test hot keys warm in priority order within the time budget."""
+        cache = CacheMechanism(config=CacheConfig(backend="memory"))
+        monitor = CacheMonitor(cache)
+        for _ in range(3):
+            cache.get("hot")
+        cache.get("slow")
+        cache.set("cached", "v")
+        cache.get("cached")
+
+        started = []
+
+        async def loader(key):
+            started.append(key)
+            await asyncio.sleep(1.0 if key == "slow" else 0.01)
+            return key.upper()
+
+        warmer = CacheWarmer(cache, CacheWarmingConfig(
+            key_loader=loader,
+            max_concurrency=1,
+            time_budget=0.3
+        ))
+        summary = asyncio.run(warmer.warm_cache())
+
+        assert started[0] == "hot"
+        assert summary["skipped"] == 1
+        assert summary["warmed"] == 1
+        assert summary["timed_out"] == 1
+        assert cache.get("hot") == "HOT"
+        assert cache.get("slow") is None
+
+
+class TestCacheSharding:
+    """Test consistent-hash sharding across Dragonfly nodes."""
+
+    def test_ring_minimal_key_movement(self):
+        """Test adding a node only remaps roughly 1/N of the keys."""
+        ring = ConsistentHashRing(["node_a", "node_b", "node_c"])
+        keys = [f"key:{i}" for i in range(5000)]
+        before = {key: ring.get_node(key) for key in keys}
+
+        ring.add_node("node_d")
+        moved = [key for key in keys if ring.get_node(key) != before[key]]
+
+        assert all(ring.get_node(key) == "node_d" for key in moved)
+        assert 0.15 < len(moved) / len(keys) < 0.35
+
+        ring.remove_node("node_d")
+        assert all(ring.get_node(key) == before[key] for key in keys)
+
+    @patch('src.core.cache_mechanism.cache.redis')
+    def test_multi_key_ops_grouped_by_node(self, mock_redis_module):
+        """Test get_many issues one MGET per node with its own pool."""
+        clients = {}
+
+        def from_url(url, **kwargs):
+            client = Mock()
+            client.pool_kwargs = kwargs
+            client.mget.side_effect = lambda keys: [None] * len(keys)
+            clients[url] = client
+            return client
+
+        mock_redis_module.Redis.from_url.side_effect = from_url
+        cache = ShardedCache(
+            CacheConfig(backend="dragonfly", namespace="ns"),
+            CacheShardingConfig(enabled=True, nodes=["df://a", "df://b"], max_connections_per_node=5),
+        )
+
+        keys = [f"k{i}" for i in range(50)]
+        assert cache.get_many(keys) == {key: None for key in keys}
+
+        fetched = []
+        for url, client in clients.items():
+            assert client.pool_kwargs == {"max_connections": 5}
+            client.mget.assert_called_once()
+            node_keys = client.mget.call_args[0][0]
+            assert all(cache.ring.get_node(key) == url for key in node_keys)
+            fetched.extend(node_keys)
+        assert sorted(fetched) == sorted(f"ns:{key}" for key in keys)
+
+    @patch('src.core.cache_mechanism.cache.redis')
+    def test_lock_lives_on_the_data_key_node(self, mock_redis_module):
+        """Test the auto_cache lock key is hash-tagged onto the node that owns the data key."""
+        clients = {}
+
+        def from_url(url, **kwargs):
+            client = Mock()
+            client.get.return_value = None
+            clients[url] = client
+            return client
+
+        mock_redis_module.Redis.from_url.side_effect = from_url
+        cache = ShardedCache(
+            CacheConfig(backend="dragonfly", namespace="ns"),
+            CacheShardingConfig(enabled=True, nodes=[f"df://{i}" for i in range(4)]),
+        )
+        ring = cache.ring
+        assert ring.get_node("ns:lock:{ns:k}") == ring.get_node("ns:k")
+        assert hash_tag("a{b}c") == "b" and hash_tag("a{}c") == "a{}c" and hash_tag("plain") == "plain"
+
+        for i in range(20):
+            @auto_cache(cache, key_func=lambda: f"k{i}", ttl=60, lock_backend="dragonfly")
+            def expensive():
+                return "value"
+
+            expensive()
+            data_node = clients[ring.get_node(f"ns:k{i}")]
+            assert data_node.set.call_args_list[-2].args[0] == f"ns:lock:{{ns:k{i}}}"
+            assert data_node.set.call_args_list[-2].kwargs["nx"] is True
+
+
+class TestCacheSnapshot:
+    """Test warm-restart snapshots of the memory backend."""
+
+    def _config(self, path):
+        return CacheConfig(backend="memory", snapshot_path=str(path), snapshot_interval=None)
+
+    def test_warm_restart_keeps_absolute_ttl(self, tmp_path):
+        """Test a new process lazily restores live keys and drops expired ones."""
+        path = tmp_path / "cache.snap"
+        cache = CacheMechanism(config=self._config(path))
+        cache.set("answer", {"text": "42"}, tenant_id="tenant_1", ttl=60)
+        cache.set("short", "v", ttl=1)
+        cache.set("deleted", "v")
+        cache.delete("deleted")
+        cache.snapshot()
+
+        time.sleep(1.1)
+        restored = CacheMechanism(config=self._config(path))
+
+        assert len(restored._store) == 0  # nothing unpickled until requested
+        assert restored.get("answer", tenant_id="tenant_1") == {"text": "42"}
+        assert restored.get("short") is None
+        assert restored.get("deleted") is None
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_incremental_snapshot_reuses_unchanged_entries(self, tmp_path):
+        """Test only changed entries are re-serialized and untouched keys carry over."""
+        path = tmp_path / "cache.snap"
+        cache = CacheMechanism(config=self._config(path))
+        cache.set_many({"a": 1, "b": 2})
+        assert cache.snapshot()["serialized"] == 2
+        assert cache.snapshot()["bytes"] == 0  # nothing changed
+
+        restored = CacheMechanism(config=self._config(path))
+        restored.get("a")
+        restored.set("c", 3)
+        stats = restored.snapshot()
+
+        assert stats["serialized"] == 1
+        assert stats["reused"] == 2
+        assert CacheMechanism(config=self._config(path)).get_many(["a", "b", "c"]) == {"a": 1, "b": 2, "c": 3}
+
+    def test_failed_snapshot_keeps_changes_dirty(self, tmp_path):
+        """Test changes from a snapshot whose write failed are written by the next one."""
+        path = tmp_path / "cache.snap"
+        cache = CacheMechanism(config=self._config(path))
+        cache.set("a", 1)
+        cache.snapshot()
+        cache.set("b", 2)
+
+        with patch("src.core.cache_mechanism.cache._write_snapshot", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                cache.snapshot()
+        cache.close()
+
+        assert CacheMechanism(config=self._config(path)).get_many(["a", "b"]) == {"a": 1, "b": 2}
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
@@ -5,7 +5,7 @@ Tests LLM operations across multiple providers.
 """
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch, MagicMock, AsyncMock
 from src.core.litellm_gateway import LiteLLMGateway
 
 
@@ -93,6 +93,25 @@ class TestLiteLLMGateway:
         
         assert len(chunks) == 2
     
+    @pytest.mark.asyncio
+    async def test_generate_stream_async(self, mock_gateway):
+        """Test streaming generation yields the text deltas."""
+        gateway, _ = mock_gateway
+
+        async def chunks():
+            for content in ("Hello ", None, "World"):
+                chunk = MagicMock()
+                chunk.choices = [MagicMock()]
+                chunk.choices[0].delta.content = content
+                yield chunk
+            yield {"choices": [{"delta": {"content": "!"}}]}
+
+        with patch.object(gateway, "generate_async", AsyncMock(return_value=chunks())) as mock_generate:
+            deltas = [text async for text in gateway.generate_stream_async(prompt="Test prompt", model="gpt-4")]
+
+        assert deltas == ["Hello ", "World", "!"]
+        assert mock_generate.call_args.kwargs["stream"] is True
+
     def test_embed(self, mock_gateway):
         """Test embedding generation."""
         gateway, mock_litellm = mock_gateway
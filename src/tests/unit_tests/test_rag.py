@@ -4,12 +4,19 @@ Unit Tests for RAG Component
 Tests document processing, retrieval, and generation.
 """
 
+import json
 import pytest
 from unittest.mock import Mock, MagicMock, patch
 from src.core.rag import RAGSystem
+from src.core.rag.answer_cache import AnswerCache
 from src.core.rag.document_processor import DocumentProcessor, DocumentChunk
+from src.core.rag.embedding_cache import QueryEmbeddingCache, normalize_query
 from src.core.rag.retriever import Retriever
 from src.core.rag.generator import RAGGenerator
+from src.core.rag.hybrid_retrieval import FusionMethod, fuse_results
+from src.core.rag.numpy_vector_store import NumpyVectorStore
+from src.core.rag.vector_store import DocumentCatalog, VectorStore
+from src.core.utils.event_loop_lag import EventLoopLagProbe
 
 
 class TestDocumentProcessor:
@@ -43,6 +50,15 @@ class TestDocumentProcessor:
         
         assert len(chunks) > 0
 
+    def test_fixed_chunking_stops_after_last_chunk(self):
+        """Test overlap does not make fixed chunking repeat the final chunk forever."""
+        processor = DocumentProcessor(chunk_size=100, chunk_overlap=20)
+        content = "word " * 50
+
+        chunks = processor._chunk_fixed(content, "doc-001", None)
+
+        assert [(c.start_char, c.end_char) for c in chunks] == [(0, 100), (80, 180), (160, 250)]
+
 
 class TestRetriever:
     """Test Retriever."""
@@ -82,6 +98,288 @@ class TestRetriever:
         assert len(results) == 1
         assert results[0]["similarity"] == 0.95
         mock_gateway.embed.assert_called_once()
+    
+    def test_retrieve_pushes_filters_into_search(self, mock_retriever):
+        """Test metadata and tenant filters go to the SQL search, not a Python post-filter."""
+        retriever, mock_vector_ops, mock_gateway = mock_retriever
+        filters = {"category": "faq"}
+        
+        results = retriever.retrieve(query="Test query", tenant_id="tenant_1", top_k=5, filters=filters)
+        
+        assert len(results) == 1  # row has no metadata but was already filtered in SQL
+        assert mock_vector_ops.similarity_search.call_args.kwargs["filters"] == {
+            "category": "faq", "tenant_id": "tenant_1"
+        }
+        assert filters == {"category": "faq"}
+
+    def test_retrieve_applies_tenant_tuned_search_params(self, mock_retriever):
+        """Test each tenant's autotuned operating point reaches the search, else the default."""
+        from src.core.postgresql_database.index_tuner import TunedSearchParams
+        from src.core.postgresql_database.vector_operations import SearchParams
+
+        retriever, mock_vector_ops, mock_gateway = mock_retriever
+        db = MagicMock()
+        db.execute_query.side_effect = lambda query, params, fetch_one: (
+            {"search_params": {"ef_search": 80}} if params == ("embeddings", "tenant_1") else None
+        )
+        default = SearchParams(ef_search=40)
+        retriever.tuned_search_params = TunedSearchParams(db, default=default)
+
+        retriever.retrieve(query="Test query", tenant_id="tenant_1")
+        assert mock_vector_ops.similarity_search.call_args.kwargs["search_params"] == SearchParams(ef_search=80)
+        retriever.retrieve(query="Test query", tenant_id="tenant_2")
+        assert mock_vector_ops.similarity_search.call_args.kwargs["search_params"] == default
+
+        retriever.retrieve(query="Test query", tenant_id="tenant_1")
+        assert db.execute_query.call_count == 2  # lookups are cached per tenant
+
+    def test_hybrid_uses_full_text_chunks(self, mock_retriever):
+        """Test keyword retrieval goes through chunk-level full-text search and fuses per document."""
+        retriever, mock_vector_ops, mock_gateway = mock_retriever
+        retriever.full_text = MagicMock()
+        retriever.full_text.search.return_value = [
+            {"id": "1", "document_id": 1, "chunk_id": 7, "content": "chunk", "similarity": 0.5},
+            {"id": "2", "document_id": 2, "chunk_id": 9, "content": "other", "similarity": 0.4},
+        ]
+
+        results = retriever.retrieve_hybrid("reset password", tenant_id="tenant_1", top_k=5, filters={"category": "faq"})
+
+        # Filters go to the keyword query too, so its LIMIT counts only matching chunks
+        retriever.full_text.search.assert_called_once_with(
+            "reset password", top_k=10, tenant_id="tenant_1",
+            filters={"category": "faq", "tenant_id": "tenant_1"}
+        )
+        assert [r["document_id"] for r in results] == [1, 2]
+        assert results[0]["vector_score"] == 0.95 and results[0]["keyword_score"] == 0.5
+
+    def test_keyword_search_failure_returns_no_matches(self, mock_retriever):
+        """Test a failing keyword index degrades to vector-only results."""
+        retriever, mock_vector_ops, mock_gateway = mock_retriever
+        retriever.full_text = MagicMock()
+        retriever.full_text.search.side_effect = RuntimeError("relation does not exist")
+
+        assert retriever._keyword_search("query", top_k=3) == []
+
+    def test_rrf_fuses_on_rank_not_raw_scale(self):
+        """Test RRF ignores the branches' score scales and rewards documents found by both."""
+        vector = [{"document_id": 1, "similarity": 0.91}, {"document_id": 2, "similarity": 0.90}]
+        keyword = [{"document_id": 2, "similarity": 0.02}, {"document_id": 3, "similarity": 0.01}]
+
+        fused = fuse_results(vector, keyword, method=FusionMethod.RRF, rrf_k=60)
+
+        assert [r["document_id"] for r in fused] == [2, 1, 3]
+        assert fused[0]["vector_rank"] == 2 and fused[0]["keyword_rank"] == 1
+        assert fused[0]["similarity"] == pytest.approx(0.7 / 62 + 0.3 / 61)
+        assert fused[2]["vector_rank"] is None and fused[2]["vector_score"] == 0.0
+
+    def test_calibrated_fusion_normalizes_each_branch(self):
+        """Test calibrated fusion min-max normalizes scores within each branch."""
+        vector = [{"document_id": 1, "similarity": 0.9}, {"document_id": 2, "similarity": 0.7}]
+        keyword = [{"document_id": 2, "similarity": 0.05}, {"document_id": 3, "similarity": 0.01}]
+
+        fused = {r["document_id"]: r["similarity"] for r in fuse_results(vector, keyword, method="calibrated")}
+
+        assert fused == pytest.approx({1: 0.7, 2: 0.3, 3: 0.0})
+        with pytest.raises(ValueError):
+            fuse_results(vector, keyword, method="weighted")
+
+    def test_search_hybrid_runs_branches_concurrently(self, mock_retriever):
+        """Test the keyword branch overlaps the vector branch and timings are reported."""
+        import time
+        retriever, mock_vector_ops, mock_gateway = mock_retriever
+        retriever.full_text = MagicMock()
+
+        def slow_vector_search(**kwargs):
+            time.sleep(0.2)
+            return [{"document_id": 1, "similarity": 0.95}]
+
+        def slow_keyword_search(*args, **kwargs):
+            time.sleep(0.2)
+            return [{"document_id": 2, "similarity": 0.3}]
+
+        mock_vector_ops.similarity_search.side_effect = slow_vector_search
+        retriever.full_text.search.side_effect = slow_keyword_search
+
+        result = retriever.search_hybrid("query", top_k=5)
+
+        assert [r["document_id"] for r in result.documents] == [1, 2]
+        assert result.fusion == FusionMethod.RRF
+        assert set(result.timings) == {"embedding", "vector_search", "keyword_search", "fusion", "total"}
+        assert result.timings["keyword_search"] >= 0.2 and result.timings["vector_search"] >= 0.2
+        assert result.timings["total"] < 0.35
+
+
+class TestQueryEmbeddingCache:
+    """Test QueryEmbeddingCache."""
+
+    def test_normalized_text_and_model_key(self):
+        """Test spelling variants share a key and models do not."""
+        cache = QueryEmbeddingCache()
+
+        assert normalize_query("  What is\tＡＩ? ") == "what is ai?"
+        assert cache.key("What is AI?", "m1") == cache.key("what  is ai?", "m1")
+        assert cache.key("What is AI?", "m1") != cache.key("What is AI?", "m2")
+
+    def test_memory_lru_in_front_of_shared_cache(self):
+        """Test float32 bytes go to the shared cache and shared hits are promoted to the LRU."""
+        import numpy as np
+        from src.core.cache_mechanism import CacheConfig, CacheMechanism
+        shared = CacheMechanism(CacheConfig(backend="memory"))
+        writer = QueryEmbeddingCache(shared)
+        reader = QueryEmbeddingCache(shared, max_entries=1)
+
+        assert reader.get("reset password", "m") is None
+        writer.put("reset password", "m", [0.5, -1.0, 2.0])
+        stored = shared.get(writer.key("reset password", "m"))
+        assert isinstance(stored, bytes) and len(stored) == 12
+
+        first = reader.get("Reset  Password", "m")
+        second = reader.get("reset password", "m")
+        assert first.dtype == np.float32 and first.tolist() == [0.5, -1.0, 2.0]
+        assert second.tolist() == [0.5, -1.0, 2.0]
+        reader.get("other", "m")  # miss; LRU of size 1 keeps the promoted entry
+        assert reader.stats() == {
+            "lookups": 4, "memory_hits": 1, "shared_hits": 1, "misses": 2,
+            "hit_rate": 0.5, "memory_hit_rate": 0.25, "entries": 1,
+        }
+
+    def test_retriever_skips_embedding_call_for_repeats(self):
+        """Test repeated queries only hit the vector store."""
+        import asyncio
+        from unittest.mock import AsyncMock
+        vector_ops = MagicMock()
+        vector_ops.similarity_search.return_value = []
+        gateway = MagicMock()
+        gateway.embed.return_value = MagicMock(embeddings=[[0.1, 0.2]])
+        gateway.embed_async = AsyncMock(return_value=MagicMock(embeddings=[[0.3, 0.4]]))
+        retriever = Retriever(vector_ops=vector_ops, gateway=gateway, embedding_cache=QueryEmbeddingCache())
+
+        for _ in range(3):
+            retriever.retrieve("How do I reset my password?")
+        asyncio.run(retriever.retrieve_async("how do i reset my password?"))
+        asyncio.run(retriever.retrieve_async("A new question"))
+        asyncio.run(retriever.retrieve_async("a new question"))
+
+        assert gateway.embed.call_count == 1 and gateway.embed_async.await_count == 1
+        assert vector_ops.similarity_search.call_count == 6
+        assert retriever.embedding_cache.stats()["hit_rate"] == pytest.approx(4 / 6)
+
+
+class TestAnswerCache:
+    """Test AnswerCache."""
+
+    @pytest.fixture
+    def answer_cache(self):
+        """Answer cache over an in-memory cache."""
+        from src.core.cache_mechanism import CacheConfig, CacheMechanism
+        return AnswerCache(CacheMechanism(CacheConfig(backend="memory")))
+
+    def test_document_change_invalidates_only_dependent_answers(self, answer_cache):
+        """Test the reverse index drops exactly the answers built from a changed document."""
+        for query, doc_id in (("q1", 1), ("q2", 2), ("q3", 1)):
+            miss = answer_cache.lookup(answer_cache.key(query))
+            assert not miss.hit
+            assert answer_cache.put(miss, {"answer": query}, [{"id": 10 + doc_id, "document_id": doc_id}])
+
+        assert answer_cache.key("What is AI?", "t1", top_k=5) == answer_cache.key("what is  ai?", "t1", top_k=5)
+        assert answer_cache.key("q1", "t1") != answer_cache.key("q1", "t2")
+        assert answer_cache.invalidate_documents(["1"]) == 2
+        assert not answer_cache.lookup(answer_cache.key("q1")).hit
+        assert not answer_cache.lookup(answer_cache.key("q3")).hit
+        assert answer_cache.lookup(answer_cache.key("q2")).result == {"answer": "q2"}
+
+    def test_version_check_catches_entries_missing_from_index(self, answer_cache):
+        """Test an entry the reverse index lost is still dropped once its document changes."""
+        miss = answer_cache.lookup(answer_cache.key("q"))
+        answer_cache.put(miss, {"answer": "a"}, [{"id": "7", "document_id": 7, "chunk_id": 70}])
+        answer_cache.cache.delete(answer_cache._index_key("7"))
+
+        assert answer_cache.invalidate_documents([7]) == 0
+        assert not answer_cache.lookup(answer_cache.key("q")).hit
+        assert answer_cache.stats()["stale"] == 1
+
+    def test_answer_not_cached_when_documents_change_mid_query(self, answer_cache):
+        """Test an answer possibly built from old content is not stored."""
+        miss = answer_cache.lookup(answer_cache.key("q"))
+        answer_cache.invalidate_documents([3])  # another request updates a document meanwhile
+
+        assert answer_cache.put(miss, {"answer": "a"}, [{"document_id": 1}]) is False
+        assert not answer_cache.lookup(answer_cache.key("q")).hit
+        assert answer_cache.stats()["skipped"] == 1
+
+    def test_rag_update_document_invalidates_cached_answers(self):
+        """Test update_document regenerates answers that used the document, and only those."""
+        gateway = MagicMock()
+        gateway.embed.return_value = MagicMock(embeddings=[[1.0, 0.0, 0.0, 0.0]])
+        gateway.generate.return_value = MagicMock(text="Generated answer", model="gpt-4", usage={})
+        rag = RAGSystem(db=None, gateway=gateway, enable_memory=False, vector_store=NumpyVectorStore(dimension=4))
+        with patch.object(rag.document_processor, 'chunk_document', return_value=[MagicMock(content="chunk")]):
+            doc_a = rag.ingest_document(title="A", content="Alpha", tenant_id="t1")
+            rag.ingest_document(title="B", content="Beta", tenant_id="t2")
+
+        def generations(tenant_id):
+            before = gateway.generate.call_count
+            rag.query("question", tenant_id=tenant_id, threshold=0.5)
+            return gateway.generate.call_count - before
+
+        assert generations("t1") == 1 and generations("t2") == 1
+        assert generations("t1") == 0 and generations("t2") == 0
+
+        with patch.object(rag.document_processor, 'chunk_document', return_value=[MagicMock(content="chunk")]):
+            assert rag.update_document(doc_a, content="Alpha v2") is True
+        assert generations("t1") == 1 and generations("t2") == 0
+
+        # A new document can change any of its tenant's answers
+        with patch.object(rag.document_processor, 'chunk_document', return_value=[MagicMock(content="chunk")]):
+            rag.ingest_document(title="C", content="Gamma", tenant_id="t2")
+        assert generations("t1") == 0 and generations("t2") == 1
+
+    def test_shared_answer_cache_hits_across_rag_systems(self, answer_cache):
+        """Test a per-request RAG system reuses answers stored by an earlier one."""
+        gateway = MagicMock()
+        gateway.embed.return_value = MagicMock(embeddings=[[1.0, 0.0, 0.0, 0.0]])
+        gateway.generate.return_value = MagicMock(text="Generated answer", model="gpt-4", usage={})
+        store = NumpyVectorStore(dimension=4)
+        first, second = (
+            RAGSystem(db=None, gateway=gateway, enable_memory=False, vector_store=store,
+                      cache=answer_cache.cache, answer_cache=answer_cache)
+            for _ in range(2)
+        )
+        with patch.object(first.document_processor, 'chunk_document', return_value=[MagicMock(content="chunk")]):
+            first.ingest_document(title="A", content="Alpha", tenant_id="t1")
+
+        first.query("question", tenant_id="t1", threshold=0.5)
+        second.query("question", tenant_id="t1", threshold=0.5)
+
+        assert second.answer_cache is answer_cache
+        assert gateway.generate.call_count == 1 and answer_cache.stats()["hits"] == 1
+
+    def test_ingest_invalidates_tenant_and_unscoped_answers(self, answer_cache):
+        """Test invalidate_tenant drops the tenant's and unscoped answers and stops in-flight puts."""
+        for tenant_id in ("t1", "t2", None):
+            miss = answer_cache.lookup(answer_cache.key("q", tenant_id), tenant_id)
+            assert answer_cache.put(miss, {"answer": tenant_id}, [{"document_id": 1}])
+        in_flight = answer_cache.lookup(answer_cache.key("other", "t2"), "t2")
+
+        answer_cache.invalidate_tenant("t1")
+
+        assert not answer_cache.lookup(answer_cache.key("q", "t1"), "t1").hit
+        assert not answer_cache.lookup(answer_cache.key("q"), None).hit
+        assert answer_cache.lookup(answer_cache.key("q", "t2"), "t2").result == {"answer": "t2"}
+        assert answer_cache.put(in_flight, {"answer": "a"}, [{"document_id": 1}]) is False
+
+    def test_entries_are_stored_as_json(self, answer_cache):
+        """Test entries round-trip through JSON and pickled or unserializable values are never used."""
+        import pickle
+        miss = answer_cache.lookup(answer_cache.key("q"))
+        assert answer_cache.put(miss, {"answer": "a"}, [{"document_id": 1}])
+        entry = json.loads(answer_cache.cache.get(miss.key))
+        assert entry["result"] == {"answer": "a"} and list(entry["versions"]) == ["1"]
+        assert json.loads(answer_cache.cache.get(answer_cache._index_key("1"))) == [miss.key]
+
+        answer_cache.cache.set(miss.key, pickle.dumps(entry))
+        assert not answer_cache.lookup(miss.key).hit
+        assert answer_cache.put(miss, {"answer": object()}, []) is False
 
 
 class TestRAGGenerator:
@@ -166,6 +464,196 @@ class TestRAGSystem:
         mock_db.execute_query.assert_called()
         mock_gateway.embed.assert_called()
     
+    def test_reembed_documents_streams_documents(self, mock_rag_system):
+        """Test re-embedding reads documents through a streaming cursor."""
+        rag, mock_db, mock_gateway = mock_rag_system
+        mock_db.stream_query.return_value = iter([
+            {"id": 1, "content": "First document about vector search. " * 20, "metadata": {}},
+            {"id": 2, "content": "Second document about retrieval. " * 20, "metadata": {}},
+        ])
+
+        with patch.object(rag.document_processor, 'chunk_document', return_value=[MagicMock(content="chunk")]), \
+                patch.object(rag.vector_ops, 'batch_insert_embeddings') as mock_insert:
+            count = rag.reembed_documents(tenant_id="t1", embedding_model="new-model", itersize=100)
+
+        assert count == 2
+        query, params = mock_db.stream_query.call_args[0]
+        assert "WHERE tenant_id = %s" in query and params == ("t1",)
+        assert mock_db.stream_query.call_args.kwargs["itersize"] == 100
+        assert {call.args[0][0][2] for call in mock_insert.call_args_list} == {"new-model"}
+
+    def test_reembed_then_query_uses_new_model(self):
+        """Test queries after a model change search the re-embedded rows, read from the catalog without a db."""
+        gateway = MagicMock()
+        gateway.embed.return_value = MagicMock(embeddings=[[1.0, 0.0, 0.0, 0.0]])
+        rag = RAGSystem(db=None, gateway=gateway, enable_memory=False, vector_store=NumpyVectorStore(dimension=4))
+        with patch.object(rag.document_processor, 'chunk_document', return_value=[MagicMock(content="chunk")]):
+            rag.ingest_document(title="A", content="Alpha", tenant_id="t1")
+            rag.ingest_document(title="B", content="Beta", tenant_id="t2")
+
+            assert rag.reembed_documents(tenant_id="t1", embedding_model="new-model") == 1
+
+        assert rag.retriever.embedding_model == "new-model"
+        assert [doc["title"] for doc in rag.retriever.retrieve("question", threshold=0.5)] == ["A"]
+
+    def test_delete_document_through_database_connection(self):
+        """Test delete runs every DELETE without fetching rows from it."""
+        from psycopg2 import ProgrammingError
+        from src.core.postgresql_database.connection import DatabaseConfig, DatabaseConnection
+
+        db = DatabaseConnection(DatabaseConfig(prepared_statements=False))
+        db.connection_pool = MagicMock()
+        cursor = db.connection_pool.getconn.return_value.cursor.return_value
+        cursor.fetchall.side_effect = ProgrammingError("no results to fetch")
+        cursor.rowcount = 1
+        rag = RAGSystem(db=db, gateway=MagicMock(), enable_memory=False)
+
+        assert rag.delete_document("7") is True
+        statements = [c.args[0] for c in cursor.execute.call_args_list]
+        assert "DELETE FROM embeddings WHERE document_id = %s;" in statements
+        assert "DELETE FROM document_chunks WHERE document_id = %s;" in statements
+        assert "DELETE FROM documents WHERE id = %s;" in statements
+
+    def test_in_process_vector_store_without_database(self):
+        """Test ingest, query and delete against NumpyVectorStore with no database."""
+        mock_gateway = MagicMock()
+        mock_gateway.embed.return_value = MagicMock(embeddings=[[1.0, 0.0, 0.0, 0.0]])
+        mock_gateway.generate.return_value = MagicMock(text="Generated answer")
+        store = NumpyVectorStore(dimension=4)
+
+        rag = RAGSystem(db=None, gateway=mock_gateway, enable_memory=False, vector_store=store)
+        with patch.object(rag.document_processor, 'chunk_document', return_value=[MagicMock(content="chunk")]):
+            doc_id = rag.ingest_document(title="Edge", content="Offline content", tenant_id="t1")
+
+        assert rag.retriever.vector_ops is store
+        assert rag.reindex_scheduler is None
+        results = rag.retriever.retrieve("query", tenant_id="t1", threshold=0.5)
+        assert [r["document_id"] for r in results] == [int(doc_id)]
+        assert results[0]["content"] == "Offline content"
+        assert rag.retriever.retrieve("query", tenant_id="t2") == []
+
+        assert rag.delete_document(doc_id) is True
+        assert len(store) == 0 and store.get_document(doc_id) is None
+
+    def test_vector_store_requires_database_or_catalog(self):
+        """Test a database is required unless the vector store holds documents."""
+        with pytest.raises(ValueError):
+            RAGSystem(db=None, gateway=MagicMock(), enable_memory=False)
+
+    async def test_query_async_keeps_blocking_work_off_the_loop(self):
+        """Test sync memory, cache and vector search run on the bounded executor, not the event loop."""
+        import asyncio
+        import gc
+        import threading
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+        from unittest.mock import AsyncMock
+
+        loop_thread = threading.current_thread()
+        calls = []
+
+        def blocking(result):
+            def call(*args, **kwargs):
+                calls.append(threading.current_thread())
+                time.sleep(0.1)
+                return result
+            return call
+
+        gateway = MagicMock()
+        gateway.embed_async = AsyncMock(return_value=MagicMock(embeddings=[[0.1] * 8]))
+        cache = MagicMock()
+        cache.get.side_effect = blocking(None)
+        cache.set.side_effect = blocking(None)
+        cache.get_many.side_effect = blocking({})
+        cache.set_many.side_effect = blocking(None)
+        executor = ThreadPoolExecutor(max_workers=16)
+        rag = RAGSystem(db=MagicMock(), gateway=gateway, cache=cache, enable_memory=False, executor=executor)
+        rag.memory = MagicMock()
+        rag.memory.retrieve.side_effect = blocking([])
+        rag.memory.store.side_effect = blocking(None)
+        rag.vector_ops.similarity_search = MagicMock(side_effect=blocking([{"document_id": 1, "similarity": 0.9}]))
+        rag.generator.generate_async = AsyncMock(return_value="answer")
+
+        gc.collect()  # a full collection would also show up as loop lag
+        async with EventLoopLagProbe(interval=0.005) as probe:
+            results = await asyncio.gather(*[rag.query_async(f"question {i}") for i in range(4)])
+
+        assert [r["answer"] for r in results] == ["answer"] * 4
+        # memory retrieve/store, answer cache lookup/versions/set/index read/index write,
+        # query embedding cache get/set, vector search
+        assert len(calls) == 4 * 10 and loop_thread not in calls
+        assert rag.retriever.executor is executor
+        assert probe.stats()["max"] < 0.09  # one 100ms call on the loop would exceed this
+        executor.shutdown()
+
+    async def test_query_stream_async_sends_sources_then_deltas_then_verdict(self):
+        """Test streaming order and that streamed answers are cached for replay."""
+        from unittest.mock import AsyncMock
+
+        async def stream(**kwargs):
+            for token in ("Vectors ", "are ", "fast."):
+                yield token
+
+        gateway = MagicMock()
+        gateway.embed_async = AsyncMock(return_value=MagicMock(embeddings=[[1.0, 0.0, 0.0, 0.0]]))
+        gateway.generate_stream_async = MagicMock(side_effect=stream)
+        rag = RAGSystem(db=None, gateway=gateway, enable_memory=False, vector_store=NumpyVectorStore(dimension=4))
+        doc_id = rag.vector_ops.put_document("Vectors", "Vector search is fast.", tenant_id="t1")
+        rag.vector_ops.batch_insert_embeddings([(doc_id, [1.0, 0.0, 0.0, 0.0], rag.embedding_model)])
+        verdict = MagicMock(is_hallucination=False)
+        verdict.to_dict.return_value = {"is_hallucination": False, "confidence": 0.9}
+        rag.generator.hallucination_detector = MagicMock(detect_async=AsyncMock(return_value=verdict))
+
+        events = [e async for e in rag.query_stream_async("How fast?", tenant_id="t1", threshold=0.5,
+                                                          check_hallucination=True)]
+
+        assert [e["event"] for e in events] == ["sources", "delta", "delta", "delta", "hallucination", "done"]
+        assert events[0]["data"]["num_documents"] == 1 and events[0]["data"]["cached"] is False
+        answer = events[-1]["data"]["answer"]
+        assert answer["response"] == "Vectors are fast." and answer["is_hallucination"] is False
+        assert rag.generator.hallucination_detector.detect_async.await_args.kwargs["response"] == "Vectors are fast."
+
+        replay = [e async for e in rag.query_stream_async("How fast?", tenant_id="t1", threshold=0.5,
+                                                          check_hallucination=True)]
+        assert [e["event"] for e in replay] == ["sources", "delta", "hallucination", "done"]
+        assert replay[1]["data"]["text"] == "Vectors are fast." and replay[-1]["data"]["cached"] is True
+        assert gateway.generate_stream_async.call_count == 1
+        assert (await rag.query_async("How fast?", tenant_id="t1", threshold=0.5))["answer"] == answer
+
+    async def test_query_stream_async_reports_errors_in_band(self):
+        """Test a failure after the stream starts ends it with an error event."""
+        from unittest.mock import AsyncMock
+
+        async def stream(**kwargs):
+            yield "partial"
+            raise ConnectionError("provider went away")
+
+        gateway = MagicMock()
+        gateway.embed_async = AsyncMock(return_value=MagicMock(embeddings=[[1.0, 0.0, 0.0, 0.0]]))
+        gateway.generate_stream_async = MagicMock(side_effect=stream)
+        rag = RAGSystem(db=None, gateway=gateway, enable_memory=False, vector_store=NumpyVectorStore(dimension=4))
+
+        events = [e async for e in rag.query_stream_async("q", check_hallucination=False)]
+
+        assert [e["event"] for e in events] == ["sources", "delta", "error"]
+        assert "provider went away" in events[-1]["data"]["error"]
+
+    async def test_event_loop_lag_probe_detects_blocking(self):
+        """Test the lag probe measures a synchronous stall on the loop."""
+        import asyncio
+        import time
+
+        probe = EventLoopLagProbe(interval=0.005)
+        probe.start()
+        await asyncio.sleep(0.02)
+        time.sleep(0.1)
+        await asyncio.sleep(0.02)
+        await probe.stop()
+
+        stats = probe.stats()
+        assert not probe.running
+        assert stats["max"] >= 0.09 and stats["p50"] < 0.05
+
     def test_query(self, mock_rag_system):
         """Test RAG query."""
         rag, mock_db, mock_gateway = mock_rag_system
@@ -336,6 +824,89 @@ class TestRAGSystem:
             assert final_memory_size > initial_memory_size
 
 
+
+class TestNumpyVectorStore:
+    """Test NumpyVectorStore."""
+
+    @staticmethod
+    def _fill(store, vectors, tenant_of=lambda i: "t1"):
+        for i, vector in enumerate(vectors):
+            doc_id = store.put_document(f"Doc {i}", f"Content {i}", {"rank": i}, tenant_id=tenant_of(i))
+            store.batch_insert_embeddings([(doc_id, vector, "model-a")])
+
+    def test_satisfies_protocols(self):
+        """Test the in-process store and pgvector operations share the VectorStore protocol."""
+        from src.core.postgresql_database.vector_operations import VectorOperations
+
+        store = NumpyVectorStore(dimension=8)
+        assert isinstance(store, VectorStore) and isinstance(store, DocumentCatalog)
+        assert isinstance(VectorOperations(MagicMock()), VectorStore)
+        assert not isinstance(VectorOperations(MagicMock()), DocumentCatalog)
+
+    def test_exact_top_k_matches_brute_force(self):
+        """Test blockwise argpartition top-k returns the exact cosine ranking."""
+        import numpy as np
+
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((300, 16)).astype(np.float32)
+        store = NumpyVectorStore(dimension=16, block_size=64, initial_capacity=8, ivf_min_rows=0)
+        self._fill(store, vectors)
+
+        query = rng.standard_normal(16)
+        results = store.similarity_search(query.tolist(), limit=5, threshold=-1.0)
+
+        normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        expected = np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:5]
+        assert [r["id"] for r in results] == expected.tolist()
+        assert results[0]["similarity"] >= results[-1]["similarity"]
+        assert results[0]["title"] == f"Doc {expected[0]}"
+
+    def test_filters_model_threshold_and_delete(self):
+        """Test tenant/metadata filters, model filter, threshold and tombstone deletes."""
+        store = NumpyVectorStore(dimension=2)
+        self._fill(store, [[1.0, 0.0], [0.9, 0.1], [0.0, 1.0]], tenant_of=lambda i: "t1" if i < 2 else "t2")
+
+        assert [r["document_id"] for r in store.similarity_search([1.0, 0.0], filters={"tenant_id": "t2"}, threshold=-1)] == [3]
+        assert [r["document_id"] for r in store.similarity_search([1.0, 0.0], filters={"rank": {"$gte": 1}}, threshold=0.5)] == [2]
+        assert store.similarity_search([1.0, 0.0], model="model-b") == []
+        assert [r["document_id"] for r in store.similarity_search([1.0, 0.0], threshold=0.5)] == [1, 2]
+
+        assert store.delete_embeddings(1) == 1
+        assert [r["document_id"] for r in store.similarity_search([1.0, 0.0], threshold=0.5)] == [2]
+
+    def test_search_batch_matches_single_queries(self):
+        """Test batched queries return the same results as one query at a time, with IVF."""
+        import numpy as np
+
+        rng = np.random.default_rng(1)
+        centers = rng.standard_normal((10, 16))
+        vectors = (centers[rng.integers(0, 10, 2000)] + 0.3 * rng.standard_normal((2000, 16))).astype(np.float32)
+        store = NumpyVectorStore(dimension=16, ivf_min_rows=1000, n_probe=3, block_size=256)
+        store.batch_insert_embeddings([(i + 1, vector, "model-a") for i, vector in enumerate(vectors)])
+
+        queries = vectors[:8]
+        batched = store.search_batch(queries, limit=5)
+        assert store.stats()["ivf_lists"] > 0
+        for query, results in zip(queries, batched):
+            assert [r["id"] for r in store.similarity_search(query, limit=5)] == [r["id"] for r in results]
+            assert results[0]["similarity"] == pytest.approx(1.0, abs=1e-5)
+
+    def test_memory_mapped_store_reopens_and_appends(self, tmp_path):
+        """Test flushed state survives reopening and appends grow the memory map."""
+        store = NumpyVectorStore(dimension=3, path=str(tmp_path), initial_capacity=2)
+        self._fill(store, [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]])
+        store.batch_insert_embeddings([(2, [0.0, 0.0, 1.0], "model-a")])
+        store.close()
+
+        reopened = NumpyVectorStore(dimension=3, path=str(tmp_path))
+        assert len(reopened) == 3
+        assert reopened.similarity_search([0.0, 0.0, 1.0], limit=1)[0]["document_id"] == 2
+        reopened.batch_insert_embeddings([(1, [0.0, 0.0, 1.0], "model-a")])
+        assert len(reopened.similarity_search([0.0, 0.0, 1.0], threshold=0.9)) == 2
+
+        with pytest.raises(ValueError):
+            NumpyVectorStore(dimension=4, path=str(tmp_path))
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
-